@@ -1,58 +1,560 @@
 import streamlit as st
-import streamlit.components.v1 as components
-import google.generativeai as genai
-import PyPDF2
-import requests
+import bisect
 import json
 import datetime
-import matplotlib.pyplot as plt
-from bs4 import BeautifulSoup
 import os
 import random
+import re
 import time
 import glob
-from typing import Dict, List, Any
+import hashlib
+import heapq
+import hmac
+import html
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Any, Optional, Tuple
 
-# --- RAG İÇİN İMPORTLAR ---
-from langchain_community.vectorstores import FAISS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain.prompts import PromptTemplate
-from langchain.chains.question_answering import load_qa_chain
-from langchain_google_genai import ChatGoogleGenerativeAI
+# Ağır kütüphaneler (google.generativeai, PyPDF2, matplotlib, BeautifulSoup, requests,
+# langchain/FAISS/HuggingFace) modül başında değil, kullanıldıkları fonksiyonlarda import
+# edilir. Böylece giriş ekranı torch/sentence-transformers yüküne katlanmadan açılır.
+# Ölçüm için: python benchmarks/import_suresi.py
+#
+# Arka plan iş parçacıklarında (hatırlatma, oturum bakımı, RAG inşası, model ön yüklemesi)
+# st.* çağrısı YAPILMAMALI; bu iş parçacıkları ihtiyaç duydukları nesneleri dışarıdan alır.
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+# ==================== İZLEME (SPAN, HİSTOGRAM, SAYAÇ) ====================
+class _BosSpan:
+    """İzleme kapalıyken dönen, hiçbir şey yapmayan bağlam yöneticisi."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *hata):
+        return False
+
+
+_BOS_SPAN = _BosSpan()
+
+
+class _Span:
+    __slots__ = ("izleyici", "ad", "t0")
+
+    def __init__(self, izleyici, ad: str):
+        self.izleyici = izleyici
+        self.ad = ad
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *hata):
+        self.izleyici.gozlem(self.ad, (time.perf_counter() - self.t0) * 1000)
+        return False
+
+
+class Izleyici:
+    """Aşama bazlı gecikme histogramları ve sayaçlar; ASISTAN_IZLEME=1 ile açılır, kapalıyken maliyeti tek bir kontroldür"""
+    # Histogram kova üst sınırları (ms); son kova +sonsuz
+    KOVALAR_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self, aktif: bool = False):
+        self.aktif = aktif
+        self._kilit = threading.Lock()
+        self._histogramlar = {}  # {asama: [kova sayıları..., +inf]}
+        self._ozetler = {}  # {asama: [adet, toplam_ms, maks_ms]}
+        self._sayaclar = {}
+
+    def span(self, ad: str):
+        if not self.aktif:
+            return _BOS_SPAN
+        return _Span(self, ad)
+
+    def gozlem(self, ad: str, ms: float):
+        """Dışarıda ölçülmüş bir süreyi (ms) histograma ekler."""
+        if not self.aktif:
+            return
+        kova = bisect.bisect_left(self.KOVALAR_MS, ms)
+        with self._kilit:
+            histogram = self._histogramlar.get(ad)
+            if histogram is None:
+                histogram = self._histogramlar[ad] = [0] * (len(self.KOVALAR_MS) + 1)
+                self._ozetler[ad] = [0, 0.0, 0.0]
+            histogram[kova] += 1
+            ozet = self._ozetler[ad]
+            ozet[0] += 1
+            ozet[1] += ms
+            ozet[2] = max(ozet[2], ms)
+
+    def sayac(self, ad: str, deger: float = 1):
+        if not self.aktif:
+            return
+        with self._kilit:
+            self._sayaclar[ad] = self._sayaclar.get(ad, 0) + deger
+
+    def _yuzdelik(self, histogram: List[int], adet: int, oran: float, maks_ms: float) -> float:
+        """Histogramdan yüzdelik tahmini (düştüğü kovanın üst sınırı)."""
+        hedef = oran * adet
+        birikimli = 0
+        for i, sayi in enumerate(histogram):
+            birikimli += sayi
+            if birikimli >= hedef:
+                return float(self.KOVALAR_MS[i]) if i < len(self.KOVALAR_MS) else maks_ms
+        return maks_ms
+
+    def anlik_goruntu(self) -> Dict[str, Any]:
+        with self._kilit:
+            histogramlar = {ad: list(h) for ad, h in self._histogramlar.items()}
+            ozetler = {ad: list(o) for ad, o in self._ozetler.items()}
+            sayaclar = dict(self._sayaclar)
+        asamalar = {}
+        for ad, histogram in sorted(histogramlar.items()):
+            adet, toplam_ms, maks_ms = ozetler[ad]
+            asamalar[ad] = {
+                "adet": adet,
+                "ortalama_ms": round(toplam_ms / adet, 2),
+                "p50_ms": self._yuzdelik(histogram, adet, 0.50, maks_ms),
+                "p95_ms": self._yuzdelik(histogram, adet, 0.95, maks_ms),
+                "maks_ms": round(maks_ms, 2),
+                "kovalar": {(f"<={s}" if i < len(self.KOVALAR_MS) else "+inf"): n
+                            for i, (s, n) in enumerate(zip(self.KOVALAR_MS + ("+inf",), histogram)) if n},
+            }
+        return {"zaman": datetime.datetime.now().isoformat(timespec="seconds"),
+                "asamalar": asamalar, "sayaclar": sayaclar}
+
+    def disa_aktar(self, dosya_yolu: str):
+        """Anlık görüntüyü JSON olarak yazar (önce geçici dosyaya, sonra atomik olarak değiştirir)."""
+        gecici = f"{dosya_yolu}.tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(self.anlik_goruntu(), f, ensure_ascii=False, indent=2)
+        os.replace(gecici, dosya_yolu)
+
+    def periyodik_disa_aktar(self, dosya_yolu: str, aralik_sn: float = 30):
+        """Arka planda her aralik_sn saniyede bir dosyaya yazar."""
+        def _dongu():
+            while True:
+                time.sleep(aralik_sn)
+                if self.aktif:
+                    try:
+                        self.disa_aktar(dosya_yolu)
+                    except OSError:
+                        pass
+        threading.Thread(target=_dongu, name="izleme-disa-aktarim", daemon=True).start()
+
+    def sifirla(self):
+        with self._kilit:
+            self._histogramlar.clear()
+            self._ozetler.clear()
+            self._sayaclar.clear()
+
+
+@st.cache_resource(show_spinner=False)
+def izleyici() -> Izleyici:
+    """Süreç genelinde paylaşılan izleyici."""
+    iz = Izleyici(aktif=os.environ.get("ASISTAN_IZLEME") == "1")
+    if os.environ.get("ASISTAN_IZLEME_DOSYASI"):
+        iz.periyodik_disa_aktar(os.environ["ASISTAN_IZLEME_DOSYASI"])
+    return iz
+
+
+# ==================== GEMINI ÇAĞRILARI ====================
+GEMINI_MODELI = 'gemini-2.5-flash'
+
+
+def gemini_uret(api_anahtari: str, icerik, islem: str) -> str:
+    """Gemini'ye tek generate_content çağrısı; süreyi ve token kullanımını izleyiciye yazar"""
+    import google.generativeai as genai
+    iz = izleyici()
+    genai.configure(api_key=api_anahtari)
+    model = genai.GenerativeModel(GEMINI_MODELI)
+    with iz.span(f"llm.{islem}"):
+        response = model.generate_content(icerik)
+    iz.sayac(f"llm.{islem}.cagri")
+    kullanim = getattr(response, "usage_metadata", None)
+    if kullanim is not None:
+        iz.sayac("llm.girdi_token", getattr(kullanim, "prompt_token_count", 0) or 0)
+        iz.sayac("llm.cikti_token", getattr(kullanim, "candidates_token_count", 0) or 0)
+    return response.text
+
+
+# ==================== VERİ MODELLERİ ====================
+# Oturum başına binlerce tutulan kayıtlar: sözlük yerine __slots__'lı sınıflar (öznitelik başına
+# bir işaretçi, anahtar tablosu yok). Ölçüm: python benchmarks/oturum_bellegi.py
+@dataclass(slots=True)
+class CalismaKaydi:
+    ders: str
+    sure: float
+    tarih: datetime.datetime
+    konular: Tuple[str, ...] = ()
+
+    @property
+    def gun(self) -> datetime.date:
+        return self.tarih.date()
+
+
+@dataclass(slots=True)
+class Hedef:
+    id: int
+    metin: str
+    kategori: str
+    olusturma_tarihi: datetime.datetime
+    bitis_tarihi: datetime.date
+    tamamlandi: bool = False
+    ilerleme: int = 0
+    tamamlanma_tarihi: Optional[datetime.datetime] = None
+
+
+@dataclass(slots=True)
+class SohbetTuru:
+    mesaj: str
+    cevap: str
+    zaman: datetime.datetime
+
+
+# ==================== KALICI VERİ (SQLite) ====================
+# Kalıcı veri isteğe bağlıdır: ASISTAN_VERI_DIZINI verilmezse çalışma kayıtları diske yazılmaz
+VERI_DIZINI = os.environ.get("ASISTAN_VERI_DIZINI", "")
+
+
+def depo_kimligi(kullanici_adi: str, api_anahtari: str) -> str:
+    """Kalıcı depodaki öğrenci kimliği: ad serbest metin olduğundan doğrulanmış API anahtarının özetiyle bağlanır."""
+    return f"{kullanici_adi}#{hashlib.sha256(api_anahtari.encode('utf-8')).hexdigest()[:12]}"
+
+
+class CalismaDeposu:
+    """Tüm öğrencilerin çalışma kayıtları ve günlük özetleri için paylaşılan SQLite deposu"""
+
+    def __init__(self, dosya_yolu: str):
+        import sqlite3
+        os.makedirs(os.path.dirname(dosya_yolu) or ".", exist_ok=True)
+        self.dosya_yolu = dosya_yolu
+        self._baglanti = sqlite3.connect(dosya_yolu, check_same_thread=False)
+        self._kilit = threading.Lock()
+        self._id_onbellegi = {"kullanicilar": {}, "dersler": {}}
+        with self._kilit, self._baglanti:
+            self._baglanti.execute("PRAGMA journal_mode=WAL")
+            self._baglanti.execute("PRAGMA synchronous=NORMAL")
+            self._baglanti.executescript("""
+                CREATE TABLE IF NOT EXISTS kullanicilar (id INTEGER PRIMARY KEY, ad TEXT NOT NULL UNIQUE);
+                CREATE TABLE IF NOT EXISTS dersler (id INTEGER PRIMARY KEY, ad TEXT NOT NULL UNIQUE COLLATE NOCASE);
+                CREATE TABLE IF NOT EXISTS calisma_kayitlari (
+                    id INTEGER PRIMARY KEY, kullanici_id INTEGER NOT NULL, ders_id INTEGER NOT NULL,
+                    sure REAL NOT NULL, konular TEXT NOT NULL, zaman REAL NOT NULL, gun INTEGER NOT NULL);
+                CREATE TABLE IF NOT EXISTS gunluk_ozet (
+                    gun INTEGER NOT NULL, kullanici_id INTEGER NOT NULL, ders_id INTEGER NOT NULL,
+                    sure REAL NOT NULL, kayit_sayisi INTEGER NOT NULL,
+                    PRIMARY KEY (gun, kullanici_id, ders_id)) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS ai_onerileri (
+                    anahtar TEXT PRIMARY KEY, kullanici TEXT NOT NULL, metin TEXT NOT NULL, zaman REAL NOT NULL);
+            """)
+
+    def _id(self, tablo: str, ad: str, yeni: Dict[Tuple[str, str], int]) -> int:
+        # İşlem içinde eklenen id'ler önce yeni'ye yazılır; önbelleğe commit'ten sonra girer
+        # (işlem geri alınırsa aynı id başka bir ada verilebilir)
+        kimlik = self._id_onbellegi[tablo].get(ad, yeni.get((tablo, ad)))
+        if kimlik is None:
+            self._baglanti.execute(f"INSERT OR IGNORE INTO {tablo} (ad) VALUES (?)", (ad,))
+            kimlik = yeni[tablo, ad] = self._baglanti.execute(f"SELECT id FROM {tablo} WHERE ad = ?", (ad,)).fetchone()[0]
+        return kimlik
+
+    def toplu_ekle(self, kayitlar) -> int:
+        """kayitlar: (kullanici_adi, ders, sure, konular, zaman) demetleri. Ham tabloya ekler, günlük özeti günceller."""
+        yeni = {}
+        with self._kilit:
+            with self._baglanti:
+                son_id = self._baglanti.execute("SELECT COALESCE(MAX(id), 0) FROM calisma_kayitlari").fetchone()[0]
+                satirlar = [(self._id("kullanicilar", k, yeni), self._id("dersler", d, yeni), float(sure),
+                             json.dumps(konular, ensure_ascii=False), zaman.timestamp(), zaman.toordinal())
+                            for k, d, sure, konular, zaman in kayitlar]
+                self._baglanti.executemany(
+                    "INSERT INTO calisma_kayitlari (kullanici_id, ders_id, sure, konular, zaman, gun) VALUES (?, ?, ?, ?, ?, ?)",
+                    satirlar)
+                self._baglanti.execute("""
+                    INSERT INTO gunluk_ozet
+                    SELECT gun, kullanici_id, ders_id, SUM(sure), COUNT(*) FROM calisma_kayitlari
+                    WHERE id > ? GROUP BY gun, kullanici_id, ders_id
+                    ON CONFLICT (gun, kullanici_id, ders_id)
+                    DO UPDATE SET sure = sure + excluded.sure, kayit_sayisi = kayit_sayisi + excluded.kayit_sayisi
+                """, (son_id,))
+            for (tablo, ad), kimlik in yeni.items():
+                self._id_onbellegi[tablo][ad] = kimlik
+        return len(satirlar)
+
+    def kayit_ekle(self, kullanici_adi: str, ders: str, sure: float, konular: List[str], zaman: datetime.datetime):
+        self.toplu_ekle([(kullanici_adi, ders, sure, konular, zaman)])
+
+    def _oku(self, sorgu: str, parametreler=()):
+        """(sütun dizileri, en büyük ham kayıt id'si) — ikisi aynı okuma işleminde alınır."""
+        import numpy as np
+        with self._kilit:
+            imlec = self._baglanti.cursor()
+            imlec.execute("BEGIN")
+            try:
+                satirlar = imlec.execute(sorgu, parametreler).fetchall()
+                son_id = imlec.execute("SELECT COALESCE(MAX(id), 0) FROM calisma_kayitlari").fetchone()[0]
+            finally:
+                imlec.execute("COMMIT")
+        dizi = np.array(satirlar, dtype="float64").reshape(-1, 4)
+        return {"gun": dizi[:, 0].astype("int32"), "kullanici_id": dizi[:, 1].astype("int32"),
+                "ders_id": dizi[:, 2].astype("int32"), "sure": dizi[:, 3]}, son_id
+
+    def gunluk_ozet(self):
+        """Tüm günlük özet satırları ve o anki en büyük ham kayıt id'si."""
+        return self._oku("SELECT gun, kullanici_id, ders_id, sure FROM gunluk_ozet")
+
+    def yeni_kayitlar(self, son_id: int):
+        """son_id'den sonra eklenen ham kayıtlar, (gün, öğrenci, ders) bazında toplanmış olarak."""
+        return self._oku("SELECT gun, kullanici_id, ders_id, SUM(sure) FROM calisma_kayitlari WHERE id > ? "
+                         "GROUP BY gun, kullanici_id, ders_id", (son_id,))
+
+    def adlar(self, tablo: str) -> Dict[int, str]:
+        with self._kilit:
+            return dict(self._baglanti.execute(f"SELECT id, ad FROM {tablo}").fetchall())
+
+    def kullanici_kayitlari(self, kullanici_adi: str) -> List[CalismaKaydi]:
+        """Bir öğrencinin ham kayıtları (eskiden yeniye)."""
+        with self._kilit:
+            satirlar = self._baglanti.execute("""
+                SELECT d.ad, c.sure, c.konular, c.zaman FROM calisma_kayitlari c
+                JOIN kullanicilar k ON k.id = c.kullanici_id JOIN dersler d ON d.id = c.ders_id
+                WHERE k.ad = ? ORDER BY c.id
+            """, (kullanici_adi,)).fetchall()
+        return [CalismaKaydi(ders, sure, datetime.datetime.fromtimestamp(zaman), tuple(json.loads(konular)))
+                for ders, sure, konular, zaman in satirlar]
+
+    def aktif_kullanicilar(self, gun_sayisi: int, bugun: datetime.date = None) -> List[str]:
+        """Son gun_sayisi gün içinde en az bir kaydı olan öğrenciler."""
+        ilk_gun = (bugun or datetime.date.today()).toordinal() - gun_sayisi + 1
+        with self._kilit:
+            return [ad for (ad,) in self._baglanti.execute("""
+                SELECT ad FROM kullanicilar WHERE id IN (SELECT DISTINCT kullanici_id FROM gunluk_ozet WHERE gun >= ?)
+                ORDER BY ad
+            """, (ilk_gun,))]
+
+    def oneri_al(self, anahtar: str):
+        """(zaman, metin) ya da None."""
+        with self._kilit:
+            return self._baglanti.execute("SELECT zaman, metin FROM ai_onerileri WHERE anahtar = ?", (anahtar,)).fetchone()
+
+    def oneri_kaydet(self, anahtar: str, kullanici_adi: str, metin: str, zaman: float):
+        with self._kilit, self._baglanti:
+            self._baglanti.execute("INSERT OR REPLACE INTO ai_onerileri VALUES (?, ?, ?, ?)",
+                                   (anahtar, kullanici_adi, metin, zaman))
+
+
+@st.cache_resource(show_spinner=False)
+def calisma_deposu():
+    """Süreç genelinde paylaşılan çalışma deposu; VERI_DIZINI boşsa None."""
+    if not VERI_DIZINI:
+        return None
+    return CalismaDeposu(os.path.join(VERI_DIZINI, "asistan.db"))
+
+
+# AI önerilerinin geçerlilik süresi (saniye)
+ONERI_TTL_SN = float(os.environ.get("ASISTAN_ONERI_TTL_SN", "86400"))
+
+
+class OneriOnbellegi:
+    """AI önerilerini analiz özeti + prompt sürümü anahtarıyla saklayan LRU (isteğe bağlı SQLite katmanıyla)"""
+    AZAMI_BELLEK = 1024
+
+    def __init__(self, depo: CalismaDeposu = None, ttl_sn: float = ONERI_TTL_SN, izleyici: Izleyici = None):
+        self.depo = depo
+        self.ttl_sn = ttl_sn
+        self.izleyici = izleyici or Izleyici()
+        self._bellek = OrderedDict()  # {anahtar: (zaman, metin)}
+        self._kilit = threading.Lock()
+        self._uretim_kilitleri = {}  # {anahtar: Lock} — sürmekte olan üretimler
+
+    @staticmethod
+    def anahtar(*parcalar) -> str:
+        return hashlib.sha256("\x1f".join(str(p) for p in parcalar).encode("utf-8")).hexdigest()
+
+    def al(self, anahtar: str):
+        """Geçerli (TTL dolmamış) öneri metni ya da None."""
+        simdi = time.time()
+        with self._kilit:
+            kayit = self._bellek.get(anahtar)
+            if kayit is not None:
+                self._bellek.move_to_end(anahtar)
+        if kayit is None and self.depo is not None:
+            try:
+                kayit = self.depo.oneri_al(anahtar)
+            except Exception:
+                self.izleyici.sayac("veri.okuma_hatasi")
+            if kayit is not None:
+                self._bellege_yaz(anahtar, kayit)
+        if kayit is None or simdi - kayit[0] > self.ttl_sn:
+            return None
+        return kayit[1]
+
+    def _bellege_yaz(self, anahtar: str, kayit):
+        with self._kilit:
+            self._bellek[anahtar] = kayit
+            self._bellek.move_to_end(anahtar)
+            while len(self._bellek) > self.AZAMI_BELLEK:
+                self._bellek.popitem(last=False)
+
+    def kaydet(self, anahtar: str, kullanici_adi: str, metin: str):
+        kayit = (time.time(), metin)
+        self._bellege_yaz(anahtar, kayit)
+        if self.depo is not None:
+            try:
+                self.depo.oneri_kaydet(anahtar, kullanici_adi, metin, kayit[0])
+            except Exception:
+                self.izleyici.sayac("veri.yazma_hatasi")
+
+    def al_veya_uret(self, anahtar: str, kullanici_adi: str, uret) -> str:
+        """Önbellekte varsa döner; yoksa uret() bir kez çağrılır, aynı anahtarı bekleyenler sonucu paylaşır."""
+        metin = self.al(anahtar)
+        if metin is not None:
+            self.izleyici.sayac("onbellek.ai_oneri.isabet")
+            return metin
+        with self._kilit:
+            kilit = self._uretim_kilitleri.setdefault(anahtar, threading.Lock())
+        try:
+            with kilit:
+                metin = self.al(anahtar)
+                if metin is not None:
+                    self.izleyici.sayac("onbellek.ai_oneri.birlestirme")
+                    return metin
+                self.izleyici.sayac("onbellek.ai_oneri.iskalama")
+                metin = uret()
+                self.kaydet(anahtar, kullanici_adi, metin)
+                return metin
+        finally:
+            with self._kilit:
+                if self._uretim_kilitleri.get(anahtar) is kilit and not kilit.locked():
+                    del self._uretim_kilitleri[anahtar]
+
+
+@st.cache_resource(show_spinner=False)
+def oneri_onbellegi() -> OneriOnbellegi:
+    """Süreç genelinde paylaşılan AI öneri önbelleği (kalıcı veri açıksa SQLite destekli)."""
+    return OneriOnbellegi(calisma_deposu(), izleyici=izleyici())
+
+
+# ==================== ARALIKLI TEKRAR (SM-2) ====================
+class AralikliTekrar:
+    """Konu başına SM-2 tekrar durumu; vadesi gelen konular kullanıcı başına bir min-heap'ten okunur"""
+    VARSAYILAN_KALITE = 4
+
+    def __init__(self):
+        self.durumlar = {}  # {kullanici_adi: {(ders, konu) küçük harf: durum}}
+        self._vade_yigini = {}  # {kullanici_adi: [(vade, sira, anahtar, surum)]}
+        self._sira = 0
+
+    @staticmethod
+    def anahtar(ders: str, konu: str):
+        return ders.strip().lower(), konu.strip().lower()
+
+    def tekrar_kaydet(self, kullanici_adi: str, ders: str, konu: str, kalite: int = VARSAYILAN_KALITE,
+                      tarih: datetime.date = None) -> Dict:
+        """Bir konunun tekrarını SM-2 ile işler ve güncel durumu döner."""
+        tarih = tarih or datetime.datetime.now().date()
+        anahtar = self.anahtar(ders, konu)
+        durumlar = self.durumlar.setdefault(kullanici_adi, {})
+        durum = durumlar.get(anahtar)
+        if durum is None:
+            durum = durumlar[anahtar] = {"ders": ders, "konu": konu.strip(), "tekrar": 0, "aralik": 0,
+                                         "kolaylik": 2.5, "son_tekrar": None, "vade": tarih, "surum": 0}
+        elif durum["son_tekrar"] == tarih and kalite >= 3:
+            return durum  # Aynı gün aynı konuyu tekrar çalışmak aralığı büyütmez
+
+        if kalite < 3:
+            durum["tekrar"] = 0
+            durum["aralik"] = 1
+        else:
+            durum["aralik"] = 1 if durum["tekrar"] == 0 else 6 if durum["tekrar"] == 1 else round(durum["aralik"] * durum["kolaylik"])
+            durum["tekrar"] += 1
+        durum["kolaylik"] = max(1.3, durum["kolaylik"] + 0.1 - (5 - kalite) * (0.08 + (5 - kalite) * 0.02))
+        durum["son_tekrar"] = tarih
+        durum["vade"] = tarih + datetime.timedelta(days=durum["aralik"])
+        durum["surum"] += 1
+
+        yigin = self._vade_yigini.setdefault(kullanici_adi, [])
+        self._sira += 1
+        heapq.heappush(yigin, (durum["vade"], self._sira, anahtar, durum["surum"]))
+        if len(yigin) > 2 * len(durumlar) + 16:
+            # Bayat kayıtlar birikmişse yığını güncel durumlardan yeniden kur
+            yigin[:] = [(d["vade"], i, a, d["surum"]) for i, (a, d) in enumerate(durumlar.items())]
+            heapq.heapify(yigin)
+        return durum
+
+    def sifirla(self, kullanici_adi: str):
+        """Kullanıcının tüm konu durumlarını siler."""
+        self.durumlar.pop(kullanici_adi, None)
+        self._vade_yigini.pop(kullanici_adi, None)
+
+    def durum_yukle(self, kullanici_adi: str, durum: Dict):
+        """Dışarıdan gelen bir konu durumunu olduğu gibi ekler ve vade yığınına koyar."""
+        anahtar = self.anahtar(durum["ders"], durum["konu"])
+        self.durumlar.setdefault(kullanici_adi, {})[anahtar] = durum
+        self._sira += 1
+        heapq.heappush(self._vade_yigini.setdefault(kullanici_adi, []), (durum["vade"], self._sira, anahtar, durum["surum"]))
+
+    def bugun_tekrar_edilecekler(self, kullanici_adi: str, bugun: datetime.date = None, k: int = 5) -> List[Dict]:
+        """Vadesi gelmiş (veya geçmiş) en acil k konu, en eski vade önce; O(k log n)."""
+        bugun = bugun or datetime.datetime.now().date()
+        yigin = self._vade_yigini.get(kullanici_adi)
+        if not yigin:
+            return []
+        durumlar = self.durumlar[kullanici_adi]
+        secilen = []
+        while yigin and len(secilen) < k and yigin[0][0] <= bugun:
+            kayit = heapq.heappop(yigin)
+            if durumlar[kayit[2]]["surum"] == kayit[3]:
+                secilen.append(kayit)
+        for kayit in secilen:
+            heapq.heappush(yigin, kayit)
+        return [dict(durumlar[kayit[2]], gecikme_gun=(bugun - kayit[0]).days) for kayit in secilen]
 
 
 # ==================== KİŞİSEL ÖĞRENME ANALİTİĞİ ====================
 class OgrenmeAnalitigi:
-    def __init__(self):
-        self.calisma_kayitlari = {}  # {kullanici_adi: [{ders, sure, tarih, konular}, ...]}
-        self.ders_istatistikleri = {}
+    # Prompt'un biçimi ya da beklenen çıktı değiştiğinde artırılır; eski önbellek kayıtları geçersizleşir
+    ONERI_PROMPT_SURUMU = 1
+
+    def __init__(self, depo: CalismaDeposu = None, oneri_onbellegi: OneriOnbellegi = None):
+        self.calisma_kayitlari = {}  # {kullanici_adi: [CalismaKaydi, ...]}
+        self.konu_tekrari = AralikliTekrar()
+        self.depo = depo  # Verilirse kayıtlar kohort analitiği için kalıcı depoya da yazılır
+        self.depo_kimlikleri = {}  # {kullanici_adi: depo_kimligi(...)}; sadece bağlanan öğrenciler depoya yazılır
+        self.oneri_onbellegi = oneri_onbellegi
     
     def calisma_kaydet(self, kullanici_adi: str, ders: str, sure: float, konular: List[str]):
         """Çalışma kaydı ekle"""
         if kullanici_adi not in self.calisma_kayitlari:
             self.calisma_kayitlari[kullanici_adi] = []
         
-        kayit = {
-            "ders": ders,
-            "sure": sure,
-            "konular": konular,
-            "tarih": datetime.datetime.now(),
-            "gun": datetime.datetime.now().date()
-        }
+        kayit = CalismaKaydi(ders, sure, datetime.datetime.now(), tuple(konular))
         self.calisma_kayitlari[kullanici_adi].append(kayit)
+        if self.depo is not None and kullanici_adi in self.depo_kimlikleri:
+            try:
+                self.depo.kayit_ekle(self.depo_kimlikleri[kullanici_adi], ders, sure, konular, kayit.tarih)
+            except Exception:
+                # Disk hatası oturumdaki analitiği bozmasın
+                izleyici().sayac("veri.yazma_hatasi")
+        for konu in konular:
+            self.konu_tekrari.tekrar_kaydet(kullanici_adi, ders, konu, tarih=kayit.gun)
     
     def son_calisma_zamani(self, kullanici_adi: str, ders: str) -> int:
         """Belirli bir derste son çalışmadan bu yana geçen gün sayısı"""
         if kullanici_adi not in self.calisma_kayitlari:
             return -1
         
-        ders_kayitlari = [k for k in self.calisma_kayitlari[kullanici_adi] if k["ders"].lower() == ders.lower()]
+        ders_kayitlari = [k for k in self.calisma_kayitlari[kullanici_adi] if k.ders.lower() == ders.lower()]
         if not ders_kayitlari:
             return -1
         
-        son_kayit = max(ders_kayitlari, key=lambda x: x["tarih"])
-        gecen_gun = (datetime.datetime.now().date() - son_kayit["gun"]).days
+        son_kayit = max(ders_kayitlari, key=lambda x: x.tarih)
+        gecen_gun = (datetime.datetime.now().date() - son_kayit.gun).days
         return gecen_gun
     
     def ders_analizi(self, kullanici_adi: str, ders: str) -> Dict:
@@ -60,7 +562,7 @@ class OgrenmeAnalitigi:
         if kullanici_adi not in self.calisma_kayitlari:
             return {"hata": "Veri bulunamadı"}
         
-        ders_kayitlari = [k for k in self.calisma_kayitlari[kullanici_adi] if k["ders"].lower() == ders.lower()]
+        ders_kayitlari = [k for k in self.calisma_kayitlari[kullanici_adi] if k.ders.lower() == ders.lower()]
         
         if not ders_kayitlari:
             return {
@@ -73,14 +575,14 @@ class OgrenmeAnalitigi:
                 "durum": "yeni"
             }
         
-        toplam_sure = sum([k["sure"] for k in ders_kayitlari])
-        calisma_gunleri = len(set([k["gun"] for k in ders_kayitlari]))
+        toplam_sure = sum([k.sure for k in ders_kayitlari])
+        calisma_gunleri = len(set([k.gun for k in ders_kayitlari]))
         son_calisma = self.son_calisma_zamani(kullanici_adi, ders)
         ortalama_sure = toplam_sure / calisma_gunleri if calisma_gunleri > 0 else 0
-        toplam_konu = sum([len(k["konular"]) for k in ders_kayitlari])
+        toplam_konu = sum([len(k.konular) for k in ders_kayitlari])
         
         # Son 7 günde çalışma kontrolü
-        son_7_gun = [k for k in ders_kayitlari if (datetime.datetime.now().date() - k["gun"]).days <= 7]
+        son_7_gun = [k for k in ders_kayitlari if (datetime.datetime.now().date() - k.gun).days <= 7]
         
         return {
             "ders": ders,
@@ -98,65 +600,100 @@ class OgrenmeAnalitigi:
         if kullanici_adi not in self.calisma_kayitlari:
             return {}
         
-        dersler = list(set([k["ders"] for k in self.calisma_kayitlari[kullanici_adi]]))
-        analiz_sonuclari = {}
-        
-        for ders in dersler:
-            analiz_sonuclari[ders] = self.ders_analizi(kullanici_adi, ders)
+        with izleyici().span("analitik.genel_analiz"):
+            dersler = list(set([k.ders for k in self.calisma_kayitlari[kullanici_adi]]))
+            analiz_sonuclari = {}
+            
+            for ders in dersler:
+                analiz_sonuclari[ders] = self.ders_analizi(kullanici_adi, ders)
         
         return analiz_sonuclari
     
-    def ai_onerileri_olustur(self, kullanici_adi: str, api_anahtari: str = "") -> str:
-        """AI tabanlı öneriler oluştur"""
-        if not api_anahtari:
-            return "API anahtarı gerekli."
-        
+    def depoya_yaz(self, kullanici_adi: str) -> int:
+        """Bellekteki kayıtlardan depoda olmayanları (ör. arşivden gelenler) depoya yazar; yazılan sayıyı döner."""
+        if self.depo is None or kullanici_adi not in self.depo_kimlikleri:
+            return 0
+        kimlik = self.depo_kimlikleri[kullanici_adi]
+        try:
+            mevcut = {(k.ders, round(k.tarih.timestamp(), 3)) for k in self.depo.kullanici_kayitlari(kimlik)}
+            yeni = [(kimlik, k.ders, k.sure, list(k.konular), k.tarih)
+                    for k in self.calisma_kayitlari.get(kullanici_adi, [])
+                    if (k.ders, round(k.tarih.timestamp(), 3)) not in mevcut]
+            return self.depo.toplu_ekle(yeni) if yeni else 0
+        except Exception:
+            izleyici().sayac("veri.yazma_hatasi")
+            return 0
+
+    def depodan_yukle(self, depo: CalismaDeposu, kullanici_adi: str):
+        """Öğrencinin kalıcı depodaki kayıtlarını belleğe alır (depoya geri yazmaz)."""
+        kayitlar = depo.kullanici_kayitlari(self.depo_kimlikleri.get(kullanici_adi, kullanici_adi))
+        self.calisma_kayitlari[kullanici_adi] = kayitlar
+        # SM-2 durumu depoda tutulmaz; kayıtlar sırayla yeniden işlenerek kurulur (elle verilen notlar hariç)
+        self.konu_tekrari.sifirla(kullanici_adi)
+        for kayit in sorted(kayitlar, key=lambda k: k.tarih):
+            for konu in kayit.konular:
+                self.konu_tekrari.tekrar_kaydet(kullanici_adi, kayit.ders, konu, tarih=kayit.gun)
+
+    def oneri_istegi(self, kullanici_adi: str):
+        """AI önerisi için (önbellek anahtarı, prompt); kayıt yoksa None."""
         genel_analiz = self.genel_analiz(kullanici_adi)
         
         if not genel_analiz:
-            return "Henüz çalışma kaydı yok. Çalışmaya başladığında analiz yapabileceğim!"
+            return None
         
-        # Analiz verilerini metin formatına çevir
+        # Analiz verilerini metin formatına çevir (ders sırası sabit, aynı veri aynı anahtarı üretsin)
         analiz_metni = "**ÇALIŞMA ANALİZİ:**\n\n"
-        for ders, veri in genel_analiz.items():
+        for ders, veri in sorted(genel_analiz.items()):
             analiz_metni += f"• **{ders}:**\n"
             analiz_metni += f"  - Toplam çalışma: {veri['toplam_sure']:.1f} saat\n"
             analiz_metni += f"  - Çalışılan gün: {veri['calisma_gun_sayisi']} gün\n"
             analiz_metni += f"  - Son çalışma: {veri['son_calisma']} gün önce\n"
             analiz_metni += f"  - Durum: {veri['durum']}\n\n"
         
+        prompt = f"""
+        Sen bir kişisel öğrenme koçusun. Aşağıdaki öğrenci çalışma verilerini analiz et ve 
+        kişiselleştirilmiş ve motive edici önerilerde bulun. Aynı zamanda eğlenceli ol. 
+        
+        {analiz_metni}
+        
+        Lütfen şu formatta Türkçe geri bildirim ver:
+        
+        **📊 GENEL DEĞERLENDİRME:**
+        (Genel çalışma alışkanlıkları hakkında kısa bir değerlendirme)
+        
+        **⚠️ DİKKAT GEREKTİREN DERSLER:**
+        (Uzun süredir çalışılmayan veya ihmal edilen dersler)
+        
+        **✨ GÜÇLÜ YÖNLER:**
+        (Düzenli çalışılan ve ilerleme kaydedilen dersler)
+        
+        **🎯 KİŞİSELLEŞTİRİLMİŞ ÖNERİLER:**
+        (Her ders için spesifik öneriler ve çalışma stratejileri)
+        
+        **💪 MOTİVASYON MESAJI:**
+        (Öğrenciyi motive edecek pozitif bir mesaj)
+        
+        Önerilerini eğlenceli, destekleyici ve uygulanabilir yap. Emoji kullanarak daha samimi ol.
+        """
+        
+        anahtar = OneriOnbellegi.anahtar(self.ONERI_PROMPT_SURUMU, GEMINI_MODELI, analiz_metni)
+        return anahtar, prompt
+
+    def ai_onerileri_olustur(self, kullanici_adi: str, api_anahtari: str = "") -> str:
+        """AI tabanlı öneriler oluştur (analiz değişmediyse önbellekten)"""
+        if not api_anahtari:
+            return "API anahtarı gerekli."
+        
+        istek = self.oneri_istegi(kullanici_adi)
+        if istek is None:
+            return "Henüz çalışma kaydı yok. Çalışmaya başladığında analiz yapabileceğim!"
+        anahtar, prompt = istek
+        
         try:
-            genai.configure(api_key=api_anahtari)
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            
-            prompt = f"""
-            Sen bir kişisel öğrenme koçusun. Aşağıdaki öğrenci çalışma verilerini analiz et ve 
-            kişiselleştirilmiş ve motive edici önerilerde bulun. Aynı zamanda eğlenceli ol. 
-            
-            {analiz_metni}
-            
-            Lütfen şu formatta Türkçe geri bildirim ver:
-            
-            **📊 GENEL DEĞERLENDİRME:**
-            (Genel çalışma alışkanlıkları hakkında kısa bir değerlendirme)
-            
-            **⚠️ DİKKAT GEREKTİREN DERSLER:**
-            (Uzun süredir çalışılmayan veya ihmal edilen dersler)
-            
-            **✨ GÜÇLÜ YÖNLER:**
-            (Düzenli çalışılan ve ilerleme kaydedilen dersler)
-            
-            **🎯 KİŞİSELLEŞTİRİLMİŞ ÖNERİLER:**
-            (Her ders için spesifik öneriler ve çalışma stratejileri)
-            
-            **💪 MOTİVASYON MESAJI:**
-            (Öğrenciyi motive edecek pozitif bir mesaj)
-            
-            Önerilerini eğlenceli, destekleyici ve uygulanabilir yap. Emoji kullanarak daha samimi ol.
-            """
-            
-            response = model.generate_content(prompt)
-            return response.text
+            if self.oneri_onbellegi is None:
+                return gemini_uret(api_anahtari, prompt, "ai_oneri")
+            return self.oneri_onbellegi.al_veya_uret(anahtar, kullanici_adi,
+                                                     lambda: gemini_uret(api_anahtari, prompt, "ai_oneri"))
             
         except Exception as e:
             return f"AI analizi oluşturulamadı: {str(e)}"
@@ -191,7 +728,7 @@ class OgrenmeAnalitigi:
         # Son 7 günün verilerini filtrele
         bugun = datetime.datetime.now().date()
         bir_hafta_once = bugun - datetime.timedelta(days=7)
-        haftalik_kayitlar = [k for k in self.calisma_kayitlari[kullanici_adi] if k['gun'] > bir_hafta_once]
+        haftalik_kayitlar = [k for k in self.calisma_kayitlari[kullanici_adi] if k.gun > bir_hafta_once]
 
         if not haftalik_kayitlar:
             return None, None, "📊 Bu hafta için henüz bir çalışma kaydı bulunmuyor. Çalışmaya devam!"
@@ -199,8 +736,8 @@ class OgrenmeAnalitigi:
         # Veriyi işle: Derslere göre toplam süre
         ders_sureleri = {}
         for kayit in haftalik_kayitlar:
-            ders = kayit['ders']
-            sure = kayit['sure']
+            ders = kayit.ders
+            sure = kayit.sure
             ders_sureleri[ders] = ders_sureleri.get(ders, 0) + sure
             
         if not ders_sureleri:
@@ -211,6 +748,9 @@ class OgrenmeAnalitigi:
         en_cok_calisilan_ders = max(ders_sureleri, key=ders_sureleri.get)
         ozet_metni = f"Bu hafta toplam **{toplam_haftalik_sure:.1f} saat** çalıştın. En çok **{en_cok_calisilan_ders}** dersine odaklandın. Harika gidiyorsun! 🚀"
 
+        grafik_t0 = time.perf_counter()
+        import matplotlib.pyplot as plt
+
         # Stil ayarları (Koyu tema için)
         plt.style.use('dark_background')
         
@@ -242,8 +782,8 @@ class OgrenmeAnalitigi:
             gunluk_sureler[tarih.strftime('%a')] = 0
         
         for kayit in haftalik_kayitlar:
-            gun_adi = kayit['gun'].strftime('%a')
-            gunluk_sureler[gun_adi] += kayit['sure']
+            gun_adi = kayit.gun.strftime('%a')
+            gunluk_sureler[gun_adi] += kayit.sure
             
         gunler = list(gunluk_sureler.keys())[::-1]
         gun_sureleri = list(gunluk_sureler.values())[::-1]
@@ -260,98 +800,311 @@ class OgrenmeAnalitigi:
         
         fig2.patch.set_facecolor('#0a0a0a')
         ax2.set_facecolor((1.0, 1.0, 1.0, 0.03))
-        
+
+        izleyici().gozlem("analitik.pano_grafikleri", (time.perf_counter() - grafik_t0) * 1000)
         return fig1, fig2, ozet_metni
 
+# ==================== KOHORT ANALİTİĞİ ====================
+class KohortAnalitigi:
+    """Bellekteki sayısal sütunlar üzerinde artımlı güncellenen kohort sorguları"""
+    SIKISTIRMA_ORANI = 0.2
+
+    def __init__(self, depo: CalismaDeposu, yenileme_sn: float = 30, ozet_kullan: bool = True,
+                 izleyici: Izleyici = None):
+        self.depo = depo
+        self.yenileme_sn = yenileme_sn
+        self.ozet_kullan = ozet_kullan
+        self.izleyici = izleyici or Izleyici()
+        self._kilit = threading.Lock()
+        self._cerceve = None
+        self._eklenen_satir = 0
+        self._son_id = 0
+        self._son_yenileme = 0.0
+        self._kullanici_adlari = {}
+        self._ders_adlari = {}
+
+    def _veri(self):
+        """Güncel (gerekirse artımlı yenilenmiş) çerçeve."""
+        import pandas as pd
+        with self._kilit:
+            simdi = time.monotonic()
+            if self._cerceve is not None and simdi - self._son_yenileme < self.yenileme_sn:
+                return self._cerceve
+            with self.izleyici.span("kohort.yenileme"):
+                if self._cerceve is None:
+                    sutunlar, son_id = self.depo.gunluk_ozet() if self.ozet_kullan else self.depo.yeni_kayitlar(0)
+                    self._cerceve = pd.DataFrame(sutunlar)
+                else:
+                    sutunlar, son_id = self.depo.yeni_kayitlar(self._son_id)
+                    if len(sutunlar["gun"]):
+                        self._cerceve = pd.concat([self._cerceve, pd.DataFrame(sutunlar)], ignore_index=True)
+                        self._eklenen_satir += len(sutunlar["gun"])
+                        if self._eklenen_satir > self.SIKISTIRMA_ORANI * len(self._cerceve):
+                            self._cerceve = self._cerceve.groupby(["gun", "kullanici_id", "ders_id"], as_index=False,
+                                                                  sort=False)["sure"].sum()
+                            self._eklenen_satir = 0
+                if son_id != self._son_id or not self._kullanici_adlari:
+                    self._kullanici_adlari = self.depo.adlar("kullanicilar")
+                    self._ders_adlari = self.depo.adlar("dersler")
+                self._son_id = son_id
+            self._son_yenileme = simdi
+            return self._cerceve
+
+    @staticmethod
+    def _gun(bugun: datetime.date = None) -> int:
+        return (bugun or datetime.date.today()).toordinal()
+
+    def ders_toplamlari(self, gun_sayisi: int = None, bugun: datetime.date = None):
+        """Ders başına toplam saat, çalışan öğrenci sayısı ve öğrenci başına ortalama (gun_sayisi: son N gün)."""
+        df = self._veri()
+        son = self._gun(bugun)
+        maske = df["gun"].to_numpy() <= son
+        if gun_sayisi:
+            maske &= df["gun"].to_numpy() > son - gun_sayisi
+        tablo = df[maske].groupby("ders_id").agg(toplam_saat=("sure", "sum"), ogrenci=("kullanici_id", "nunique"))
+        tablo["ogrenci_basina_saat"] = (tablo["toplam_saat"] / tablo["ogrenci"]).round(2)
+        tablo["toplam_saat"] = tablo["toplam_saat"].round(1)
+        tablo.insert(0, "ders", tablo.index.map(self._ders_adlari))
+        return tablo.sort_values("toplam_saat", ascending=False).reset_index(drop=True)
+
+    def aktivite_isi_haritasi(self, hafta_sayisi: int = 12, bugun: datetime.date = None):
+        """Haftanın günü x son hafta_sayisi hafta matrisi (toplam saat); sütunlar haftanın pazartesisi."""
+        import numpy as np
+        import pandas as pd
+        df = self._veri()
+        son = self._gun(bugun)
+        # date(1, 1, 1).toordinal() == 1 ve pazartesidir: haftanın günü (ordinal - 1) % 7
+        baslangic = son - (son - 1) % 7 - 7 * (hafta_sayisi - 1)
+        gunler = df["gun"].to_numpy()
+        maske = (gunler >= baslangic) & (gunler <= son)
+        fark = gunler[maske] - baslangic
+        matris = np.bincount((fark % 7) * hafta_sayisi + fark // 7, weights=df["sure"].to_numpy()[maske],
+                             minlength=7 * hafta_sayisi).reshape(7, hafta_sayisi)
+        haftalar = [datetime.date.fromordinal(baslangic + 7 * h).strftime("%d.%m") for h in range(hafta_sayisi)]
+        return pd.DataFrame(matris.round(1), index=GUNLER, columns=haftalar)
+
+    def durgun_ogrenciler(self, bugun: datetime.date = None, esik_gun: int = 7, onceki_hafta: int = 4,
+                          dusus_orani: float = 0.25):
+        """esik_gun gündür çalışmayan ya da son haftası önceki haftaların ortalamasının altına düşen öğrenciler"""
+        import pandas as pd
+        df = self._veri()
+        son = self._gun(bugun)
+        df = df[df["gun"].to_numpy() <= son]
+        gunler = df["gun"].to_numpy()
+        son_hafta = df[gunler > son - 7].groupby("kullanici_id")["sure"].sum()
+        onceki = df[(gunler > son - 7 * (onceki_hafta + 1)) & (gunler <= son - 7)].groupby("kullanici_id")["sure"].sum()
+        tablo = pd.DataFrame({"gun_once": son - df.groupby("kullanici_id")["gun"].max()})
+        tablo["son_7_gun_saat"] = son_hafta.reindex(tablo.index, fill_value=0.0).round(1)
+        tablo["onceki_haftalik_ort"] = (onceki.reindex(tablo.index, fill_value=0.0) / onceki_hafta).round(1)
+        pasif = tablo["gun_once"] >= esik_gun
+        dusus = (tablo["onceki_haftalik_ort"] > 0) & (tablo["son_7_gun_saat"] < dusus_orani * tablo["onceki_haftalik_ort"])
+        tablo = tablo[pasif | dusus].copy()
+        tablo["neden"] = "çalışma süresi düştü"
+        tablo.loc[pasif[pasif | dusus], "neden"] = "uzun süredir çalışmıyor"
+        tablo.insert(0, "kullanici", tablo.index.map(self._kullanici_adlari))
+        return tablo.sort_values(["gun_once", "onceki_haftalik_ort"], ascending=False).reset_index(drop=True)
+
+    def yuzdelik_siralamalari(self, gun_sayisi: int = 30, bugun: datetime.date = None, ders: str = None):
+        """Son gun_sayisi gündeki toplam süreye göre öğrencilerin yüzdelik dilimi (100: en çok çalışan)."""
+        df = self._veri()
+        son = self._gun(bugun)
+        gunler = df["gun"].to_numpy()
+        maske = (gunler > son - gun_sayisi) & (gunler <= son)
+        if ders is not None:
+            ders_id = next((i for i, ad in self._ders_adlari.items() if ad.lower() == ders.lower()), -1)
+            maske &= df["ders_id"].to_numpy() == ders_id
+        toplamlar = df[maske].groupby("kullanici_id")["sure"].sum()
+        # Pencerede hiç çalışmayanlar da sıralamada 0 saatle yer alır
+        toplamlar = toplamlar.reindex(df["kullanici_id"].unique(), fill_value=0.0)
+        tablo = toplamlar.round(1).to_frame("toplam_saat")
+        tablo["yuzdelik"] = (toplamlar.rank(pct=True, method="max") * 100).round(1)
+        tablo.insert(0, "kullanici", tablo.index.map(self._kullanici_adlari))
+        return tablo.sort_values("toplam_saat", ascending=False).reset_index(drop=True)
+
+    def ozet(self, bugun: datetime.date = None) -> Dict[str, Any]:
+        """Sınıf paneli için tüm sorgular tek seferde."""
+        t0 = time.perf_counter()
+        with self.izleyici.span("kohort.analiz"):
+            sonuc = {
+                "ders_toplamlari": self.ders_toplamlari(bugun=bugun),
+                "isi_haritasi": self.aktivite_isi_haritasi(bugun=bugun),
+                "durgun": self.durgun_ogrenciler(bugun=bugun),
+                "siralama": self.yuzdelik_siralamalari(bugun=bugun),
+            }
+        sonuc["ogrenci_sayisi"] = len(sonuc["siralama"])
+        sonuc["sure_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        return sonuc
+
+
+@st.cache_resource(show_spinner=False)
+def kohort_analitigi():
+    """Süreç genelinde paylaşılan kohort analitiği (ASISTAN_KOHORT_YENILEME_SN, varsayılan 30); depo yoksa None."""
+    depo = calisma_deposu()
+    if depo is None:
+        return None
+    return KohortAnalitigi(depo, float(os.environ.get("ASISTAN_KOHORT_YENILEME_SN", "30")), izleyici=izleyici())
+
+
 # ==================== HEDEF TAKİP SİSTEMİ ====================
 class HedefTakipSistemi:
+    """Hedefleri id ile indeksli tutar; aktif/tamamlanan görünümleri ve bitiş tarihi yığını"""
+    HATIRLATMA_GUN = 2  # Bitişine bu kadar gün (veya daha az) kalan hedefler hatırlatılır
     def __init__(self):
-        self.hedefler = {}
-        # self.tamamlanan_hedefler = {}
+        self.hedefler = {}  # {kullanici_adi: {hedef_id: hedef}}
+        self._aktif = {}  # {kullanici_adi: {hedef_id: hedef}}, aktifleşme sırasıyla
+        self._tamamlanan = {}  # {kullanici_adi: {hedef_id: hedef}}, tamamlanma sırasıyla
+        self._sonraki_id = {}  # {kullanici_adi: int}; silinen hedeflerin id'leri tekrar kullanılmaz
+        # {kullanici_adi: [(bitis_tarihi, hedef_id)]}; tamamlanan/silinen hedeflerin kayıtları okunurken atılır
+        self._bitis_yigini = {}
+    
+    def _yigina_ekle(self, kullanici_adi: str, hedef: Hedef):
+        yigin = self._bitis_yigini.setdefault(kullanici_adi, [])
+        heapq.heappush(yigin, (hedef.bitis_tarihi, hedef.id))
+        if len(yigin) > 2 * len(self._aktif[kullanici_adi]) + 8:
+            # Bayat kayıtlar birikmişse yığını aktif hedeflerden yeniden kur
+            yigin[:] = [(h.bitis_tarihi, h.id) for h in self._aktif[kullanici_adi].values()]
+            heapq.heapify(yigin)
+    
+    def _gecerli_mi(self, kullanici_adi: str, kayit) -> bool:
+        hedef = self._aktif[kullanici_adi].get(kayit[1])
+        return hedef is not None and hedef.bitis_tarihi == kayit[0]
+    
+    def _durum_ayarla(self, kullanici_adi: str, hedef: Hedef, tamamlandi: bool):
+        """Hedefi aktif/tamamlanan görünümleri arasında taşır."""
+        if hedef.tamamlandi == tamamlandi:
+            return
+        hedef.tamamlandi = tamamlandi
+        kaynak, hedef_gorunum = (self._aktif, self._tamamlanan) if tamamlandi else (self._tamamlanan, self._aktif)
+        del kaynak[kullanici_adi][hedef.id]
+        hedef_gorunum[kullanici_adi][hedef.id] = hedef
+        if not tamamlandi:
+            self._yigina_ekle(kullanici_adi, hedef)
     
     def hedef_ekle(self, kullanici_adi: str, hedef_metni: str, bitis_tarihi: datetime.date, kategori: str = "Genel"):
         if kullanici_adi not in self.hedefler:
-            self.hedefler[kullanici_adi] = []
-        
+            self.hedefler[kullanici_adi] = {}
+            self._aktif[kullanici_adi] = {}
+            self._tamamlanan[kullanici_adi] = {}
+            self._sonraki_id[kullanici_adi] = 1
         
-        next_id = max([h['id'] for h in self.hedefler[kullanici_adi]]) + 1 if self.hedefler[kullanici_adi] else 1
+        next_id = self._sonraki_id[kullanici_adi]
+        self._sonraki_id[kullanici_adi] = next_id + 1
         
-        hedef = {
-            "id": next_id,
-            "metin": hedef_metni,
-            "kategori": kategori,
-            "olusturma_tarihi": datetime.datetime.now(),
-            "bitis_tarihi": bitis_tarihi,
-            "tamamlandi": False,
-            "ilerleme": 0
-        }
-        self.hedefler[kullanici_adi].append(hedef)
+        hedef = Hedef(next_id, hedef_metni, kategori, datetime.datetime.now(), bitis_tarihi)
+        self.hedefler[kullanici_adi][next_id] = hedef
+        self._aktif[kullanici_adi][next_id] = hedef
+        self._yigina_ekle(kullanici_adi, hedef)
         return hedef
     
+    def hedef_yukle(self, kullanici_adi: str, hedef: Hedef, sonraki_id: int = 0):
+        """Dışarıdan gelen (id'li) bir hedefi olduğu gibi ekler; görünümler ve yığın güncellenir."""
+        if kullanici_adi not in self.hedefler:
+            self.hedefler[kullanici_adi] = {}
+            self._aktif[kullanici_adi] = {}
+            self._tamamlanan[kullanici_adi] = {}
+            self._sonraki_id[kullanici_adi] = 1
+        self.hedefler[kullanici_adi][hedef.id] = hedef
+        self._sonraki_id[kullanici_adi] = max(self._sonraki_id[kullanici_adi], hedef.id + 1, sonraki_id)
+        if hedef.tamamlandi:
+            self._tamamlanan[kullanici_adi][hedef.id] = hedef
+        else:
+            self._aktif[kullanici_adi][hedef.id] = hedef
+            self._yigina_ekle(kullanici_adi, hedef)
+    
     def hedef_tamamla(self, kullanici_adi: str, hedef_id: int):
-        if kullanici_adi in self.hedefler:
-            for hedef in self.hedefler[kullanici_adi]:
-                if hedef["id"] == hedef_id:
-                    hedef["tamamlandi"] = True
-                    hedef["ilerleme"] = 100
-                    hedef["tamamlanma_tarihi"] = datetime.datetime.now()
-                    
-                    return True
-        return False
+        hedef = self.hedefler.get(kullanici_adi, {}).get(hedef_id)
+        if hedef is None:
+            return False
+        self._durum_ayarla(kullanici_adi, hedef, True)
+        hedef.ilerleme = 100
+        hedef.tamamlanma_tarihi = datetime.datetime.now()
+        return True
     
     def hedef_guncelle(self, kullanici_adi: str, hedef_id: int, ilerleme: int):
-        if kullanici_adi in self.hedefler:
-            for hedef in self.hedefler[kullanici_adi]:
-                if hedef["id"] == hedef_id:
-                    hedef["ilerleme"] = min(ilerleme, 100)
-                    if ilerleme >= 100:
-                        hedef["tamamlandi"] = True     # direkt durumu güncelliyoruz
-                        if "tamamlanma_tarihi" not in hedef:
-                            hedef["tamamlanma_tarihi"] = datetime.datetime.now()
-                    else:
-                        hedef["tamamlandi"] = False          # eğer ilerleme %100'den düşerse tekrar aktif hale getirmek için 
-                    return True
-        return False
+        hedef = self.hedefler.get(kullanici_adi, {}).get(hedef_id)
+        if hedef is None:
+            return False
+        hedef.ilerleme = min(ilerleme, 100)
+        if ilerleme >= 100:
+            self._durum_ayarla(kullanici_adi, hedef, True)     # direkt durumu güncelliyoruz
+            if hedef.tamamlanma_tarihi is None:
+                hedef.tamamlanma_tarihi = datetime.datetime.now()
+        else:
+            self._durum_ayarla(kullanici_adi, hedef, False)          # eğer ilerleme %100'den düşerse tekrar aktif hale getirmek için 
+        return True
     
     def hedef_sil(self, kullanici_adi: str, hedef_id: int):
         if kullanici_adi in self.hedefler:
-            self.hedefler[kullanici_adi] = [h for h in self.hedefler[kullanici_adi] if h["id"] != hedef_id]
+            hedef = self.hedefler[kullanici_adi].pop(hedef_id, None)
+            if hedef is not None:
+                (self._tamamlanan if hedef.tamamlandi else self._aktif)[kullanici_adi].pop(hedef_id)
             return True
         return False
     
-    def aktif_hedefler(self, kullanici_adi: str) -> List[Dict]:
-        if kullanici_adi not in self.hedefler:
-            return []
-        return [h for h in self.hedefler[kullanici_adi] if not h["tamamlandi"]]
+    def aktif_hedefler(self, kullanici_adi: str) -> List[Hedef]:
+        return list(self._aktif.get(kullanici_adi, {}).values())
     
-    def tamamlanan_hedefler_listesi(self, kullanici_adi: str) -> List[Dict]:
-        if kullanici_adi not in self.hedefler:
+    def tamamlanan_hedefler_listesi(self, kullanici_adi: str) -> List[Hedef]:
+        return list(self._tamamlanan.get(kullanici_adi, {}).values())
+    
+    @staticmethod
+    def hatirlatma_metni(hedef: Hedef, kalan_gun: int) -> str:
+        if kalan_gun < 0:
+            return f"🔴 **GECIKMIŞ:** {hedef.metin} ({abs(kalan_gun)} gün geçti)"
+        if kalan_gun == 0:
+            return f"🟡 **BUGÜN BİTİYOR:** {hedef.metin}"
+        return f"🟠 **{kalan_gun} GÜN KALDI:** {hedef.metin}"
+    
+    def acil_hedefler(self, kullanici_adi: str, k: int, son_tarih: datetime.date) -> List[Hedef]:
+        """Bitişi son_tarih'e kadar olan en acil k aktif hedef (en erken bitiş önce), O(k log n)."""
+        yigin = self._bitis_yigini.get(kullanici_adi)
+        if not yigin:
             return []
-        return [h for h in self.hedefler[kullanici_adi] if h["tamamlandi"]]
+        secilen = []
+        while yigin and len(secilen) < k and yigin[0][0] <= son_tarih:
+            kayit = heapq.heappop(yigin)
+            if self._gecerli_mi(kullanici_adi, kayit) and all(kayit[1] != s[1] for s in secilen):
+                secilen.append(kayit)
+        for kayit in secilen:
+            heapq.heappush(yigin, kayit)
+        return [self._aktif[kullanici_adi][hedef_id] for _, hedef_id in secilen]
     
     def hatirlatma_kontrol(self, kullanici_adi: str) -> List[str]:
-        hatirlatmalar = []
         bugun = datetime.datetime.now().date()
-        
-        for hedef in self.aktif_hedefler(kullanici_adi):
-            bitis = hedef["bitis_tarihi"]
-            kalan_gun = (bitis - bugun).days
-            
-            if kalan_gun < 0:
-                hatirlatmalar.append(f"🔴 **GECIKMIŞ:** {hedef['metin']} ({abs(kalan_gun)} gün geçti)")
-            elif kalan_gun == 0:
-                hatirlatmalar.append(f"🟡 **BUGÜN BİTİYOR:** {hedef['metin']}")
-            elif kalan_gun <= 2:
-                hatirlatmalar.append(f"🟠 **{kalan_gun} GÜN KALDI:** {hedef['metin']}")
-        
-        return hatirlatmalar[:3]      # En fazla 3 hatırlatma göstercek şekilde yaptım
+        son_tarih = bugun + datetime.timedelta(days=self.HATIRLATMA_GUN)
+        # En fazla 3 hatırlatma göstercek şekilde yaptım; en acil olanlar önce
+        return [self.hatirlatma_metni(h, (h.bitis_tarihi - bugun).days)
+                for h in self.acil_hedefler(kullanici_adi, 3, son_tarih)]
+    
+    def toplu_hatirlatma(self, bugun: datetime.date = None) -> Dict[str, List[Dict]]:
+        """Tüm kullanıcıların süresi yaklaşan/geçen hedefleri (yığınların kopyası üzerinden okunur)"""
+        bugun = bugun or datetime.datetime.now().date()
+        son_tarih = bugun + datetime.timedelta(days=self.HATIRLATMA_GUN)
+        sonuc = {}
+        for kullanici_adi, yigin in list(self._bitis_yigini.items()):
+            aktif = self._aktif.get(kullanici_adi, {})
+            bildirimler = {}
+            for bitis, hedef_id in sorted(k for k in list(yigin) if k[0] <= son_tarih):
+                hedef = aktif.get(hedef_id)
+                if hedef is None or hedef.bitis_tarihi != bitis or hedef_id in bildirimler:
+                    continue
+                kalan_gun = (bitis - bugun).days
+                bildirimler[hedef_id] = {
+                    "hedef_id": hedef_id,
+                    "kalan_gun": kalan_gun,
+                    "durum": "gecikmis" if kalan_gun < 0 else "bugun" if kalan_gun == 0 else "yaklasiyor",
+                    "mesaj": self.hatirlatma_metni(hedef, kalan_gun),
+                }
+            if bildirimler:
+                sonuc[kullanici_adi] = list(bildirimler.values())
+        return sonuc
     
     def hedef_istatistikleri(self, kullanici_adi: str) -> Dict:
         if kullanici_adi not in self.hedefler or not self.hedefler[kullanici_adi]:
             return {"aktif_hedef": 0, "tamamlanan_hedef": 0, "toplam_hedef": 0, "tamamlanma_orani": 0}
 
-        aktif = len(self.aktif_hedefler(kullanici_adi))
-        tamamlanan = len(self.tamamlanan_hedefler_listesi(kullanici_adi))
+        aktif = len(self._aktif[kullanici_adi])
+        tamamlanan = len(self._tamamlanan[kullanici_adi])
         toplam = aktif + tamamlanan
         
         tamamlanma_orani = (tamamlanan / toplam * 100) if toplam > 0 else 0
@@ -362,6 +1115,209 @@ class HedefTakipSistemi:
             "toplam_hedef": toplam,
             "tamamlanma_orani": tamamlanma_orani
         }
+
+
+class HatirlatmaZamanlayici:
+    """Kayıtlı hedef sistemlerinin hatırlatmalarını arka planda toplu hesaplar"""
+
+    def __init__(self, aralik_sn: float = 300, izleyici: Izleyici = None):
+        import weakref
+        self.aralik_sn = aralik_sn
+        self.izleyici = izleyici or Izleyici()
+        self.son_bildirimler = weakref.WeakKeyDictionary()  # {HedefTakipSistemi: {kullanici_adi: [bildirim]}}
+        self.son_hesaplama = None
+        self._sistemler = weakref.WeakSet()
+        self._kilit = threading.Lock()
+        self._baslatildi = False
+
+    def kaydet(self, hedef_sistemi: HedefTakipSistemi):
+        with self._kilit:
+            self._sistemler.add(hedef_sistemi)
+
+    def toplu_hesapla(self, bugun: datetime.date = None):
+        import weakref
+        with self._kilit:
+            sistemler = list(self._sistemler)
+        with self.izleyici.span("hatirlatma.toplu_hesaplama"):
+            bildirimler = weakref.WeakKeyDictionary()
+            for sistem in sistemler:
+                bildirimler[sistem] = sistem.toplu_hatirlatma(bugun)
+        self.izleyici.sayac("hatirlatma.bildirim", self.bildirim_sayisi(bildirimler))
+        self.son_bildirimler = bildirimler
+        self.son_hesaplama = datetime.datetime.now()
+        return bildirimler
+
+    def bildirimler(self, hedef_sistemi: HedefTakipSistemi, kullanici_adi: str) -> List[Dict]:
+        """Son geçişte bu oturumun hedef sistemi için bulunan bildirimler."""
+        return self.son_bildirimler.get(hedef_sistemi, {}).get(kullanici_adi, [])
+
+    def bildirim_sayisi(self, bildirimler=None) -> int:
+        bildirimler = self.son_bildirimler if bildirimler is None else bildirimler
+        return sum(len(liste) for kullanicilar in list(bildirimler.values()) for liste in kullanicilar.values())
+
+    def baslat(self):
+        """Arka plan döngüsünü (bir kez) başlatır."""
+        with self._kilit:
+            if self._baslatildi:
+                return
+            self._baslatildi = True
+
+        def _dongu():
+            while True:
+                try:
+                    self.toplu_hesapla()
+                except Exception:
+                    self.izleyici.sayac("hatirlatma.hata")
+                time.sleep(self.aralik_sn)
+        threading.Thread(target=_dongu, name="hatirlatma-zamanlayici", daemon=True).start()
+
+
+@st.cache_resource(show_spinner=False)
+def hatirlatma_zamanlayici() -> HatirlatmaZamanlayici:
+    """Süreç genelinde paylaşılan hatırlatma zamanlayıcısı (ASISTAN_HATIRLATMA_ARALIGI_SN, varsayılan 300)."""
+    zamanlayici = HatirlatmaZamanlayici(float(os.environ.get("ASISTAN_HATIRLATMA_ARALIGI_SN", "300")), izleyici=izleyici())
+    zamanlayici.baslat()
+    return zamanlayici
+# ==================== ÇALIŞMA PLANLAYICI ====================
+GUNLER = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+ZORLUK_AGIRLIKLARI = {"kolay": 1.0, "orta": 1.5, "zor": 2.0}
+
+
+class CalismaPlanlayici:
+    """Çalışma saatlerini derslere ağırlıkla dağıtan planlayıcı (D'Hondt paylaşımı, açgözlü yerleştirme, onarım)"""
+    BLOK_SAAT = 1.0
+    GUNLUK_AZAMI_BLOK = 2
+
+    def __init__(self, gunluk_saat: List[float] = None):
+        self.gunluk_saat = gunluk_saat or [2.0] * 7  # Pazartesi'den başlayarak gün başına saat
+
+    @staticmethod
+    def agirlik(zorluk: str, son_calisma_gun: int, kalan_gun: int = None) -> float:
+        # Hiç çalışılmamış ders (-1) iki haftadır çalışılmamış sayılır
+        tazelik = 1 + min(14 if son_calisma_gun < 0 else son_calisma_gun, 14) / 14
+        aciliyet = 1 + 2 * max(0.0, 1 - max(kalan_gun, 0) / 14) if kalan_gun is not None else 1.0
+        return ZORLUK_AGIRLIKLARI.get(zorluk.lower(), 1.5) * tazelik * aciliyet
+
+    def planla(self, dersler: List[Dict], baslangic: datetime.date, hafta_sayisi: int = 1,
+               son_calisma: Dict[str, int] = None, son_tarihler: Dict[str, datetime.date] = None) -> Dict[str, Any]:
+        """Ufuk boyunca günlük blokları yerleştirir; {"gunler", "yerlestirilemeyen", ...} döner"""
+        t0 = time.perf_counter()
+        son_calisma = son_calisma or {}
+        son_tarihler = son_tarihler or {}
+        gun_sayisi = hafta_sayisi * 7
+        tarihler = [baslangic + datetime.timedelta(days=i) for i in range(gun_sayisi)]
+        slotlar = [int(self.gunluk_saat[t.weekday()] // self.BLOK_SAAT) for t in tarihler]
+        adlar = [d["adi"] for d in dersler]
+        zorluklar = {d["adi"]: d["zorluk"] for d in dersler}
+        # Dersin bloklarının öne çekileceği son günün indeksi (tarih geçmişse ilk gün, ufuk dışındaysa son gün)
+        son_gun = {}
+        for ad in adlar:
+            tarih = son_tarihler.get(ad)
+            son_gun[ad] = gun_sayisi - 1 if tarih is None else max(0, min(gun_sayisi - 1, (tarih - baslangic).days))
+        agirliklar = {ad: self.agirlik(zorluklar[ad], son_calisma.get(ad, -1),
+                                       (son_tarihler[ad] - baslangic).days if ad in son_tarihler else None)
+                      for ad in adlar}
+
+        # 1) Hedef blok sayıları: kapasite sınırlı D'Hondt paylaştırması. Aciliyet payı sadece bitiş tarihine
+        # kadar sığan bloklar için geçerlidir; sonrası dersin tarihsiz ağırlığıyla yarışır
+        kapasite = sum(min(slot, self.GUNLUK_AZAMI_BLOK) for slot in slotlar)
+        tarihe_kadar = {ad: sum(min(slotlar[g], self.GUNLUK_AZAMI_BLOK) for g in range(son_gun[ad] + 1)) for ad in adlar}
+        taban_agirlik = {ad: self.agirlik(zorluklar[ad], son_calisma.get(ad, -1)) for ad in adlar}
+
+        def pay(ad, blok):
+            return (agirliklar[ad] if blok < tarihe_kadar[ad] else taban_agirlik[ad]) / (blok + 1)
+
+        hedef = dict.fromkeys(adlar, 0)
+        yigin = [(-pay(ad, 0), i, ad) for i, ad in enumerate(adlar)] if kapasite > 0 else []
+        heapq.heapify(yigin)
+        for _ in range(sum(slotlar)):
+            if not yigin:
+                break
+            _, i, ad = heapq.heappop(yigin)
+            hedef[ad] += 1
+            if hedef[ad] < kapasite:
+                heapq.heappush(yigin, (-pay(ad, hedef[ad]), i, ad))
+
+        # 2) Açgözlü yerleştirme
+        kalan = dict(hedef)
+        son_yerlesim = {ad: -1 - (14 if son_calisma.get(ad, -1) < 0 else son_calisma[ad]) for ad in adlar}
+        plan = [dict() for _ in range(gun_sayisi)]  # gün -> {ders: blok}
+        for g in range(gun_sayisi):
+            adaylar = [ad for ad in adlar if kalan[ad] > 0]
+            tempo = {ad: kalan[ad] / ((son_gun[ad] if g <= son_gun[ad] else gun_sayisi - 1) - g + 1) for ad in adaylar}
+            adaylar.sort(key=lambda ad: (tempo[ad] + 0.05 * (g - son_yerlesim[ad])) * agirliklar[ad], reverse=True)
+            bos = slotlar[g]
+            # Önce her derse bir blok, sonra temposu günde birden fazla blok gerektirenlere, en son kalan boşluklar
+            for tur in range(3):
+                for ad in adaylar:
+                    if bos == 0:
+                        break
+                    mevcut = plan[g].get(ad, 0)
+                    if kalan[ad] == 0 or mevcut >= self.GUNLUK_AZAMI_BLOK or (tur == 0 and mevcut) \
+                            or (tur == 1 and tempo[ad] <= 1):
+                        continue
+                    plan[g][ad] = mevcut + 1
+                    kalan[ad] -= 1
+                    bos -= 1
+                    son_yerlesim[ad] = g
+
+        # 3) Onarım: tarihli derslerin açıkta ya da tarihten sonra kalan bloklarını tarihten önceye çek;
+        # yer boş değilse daha esnek bir dersin bloğuyla yer değiştirir (o blok geç güne ya da açığa geçer)
+        tasinan = 0
+        for ad in sorted((ad for ad in adlar if ad in son_tarihler), key=lambda ad: son_gun[ad]):
+            gec = [h for h in range(gun_sayisi - 1, son_gun[ad], -1) for _ in range(plan[h].get(ad, 0))]
+            for g in range(son_gun[ad] + 1):
+                while (kalan[ad] or gec) and plan[g].get(ad, 0) < self.GUNLUK_AZAMI_BLOK:
+                    h = None if kalan[ad] else gec[0]
+                    kurban = None
+                    if sum(plan[g].values()) >= slotlar[g]:
+                        kurban = next((d for d in plan[g] if d != ad and son_gun[d] > son_gun[ad] and (
+                            h is None or (h <= son_gun[d] and plan[h].get(d, 0) < self.GUNLUK_AZAMI_BLOK))), None)
+                        if kurban is None:
+                            break
+                        plan[g][kurban] -= 1
+                        if not plan[g][kurban]:
+                            del plan[g][kurban]
+                    plan[g][ad] = plan[g].get(ad, 0) + 1
+                    if h is None:
+                        kalan[ad] -= 1
+                        if kurban is not None:
+                            kalan[kurban] += 1
+                    else:
+                        gec.pop(0)
+                        plan[h][ad] -= 1
+                        if not plan[h][ad]:
+                            del plan[h][ad]
+                        if kurban is not None:
+                            plan[h][kurban] = plan[h].get(kurban, 0) + 1
+                    tasinan += 1
+        for ad in adlar:  # Yerinden edilen (veya sığmayan) blokları boş yerlere taşı
+            for g in range(gun_sayisi):
+                while kalan[ad] and sum(plan[g].values()) < slotlar[g] and plan[g].get(ad, 0) < self.GUNLUK_AZAMI_BLOK:
+                    plan[g][ad] = plan[g].get(ad, 0) + 1
+                    kalan[ad] -= 1
+        # Günlük sınır yüzünden payını alamayan dersler kaldıysa boş saatler ağırlığı yüksek derslere ek tekrar olur
+        agirlik_sirasi = sorted(adlar, key=lambda ad: -agirliklar[ad])
+        for g in range(gun_sayisi):
+            for ad in agirlik_sirasi:
+                while sum(plan[g].values()) < slotlar[g] and plan[g].get(ad, 0) < self.GUNLUK_AZAMI_BLOK:
+                    plan[g][ad] = plan[g].get(ad, 0) + 1
+
+        gunler = [{
+            "tarih": tarihler[g],
+            "gun": GUNLER[tarihler[g].weekday()],
+            "bloklar": [{"ders": ad, "sure": blok * self.BLOK_SAAT, "zorluk": zorluklar[ad]}
+                        for ad, blok in sorted(plan[g].items(), key=lambda x: -x[1])],
+        } for g in range(gun_sayisi)]
+        return {
+            "gunler": gunler,
+            "hedef_blok": hedef,
+            "yerlestirilemeyen": {ad: n for ad, n in kalan.items() if n},
+            "tasinan_blok": tasinan,
+            "sure_ms": round((time.perf_counter() - t0) * 1000, 3),
+        }
+
+
 # ==================== MOTİVASYON SİSTEMİ ====================
 class MotivasyonSistemi:
     def __init__(self):
@@ -395,13 +1351,9 @@ class PDFIsleyici:
         if not api_anahtari:
             return "Lütfen önce API anahtarınızı giriniz."
         try:
-            genai.configure(api_key=api_anahtari)
-            model = genai.GenerativeModel('gemini-2.5-flash')
-
-            
-            
             pdf_bytes = pdf_dosyasi.read()
             pdf_dosyasi.seek(0)
+            izleyici().sayac("pdf.bayt", len(pdf_bytes))
             
             pdf_part = {
                 'mime_type': 'application/pdf',
@@ -422,10 +1374,7 @@ class PDFIsleyici:
             """
             
             
-            response = model.generate_content([prompt, pdf_part])
-            
-            
-            return response.text
+            return gemini_uret(api_anahtari, [prompt, pdf_part], "pdf_ozet")
             
         except Exception as e:
             return f"Özetleme hatası: {str(e)}\n\n**İpucu:** API anahtarınızın doğru olduğundan ve 'Generative Language API' izninin aktif olduğundan emin olun."
@@ -434,12 +1383,9 @@ class PDFIsleyici:
         if not api_anahtari:
             return "Lütfen önce API anahtarınızı giriniz."
         try:
-            genai.configure(api_key=api_anahtari)
-            model = genai.GenerativeModel('gemini-2.5-flash')
-
-            
             pdf_bytes = pdf_dosyasi.read()
             pdf_dosyasi.seek(0)
+            izleyici().sayac("pdf.bayt", len(pdf_bytes))
             
             pdf_part = {
                 'mime_type': 'application/pdf',
@@ -455,10 +1401,7 @@ class PDFIsleyici:
             """
             
             # Modeli, prompt ve dosya bölümü ile birlikte çağırıyoruz.
-            response = model.generate_content([prompt, pdf_part])
-            
-            
-            return response.text
+            return gemini_uret(api_anahtari, [prompt, pdf_part], "pdf_soru")
             
         except Exception as e:
             return f"Soru cevaplama hatası: {str(e)}"
@@ -468,8 +1411,9 @@ class WebAnaliz:
         self.web_icerikleri = {}
         self.mevcut_url = None
         self.mevcut_icerik = None
+        self.son_veri = None  # Sekmede gösterilen son analiz (başlık, önizleme, analiz)
 
-    def _clean_html_content(self, soup: BeautifulSoup) -> str:
+    def _clean_html_content(self, soup: "BeautifulSoup") -> str:
         """HTML'den temiz metin içeriği çıkarmak için yardımcı fonksiyon."""
         
         # 1. Öncelikli etiketleri aramak için
@@ -518,24 +1462,29 @@ class WebAnaliz:
             return {"hata": "API anahtarı gerekli"}
         
         try:
+            import requests
+            from bs4 import BeautifulSoup
+
+            iz = izleyici()
             headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            baslik = soup.find('title').text if soup.find('title') else "Başlık Yok"
-            
-            
-            # icerik = "\n".join([p.text for p in soup.find_all('p')]) # ESKİ KOD
-            icerik = self._clean_html_content(soup)
+            with iz.span("web.indirme"):
+                response = requests.get(url, headers=headers, timeout=10)
+            iz.sayac("web.bayt", len(response.content))
+
+            with iz.span("web.html_ayristirma"):
+                soup = BeautifulSoup(response.content, 'html.parser')
+                
+                baslik = soup.find('title').text if soup.find('title') else "Başlık Yok"
+                
+                
+                # icerik = "\n".join([p.text for p in soup.find_all('p')]) # ESKİ KOD
+                icerik = self._clean_html_content(soup)
             
             
             if not icerik.strip():
                  return {"hata": "Bu web sitesinden metin içeriği çekilemedi. Site, dinamik (JavaScript) içerik kullanıyor olabilir veya erişim engellidir."}
             
             # Analiz
-            genai.configure(api_key=api_anahtari)
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            
             analiz_prompt = f"""
             Aşağıdaki web sitesi içeriğini analiz et ve Türkçe olarak özetle:
             
@@ -549,7 +1498,7 @@ class WebAnaliz:
             3. İçerik türü (Blog, haber, eğitim vb.)
             """
             
-            analiz_response = model.generate_content(analiz_prompt)
+            analiz = gemini_uret(api_anahtari, analiz_prompt, "web_analiz")
             
             self.mevcut_url = url
             self.mevcut_icerik = icerik
@@ -558,7 +1507,7 @@ class WebAnaliz:
                 "baslik": baslik,
                 "icerik": icerik[:2000], # Önizleme için kısa içerik
                 "url": url,
-                "analiz": analiz_response.text,
+                "analiz": analiz,
                 "alınma_tarihi": datetime.datetime.now(),
                 "tam_icerik": icerik  # Tam içerik sonraki sorular için
             }
@@ -572,10 +1521,6 @@ class WebAnaliz:
             return "Lütfen önce API anahtarınızı giriniz."
         
         try:
-            genai.configure(api_key=api_anahtari)
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            
-            
             tam_icerik = web_verisi.get('tam_icerik', web_verisi.get('icerik', ''))
             
             prompt = f"""
@@ -590,115 +1535,836 @@ class WebAnaliz:
             Lütfen detaylı ve açıklayıcı bir cevap ver. Web sitesindeki bilgilere dayanarak yanıt oluştur.
             """
             
-            response = model.generate_content(prompt)
-            return response.text
+            return gemini_uret(api_anahtari, prompt, "web_soru")
             
         except Exception as e:
             return f"Analiz hatası: {str(e)}"
 
 # ==================== RAG CHATBOT MODÜLÜ ====================
-class RAGIsleyici:
-    def __init__(self):
-        self.api_anahtari = None
-        self.embeddings = None  
+EMBEDDING_MODELI = "sentence-transformers/all-MiniLM-L6-v2"
+# Embedding arka ucu: torch (sentence-transformers, varsayılan) | onnx | onnx_int8 — bkz. OnnxEmbedding
+EMBEDDING_ARKA_UCU = os.environ.get("ASISTAN_EMBEDDING_ARKA_UCU", "torch")
+ONNX_MODEL_DIZINI = os.environ.get("ASISTAN_ONNX_MODEL_DIZINI", os.path.join("modeller", "embedding_onnx"))
+# ONNX Runtime iş parçacığı sayısı; 0 ise çekirdek sayısı kadar
+ONNX_IS_PARCACIGI = int(os.environ.get("ASISTAN_ONNX_IS_PARCACIGI", "0"))
+# Süreç genelindeki sorgu embedding önbelleğinin kayıt sayısı; 0 önbelleği kapatır
+SORGU_ONBELLEK_BOYUTU = int(os.environ.get("ASISTAN_SORGU_ONBELLEK_BOYUTU", "2048"))
+CHUNK_BOYUTU = 1000
+CHUNK_ORTUSMESI = 200
+# Artifakt biçimi değiştiğinde artırılır; farklı sürümdeki artifaktlar yüklenmez, yeniden inşa edilir
+RAG_INDEKS_SURUMU = 1
+# İki aşamalı arama: FAISS'ten ADAY_SAYISI aday alınır, cross-encoder ile sıralanır, ilk BAGLAM_SAYISI prompt'a girer
+YENIDEN_SIRALAMA_MODELI = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"  # Türkçe dahil çok dilli, küçük
+ADAY_SAYISI = 20
+BAGLAM_SAYISI = 3
+# Vektör saklama biçimi: float32 (FAISS, varsayılan) | int8 | ikili — bkz. KompaktVektorDeposu
+RAG_VEKTOR_BICIMI = os.environ.get("ASISTAN_RAG_VEKTOR_BICIMI", "float32")
+# Prompt'a giren bağlamın tahmini token üst sınırı (BAGLAM_SAYISI tam chunk ≈ 750 token)
+BAGLAM_TOKEN_BUTCESI = 700
 
-    
-    def _load_embeddings(self):
-        """Embedding modelini sadece gerektiğinde (butona basılınca) yükler."""
-        if self.embeddings is None:
-            try:
-                # --- DEĞİŞTİ ---
-                # Kullanıcıya indirme başladığını haber ver
-                st.info("Embedding modeli Hugging Face'den indiriliyor... (İlk çalıştırmada uzun sürebilir)")
-                
-                
-                self.embeddings = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2",
-    model_kwargs={'device': 'cpu'}
-)
-                
-                st.success("Embedding modeli başarıyla yüklendi.")
-            except Exception as e:
-                
-                st.error(f"Embedding modeli yüklenemedi: {e}. Lütfen internet bağlantınızı kontrol edin veya model adını (KULLANICI_ADINIZ/MODEL_ADINIZ) doğru yazdığınızdan emin olun.")
-                return False
-        return True
 
-    def ayarla(self, api_anahtari: str):
-        """API anahtarını ayarlar."""
-        self.api_anahtari = api_anahtari
+class OnnxEmbedding:
+    """onnx_model_disa_aktar.py ile üretilen ONNX modeli üzerinde çalışan embedding"""
+    PARTI_BOYUTU = 32
 
-    def _get_pdf_text(self, pdf_docs):
-        """Yüklenen PDF dosyalarından metinleri okur."""
-        text = ""
-        for pdf in pdf_docs:
-            pdf_reader = PyPDF2.PdfReader(pdf)
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        return text
+    def __init__(self, model_dizini: str, nicemli: bool = False, is_parcacigi: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
 
-    def _get_text_chunks(self, text):
-        """Metni işlenebilir küçük parçalara (chunk) ayırır."""
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-        chunks = text_splitter.split_text(text)
-        return chunks
+        with open(os.path.join(model_dizini, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("embedding_modeli") != EMBEDDING_MODELI:
+            # Farklı modelin vektörleri mevcut indekslerle karşılaştırılamaz
+            raise ValueError(f"ONNX modeli {manifest.get('embedding_modeli')} için, beklenen {EMBEDDING_MODELI}")
+        self.havuzlama = manifest["havuzlama"]  # "ortalama" | "cls"
+        self.normalize = manifest["normalize"]
 
-    # YENİ METOD (Klasörden PDF'leri otomatik okuyan)
-    def initialize_vector_store(self, pdf_folder_path="rag_pdfs"):
-        """
-        Belirtilen klasördeki TÜM PDF'leri okur, chunk'lar oluşturur,
-        embedding'lerini alır ve FAISS vektör veritabanını oluşturur.
-        Sonucu session_state'de saklar.
-        """
-        # Eğer vektör deposu zaten oluşturulmuşsa, tekrar yapma
-        if "rag_vector_store" in st.session_state:
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dizini, "tokenizer.json"))
+        self.tokenizer.enable_truncation(manifest["azami_token"])
+        if self.tokenizer.padding is None:
+            self.tokenizer.enable_padding()
+
+        ayarlar = ort.SessionOptions()
+        ayarlar.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        ayarlar.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        ayarlar.intra_op_num_threads = is_parcacigi or (os.cpu_count() or 1)
+        ayarlar.inter_op_num_threads = 1
+        dosya = "model_int8.onnx" if nicemli else "model.onnx"
+        self.oturum = ort.InferenceSession(os.path.join(model_dizini, dosya), ayarlar,
+                                           providers=["CPUExecutionProvider"])
+        self.girdi_adlari = [g.name for g in self.oturum.get_inputs()]
+
+    def _parti_kodla(self, metinler: List[str]):
+        import numpy as np
+
+        kodlar = self.tokenizer.encode_batch(metinler)
+        maske = np.array([k.attention_mask for k in kodlar], dtype="int64")
+        girdiler = {
+            "input_ids": np.array([k.ids for k in kodlar], dtype="int64"),
+            "attention_mask": maske,
+            "token_type_ids": np.array([k.type_ids for k in kodlar], dtype="int64"),
+        }
+        gizli = self.oturum.run(None, {ad: girdiler[ad] for ad in self.girdi_adlari})[0]
+        if self.havuzlama == "cls":
+            vektorler = gizli[:, 0]
+        else:
+            agirlik = maske[:, :, None].astype("float32")
+            vektorler = (gizli * agirlik).sum(axis=1) / np.clip(agirlik.sum(axis=1), 1e-9, None)
+        if self.normalize:
+            vektorler = vektorler / np.clip(np.linalg.norm(vektorler, axis=1, keepdims=True), 1e-12, None)
+        return vektorler
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        import numpy as np
+
+        sira = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        sonuc = [None] * len(texts)
+        for bas in range(0, len(sira), self.PARTI_BOYUTU):
+            parti = sira[bas:bas + self.PARTI_BOYUTU]
+            for i, vektor in zip(parti, self._parti_kodla([texts[i] for i in parti])):
+                sonuc[i] = vektor.astype(np.float32).tolist()
+        return sonuc
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._parti_kodla([text])[0].tolist()
+
+
+def _embedding_modeli_yukle():
+    """Embedding modelini EMBEDDING_ARKA_UCU'na göre yükler (torch: ilk çalıştırmada Hugging Face'den indirilir)."""
+    if EMBEDDING_ARKA_UCU in ("onnx", "onnx_int8"):
+        from langchain_core.embeddings import Embeddings
+        # FAISS deposu embedding nesnesini isinstance ile tanıyor; langchain'i modül başında import etmemek için kayıt burada
+        Embeddings.register(OnnxEmbedding)
+        return OnnxEmbedding(ONNX_MODEL_DIZINI, nicemli=EMBEDDING_ARKA_UCU == "onnx_int8", is_parcacigi=ONNX_IS_PARCACIGI)
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(model_name=EMBEDDING_MODELI, model_kwargs={'device': 'cpu'})
+
+
+@st.cache_resource(show_spinner=False)
+def _embedding_modeli_olustur():
+    """Süreç genelinde tek yüklenen embedding modeli (Streamlit dışı araçlar ve benchmark'lar için)."""
+    return _embedding_modeli_yukle()
+
+
+class SorguEmbeddingOnbellegi:
+    """Normalize edilmiş sorgu metnine göre süreç genelinde paylaşılan embedding LRU'su"""
+
+    def __init__(self, kapasite: int = 2048, izleyici: Izleyici = None):
+        self.kapasite = kapasite
+        self.izleyici = izleyici or Izleyici()
+        self.isabet = 0
+        self.iskalama = 0
+        self.model_kimligi = None
+        self._kayitlar = OrderedDict()  # {normalize_metin: float32 vektör}, en son kullanılan sonda
+        self._kilit = threading.Lock()
+
+    @staticmethod
+    def normalize(metin: str) -> str:
+        # Model küçük harfe çevirerek (uncased) tokenize ediyor; büyük/küçük harf ve boşluk farkı vektörü değiştirmez
+        return " ".join(metin.split()).lower()
+
+    @property
+    def isabet_orani(self) -> float:
+        toplam = self.isabet + self.iskalama
+        return self.isabet / toplam if toplam else 0.0
+
+    def embed_query(self, model_kimligi: str, metin: str, hesapla) -> List[float]:
+        """Önbellekte varsa kayıtlı vektörü, yoksa hesapla(metin) sonucunu döner ve saklar."""
+        if self.kapasite <= 0:
+            return hesapla(metin)
+        import numpy as np
+
+        anahtar = self.normalize(metin)
+        with self._kilit:
+            if model_kimligi != self.model_kimligi:
+                if self.model_kimligi is not None:
+                    self.izleyici.sayac("onbellek.sorgu_embedding.gecersiz_kilma")
+                self._kayitlar.clear()
+                self.model_kimligi = model_kimligi
+            vektor = self._kayitlar.get(anahtar)
+            if vektor is not None:
+                self._kayitlar.move_to_end(anahtar)
+                self.isabet += 1
+            else:
+                self.iskalama += 1
+        if vektor is not None:
+            self.izleyici.sayac("onbellek.sorgu_embedding.isabet")
+            return vektor.tolist()
+        self.izleyici.sayac("onbellek.sorgu_embedding.iskalama")
+
+        sonuc = hesapla(metin)
+        with self._kilit:
+            if model_kimligi == self.model_kimligi:
+                self._kayitlar[anahtar] = np.asarray(sonuc, dtype="float32")
+                while len(self._kayitlar) > self.kapasite:
+                    self._kayitlar.popitem(last=False)
+        return sonuc
+
+
+@st.cache_resource(show_spinner=False)
+def sorgu_embedding_onbellegi() -> SorguEmbeddingOnbellegi:
+    """Süreç genelinde paylaşılan sorgu embedding önbelleği."""
+    return SorguEmbeddingOnbellegi(SORGU_ONBELLEK_BOYUTU, izleyici=izleyici())
+
+
+class OnbellekliEmbedding:
+    """embed_query çağrılarını sorgu önbelleğinden geçiren, modeli gerekirse ilk kullanımda yükleyen katman"""
+
+    def __init__(self, taban=None, onbellek: SorguEmbeddingOnbellegi = None, yukleyici=None):
+        self._taban = taban
+        self._yukleyici = yukleyici
+        self._kilit = threading.Lock()
+        self.onbellek = onbellek
+
+    def yukle(self):
+        """Modeli (yüklü değilse) yükler ve döner."""
+        with self._kilit:
+            if self._taban is None:
+                self._taban = self._yukleyici()
+            return self._taban
+
+    @property
+    def taban(self):
+        return self._taban if self._taban is not None else self.yukle()
+
+    @property
+    def model_kimligi(self) -> str:
+        # Model yeniden yüklendiğinde (ör. cache_resource temizlenince) nesne, dolayısıyla kimlik değişir
+        return f"{EMBEDDING_MODELI}/{type(self.taban).__name__}/{id(self.taban)}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.taban.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.onbellek.embed_query(self.model_kimligi, text, self.taban.embed_query)
+
+
+def _embedding_modeli() -> OnbellekliEmbedding:
+    """İndeks inşası ve sorgular için kullanılan, sorgu önbellekli embedding modeli."""
+    return OnbellekliEmbedding(_embedding_modeli_olustur(), sorgu_embedding_onbellegi())
+
+
+def _paylasilan_embedding_modeli() -> OnbellekliEmbedding:
+    """Koleksiyon yöneticisine verilen, ilk kullanımda yüklenen embedding modeli"""
+    return OnbellekliEmbedding(onbellek=sorgu_embedding_onbellegi(), yukleyici=_embedding_modeli_yukle)
+
+
+def _dosya_ozeti(yol: str) -> Dict[str, Any]:
+    """Kaynak PDF'in adı, boyutu ve SHA-256 özeti (artifaktın güncelliğini kontrol etmek için)."""
+    h = hashlib.sha256()
+    with open(yol, "rb") as f:
+        for blok in iter(lambda: f.read(1 << 20), b""):
+            h.update(blok)
+    return {"dosya": os.path.basename(yol), "boyut": os.path.getsize(yol), "sha256": h.hexdigest()}
+
+
+class KompaktVektorDeposu:
+    """Nicemlenmiş kodlarla arayan, adayları mmap'li float32 vektörlerle yeniden puanlayan vektör deposu"""
+    BICIMLER = ("int8", "ikili")
+    DOSYALAR = ("vektorler.kod", "vektorler_f32.npy", "metinler.bin", "metin_konumlari.npy")
+    # İkili kodlar sıralamayı daha kaba koruduğundan daha geniş aday havuzuyla yeniden puanlanır
+    YENIDEN_PUANLAMA_CARPANI = {"int8": 4, "ikili": 10}
+
+    def __init__(self, bicim: str, indeks, vektorler, metinler, konumlar, embedding_function):
+        self.bicim = bicim
+        self.indeks = indeks  # faiss IndexScalarQuantizer (int8) ya da IndexBinaryFlat (ikili)
+        self.vektorler = vektorler  # (n, d) float32; yüklenince np.memmap
+        self.metinler = metinler  # UTF-8 baytlar; yüklenince mmap
+        self.konumlar = konumlar  # (n + 1,) int64 metin başlangıçları
+        self.embedding_function = embedding_function
+
+    @staticmethod
+    def _kodla(bicim: str, vektorler):
+        import numpy as np
+        return np.packbits(vektorler > 0, axis=1) if bicim == "ikili" else vektorler
+
+    @classmethod
+    def olustur(cls, metinler: List[str], vektorler, embedding_function, bicim: str = "int8"):
+        """Bellekte bir depo kurar; save_local + load_local ile bellek eşlemeli hale gelir."""
+        import faiss
+        import numpy as np
+
+        if bicim not in cls.BICIMLER:
+            raise ValueError(f"Bilinmeyen vektör biçimi: {bicim}")
+        vektorler = np.asarray(vektorler, dtype="float32")
+        boyut = vektorler.shape[1]
+        if bicim == "ikili":
+            indeks = faiss.IndexBinaryFlat(boyut)
+        else:
+            indeks = faiss.IndexScalarQuantizer(boyut, faiss.ScalarQuantizer.QT_8bit)
+            indeks.train(vektorler)
+        indeks.add(cls._kodla(bicim, vektorler))
+        kodlu = [m.encode("utf-8") for m in metinler]
+        konumlar = np.zeros(len(kodlu) + 1, dtype="int64")
+        np.cumsum([len(m) for m in kodlu], out=konumlar[1:])
+        return cls(bicim, indeks, vektorler, b"".join(kodlu), konumlar, embedding_function)
+
+    def save_local(self, dizin: str):
+        import faiss
+        import numpy as np
+
+        yol = os.path.join(dizin, "vektorler.kod")
+        if self.bicim == "ikili":
+            faiss.write_index_binary(self.indeks, yol)
+        else:
+            faiss.write_index(self.indeks, yol)
+        np.save(os.path.join(dizin, "vektorler_f32.npy"), np.asarray(self.vektorler))
+        np.save(os.path.join(dizin, "metin_konumlari.npy"), np.asarray(self.konumlar))
+        with open(os.path.join(dizin, "metinler.bin"), "wb") as f:
+            f.write(self.metinler)
+
+    @classmethod
+    def load_local(cls, dizin: str, embedding_function, bicim: str):
+        import faiss
+        import mmap
+        import numpy as np
+
+        yol = os.path.join(dizin, "vektorler.kod")
+        indeks = faiss.read_index_binary(yol) if bicim == "ikili" else faiss.read_index(yol)
+        vektorler = np.load(os.path.join(dizin, "vektorler_f32.npy"), mmap_mode="r")
+        konumlar = np.load(os.path.join(dizin, "metin_konumlari.npy"))
+        with open(os.path.join(dizin, "metinler.bin"), "rb") as f:
+            # Boş korpusta mmap açılamaz; inşa zaten en az bir chunk garanti eder
+            metinler = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(bicim, indeks, vektorler, metinler, konumlar, embedding_function)
+
+    def _metin(self, i: int) -> str:
+        return bytes(self.metinler[self.konumlar[i]:self.konumlar[i + 1]]).decode("utf-8")
+
+    def similarity_search_with_score(self, query: str, k: int = 4):
+        import numpy as np
+        from langchain_core.documents import Document
+
+        sorgu = np.asarray([self.embedding_function.embed_query(query)], dtype="float32")
+        aday_sayisi = min(self.indeks.ntotal, k * self.YENIDEN_PUANLAMA_CARPANI[self.bicim])
+        _, adaylar = self.indeks.search(self._kodla(self.bicim, sorgu), aday_sayisi)
+        adaylar = np.sort(adaylar[0][adaylar[0] >= 0])  # Sıralı erişim mmap'te daha az sayfa okur
+        uzakliklar = ((self.vektorler[adaylar] - sorgu[0]) ** 2).sum(axis=1)
+        en_iyiler = np.argsort(uzakliklar)[:k]
+        return [(Document(page_content=self._metin(int(adaylar[j]))), float(uzakliklar[j])) for j in en_iyiler]
+
+    def similarity_search(self, query: str, k: int = 4):
+        return [belge for belge, _ in self.similarity_search_with_score(query, k)]
+
+
+class RAGIndeksInsaci:
+    """Bir PDF klasörünün FAISS indeksini arka planda (varsa artifakttan) hazırlar"""
+    EMBEDDING_PARTI_BOYUTU = 64
+
+    def __init__(self, pdf_folder_path: str = "rag_pdfs", artifakt_dizini: str = "rag_index", izleyici: Izleyici = None,
+                 vektor_bicimi: str = None, embedding_modeli: OnbellekliEmbedding = None):
+        self.pdf_folder_path = pdf_folder_path
+        self.artifakt_dizini = artifakt_dizini
+        self.vektor_bicimi = vektor_bicimi or RAG_VEKTOR_BICIMI
+        # Arka plan iş parçacığından cache_resource'a gitmemek için izleyici ve embedding modeli dışarıdan verilir;
+        # model verilmezse (CLI, benchmark) _embedding_modeli() kullanılır
+        self.izleyici = izleyici or Izleyici()
+        self.embedding_modeli = embedding_modeli
+        self.vector_store = None
+        self.istatistikler = {}
+        self.ilerleme_dinleyicisi = None  # Opsiyonel: fn(durum_ozeti) — CLI ilerlemeyi yazdırmak için kullanır
+        self._kilit = threading.Lock()
+        self._is_parcacigi = None
+        self._durum = "bekliyor"  # bekliyor | calisiyor | hazir | hata
+        self._asama = ""
+        self._hata = None
+        self._uyarilar = []
+        self._ilerleme = {"okunan_dosya": 0, "toplam_dosya": 0, "sayfa": 0,
+                          "gomulen_chunk": 0, "toplam_chunk": 0}
+
+    def baslat(self) -> bool:
+        """İnşa çalışmıyorsa ve hazır değilse arka planda başlatır. Başlattıysa True döner."""
+        with self._kilit:
+            if self._durum in ("calisiyor", "hazir"):
+                return False
+            self._durum = "calisiyor"
+            self._hata = None
+            self._uyarilar = []
+            self._is_parcacigi = threading.Thread(target=self._calistir, name="rag-indeks-insasi", daemon=True)
+            self._is_parcacigi.start()
             return True
 
-        if not self.api_anahtari:
-            st.error("API anahtarı ayarlanmamış. RAG başlatılamıyor.")
-            return False
-        
-        # Embedding modelini yükle (diskten)
-        if not self._load_embeddings():
-            return False # Yükleme başarısız olursa dur
+    def durum_ozeti(self) -> Dict[str, Any]:
+        with self._kilit:
+            return {"durum": self._durum, "asama": self._asama, "hata": self._hata,
+                    "uyarilar": list(self._uyarilar), **self._ilerleme}
 
-        pdf_files = glob.glob(os.path.join(pdf_folder_path, "*.pdf"))
-        
-        if not pdf_files:
-            st.error(f"'{pdf_folder_path}' klasöründe hiç PDF dosyası bulunamadı.")
-            return False
+    def _yayinla(self, asama: str = None, **ilerleme):
+        with self._kilit:
+            if asama is not None:
+                self._asama = asama
+            self._ilerleme.update(ilerleme)
+        if self.ilerleme_dinleyicisi:
+            self.ilerleme_dinleyicisi(self.durum_ozeti())
+
+    def _uyar(self, mesaj: str):
+        with self._kilit:
+            self._uyarilar.append(mesaj)
 
-        with st.spinner(f"⏳ {len(pdf_files)} PDF dosyası işleniyor ve RAG veritabanı oluşturuluyor..."):
-            all_text = ""
-            for pdf_path in pdf_files:
+    def _calistir(self):
+        try:
+            vector_store = self.artifakti_yukle()
+            if vector_store is None:
+                vector_store = self.insa_et()
                 try:
-                    # PDF dosyalarını 'rb' (read binary) modunda aç
-                    with open(pdf_path, "rb") as f:
-                        pdf_reader = PyPDF2.PdfReader(f)
-                        for page in pdf_reader.pages:
-                            all_text += page.extract_text() or "" # Eğer sayfa boşsa hata vermesin
-                except Exception as e:
-                    st.warning(f"'{os.path.basename(pdf_path)}' okunurken hata: {e}")
-            
-            if not all_text.strip():
-                 st.error("PDF dosyalarından metin okunamadı.")
-                 return False
+                    self.artifakt_kaydet(vector_store)
+                    if self.vektor_bicimi != "float32":
+                        # Kompakt depo diskten bellek eşlemeli açılınca float vektörler ve metinler bellekten çıkar
+                        vector_store = self.artifakti_yukle() or vector_store
+                except OSError as e:
+                    # Salt okunur dağıtımlarda kaydetme başarısız olabilir; indeks yine de kullanılır
+                    self._uyar(f"İndeks artifaktı kaydedilemedi: {e}")
+            with self._kilit:
+                self.vector_store = vector_store
+                self._durum = "hazir"
+                self._asama = "Hazır"
+        except Exception as e:
+            with self._kilit:
+                self._durum = "hata"
+                self._hata = str(e)
 
-            text_chunks = self._get_text_chunks(all_text)
-            
-            # Vektör veritabanını oluştur ve session'da sakla
+    def _pdf_dosyalari(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.pdf_folder_path, "*.pdf")))
+
+    def _embeddings(self) -> OnbellekliEmbedding:
+        from langchain_core.embeddings import Embeddings
+        Embeddings.register(OnbellekliEmbedding)  # bkz. _embedding_modeli_yukle
+        embeddings = self.embedding_modeli or _embedding_modeli()
+        embeddings.yukle()  # İlk sorgu arayüzde beklemesin, model burada (arka planda) yüklensin
+        return embeddings
+
+    def insa_et(self):
+        """Klasördeki PDF'leri okur, chunk'lara ayırır, embedding'lerini alır ve FAISS'i kurar."""
+        import PyPDF2
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        from langchain_community.vectorstores import FAISS
+
+        sureler = {}
+        pdf_files = self._pdf_dosyalari()
+        if not pdf_files:
+            raise ValueError(f"'{self.pdf_folder_path}' klasöründe hiç PDF dosyası bulunamadı.")
+        self._yayinla("PDF dosyaları okunuyor", toplam_dosya=len(pdf_files))
+
+        t0 = time.perf_counter()
+        all_text = ""
+        sayfa_sayisi = 0
+        for i, pdf_path in enumerate(pdf_files, 1):
             try:
-                vector_store = FAISS.from_texts(text_chunks, embedding=self.embeddings)
-                st.session_state.rag_vector_store = vector_store 
-                st.success("✅ RAG Chatbot veritabanı başarıyla oluşturuldu!")
-                return True
+                # PDF dosyalarını 'rb' (read binary) modunda aç
+                with open(pdf_path, "rb") as f:
+                    pdf_reader = PyPDF2.PdfReader(f)
+                    for page in pdf_reader.pages:
+                        all_text += page.extract_text() or ""  # Eğer sayfa boşsa hata vermesin
+                        sayfa_sayisi += 1
+                        self._yayinla(sayfa=sayfa_sayisi)
             except Exception as e:
-                st.error(f"Vektör veritabanı oluşturulurken hata: {e}")
-                return False
+                self._uyar(f"'{os.path.basename(pdf_path)}' okunurken hata: {e}")
+            self._yayinla(okunan_dosya=i)
+        sureler["okuma"] = time.perf_counter() - t0
+
+        if not all_text.strip():
+            raise ValueError("PDF dosyalarından metin okunamadı.")
+
+        self._yayinla("Metin parçalanıyor")
+        t0 = time.perf_counter()
+        text_splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_BOYUTU, chunk_overlap=CHUNK_ORTUSMESI)
+        text_chunks = text_splitter.split_text(all_text)
+        sureler["parcalama"] = time.perf_counter() - t0
+
+        self._yayinla("Embedding modeli yükleniyor", toplam_chunk=len(text_chunks))
+        t0 = time.perf_counter()
+        embeddings = self._embeddings()
+        sureler["model_yukleme"] = time.perf_counter() - t0
+
+        # Parça parça embed et ki ilerleme raporlanabilsin
+        self._yayinla("Chunk'lar vektöre dönüştürülüyor")
+        t0 = time.perf_counter()
+        vektorler = []
+        for bas in range(0, len(text_chunks), self.EMBEDDING_PARTI_BOYUTU):
+            vektorler.extend(embeddings.embed_documents(text_chunks[bas:bas + self.EMBEDDING_PARTI_BOYUTU]))
+            self._yayinla(gomulen_chunk=len(vektorler))
+        sureler["embedding"] = time.perf_counter() - t0
+
+        self._yayinla("FAISS indeksi kuruluyor")
+        t0 = time.perf_counter()
+        if self.vektor_bicimi == "float32":
+            vector_store = FAISS.from_embeddings(list(zip(text_chunks, vektorler)), embedding=embeddings)
+        else:
+            vector_store = KompaktVektorDeposu.olustur(text_chunks, vektorler, embeddings, self.vektor_bicimi)
+        sureler["faiss"] = time.perf_counter() - t0
+
+        for asama, sure in sureler.items():
+            self.izleyici.gozlem(f"rag.insa.{asama}", sure * 1000)
+        self.izleyici.sayac("rag.insa.sayfa", sayfa_sayisi)
+        self.izleyici.sayac("rag.insa.chunk", len(text_chunks))
+        self.istatistikler = {
+            "dosya_sayisi": len(pdf_files),
+            "sayfa_sayisi": sayfa_sayisi,
+            "karakter_sayisi": len(all_text),
+            "chunk_sayisi": len(text_chunks),
+            "sureler_sn": {k: round(v, 3) for k, v in sureler.items()},
+        }
+        return vector_store
+
+    def artifakt_kaydet(self, vector_store, artifakt_dizini: str = None) -> Dict[str, Any]:
+        """FAISS indeksini ve sürümlü manifest.json'u diske yazar; manifest'i döner."""
+        artifakt_dizini = artifakt_dizini or self.artifakt_dizini
+        os.makedirs(artifakt_dizini, exist_ok=True)
+        vector_store.save_local(artifakt_dizini)
+        dosyalar = getattr(vector_store, "DOSYALAR", ("index.faiss", "index.pkl"))
+        indeks_boyutu = sum(os.path.getsize(os.path.join(artifakt_dizini, d)) for d in dosyalar)
+        manifest = {
+            "surum": RAG_INDEKS_SURUMU,
+            "olusturma_tarihi": datetime.datetime.now().isoformat(timespec="seconds"),
+            "embedding_modeli": EMBEDDING_MODELI,
+            "vektor_bicimi": self.vektor_bicimi,
+            "chunk_boyutu": CHUNK_BOYUTU,
+            "chunk_ortusmesi": CHUNK_ORTUSMESI,
+            "kaynaklar": [_dosya_ozeti(p) for p in self._pdf_dosyalari()],
+            "istatistikler": {**self.istatistikler, "indeks_boyutu_bayt": indeks_boyutu},
+        }
+        with open(os.path.join(artifakt_dizini, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return manifest
+
+    def _artifakt_gecerli_mi(self, manifest: Dict[str, Any]) -> bool:
+        if manifest.get("surum") != RAG_INDEKS_SURUMU or manifest.get("embedding_modeli") != EMBEDDING_MODELI:
+            return False
+        if (manifest.get("chunk_boyutu"), manifest.get("chunk_ortusmesi")) != (CHUNK_BOYUTU, CHUNK_ORTUSMESI):
+            return False
+        if manifest.get("vektor_bicimi", "float32") != self.vektor_bicimi:
+            return False
+        pdf_files = self._pdf_dosyalari()
+        # PDF'siz dağıtımlarda (sadece hazır indeks gönderilmişse) artifakt olduğu gibi kullanılır
+        return not pdf_files or [_dosya_ozeti(p) for p in pdf_files] == manifest.get("kaynaklar")
+
+    def artifakti_yukle(self):
+        """Güncel bir artifakt varsa FAISS indeksini yükleyip döner, yoksa None."""
+        manifest_yolu = os.path.join(self.artifakt_dizini, "manifest.json")
+        if not os.path.exists(manifest_yolu):
+            return None
+        with open(manifest_yolu, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if not self._artifakt_gecerli_mi(manifest):
+            self._uyar("Kayıtlı RAG indeksi güncel değil, yeniden oluşturuluyor.")
+            return None
+
+        from langchain_community.vectorstores import FAISS
+
+        self._yayinla("Hazır indeks yükleniyor")
+        with self.izleyici.span("rag.artifakt_yukleme"):
+            embeddings = self._embeddings()  # Sorguların vektörleştirilmesi için yine gerekli
+            if self.vektor_bicimi == "float32":
+                # index.pkl bu uygulamanın kendi ürettiği bir dosya, pickle yüklemesine izin veriyoruz
+                vector_store = FAISS.load_local(self.artifakt_dizini, embeddings, allow_dangerous_deserialization=True)
+            else:
+                vector_store = KompaktVektorDeposu.load_local(self.artifakt_dizini, embeddings, self.vektor_bicimi)
+        self.istatistikler = manifest.get("istatistikler", {})
+        return vector_store
+
+
+class RAGKoleksiyonYoneticisi:
+    """Ders bazlı RAG koleksiyonları; bellekte en fazla azami_bellekte indeks tutulur"""
+    GENEL = "genel"
+
+    def __init__(self, kok_klasor: str = "rag_pdfs", artifakt_koku: str = "rag_index",
+                 azami_bellekte: int = 4, izleyici: Izleyici = None, embedding_modeli: OnbellekliEmbedding = None):
+        self.kok_klasor = kok_klasor
+        self.artifakt_koku = artifakt_koku
+        self.azami_bellekte = azami_bellekte
+        self.izleyici = izleyici or Izleyici()
+        self.embedding_modeli = embedding_modeli  # Tüm koleksiyonlar aynı modeli paylaşır
+        self._insacilar = OrderedDict()  # {koleksiyon: RAGIndeksInsaci}, en son kullanılan sonda
+        self._kilit = threading.Lock()
+        self._on_yukleme_yapildi = False
+
+    def yollar(self, ad: str):
+        """Koleksiyonun (pdf_klasoru, artifakt_dizini) çifti."""
+        if ad == self.GENEL:
+            return self.kok_klasor, self.artifakt_koku
+        return os.path.join(self.kok_klasor, ad), os.path.join(self.artifakt_koku, ad)
+
+    def koleksiyonlar(self) -> List[str]:
+        """PDF'i ya da kayıtlı artifaktı olan koleksiyonlar ("genel" varsa başta)."""
+        adlar = set()
+        for kok, dosya in ((self.kok_klasor, "*.pdf"), (self.artifakt_koku, "manifest.json")):
+            if glob.glob(os.path.join(kok, dosya)):
+                adlar.add(self.GENEL)
+            adlar.update(os.path.basename(os.path.dirname(yol)) for yol in glob.glob(os.path.join(kok, "*", dosya)))
+        return sorted(adlar, key=lambda ad: (ad != self.GENEL, ad.lower()))
+
+    def insaci(self, ad: str, koru: Iterable[str] = ()) -> RAGIndeksInsaci:
+        """Koleksiyonun inşacısını döner, gerekirse yüklemeyi başlatır; koru'dakiler tahliye edilmez"""
+        with self._kilit:
+            insaci = self._insacilar.get(ad)
+            if insaci is None:
+                insaci = RAGIndeksInsaci(*self.yollar(ad), izleyici=self.izleyici, embedding_modeli=self.embedding_modeli)
+                self._insacilar[ad] = insaci
+            self._insacilar.move_to_end(ad)
+            self._tahliye_et(set(koru) | {ad})
+        if insaci.durum_ozeti()["durum"] == "bekliyor":
+            insaci.baslat()
+        return insaci
+
+    def _tahliye_et(self, koru: set):
+        # Kilit tutulurken çağrılır. Sadece hazır indeksler sayılır/atılır; süren inşalar bitmeye bırakılır.
+        # Aktif seçim atılırsa seçili indeksler birbirini sırayla atıp her istekte yeniden yüklenir.
+        hazirlar = [ad for ad, i in self._insacilar.items() if i.durum_ozeti()["durum"] == "hazir"]
+        fazla = len(hazirlar) - self.azami_bellekte
+        for ad in [ad for ad in hazirlar if ad not in koru][:max(0, fazla)]:
+            del self._insacilar[ad]
+            self.izleyici.sayac("rag.koleksiyon.tahliye")
+
+    def hazir_mi(self, ad: str, koru: Iterable[str] = ()) -> bool:
+        return self.insaci(ad, koru).durum_ozeti()["durum"] == "hazir"
+
+    def bellekteki_koleksiyonlar(self) -> List[str]:
+        with self._kilit:
+            return list(self._insacilar)
+
+    def on_yukle(self):
+        """Artifaktı hazır koleksiyonları (en fazla azami_bellekte) süreç açılışında bir kez yüklemeye başlar."""
+        with self._kilit:
+            if self._on_yukleme_yapildi:
+                return
+            self._on_yukleme_yapildi = True
+        hazir_artifaktlar = [ad for ad in self.koleksiyonlar()
+                             if os.path.exists(os.path.join(self.yollar(ad)[1], "manifest.json"))]
+        for ad in hazir_artifaktlar[:self.azami_bellekte]:
+            self.insaci(ad)
+
+    def ara(self, adlar: List[str], soru: str, k: int = 3):
+        """Sadece seçili koleksiyonlarda arar; sonuçları benzerlik skoruna göre birleştirip ilk k'yı döner."""
+        adaylar = []
+        for ad in adlar:
+            vector_store = self.insaci(ad, adlar).vector_store
+            if vector_store is not None:
+                adaylar.extend(vector_store.similarity_search_with_score(soru, k=k))
+        adaylar.sort(key=lambda aday: aday[1])  # FAISS L2 uzaklığı: küçük olan daha benzer
+        return [belge for belge, _ in adaylar[:k]]
+
+
+@st.cache_resource(show_spinner=False)
+def rag_koleksiyon_yoneticisi(kok_klasor: str = "rag_pdfs", artifakt_koku: str = "rag_index") -> RAGKoleksiyonYoneticisi:
+    """Süreç genelinde paylaşılan koleksiyon yöneticisi. Bellekteki indeks sayısı ASISTAN_RAG_AZAMI_KOLEKSIYON ile sınırlanır."""
+    azami = int(os.environ.get("ASISTAN_RAG_AZAMI_KOLEKSIYON", "4"))
+    return RAGKoleksiyonYoneticisi(kok_klasor, artifakt_koku, azami_bellekte=azami, izleyici=izleyici(),
+                                   embedding_modeli=_paylasilan_embedding_modeli())
+
+
+def _yeniden_siralama_modeli_olustur():
+    """Cross-encoder modelini yükler (ilk çalıştırmada Hugging Face'den indirilir)."""
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(YENIDEN_SIRALAMA_MODELI, device="cpu", max_length=512)
+
+
+class YenidenSiralayici:
+    """FAISS adaylarını zaman bütçesi içinde cross-encoder ile yeniden sıralar"""
+
+    def __init__(self, model_olusturucu=None, parti_boyutu: int = 8, butce_ms: float = 300,
+                 izleyici: Izleyici = None):
+        self.model_olusturucu = model_olusturucu or _yeniden_siralama_modeli_olustur
+        self.parti_boyutu = parti_boyutu
+        self.butce_ms = butce_ms
+        self.izleyici = izleyici or Izleyici()
+        self._model = None
+        self._hata = None
+        self._yukleyici = None  # Modeli yükleyen arka plan iş parçacığı
+        self._kilit = threading.Lock()
+
+    def on_yukle(self):
+        """Modeli arka planda yüklemeye başlar (bir kez)."""
+        with self._kilit:
+            if self._yukleyici is not None:
+                return
+            self._yukleyici = threading.Thread(target=self._yukle, name="yeniden-siralama-modeli", daemon=True)
+        self._yukleyici.start()
+
+    def _yukle(self):
+        try:
+            with self.izleyici.span("rag.yeniden_siralama.model_yukleme"):
+                self._model = self.model_olusturucu()
+        except Exception as e:
+            self._hata = str(e)
+
+    def sirala(self, soru: str, belgeler: List[Any], k: int) -> List[Any]:
+        """belgeler (FAISS sırasıyla) içinden en alakalı k tanesini döner."""
+        model = self._model
+        if model is None:
+            self.on_yukle()
+            if self._hata is None:
+                self.izleyici.sayac("rag.yeniden_siralama.model_hazir_degil")
+        if model is None or len(belgeler) <= 1:
+            return belgeler[:k]
+
+        puanlar = []
+        t0 = time.perf_counter()
+        with self.izleyici.span("rag.yeniden_siralama"):
+            for bas in range(0, len(belgeler), self.parti_boyutu):
+                parti = belgeler[bas:bas + self.parti_boyutu]
+                puanlar.extend(model.predict([(soru, b.page_content) for b in parti], batch_size=self.parti_boyutu))
+                if (time.perf_counter() - t0) * 1000 > self.butce_ms and len(puanlar) < len(belgeler):
+                    self.izleyici.sayac("rag.yeniden_siralama.butce_asimi")
+                    break
+        self.izleyici.sayac("rag.yeniden_siralama.puanlanan", len(puanlar))
+
+        puanlanan = sorted(range(len(puanlar)), key=lambda i: puanlar[i], reverse=True)
+        return [belgeler[i] for i in puanlanan[:k]] + belgeler[len(puanlar):][:max(0, k - len(puanlar))]
+
+
+@st.cache_resource(show_spinner=False)
+def yeniden_siralayici() -> YenidenSiralayici:
+    """Süreç genelinde paylaşılan yeniden sıralayıcı. Süre bütçesi ASISTAN_RAG_SIRALAMA_BUTCE_MS ile ayarlanır."""
+    return YenidenSiralayici(butce_ms=float(os.environ.get("ASISTAN_RAG_SIRALAMA_BUTCE_MS", "300")),
+                             izleyici=izleyici())
+
+
+# ==================== BAĞLAM SIKIŞTIRMA ====================
+_CUMLE_SONU = re.compile(r"(?<=[.!?…])\s+|\n{2,}")
+_NORMALIZE_DISI = re.compile(r"[^\w\s]")
+
+
+def _token_tahmini(metin: str) -> int:
+    """Gemini tokenizer'ı yerelde yok; Türkçe metinde ~4 karakter/token yaklaşımı kullanılır."""
+    return (len(metin) + 3) // 4
+
+
+def _ortusme_uzunlugu(onceki: str, sonraki: str, en_az: int = 40) -> int:
+    """onceki'nin sonu ile sonraki'nin başı arasındaki ortak metnin uzunluğu (yoksa 0)"""
+    if len(onceki) < en_az or len(sonraki) < en_az:
+        return 0
+    bas = sonraki[:en_az]
+    pencere_basi = max(0, len(onceki) - CHUNK_ORTUSMESI - en_az)
+    konum = onceki.find(bas, pencere_basi)
+    while konum != -1:
+        if sonraki.startswith(onceki[konum:]):
+            return len(onceki) - konum
+        konum = onceki.find(bas, konum + 1)
+    return 0
+
+
+def _komsulari_birlestir(parcalar: List[str]) -> List[str]:
+    """Örtüşen komşu chunk'ları tek parçada birleştirir; ilk görülen parçanın sırası korunur."""
+    segmentler = []
+    for parca in parcalar:
+        for i, segment in enumerate(segmentler):
+            if parca in segment:
+                break
+            ortusme = _ortusme_uzunlugu(segment, parca)
+            if ortusme:
+                segmentler[i] = segment + parca[ortusme:]
+                break
+            ortusme = _ortusme_uzunlugu(parca, segment)
+            if ortusme:
+                segmentler[i] = parca + segment[ortusme:]
+                break
+        else:
+            segmentler.append(parca)
+    return segmentler
+
+
+def _normalize_kelimeler(cumle: str) -> frozenset:
+    return frozenset(_NORMALIZE_DISI.sub(" ", cumle.lower()).split())
+
+
+def baglam_derle(belgeler: List[Any], token_butcesi: int = BAGLAM_TOKEN_BUTCESI,
+                 benzerlik_esigi: float = 0.85):
+    """Örtüşen chunk'ları birleştirir, tekrar cümleleri atar, token bütçesine kırpar; (metinler, istatistik) döner"""
+    parcalar = [b.page_content for b in belgeler]
+    token_once = sum(_token_tahmini(p) for p in parcalar)
+
+    gorulen = []  # Tutulan cümlelerin kelime kümeleri
+    atilan = 0
+    kalan_butce = token_butcesi
+    derlenmis = []
+    for segment in _komsulari_birlestir(parcalar):
+        tutulan = []
+        for cumle in _CUMLE_SONU.split(segment):
+            cumle = cumle.strip()
+            if not cumle:
+                continue
+            kelimeler = _normalize_kelimeler(cumle)
+            if kelimeler and any(len(kelimeler & g) / len(kelimeler | g) >= benzerlik_esigi for g in gorulen):
+                atilan += 1
+                continue
+            maliyet = _token_tahmini(cumle) + 1
+            if maliyet > kalan_butce:
+                if not derlenmis and not tutulan:
+                    tutulan.append(cumle[:kalan_butce * 4])  # Tek ve çok uzun cümle: bağlam boş kalmasın
+                kalan_butce = 0  # Bütçe doldu; daha az alakalı segmentlere geçilmez
+                break
+            kalan_butce -= maliyet
+            gorulen.append(kelimeler)
+            tutulan.append(cumle)
+        if tutulan:
+            derlenmis.append(" ".join(tutulan))
+        if kalan_butce <= 0:
+            break
+
+    istatistik = {"token_once": token_once, "token_sonra": sum(_token_tahmini(d) for d in derlenmis),
+                  "atilan_cumle": atilan}
+    return derlenmis, istatistik
+
+
+class RAGIsleyici:
+    def __init__(self, koleksiyon_yoneticisi: RAGKoleksiyonYoneticisi = None,
+                 siralayici: YenidenSiralayici = None):
+        self.api_anahtari = None
+        # Verilmezse süreç genelindeki örnekler kullanılır (ölçüm betikleri kendilerininkini verir)
+        self.koleksiyon_yoneticisi = koleksiyon_yoneticisi
+        self.siralayici = siralayici
+        self.son_baglam_istatistigi = None  # Son sorgudaki bağlamın sıkıştırma öncesi/sonrası token sayıları
+
+    def _yonetici(self) -> RAGKoleksiyonYoneticisi:
+        return self.koleksiyon_yoneticisi or rag_koleksiyon_yoneticisi()
+
+    def _siralayici(self) -> YenidenSiralayici:
+        return self.siralayici or yeniden_siralayici()
+
+    def ayarla(self, api_anahtari: str):
+        """API anahtarını ayarlar."""
+        self.api_anahtari = api_anahtari
+
+    def _get_pdf_text(self, pdf_docs):
+        """Yüklenen PDF dosyalarından metinleri okur."""
+        import PyPDF2
+
+        text = ""
+        for pdf in pdf_docs:
+            pdf_reader = PyPDF2.PdfReader(pdf)
+            for page in pdf_reader.pages:
+                text += page.extract_text()
+        return text
+
+    def _get_text_chunks(self, text):
+        """Metni işlenebilir küçük parçalara (chunk) ayırır."""
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+        text_splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_BOYUTU, chunk_overlap=CHUNK_ORTUSMESI)
+        chunks = text_splitter.split_text(text)
+        return chunks
+
+    def initialize_vector_store(self, koleksiyonlar: List[str]):
+        """
+        Seçili koleksiyonların hepsi hazırsa True döner. Hazır olmayanların yüklenmesini/inşasını
+        arka planda başlatır (zaten çalışıyorsa tekrar başlatmaz) ve beklemeden False döner;
+        ilerleme rag_koleksiyon_yoneticisi() üzerinden okunur.
+        """
+        if not self.api_anahtari:
+            st.error("API anahtarı ayarlanmamış. RAG başlatılamıyor.")
+            return False
+
+        yonetici = self._yonetici()
+        # all() kısa devre yapmasın: hazır olmayanların hepsi aynı anda başlatılsın
+        return all([yonetici.hazir_mi(ad, koleksiyonlar) for ad in koleksiyonlar])
 
 
     def _get_conversational_chain(self):
         """Soru-cevap zincirini (QA Chain) oluşturur."""
+        from langchain.prompts import PromptTemplate
+        from langchain.chains.question_answering import load_qa_chain
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         prompt_template = """
         Sana verilen bağlamı kullanarak soruyu olabildiğince detaylı cevapla.
         Eğer cevap bağlamda yoksa, kendi bilgine göre hızlı ve kısaca cevapla.
@@ -716,259 +2382,973 @@ class RAGIsleyici:
         
         return chain
 
-    def user_input(self, user_question):
-        """Kullanıcının sorusunu alır ve RAG pipeline'ını çalıştırır."""
-        if "rag_vector_store" not in st.session_state:
-            st.warning("Lütfen önce bir PDF dosyası yükleyip işleyin.")
+    def user_input(self, user_question, koleksiyonlar: List[str]):
+        """Kullanıcının sorusunu alır ve RAG pipeline'ını sadece seçili koleksiyonlarda çalıştırır."""
+        if not koleksiyonlar:
+            st.warning("Lütfen en az bir koleksiyon seçin.")
             return
 
-        vector_store = st.session_state.rag_vector_store
+        iz = izleyici()
         
-        # Veri boyutu (token) limitini aşmamak için k=1 olarak ayarladık
-        docs = vector_store.similarity_search(user_question, k=3)
+        # Geniş aday kümesi ucuz yoğun aramayla alınır, yeniden sıralanır; token limitini
+        # aşmamak için prompt'a yine sadece BAGLAM_SAYISI parça girer
+        with iz.span("rag.arama"):
+            adaylar = self._yonetici().ara(koleksiyonlar, user_question, k=ADAY_SAYISI)
+        docs = self._siralayici().sirala(user_question, adaylar, k=BAGLAM_SAYISI)
+
+        # chunk_overlap nedeniyle tekrar eden metin prompt'a girmesin
+        from langchain_core.documents import Document
+
+        with iz.span("rag.baglam_derleme"):
+            derlenmis, istatistik = baglam_derle(docs)
+        self.son_baglam_istatistigi = istatistik
+        iz.sayac("rag.baglam.token_once", istatistik["token_once"])
+        iz.sayac("rag.baglam.token_sonra", istatistik["token_sonra"])
+        docs = [Document(page_content=metin) for metin in derlenmis]
         
         chain = self._get_conversational_chain()
-        response = chain({"input_documents": docs, "question": user_question}, return_only_outputs=True)
+        with iz.span("llm.rag"):
+            response = chain({"input_documents": docs, "question": user_question}, return_only_outputs=True)
+        iz.sayac("llm.rag.cagri")
         return response["output_text"]
 
+# ==================== SOHBET CEVAP ÖNBELLEĞİ ====================
+# Bağlamdan bağımsız sohbet mesajlarının cevap önbelleği; ASISTAN_SOHBET_ONBELLEGI=1 ile açılır
+SOHBET_ONBELLEGI_ACIK = os.environ.get("ASISTAN_SOHBET_ONBELLEGI", "0") == "1"
+SOHBET_ONBELLEK_TTL_SN = float(os.environ.get("ASISTAN_SOHBET_ONBELLEK_TTL_SN", "21600"))
+# Sohbet prompt'u değiştiğinde artırılır; eski cevaplar kullanılmaz
+SOHBET_PROMPT_SURUMU = 2
+
+
+class SohbetOnbellegi:
+    """Bağlamdan bağımsız genel sohbet mesajlarının cevapları için TTL'li LRU"""
+    AZAMI_KELIME = 8
+    GENEL_NIYETLER = re.compile(
+        r"\b(selam\w*|merhaba\w*|gunaydin|iyi (aksamlar|geceler|gunler)|naber|nasilsin\w*|slm|mrb|"
+        r"tesekkur\w*|sagol\w*|sag ol\w*|eyvallah|"
+        r"motivasyon\w*|motive|moral\w*|"
+        r"(nasil|nasil daha (iyi|verimli)) (ders )?calis\w*|verimli calis\w*|ders calisma (teknik|yontem)\w*|"
+        r"odaklan\w*|konsantr\w*|pomodoro|erteleme\w*|sinav (kaygi|stres)\w*|stres\w*|"
+        r"calisma (tavsiye|oneri|ipucu)\w*)\b")
+    # Önceki konuşmaya gönderme yapan kelimeler: bunlar varsa cevap geçmişe bağlı olabilir
+    BAGLAM_KELIMELERI = frozenset(
+        "bu bunu bunlari bunun bunda buna su sunu o onu onlari onun ona onda oyle boyle "
+        "onceki yukaridaki demin az once dedigin dedin soyledigin soyledin yazdigin "
+        "devam daha baska tekrar yine ayni peki neden niye ya evet hayir tamam".split())
+    _TURKCE_HARFLER = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+    def __init__(self, kapasite: int = 512, ttl_sn: float = SOHBET_ONBELLEK_TTL_SN, izleyici: Izleyici = None):
+        self.kapasite = kapasite
+        self.ttl_sn = ttl_sn
+        self.izleyici = izleyici or Izleyici()
+        self.isabet = 0
+        self.iskalama = 0
+        self.kazanilan_ms = 0.0
+        self._llm_ort_ms = None  # Iskalamalardaki LLM süresinin üssel hareketli ortalaması
+        self._kayitlar = OrderedDict()  # {anahtar: (zaman, cevap)}, en son kullanılan sonda
+        self._kilit = threading.Lock()
+
+    @staticmethod
+    def normalize(mesaj: str) -> str:
+        """Önbellek anahtarı: Türkçe küçük harf, sadeleştirilmiş boşluk."""
+        return " ".join(mesaj.replace("İ", "i").replace("I", "ı").lower().split())
+
+    @classmethod
+    def _siniflandirma_metni(cls, mesaj: str) -> str:
+        """Aksan, noktalama, emoji ve uzatılmış harf ("selaaam") farklarını da siler; sadece niyet tanıma için."""
+        metin = cls.normalize(mesaj).translate(cls._TURKCE_HARFLER)
+        metin = re.sub(r"[^\w\s]|_", " ", metin)
+        metin = re.sub(r"([^\W\d])\1{2,}", r"\1", metin)
+        return " ".join(metin.split())
+
+    @classmethod
+    def baglamdan_bagimsiz_mi(cls, mesaj: str) -> bool:
+        normalize_mesaj = cls._siniflandirma_metni(mesaj)
+        kelimeler = normalize_mesaj.split()
+        if not kelimeler or len(kelimeler) > cls.AZAMI_KELIME:
+            return False
+        if any(k in cls.BAGLAM_KELIMELERI for k in kelimeler):
+            return False
+        return cls.GENEL_NIYETLER.search(normalize_mesaj) is not None
+
+    @property
+    def isabet_orani(self) -> float:
+        toplam = self.isabet + self.iskalama
+        return self.isabet / toplam if toplam else 0.0
+
+    def cevapla(self, mesaj: str, uret, uret_gecmissiz) -> str:
+        """Uygun olmayan mesajda uret(); uygunsa önbellekteki ya da geçmişsiz üretilip saklanan cevabı döner."""
+        t0 = time.perf_counter()
+        normalize_mesaj = self.normalize(mesaj)
+        if self.kapasite <= 0 or not normalize_mesaj or not self.baglamdan_bagimsiz_mi(mesaj):
+            self.izleyici.sayac("onbellek.sohbet.uygun_degil")
+            return uret()
+        anahtar = f"{SOHBET_PROMPT_SURUMU}|{GEMINI_MODELI}|{normalize_mesaj}"
+        with self._kilit:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is not None and time.time() - kayit[0] > self.ttl_sn:
+                del self._kayitlar[anahtar]
+                kayit = None
+            if kayit is not None:
+                self._kayitlar.move_to_end(anahtar)
+                self.isabet += 1
+                kazanilan = max(0.0, (self._llm_ort_ms or 0.0) - (time.perf_counter() - t0) * 1000)
+                self.kazanilan_ms += kazanilan
+            else:
+                self.iskalama += 1
+        if kayit is not None:
+            self.izleyici.sayac("onbellek.sohbet.isabet")
+            self.izleyici.sayac("onbellek.sohbet.kazanilan_ms", round(kazanilan, 1))
+            return kayit[1]
+        self.izleyici.sayac("onbellek.sohbet.iskalama")
+
+        # Cevap başka oturumlara da verileceğinden bu kullanıcının konuşma geçmişi prompt'a girmez
+        cevap = uret_gecmissiz()
+        sure_ms = (time.perf_counter() - t0) * 1000
+        with self._kilit:
+            self._llm_ort_ms = sure_ms if self._llm_ort_ms is None else 0.8 * self._llm_ort_ms + 0.2 * sure_ms
+            self._kayitlar[anahtar] = (time.time(), cevap)
+            while len(self._kayitlar) > self.kapasite:
+                self._kayitlar.popitem(last=False)
+        return cevap
+
+
+@st.cache_resource(show_spinner=False)
+def sohbet_onbellegi():
+    """Süreç genelinde paylaşılan sohbet cevap önbelleği; kapalıysa None."""
+    if not SOHBET_ONBELLEGI_ACIK:
+        return None
+    return SohbetOnbellegi(izleyici=izleyici())
+
+
+# ==================== DURUM ARŞİVİ (DIŞA/İÇE AKTARMA) ====================
+class DurumArsivi:
+    """Asistan durumunun Arrow IPC çerçeveli taşınabilir ikili anlık görüntüsü"""
+    SIHIRLI = b"ASISTANARSIV"
+    BICIM_SURUMU = 1
+    PARTI_SATIR = 65536
+
+    @staticmethod
+    def _semalar():
+        import pyarrow as pa
+        metin_sozluk = pa.dictionary(pa.int32(), pa.string())
+        zaman = pa.timestamp("us")
+        return {
+            "calisma_kayitlari": pa.schema([("kullanici", metin_sozluk), ("ders", metin_sozluk), ("sure", pa.float64()),
+                                            ("tarih", zaman), ("konular", pa.list_(pa.string()))]),
+            "konu_tekrarlari": pa.schema([("kullanici", metin_sozluk), ("ders", metin_sozluk), ("konu", pa.string()),
+                                          ("tekrar", pa.int32()), ("aralik", pa.int32()), ("kolaylik", pa.float64()),
+                                          ("son_tekrar", pa.date32()), ("vade", pa.date32()), ("surum", pa.int32())]),
+            "hedefler": pa.schema([("kullanici", metin_sozluk), ("id", pa.int32()), ("metin", pa.string()),
+                                   ("kategori", metin_sozluk), ("olusturma_tarihi", zaman), ("bitis_tarihi", pa.date32()),
+                                   ("tamamlandi", pa.bool_()), ("ilerleme", pa.int16()), ("tamamlanma_tarihi", zaman)]),
+            "dersler": pa.schema([("adi", pa.string()), ("zorluk", pa.string()), ("eklenme_tarihi", zaman)]),
+            "chat_gecmisi": pa.schema([("kullanici", metin_sozluk), ("mesaj", pa.string()), ("cevap", pa.string()),
+                                       ("zaman", zaman)]),
+        }
+
+    @staticmethod
+    def _kaynaklar(asistan):
+        """Tablo adı -> ((kullanici_adi, [kayıt]) grupları, yazılacak alanlar)"""
+        analitik = asistan.ogrenme_analitigi
+        hedefler = asistan.hedef_takip
+        return {
+            "calisma_kayitlari": (analitik.calisma_kayitlari.items(), ("ders", "sure", "tarih", "konular")),
+            "konu_tekrarlari": (((k, list(d.values())) for k, d in analitik.konu_tekrari.durumlar.items()),
+                                ("ders", "konu", "tekrar", "aralik", "kolaylik", "son_tekrar", "vade", "surum")),
+            # Görünüm sırası korunsun diye önce aktifler (aktifleşme sırası), sonra tamamlananlar
+            "hedefler": (((k, hedefler.aktif_hedefler(k) + hedefler.tamamlanan_hedefler_listesi(k)) for k in hedefler.hedefler),
+                         ("id", "metin", "kategori", "olusturma_tarihi", "bitis_tarihi", "tamamlandi", "ilerleme",
+                          "tamamlanma_tarihi")),
+            "dersler": ([(None, asistan.dersler)], ("adi", "zorluk", "eklenme_tarihi")),
+            "chat_gecmisi": ([(asistan.kullanici_adi, asistan.chat_gecmisi)], ("mesaj", "cevap", "zaman")),
+        }
+
+    @classmethod
+    def _tablo_yaz(cls, cikti, sema, gruplar, anahtarlar) -> int:
+        """Bir tabloyu çerçeve olarak yazar: uzunluk alanı yer tutucu yazılır, akış bitince düzeltilir."""
+        import struct
+        import pyarrow as pa
+
+        def arrow_dizisi(alan, degerler):
+            if pa.types.is_dictionary(alan.type):
+                return pa.array(degerler, type=alan.type.value_type).dictionary_encode()
+            return pa.array(degerler, type=alan.type)
+
+        uzunluk_konumu = cikti.tell()
+        cikti.write(struct.pack("<Q", 0))
+        yazici = pa.ipc.new_stream(pa.PythonFile(cikti, mode="w"), sema)
+        toplam = 0
+        for kullanici_adi, kayitlar in gruplar:
+            for bas in range(0, len(kayitlar), cls.PARTI_SATIR):
+                parti = kayitlar[bas:bas + cls.PARTI_SATIR]
+                alanlar = iter(sema)
+                sutunlar = []
+                if kullanici_adi is not None:
+                    next(alanlar)
+                    sutunlar.append(pa.DictionaryArray.from_arrays(pa.nulls(len(parti), pa.int32()).fill_null(0),
+                                                                   pa.array([kullanici_adi])))
+                oku = dict.get if isinstance(parti[0], dict) else getattr
+                for alan, anahtar in zip(alanlar, anahtarlar):
+                    sutunlar.append(arrow_dizisi(alan, [oku(kayit, anahtar) for kayit in parti]))
+                yazici.write_batch(pa.RecordBatch.from_arrays(sutunlar, schema=sema))
+                toplam += len(parti)
+        yazici.close()
+        son = cikti.tell()
+        cikti.seek(uzunluk_konumu)
+        cikti.write(struct.pack("<Q", son - uzunluk_konumu - 8))
+        cikti.seek(son)
+        return toplam
+
+    @classmethod
+    def disa_aktar(cls, asistan, cikti) -> Dict[str, int]:
+        """Durumu cikti'ya (dosya yolu ya da yazılabilir, konumlanabilir ikili nesne) yazar; tablo başına satır sayısı döner."""
+        import struct
+        if isinstance(cikti, str):
+            with open(cikti, "wb") as f:
+                return cls.disa_aktar(asistan, f)
+
+        with izleyici().span("arsiv.disa_aktar"):
+            plan = dict(asistan.calisma_plani)
+            if plan.get("gunler"):
+                plan["gunler"] = [dict(g, tarih=g["tarih"].isoformat()) for g in plan["gunler"]]
+            meta = {
+                "bicim_surumu": cls.BICIM_SURUMU,
+                "olusturma": datetime.datetime.now().isoformat(timespec="seconds"),
+                "kullanici_adi": asistan.kullanici_adi,
+                "sonraki_hedef_id": dict(asistan.hedef_takip._sonraki_id),
+                "haftalik_plan": asistan.haftalik_plan,
+                "calisma_plani": plan,
+            }
+            cikti.write(cls.SIHIRLI + struct.pack("<H", cls.BICIM_SURUMU))
+            meta_bayt = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+            cikti.write(struct.pack("<H", 4) + b"meta" + struct.pack("<Q", len(meta_bayt)) + meta_bayt)
+
+            semalar = cls._semalar()
+            sayilar = {}
+            for ad, (gruplar, anahtarlar) in cls._kaynaklar(asistan).items():
+                ad_bayt = ad.encode("utf-8")
+                cikti.write(struct.pack("<H", len(ad_bayt)) + ad_bayt)
+                sayilar[ad] = cls._tablo_yaz(cikti, semalar[ad], gruplar, anahtarlar)
+        return sayilar
+
+    @classmethod
+    def _cerceveler(cls, tampon):
+        """(ad, pyarrow.Buffer) çerçeveleri; tampon kopyalanmaz."""
+        import struct
+        bellek = memoryview(tampon)
+        if bytes(bellek[:len(cls.SIHIRLI)]) != cls.SIHIRLI:
+            raise ValueError("Geçerli bir asistan arşivi değil.")
+        konum = len(cls.SIHIRLI)
+        (surum,) = struct.unpack_from("<H", bellek, konum)
+        if surum > cls.BICIM_SURUMU:
+            raise ValueError(f"Arşiv biçim sürümü {surum} desteklenmiyor (en fazla {cls.BICIM_SURUMU}).")
+        konum += 2
+        while konum < len(bellek):
+            (ad_uzunlugu,) = struct.unpack_from("<H", bellek, konum)
+            ad = bytes(bellek[konum + 2:konum + 2 + ad_uzunlugu]).decode("utf-8")
+            konum += 2 + ad_uzunlugu
+            (uzunluk,) = struct.unpack_from("<Q", bellek, konum)
+            konum += 8
+            if konum + uzunluk > len(bellek):
+                raise ValueError("Arşiv eksik ya da bozuk.")
+            yield ad, tampon.slice(konum, uzunluk)
+            konum += uzunluk
+
+    @staticmethod
+    def _python_listesi(sutun) -> list:
+        """Arrow sütununu Python listesine çevirir (uygun sütunlarda numpy üzerinden)"""
+        import pyarrow as pa
+        sutun = sutun.combine_chunks() if isinstance(sutun, pa.ChunkedArray) else sutun
+        if sutun.null_count:
+            return sutun.to_pylist()
+        if pa.types.is_dictionary(sutun.type):
+            sozluk = sutun.dictionary.to_pylist()
+            return [sozluk[i] for i in sutun.indices.to_numpy().tolist()]
+        if pa.types.is_timestamp(sutun.type):
+            return sutun.to_numpy(zero_copy_only=False).astype("datetime64[us]").tolist()
+        if pa.types.is_date32(sutun.type):
+            return sutun.to_numpy(zero_copy_only=False).astype("datetime64[D]").tolist()
+        if pa.types.is_list(sutun.type):
+            degerler = DurumArsivi._python_listesi(sutun.flatten())
+            konumlar = (sutun.offsets.to_numpy() - sutun.offsets[0].as_py()).tolist()
+            # Demet olarak döner (veri sınıfları demet tutar); boş listeler tek () nesnesini paylaşır
+            return [tuple(degerler[bas:son]) if son > bas else () for bas, son in zip(konumlar, konumlar[1:])]
+        return sutun.to_pylist()
+
+    @classmethod
+    def ice_aktar(cls, asistan, kaynak, kullanici_adi: str = None) -> Dict[str, int]:
+        """kaynak'taki (yol ya da bayt) durumu asistana yükler; kullanici_adi verilirse kayıtlar ona aktarılır"""
+        import itertools
+        import struct
+        import pyarrow as pa
+
+        tampon = pa.memory_map(kaynak).read_buffer() if isinstance(kaynak, str) else pa.py_buffer(kaynak)
+        try:
+            with izleyici().span("arsiv.ice_aktar"):
+                meta, tablolar = None, {}
+                for ad, parca in cls._cerceveler(tampon):
+                    if ad == "meta":
+                        meta = json.loads(parca.to_pybytes().decode("utf-8"))
+                    else:
+                        tablolar[ad] = pa.ipc.open_stream(parca).read_all()
+                        # Arrow IPC okuması ofset/sözlük indekslerini denetlemez; bozuk tampon dönüşümde süreci çökertir
+                        tablolar[ad].validate(full=True)
+                if meta is None:
+                    raise ValueError("Arşivde meta bilgisi yok.")
+                kullanici = (lambda k: kullanici_adi) if kullanici_adi else (lambda k: k)
+
+                def sutunlar(ad):
+                    tablo = tablolar.get(ad)
+                    if tablo is None or not tablo.num_rows:
+                        return 0, []
+                    return tablo.num_rows, [cls._python_listesi(tablo.column(i)) for i in range(tablo.num_columns)]
+
+                sayilar = {}
+                analitik = OgrenmeAnalitigi(depo=asistan.ogrenme_analitigi.depo,
+                                            oneri_onbellegi=asistan.ogrenme_analitigi.oneri_onbellegi)
+                analitik.depo_kimlikleri = dict(asistan.ogrenme_analitigi.depo_kimlikleri)
+                sayilar["calisma_kayitlari"], s = sutunlar("calisma_kayitlari")
+                if s:
+                    kayitlar = [CalismaKaydi(*satir) for satir in zip(*s[1:])]
+                    # Satırlar kullanıcıya göre gruplu yazıldı; her grup tek dilimle eklenir
+                    bas = 0
+                    for k, grup in itertools.groupby(s[0]):
+                        adet = sum(1 for _ in grup)
+                        analitik.calisma_kayitlari.setdefault(kullanici(k), []).extend(kayitlar[bas:bas + adet])
+                        bas += adet
+                sayilar["konu_tekrarlari"], s = sutunlar("konu_tekrarlari")
+                for k, ders, konu, tekrar, aralik, kolaylik, son_tekrar, vade, surum in zip(*s):
+                    analitik.konu_tekrari.durum_yukle(kullanici(k), {
+                        "ders": ders, "konu": konu, "tekrar": tekrar, "aralik": aralik, "kolaylik": kolaylik,
+                        "son_tekrar": son_tekrar, "vade": vade, "surum": surum})
+
+                hedef_takip = HedefTakipSistemi()
+                sonraki_id = meta.get("sonraki_hedef_id", {})
+                sayilar["hedefler"], s = sutunlar("hedefler")
+                for k, hid, metin, kategori, olusturma, bitis, tamamlandi, ilerleme, tamamlanma in zip(*s):
+                    hedef_takip.hedef_yukle(kullanici(k), Hedef(hid, metin, kategori, olusturma, bitis, tamamlandi,
+                                                                ilerleme, tamamlanma), sonraki_id.get(k, 0))
+
+                sayilar["dersler"], s = sutunlar("dersler")
+                dersler = [{"adi": adi, "zorluk": zorluk, "eklenme_tarihi": eklenme} for adi, zorluk, eklenme in zip(*s)]
+                sayilar["chat_gecmisi"], s = sutunlar("chat_gecmisi")
+                chat_gecmisi = [SohbetTuru(mesaj, cevap, zaman) for mesaj, cevap, zaman in zip(*s[1:])]
+
+                plan = meta.get("calisma_plani") or {}
+                if plan.get("gunler"):
+                    plan["gunler"] = [dict(g, tarih=datetime.date.fromisoformat(g["tarih"])) for g in plan["gunler"]]
+
+                # Hepsi okunup kurulduktan sonra değiştir: bozuk arşiv yarım yüklenmiş durum bırakmaz
+                asistan.ogrenme_analitigi = analitik
+                asistan.hedef_takip = hedef_takip
+                asistan.dersler = dersler
+                asistan.chat_gecmisi = chat_gecmisi
+                asistan.haftalik_plan = meta.get("haftalik_plan") or {}
+                asistan.calisma_plani = plan
+        except (struct.error, pa.ArrowException, OSError, UnicodeDecodeError, KeyError, TypeError) as e:
+            # Kesik ya da değiştirilmiş dosya: çağıranlar sadece ValueError yakalar
+            raise ValueError(f"Arşiv eksik ya da bozuk ({type(e).__name__}).") from e
+        return sayilar
+
+
 # ==================== ANA UYGULAMA SINIFI ====================
 class AkilliOgrenciAsistani:
     def __init__(self):
         self.kullanici_adi = ""
         self.dersler = []
         self.haftalik_plan = {}
-        self.chat_gecmisi = []
+        self.calisma_plani = {}  # CalismaPlanlayici.planla çıktısı (çok haftalı, tarihli)
+        self.chat_gecmisi = []  # [SohbetTuru, ...] (en fazla SOHBET_GECMISI_AZAMI)
         self.api_anahtari = ""
         self.motivasyon_sistemi = MotivasyonSistemi()
         self.pdf_isleyici = PDFIsleyici()
         self.web_analiz = WebAnaliz()
         self.hedef_takip = HedefTakipSistemi()
-        self.ogrenme_analitigi = OgrenmeAnalitigi()
+        self.ogrenme_analitigi = OgrenmeAnalitigi(depo=calisma_deposu(), oneri_onbellegi=oneri_onbellegi())
         self.rag_isleyici = RAGIsleyici() # <--- YENİ EKLENDİ
 
-    def gemini_ayarla(self, api_anahtari: str):
-        self.api_anahtari = api_anahtari
-        genai.configure(api_key=api_anahtari)
-        self.rag_isleyici.ayarla(api_anahtari) # <--- YENİ EKLENDİ
+    def kullanici_ayarla(self, kullanici_adi: str, api_anahtari: str = ""):
+        """Oturumun öğrencisini ayarlar; doğrulanmış API anahtarı verilirse depodaki kayıtları yüklenir."""
+        self.kullanici_adi = kullanici_adi
+        analitik = self.ogrenme_analitigi
+        if analitik.depo is None or not kullanici_adi or not api_anahtari:
+            return
+        analitik.depo_kimlikleri[kullanici_adi] = depo_kimligi(kullanici_adi, api_anahtari)
+        if kullanici_adi not in analitik.calisma_kayitlari:
+            analitik.depodan_yukle(analitik.depo, kullanici_adi)
+
+    def gemini_ayarla(self, api_anahtari: str):
+        import google.generativeai as genai
+        self.api_anahtari = api_anahtari
+        genai.configure(api_key=api_anahtari)
+        self.rag_isleyici.ayarla(api_anahtari) # <--- YENİ EKLENDİ
+
+    def ders_ekle(self, ders_adi: str, zorluk_seviyesi: str = "orta"):
+        self.dersler.append({"adi": ders_adi, "zorluk": zorluk_seviyesi, "eklenme_tarihi": datetime.datetime.now()})
+
+    def _ders_son_tarihleri(self) -> Dict[str, datetime.date]:
+        """Metninde ders adı geçen aktif hedeflerin en yakın bitiş tarihi (ör. "Fizik vizesine hazırlan")."""
+        son_tarihler = {}
+        for hedef in self.hedef_takip.aktif_hedefler(self.kullanici_adi):
+            metin = hedef.metin.lower()
+            for ders in self.dersler:
+                ad = ders["adi"]
+                if ad.lower() in metin and (ad not in son_tarihler or hedef.bitis_tarihi < son_tarihler[ad]):
+                    son_tarihler[ad] = hedef.bitis_tarihi
+        return son_tarihler
+
+    def haftalik_plan_olustur(self, gunluk_saat: List[float] = None, hafta_sayisi: int = 1) -> Dict[str, Any]:
+        if not self.dersler:
+            return {"hata": "Önce ders ekleyiniz."}
+        son_calisma = {d["adi"]: self.ogrenme_analitigi.son_calisma_zamani(self.kullanici_adi, d["adi"]) for d in self.dersler}
+        self.calisma_plani = CalismaPlanlayici(gunluk_saat).planla(
+            self.dersler, datetime.datetime.now().date(), hafta_sayisi, son_calisma, self._ders_son_tarihleri())
+        # İlk hafta gün adına göre (bugünden başlayarak); boş günler planda yer almaz
+        plan = {}
+        for gun in self.calisma_plani["gunler"][:7]:
+            if not gun["bloklar"]:
+                continue
+            ana = gun["bloklar"][0]
+            plan[gun["gun"]] = {"ders": ", ".join(b["ders"] for b in gun["bloklar"]),
+                                "sure": f"{sum(b['sure'] for b in gun['bloklar']):g} saat",
+                                "konu": f"{ana['ders']} temel konular", "zorluk": ana["zorluk"], "bloklar": gun["bloklar"]}
+        self.haftalik_plan = plan
+        return plan
+
+    def bugun_ne_calismali(self) -> str:
+        tekrarlar = self.ogrenme_analitigi.konu_tekrari.bugun_tekrar_edilecekler(self.kullanici_adi, k=3)
+        tekrar_metni = ""
+        if tekrarlar:
+            tekrar_metni = "\n\n🔁 **Tekrar zamanı gelen konular:**" + "".join(
+                f"\n• {t['konu']} ({t['ders']})" + (f" — {t['gecikme_gun']} gün gecikti" if t["gecikme_gun"] else "")
+                for t in tekrarlar)
+        if not self.haftalik_plan:
+            return f"🎯 **Bugün için önerim:**{tekrar_metni}" if tekrarlar else "Önce haftalık plan oluşturunuz."
+        bugun_gun = GUNLER[datetime.datetime.now().weekday()]
+        if bugun_gun in self.haftalik_plan:
+            plan = self.haftalik_plan[bugun_gun]
+            # Plandaki ana dersin vadesi gelmiş bir konusu varsa genel "temel konular" yerine o önerilir
+            konu = next((t["konu"] for t in tekrarlar if t["ders"].lower() == plan["bloklar"][0]["ders"].lower()), plan["konu"])
+            return f"🎯 **Bugün ({bugun_gun}) için önerim:**\n\n• **Ders:** {plan['ders']}\n• **Süre:** {plan['sure']}\n• **Konu:** {konu}\n• **Zorluk:** {plan['zorluk']}{tekrar_metni}"
+        return "Bugün için planlanmış ders bulunmuyor. Dinlenme günü! 😊" + tekrar_metni
+
+    SOHBET_GECMISI_AZAMI = 100
+
+    def chat_gecmisi_kaydet(self, mesaj: str, cevap: str):
+        self.chat_gecmisi.append(SohbetTuru(mesaj, cevap, datetime.datetime.now()))
+        del self.chat_gecmisi[:-self.SOHBET_GECMISI_AZAMI]
+
+    def gemini_sohbet(self, mesaj: str) -> str:
+        if not self.api_anahtari:
+            return "Lütfen önce API anahtarınızı giriniz."
+        try:
+            def uret(gecmis):
+                context = "\n".join([f"Kullanıcı: {chat.mesaj}\nAsistan: {chat.cevap}" for chat in gecmis])
+                prompt = f"Sen bir akıllı öğrenci asistanısın. Samimi, arkadaşça, eğlenceli, komik ve motive edici bir dil kullan.\n{context}\nKullanıcı: {mesaj}\nAsistan:"
+                return gemini_uret(self.api_anahtari, prompt, "sohbet")
+            onbellek = sohbet_onbellegi()
+            if onbellek is None:
+                return uret(self.chat_gecmisi[-5:])
+            return onbellek.cevapla(mesaj, lambda: uret(self.chat_gecmisi[-5:]), lambda: uret([]))
+        except Exception as e:
+            return f"Sohbet hatası: {str(e)}"
+
+# ==================== OTURUM YÖNETİCİSİ ====================
+# Bu süre boyunca dokunulmayan oturumun durumu diske alınır (saniye)
+OTURUM_BOSTA_SN = float(os.environ.get("ASISTAN_OTURUM_BOSTA_SN", "1800"))
+# Bellekteki oturumların tahmini toplam boyutu için üst sınır (MB, 0: sınırsız)
+OTURUM_BELLEK_MB = float(os.environ.get("ASISTAN_OTURUM_BELLEK_MB", "512"))
+# Diske alınmış ama bu süre boyunca geri istenmemiş oturum silinir (saniye)
+OTURUM_DISK_TTL_SN = float(os.environ.get("ASISTAN_OTURUM_DISK_TTL_SN", "86400"))
+
+
+class _Oturum:
+    __slots__ = ("asistan", "kullanici_adi", "api_anahtari", "son_erisim", "boyut", "kullanimda", "surum",
+                 "tasiniyor", "hedef_takip", "kilit")
+
+    def __init__(self, asistan):
+        self.asistan = asistan
+        self.kullanici_adi = asistan.kullanici_adi
+        self.api_anahtari = asistan.api_anahtari
+        self.son_erisim = time.monotonic()
+        self.boyut = 0
+        self.kullanimda = 0
+        self.surum = 0  # Her kullan()'da artar; yazılırken dokunulan oturum diske alınmaz
+        self.tasiniyor = False
+        self.hedef_takip = None  # Diskteyken hatırlatmalar sürsün diye hedef sistemi bellekte kalır
+        self.kilit = threading.Lock()  # Aynı oturumun geri yüklenmesi tek seferde
+
+
+class OturumYoneticisi:
+    """Asistan nesnelerini oturum kimliğiyle tutar; boşta kalan ya da tavanı aşan oturumları diske alır"""
+    # Boyut tahmini için yaklaşık nesne maliyetleri (bayt); tahminin tracemalloc'a oranı
+    # benchmarks/oturum_yoneticisi.py ile ölçülür
+    KAYIT_BAYT = 300
+    TEKRAR_BAYT = 400
+    HEDEF_BAYT = 400
+    TABAN_BAYT = 16 * 1024
+    # İstek gelmese de boşta oturumlar bu aralıkla kontrol edilir (saniye)
+    BAKIM_ARALIGI_SN = 60
+
+    class YuklemeHatasi(Exception):
+        """Diske alınmış oturum dosyalarından geri kurulamadı (oturum diskte kalır)."""
+
+    def __init__(self, dizin: str, bosta_sn: float = OTURUM_BOSTA_SN, tavan_bayt: int = 0,
+                 disk_ttl_sn: float = OTURUM_DISK_TTL_SN, izleyici: Izleyici = None, arka_plan: bool = True):
+        import collections
+        self.dizin = dizin
+        self.bosta_sn = bosta_sn
+        self.tavan_bayt = tavan_bayt
+        self.disk_ttl_sn = disk_ttl_sn
+        self.izleyici = izleyici or Izleyici()
+        self.arka_plan = arka_plan
+        self._bellekte = collections.OrderedDict()  # {kimlik: _Oturum}, en eski erişim başta
+        self._diskte = {}  # {kimlik: _Oturum (asistan=None)}
+        self._kilit = threading.RLock()
+        self._bakim_olayi = threading.Event()
+        self._son_kullanilan = None
+        self._bakim_baslatildi = False
+        os.makedirs(dizin, exist_ok=True)
+
+    def _yol(self, kimlik: str, uzanti: str) -> str:
+        return os.path.join(self.dizin, f"{kimlik}.{uzanti}")
+
+    def _dosyalari_sil(self, kimlik: str):
+        for uzanti in ("arsiv", "json", "pdf"):
+            try:
+                os.remove(self._yol(kimlik, uzanti))
+            except FileNotFoundError:
+                pass
+
+    @classmethod
+    def boyut_tahmini(cls, asistan) -> int:
+        """Asistanın bellekteki yaklaşık boyutu; nesne gezmek yerine sayılardan hesaplanır."""
+        analitik = asistan.ogrenme_analitigi
+        return (cls.TABAN_BAYT
+                + cls.KAYIT_BAYT * sum(len(k) for k in analitik.calisma_kayitlari.values())
+                + cls.TEKRAR_BAYT * sum(len(d) for d in analitik.konu_tekrari.durumlar.values())
+                + cls.HEDEF_BAYT * sum(len(h) for h in asistan.hedef_takip.hedefler.values())
+                + sum(len(t.mesaj) + len(t.cevap) for t in asistan.chat_gecmisi)
+                + len(asistan.web_analiz.mevcut_icerik or "")
+                + len(json.dumps(asistan.web_analiz.son_veri or {}, default=str))
+                + len(asistan.pdf_isleyici.mevcut_pdf_bytes or b""))
+
+    def ekle(self, asistan) -> str:
+        """Asistanı yöneticiye verir, session_state'te saklanacak kimliği döner."""
+        import uuid
+        kimlik = uuid.uuid4().hex
+        oturum = _Oturum(asistan)
+        oturum.boyut = self.boyut_tahmini(asistan)
+        with self._kilit:
+            self._bellekte[kimlik] = oturum
+        return kimlik
+
+    def var_mi(self, kimlik: str) -> bool:
+        with self._kilit:
+            return kimlik in self._bellekte or kimlik in self._diskte
+
+    @contextmanager
+    def kullan(self, kimlik: str):
+        """Oturumun asistanını verir (diskteyse yeniden kurar); blok süresince oturum diske alınmaz"""
+        with self._kilit:
+            oturum = self._bellekte.get(kimlik) or self._diskte.get(kimlik)
+            if oturum is None:
+                raise KeyError(kimlik)
+            oturum.son_erisim = time.monotonic()
+            oturum.kullanimda += 1
+            oturum.surum += 1
+        try:
+            if oturum.asistan is None:
+                with oturum.kilit:
+                    if oturum.asistan is None:
+                        self._geri_yukle(kimlik, oturum)
+            with self._kilit:
+                if kimlik in self._bellekte:
+                    self._bellekte.move_to_end(kimlik)
+            yield oturum.asistan
+        finally:
+            asistan = oturum.asistan
+            boyut = self.boyut_tahmini(asistan) if asistan is not None else oturum.boyut
+            with self._kilit:
+                oturum.kullanimda -= 1
+                oturum.boyut = boyut
+                if asistan is not None:
+                    oturum.kullanici_adi = asistan.kullanici_adi
+                    oturum.api_anahtari = asistan.api_anahtari
+            self._bakim_iste(kimlik)
+
+    def birak(self, kimlik: str):
+        """Oturumu (çıkışta) bellekten ve diskten siler."""
+        with self._kilit:
+            self._bellekte.pop(kimlik, None)
+            self._diskte.pop(kimlik, None)
+        self._dosyalari_sil(kimlik)
+
+    def _bakim_iste(self, son_kullanilan: str):
+        self._son_kullanilan = son_kullanilan
+        if not self.arka_plan:
+            self.bakim(haric=son_kullanilan)
+            return
+        with self._kilit:
+            if not self._bakim_baslatildi:
+                self._bakim_baslatildi = True
+                threading.Thread(target=self._bakim_dongusu, name="oturum-bakimi", daemon=True).start()
+        self._bakim_olayi.set()
+
+    def _bakim_dongusu(self):
+        while True:
+            self._bakim_olayi.wait(self.BAKIM_ARALIGI_SN)
+            self._bakim_olayi.clear()
+            try:
+                self.bakim(haric=self._son_kullanilan)
+            except Exception:
+                self.izleyici.sayac("oturum.bakim_hatasi")
+
+    def bakim(self, simdi: float = None, haric: str = None):
+        """Boşta kalan, ardından tavan aşılıyorsa en büyük oturumları (haric dışında) diske alır"""
+        simdi = time.monotonic() if simdi is None else simdi
+        with self._kilit:
+            uygun = {k: o for k, o in self._bellekte.items() if not o.kullanimda and not o.tasiniyor}
+            secilen = [(k, "bosta") for k, o in uygun.items() if simdi - o.son_erisim >= self.bosta_sn]
+            if self.tavan_bayt:
+                toplam = sum(o.boyut for o in self._bellekte.values()) - sum(uygun[k].boyut for k, _ in secilen)
+                bosta = {k for k, _ in secilen}
+                # OrderedDict sırası eskiden yeniye; sıralama kararlı olduğu için eşit boyutta eski önce gelir
+                for kimlik in sorted((k for k in uygun if k not in bosta and k != haric), key=lambda k: -uygun[k].boyut):
+                    if toplam <= self.tavan_bayt:
+                        break
+                    toplam -= uygun[kimlik].boyut
+                    secilen.append((kimlik, "tavan"))
+            islenecek = [(k, uygun[k], uygun[k].surum, neden) for k, neden in secilen]
+            for _, oturum, _, _ in islenecek:
+                oturum.tasiniyor = True
+            # Tarayıcısı kapanmış oturumların tutamağı da gitmiştir; dosyaları sonsuza dek tutulmaz
+            suresi_dolan = [k for k, o in self._diskte.items()
+                            if not o.kullanimda and simdi - o.son_erisim >= self.disk_ttl_sn]
+        for kimlik, oturum, surum, neden in islenecek:
+            self._diske_al(kimlik, oturum, surum, neden)
+        for kimlik in suresi_dolan:
+            self.birak(kimlik)
+            self.izleyici.sayac("oturum.suresi_dolan")
+
+    def _diske_al(self, kimlik: str, oturum: _Oturum, surum: int, neden: str):
+        asistan = oturum.asistan
+        with self.izleyici.span("oturum.diske_al"):
+            try:
+                DurumArsivi.disa_aktar(asistan, self._yol(kimlik, "arsiv"))
+                web = asistan.web_analiz
+                son_veri = dict(web.son_veri) if web.son_veri else None
+                if son_veri and isinstance(son_veri.get("alınma_tarihi"), datetime.datetime):
+                    son_veri["alınma_tarihi"] = son_veri["alınma_tarihi"].isoformat()
+                with open(self._yol(kimlik, "json"), "w", encoding="utf-8") as f:
+                    json.dump({"web": {"son_veri": son_veri, "mevcut_url": web.mevcut_url,
+                                       "mevcut_icerik": web.mevcut_icerik}}, f, ensure_ascii=False)
+                if asistan.pdf_isleyici.mevcut_pdf_bytes:
+                    with open(self._yol(kimlik, "pdf"), "wb") as f:
+                        f.write(asistan.pdf_isleyici.mevcut_pdf_bytes)
+                yazildi = True
+            except Exception:
+                # Yazılamayan oturum bellekte kalır; veri kaybı yerine tavanın aşılması tercih edilir
+                self.izleyici.sayac("oturum.diske_alma_hatasi")
+                yazildi = False
+        with self._kilit:
+            oturum.tasiniyor = False
+            # Yazarken kullanılan (değişmiş olabilir) ya da çıkış yapılmış oturum bellekte kalır
+            if yazildi and not oturum.kullanimda and oturum.surum == surum and self._bellekte.get(kimlik) is oturum:
+                del self._bellekte[kimlik]
+                oturum.hedef_takip = asistan.hedef_takip
+                oturum.asistan = None
+                self._diskte[kimlik] = oturum
+                self.izleyici.sayac(f"oturum.diske_alinan.{neden}")
+                self.izleyici.sayac("oturum.diske_alinan_bayt", oturum.boyut)
+                return
+        if yazildi:
+            self.izleyici.sayac("oturum.diske_alma_iptal")
+        self._dosyalari_sil(kimlik)
+
+    def _geri_yukle(self, kimlik: str, oturum: _Oturum):
+        """Dosyalardan asistanı kurar; oturum ancak kurulum başarılıysa diskten belleğe geçer."""
+        try:
+            with self.izleyici.span("oturum.geri_yukle"):
+                asistan = AkilliOgrenciAsistani()
+                if oturum.api_anahtari:
+                    asistan.gemini_ayarla(oturum.api_anahtari)
+                DurumArsivi.ice_aktar(asistan, self._yol(kimlik, "arsiv"))
+                # Kayıtlar arşivden geldi; sadece depo kimliği yeniden bağlanır
+                asistan.kullanici_ayarla(oturum.kullanici_adi, oturum.api_anahtari)
+                with open(self._yol(kimlik, "json"), encoding="utf-8") as f:
+                    web = json.load(f)["web"]
+                son_veri = web["son_veri"]
+                if son_veri and son_veri.get("alınma_tarihi"):
+                    son_veri["alınma_tarihi"] = datetime.datetime.fromisoformat(son_veri["alınma_tarihi"])
+                asistan.web_analiz.son_veri = son_veri
+                asistan.web_analiz.mevcut_url = web["mevcut_url"]
+                asistan.web_analiz.mevcut_icerik = web["mevcut_icerik"]
+                if os.path.exists(self._yol(kimlik, "pdf")):
+                    with open(self._yol(kimlik, "pdf"), "rb") as f:
+                        asistan.pdf_isleyici.mevcut_pdf_bytes = f.read()
+        except Exception as e:
+            self.izleyici.sayac("oturum.geri_yukleme_hatasi")
+            raise self.YuklemeHatasi(f"Oturum {kimlik} geri yüklenemedi: {e}") from e
+        if oturum.hedef_takip is not None:
+            # Diskteyken hatırlatmalar için tutulan (ve arşivdekiyle aynı) hedef sistemi sürer
+            asistan.hedef_takip = oturum.hedef_takip
+        with self._kilit:
+            oturum.asistan = asistan
+            oturum.hedef_takip = None
+            if self._diskte.get(kimlik) is oturum:
+                del self._diskte[kimlik]
+                self._bellekte[kimlik] = oturum
+        self._dosyalari_sil(kimlik)
+        self.izleyici.sayac("oturum.geri_yuklenen")
+
+    def istatistik(self) -> Dict[str, Any]:
+        with self._kilit:
+            return {"bellekte": len(self._bellekte), "diskte": len(self._diskte),
+                    "bellekte_bayt": sum(o.boyut for o in self._bellekte.values()),
+                    "tavan_bayt": self.tavan_bayt}
+
+
+@st.cache_resource(show_spinner=False)
+def oturum_yoneticisi() -> OturumYoneticisi:
+    """Süreç genelinde paylaşılan oturum yöneticisi (ASISTAN_OTURUM_* ayarlarıyla)"""
+    import shutil
+    import tempfile
+    kok = os.path.join(VERI_DIZINI, "oturumlar") if VERI_DIZINI else None
+    if kok:
+        os.makedirs(kok, exist_ok=True)
+        # Kapanmış süreçlerin dizinleri: oturumları (ve tutamakları) o süreçle birlikte gitti
+        for ad in os.listdir(kok):
+            yol = os.path.join(kok, ad)
+            if time.time() - os.path.getmtime(yol) > OTURUM_DISK_TTL_SN:
+                shutil.rmtree(yol, ignore_errors=True)
+    dizin = tempfile.mkdtemp(prefix="surec_", dir=kok)
+    return OturumYoneticisi(dizin, OTURUM_BOSTA_SN, int(OTURUM_BELLEK_MB * 1024 * 1024), OTURUM_DISK_TTL_SN,
+                            izleyici=izleyici())
+
+# ==================== RERUN ZAMANLAYICI ====================
+class RerunZamanlayici:
+    """Bir rerun içindeki bölümlerin (stil, sidebar, sekme) sürelerini ölçer."""
+
+    def __init__(self):
+        self.baslangic = time.perf_counter()
+        self.olcumler = {}  # {bolum: saniye}
+
+    @contextmanager
+    def olc(self, bolum: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            sure = time.perf_counter() - t0
+            self.olcumler[bolum] = self.olcumler.get(bolum, 0.0) + sure
+            izleyici().gozlem(f"arayuz.{bolum}", sure * 1000)
+
+    def toplam(self) -> float:
+        return time.perf_counter() - self.baslangic
+
+    def kaydet(self, aktif_sekme: str):
+        """Bu rerun'ın toplam süresini sekme bazlı geçmişe ekler (son 20 rerun)."""
+        gecmis = st.session_state.setdefault("rerun_sure_gecmisi", {})
+        sureler = gecmis.setdefault(aktif_sekme, [])
+        sureler.append(self.toplam())
+        del sureler[:-20]
+
+    def goster(self):
+        """Sidebar'da son rerun'ın süre dökümünü ve sekme bazlı ortalamaları gösterir."""
+        with st.expander("⏱️ Rerun Süreleri", expanded=False):
+            for bolum, sure in self.olcumler.items():
+                st.caption(f"{bolum}: {sure * 1000:.1f} ms")
+            st.caption(f"**Toplam:** {self.toplam() * 1000:.1f} ms")
+            gecmis = st.session_state.get("rerun_sure_gecmisi", {})
+            if gecmis:
+                st.markdown("###### Sekme bazlı ortalama")
+                for sekme, sureler in gecmis.items():
+                    st.caption(f"{sekme}: {sum(sureler) / len(sureler) * 1000:.1f} ms ({len(sureler)} rerun)")
+
+# ==================== STATİK STİLLER VE HTML ŞABLONLARI ====================
+# Büyük CSS blokları static/ klasöründen sunulur (.streamlit/config.toml: enableStaticServing).
+# Her rerun'da kilobaytlarca <style> göndermek yerine sadece <link> etiketi gider;
+# dosyanın kendisi tarayıcıda önbelleklenir.
+STATIK_DIZIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+@st.cache_data(show_spinner=False)
+def _statik_surum(dosya: str) -> str:
+    """Dosya içeriğinin kısa özeti; içerik değişince tarayıcı önbelleğini geçersiz kılar."""
+    with open(os.path.join(STATIK_DIZIN, dosya), "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:10]
+
+
+def _stil_baglantisi(*dosyalar: str) -> str:
+    return "".join(f'<link rel="stylesheet" href="app/static/{d}?v={_statik_surum(d)}">' for d in dosyalar)
+
+
+_CIKIS_HTML_SABLONU = """{stil}
+    
+    <div class="logout-overlay">
+        <div class="robot-container">
+            <svg viewBox="0 0 100 100">
+                <path class="robot-path" d="M 20 40 Q 15 40, 15 45 V 85 Q 15 90, 20 90 H 80 Q 85 90, 85 85 V 45 Q 85 40, 80 40 H 20" />
+                <circle class="robot-feature" cx="35" cy="60" r="7" />
+                <circle class="robot-feature" cx="65" cy="60" r="7" />
+                <path class="robot-path robot-mouth-sad" d="M 35 82 Q 50 70, 65 82" />
+                <g id="waving-antenna">
+                    <path class="robot-path" d="M 50 40 V 20" />
+                    <circle class="robot-feature" cx="50" cy="15" r="5" />
+                </g>
+            </svg>
+        </div>
+        <div class="logout-text">GÜLE GÜLE, {kullanici_adi}!</div>
+    </div>
+"""
+
+_BASARI_ANIMASYONU_SABLONU = '<div class="success-animation-overlay"><div class="icon-container"><span class="icon">{icon}</span></div></div>'
 
-    def ders_ekle(self, ders_adi: str, zorluk_seviyesi: str = "orta"):
-        self.dersler.append({"adi": ders_adi, "zorluk": zorluk_seviyesi, "eklenme_tarihi": datetime.datetime.now()})
+_METRIK_KARTI_SABLONU = (
+    '<div class="metric-card">'
+    '<div class="metric-card-icon" style="background: linear-gradient(135deg, {color} 0%, {color}99 100%);"><i class="bi {icon}"></i></div>'
+    '<div class="metric-card-content"><h3>{value}</h3><p>{title}</p></div>'
+    '</div>'
+)
 
-    def haftalik_plan_olustur(self) -> Dict[str, Any]:
-        if not self.dersler:
-            return {"hata": "Önce ders ekleyiniz."}
-        plan = {}
-        gunler = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
-        for i, gun in enumerate(gunler):
-            ders_index = i % len(self.dersler)
-            plan[gun] = {"ders": self.dersler[ders_index]["adi"], "sure": "2 saat", "konu": f"{self.dersler[ders_index]['adi']} temel konular", "zorluk": self.dersler[ders_index]["zorluk"]}
-        self.haftalik_plan = plan
-        return plan
 
-    def bugun_ne_calismali(self) -> str:
-        if not self.haftalik_plan:
-            return "Önce haftalık plan oluşturunuz."
-        gunler = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
-        bugun_index = datetime.datetime.now().weekday()
-        bugun_gun = gunler[bugun_index]
-        if bugun_gun in self.haftalik_plan:
-            plan = self.haftalik_plan[bugun_gun]
-            return f"🎯 **Bugün ({bugun_gun}) için önerim:**\n\n• **Ders:** {plan['ders']}\n• **Süre:** {plan['sure']}\n• **Konu:** {plan['konu']}\n• **Zorluk:** {plan['zorluk']}"
-        return "Bugün için planlanmış ders bulunmuyor. Dinlenme günü! 😊"
+@st.cache_data(show_spinner=False)
+def create_animated_title(line1, line2):
+    """Giriş ekranındaki harf harf düşen başlık; girdiler sabit olduğu için bir kez üretilir."""
+    html = '<div class="hero-text">'
+    html += '<div class="line">'
+    
+    # Kelimeleri boşluğa göre ayır
+    words = line1.split(' ')
+    char_count = 0
+    
+    for word_index, word in enumerate(words):
+        # Kelimenin harflerini animasyonlu ekle
+        for i, char in enumerate(word):
+            delay = (char_count + i) * 0.06
+            html += f'<span class="letter" style="animation-delay: {delay:g}s;">{char}</span>'
+        
+        char_count += len(word)
+        
+        # Kelimeler arasına animasyonlu bir boşluk ekle (&nbsp; kullanarak)
+        if word_index < len(words) - 1:
+            delay = char_count * 0.06
+            # CSS'de inline-block olduğu için çökmemesi için &nbsp; kullanıyoruz
+            html += f'<span class="letter" style="animation-delay: {delay:g}s;">&nbsp;</span>'
+            char_count += 1 # Boşluk karakterini de say
+    
+    html += '</div>'
+    html += '<div class="line">'
+    # base_delay'i toplam karakter sayısına (boşluk dahil) göre ayarla
+    base_delay = char_count * 0.06
+    for i, char in enumerate(line2):
+        delay = base_delay + (i * 0.06)
+        html += f'<span class="letter" style="animation-delay: {delay:g}s;">{char}</span>'
+    html += '</div>'
+    html += '</div>'
+    return html
 
-    def chat_gecmisi_kaydet(self, kullanici: str, mesaj: str, cevap: str):
-        self.chat_gecmisi.append({"kullanici": kullanici, "mesaj": mesaj, "cevap": cevap, "zaman": datetime.datetime.now()})
-        if len(self.chat_gecmisi) > 100:
-            self.chat_gecmisi = self.chat_gecmisi[-100:]
+# ==================== API ANAHTARI DOĞRULAMA ====================
+def _gemini_modelleri_listele(api_anahtari: str):
+    """Anahtar geçersizse hata fırlatır (model listesinin ilk elemanını çekmek yeterli)."""
+    import google.generativeai as genai
+    genai.configure(api_key=api_anahtari)
+    next(genai.list_models())
+
+
+class AnahtarDogrulamaOnbellegi:
+    """API anahtarı doğrulama sonuçlarını anahtarın özetiyle TTL'li saklar"""
+
+    def __init__(self, basarili_ttl: float = 600, basarisiz_ttl: float = 60, model_listeleyici=None,
+                 izleyici: Izleyici = None):
+        self.basarili_ttl = basarili_ttl
+        self.basarisiz_ttl = basarisiz_ttl
+        self.model_listeleyici = model_listeleyici or _gemini_modelleri_listele
+        self.izleyici = izleyici or Izleyici()
+        self.isabet = 0
+        self.iskalama = 0
+        self._kayitlar = {}  # {anahtar_ozeti: (gecerli_mi, zaman)}
+        self._kilit = threading.Lock()
+
+    def dogrula(self, api_anahtari: str) -> bool:
+        if not api_anahtari:
+            return False
+        ozet = hashlib.sha256(api_anahtari.encode("utf-8")).hexdigest()
+        simdi = time.monotonic()
+        with self._kilit:
+            kayit = self._kayitlar.get(ozet)
+            if kayit and simdi - kayit[1] < (self.basarili_ttl if kayit[0] else self.basarisiz_ttl):
+                self.isabet += 1
+                self.izleyici.sayac("onbellek.anahtar_dogrulama.isabet")
+                return kayit[0]
+            self.iskalama += 1
+        self.izleyici.sayac("onbellek.anahtar_dogrulama.iskalama")
 
-    def gemini_sohbet(self, mesaj: str) -> str:
-        if not self.api_anahtari:
-            return "Lütfen önce API anahtarınızı giriniz."
         try:
-            genai.configure(api_key=self.api_anahtari)
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            context = "\n".join([f"Kullanıcı: {chat['mesaj']}\nAsistan: {chat['cevap']}" for chat in self.chat_gecmisi[-5:]])
-            prompt = f"Sen bir akıllı öğrenci asistanısın. Samimi, arkadaşça, eğlenceli, komik ve motive edici bir dil kullan.\n{context}\nKullanıcı: {mesaj}\nAsistan:"
-            response = model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Sohbet hatası: {str(e)}"
+            self.model_listeleyici(api_anahtari)
+            gecerli = True
+        except Exception:
+            gecerli = False
+
+        with self._kilit:
+            self._kayitlar[ozet] = (gecerli, time.monotonic())
+        return gecerli
+
+
+@st.cache_resource(show_spinner=False)
+def anahtar_dogrulama_onbellegi() -> AnahtarDogrulamaOnbellegi:
+    """Süreç genelinde paylaşılan doğrulama önbelleği."""
+    return AnahtarDogrulamaOnbellegi(izleyici=izleyici())
+
+
+def _dogrulama_overlay_html(auth_status: str) -> str:
+    """Robot animasyonlu doğrulama katmanı"""
+    bitti = " bitti" if auth_status else ""
+    # Giriş başarılıysa katman ana uygulamanın üstünde oynar; sidebar'ı arkada bırak
+    sidebar_css = '[data-testid="stSidebar"] { z-index: 0 !important; }' if auth_status == "success" else ""
+    return f"""
+    {_stil_baglantisi("dogrulama.css")}<style>{sidebar_css}</style>
+    <div class="loading-overlay{bitti}">
+        <div class="loading-robot-container {auth_status}">
+            <svg viewBox="0 0 100 100">
+                <path class="robot-path robot-draw" d="M 20 40 Q 15 40, 15 45 V 85 Q 15 90, 20 90 H 80 Q 85 90, 85 85 V 45 Q 85 40, 80 40 H 20" />
+                <path class="robot-path robot-draw" d="M 50 40 V 20" />
+                <path class="robot-path robot-mouth-straight" d="M 35 78 H 65" />
+                <path class="robot-path robot-mouth-smile" d="M 35 78 Q 50 90, 65 78" />
+                <path class="robot-path robot-mouth-sad" d="M 35 82 Q 50 70, 65 82" />
+                <circle class="robot-feature" cx="50" cy="15" r="5" />
+                <circle class="robot-feature" cx="35" cy="60" r="7" />
+                <circle class="robot-feature" cx="65" cy="60" r="7" />
+            </svg>
+        </div>
+        <div class="loading-text">DOĞRULANIYOR...</div>
+    </div>
+    """
 
 # ==================== GİRİŞ EKRANI ====================
 def show_login_screen():
-    # --- YARDIMCI FONKSİYON ---
-    def create_animated_title(line1, line2):
-        html = '<div class="hero-text">'
-        html += '<div class="line">'
-        
-        # Kelimeleri boşluğa göre ayır
-        words = line1.split(' ')
-        char_count = 0
-        
-        for word_index, word in enumerate(words):
-            # Kelimenin harflerini animasyonlu ekle
-            for i, char in enumerate(word):
-                delay = (char_count + i) * 0.06
-                html += f'<span class="letter" style="animation-delay: {delay}s;">{char}</span>'
-            
-            char_count += len(word)
-            
-            # Kelimeler arasına animasyonlu bir boşluk ekle (&nbsp; kullanarak)
-            if word_index < len(words) - 1:
-                delay = char_count * 0.06
-                # CSS'de inline-block olduğu için çökmemesi için &nbsp; kullanıyoruz
-                html += f'<span class="letter" style="animation-delay: {delay}s;">&nbsp;</span>'
-                char_count += 1 # Boşluk karakterini de say
-        
-        html += '</div>'
-        html += '<div class="line">'
-        # base_delay'i toplam karakter sayısına (boşluk dahil) göre ayarla
-        base_delay = char_count * 0.06
-        for i, char in enumerate(line2):
-            delay = base_delay + (i * 0.06)
-            html += f'<span class="letter" style="animation-delay: {delay}s;">{char}</span>'
-        html += '</div>'
-        html += '</div>'
-        return html
-
-    # --- YÜKLEME ARAYÜZÜNÜN HTML ve CSS KODLARI ---
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@700&family=Inter:wght@400&display=swap');
-    
-    .stApp {
-        background-color: #0a0a0f;
-    }
-    
-    /* YÜKLEME ARAYÜZÜ (OVERLAY) */
-    .loading-overlay {
-        position: fixed; top: 0; left: 0; width: 100vw; height: 100vh;
-        background-color: rgba(10, 10, 15, 0.85); backdrop-filter: blur(5px);
-        z-index: 9999; display: flex; justify-content: center; align-items: center;
-        flex-direction: column; opacity: 0; animation: fadeInOverlay 0.5s ease-out forwards;
-    }
-    @keyframes fadeInOverlay { to { opacity: 1; } }
-    
-    /* ---DUYGUSAL ROBOT ANİMASYONU --- */
-    .loading-robot-container {
-        width: 150px; height: 150px; margin-bottom: 20px;
-    }
-
-    .robot-path {
-        stroke: #a8b8ff; stroke-width: 4; fill: none;
-        stroke-linecap: round; stroke-linejoin: round;
-        filter: drop-shadow(0 0 5px rgba(168, 184, 255, 0.9));
-    }
-    
-    /* Ana çizim animasyonu (kafa, anten, düz ağız) */
-    .robot-draw {
-        stroke-dasharray: 400; stroke-dashoffset: 400;
-        animation: draw 2.5s ease-out forwards;
-    }
-    
-    .robot-feature { /* Gözler ve anten topu */
-        fill: #a8b8ff; stroke: none; opacity: 0;
-        animation: fadeInFeature 0.5s ease-out forwards;
-        animation-delay: 2s;
-    }
-
-    /* Düz ağız: HER ZAMAN çizilir ve sonra kaybolur */
-    .robot-mouth-straight {
-        animation: draw 2.5s ease-out forwards, fadeOut 0.3s ease-in forwards;
-        animation-delay: 0s, 2.8s; /* 2.8s sonra kaybolmaya başla */
-    }
-
-    /* Gülümseyen ve üzgün ağızlar başlangıçta görünmez */
-    .robot-mouth-smile, .robot-mouth-sad {
-        stroke-dasharray: 40; stroke-dashoffset: 40;
-    }
-    
-    /* BAŞARILI DURUM: success sınıfı eklenince bu animasyon tetiklenir */
-    .success .robot-mouth-smile {
-        animation: drawEmotion 1s ease-out forwards;
-        animation-delay: 3s; /* Düz ağız kaybolduktan sonra başla */
-    }
-    
-    /* HATALI DURUM: error sınıfı eklenince bu animasyon tetiklenir */
-    .error .robot-mouth-sad {
-        stroke: #ff6b6b; /* Üzgün ağzın rengini kırmızımsı yapalım */
-        filter: drop-shadow(0 0 5px #ff6b6b);
-        animation: drawEmotion 1s ease-out forwards;
-        animation-delay: 3s;
-    }
-
-    @keyframes draw { to { stroke-dashoffset: 0; } }
-    @keyframes fadeInFeature { to { opacity: 1; } }
-    @keyframes fadeOut { to { opacity: 0; stroke-dashoffset: 400; } }
-    @keyframes drawEmotion { to { stroke-dashoffset: 0; } }
-    /* --- GÜNCELLEME SONU --- */
-
-    .loading-text {
-        font-family: 'Inter', sans-serif; color: rgba(255, 255, 255, 0.8);
-        font-size: 1rem; letter-spacing: 0.2rem; text-transform: uppercase;
-        animation: pulseText 2s ease-in-out infinite;
-    }
-    @keyframes pulseText { 0%, 100% { opacity: 0.7; } 50% { opacity: 1; } }
-    
-    /* MEVCUT ANİMASYONLARINIZ DEĞİŞMEDİ */
-    .hero-text { font-family: 'Orbitron', sans-serif; font-size: 4.5rem; font-weight: 700; text-align: center; letter-spacing: 0.5rem; margin: 1.5rem 0 1rem 0; line-height: 1.2; text-transform: uppercase; color: #e5e5e5; display: flex; justify-content: center; flex-direction: column; align-items: center; perspective: 500px; }
-    .letter { display: inline-block; opacity: 0; transform: translateY(-40px) rotateX(90deg); text-shadow: 0 0 8px rgba(255, 255, 255, 0.5), 0 0 20px rgba(102, 126, 234, 0.7); animation: dropAndShine 1s cubic-bezier(0.68, -0.55, 0.27, 1.55) forwards; }
-    @keyframes dropAndShine { from { opacity: 0; transform: translateY(-40px) rotateX(90deg) scale(1.5); } to { opacity: 1; transform: translateY(0) rotateX(0deg) scale(1.0); } }
-    .hero-subtitle-container { display: flex; justify-content: center; align-items: center; margin-bottom: 2rem; opacity: 0; animation: fadeIn 1.5s ease-out forwards; animation-delay: 2.0s; }
-    .hero-subtitle { font-family: 'Inter', sans-serif; font-size: 0.9rem; color: rgba(255,255,255,0.7); letter-spacing: 0.3rem; text-transform: uppercase; margin: 0 15px; white-space: nowrap; }
-    .ekg-line-container { width: 120px; height: 50px; }
-    .ekg-line-container.right { transform: scaleX(-1); }
-    .ekg-path { stroke: #a8b8ff; stroke-width: 2.5; fill: none; stroke-dasharray: 242; stroke-dashoffset: 242; animation: drawEkg 3s ease-in-out infinite; filter: drop-shadow(0 0 4px rgba(168, 184, 255, 0.8)); }
-    @keyframes drawEkg { 0% { stroke-dashoffset: 242; } 40% { stroke-dashoffset: 0; } 60% { stroke-dashoffset: 0; } 100% { stroke-dashoffset: -242; } }
-    @keyframes fadeIn { to { opacity: 1; } }
-    [data-testid="stForm"], [data-testid="stExpander"] { opacity: 0; animation: formFadeInUp 1s ease-out forwards; animation-delay: 3.0s; }
-    @keyframes formFadeInUp { from { opacity: 0; transform: translateY(20px); } to { opacity: 1; transform: translateY(0); } }
-    </style>
-    """, unsafe_allow_html=True)
+    # --- YÜKLEME ARAYÜZÜNÜN CSS KODLARI (static/giris.css, tarayıcıda önbelleklenir) ---
+    st.markdown(_stil_baglantisi("giris.css"), unsafe_allow_html=True)
     
     # --- SESSION STATE KONTROLÜ ---
     if st.session_state.get('loading', False):
         
-        # 1. API ANAHTARINI TEST ET
+        # 1. DOĞRULAMA SÜRERKEN ROBOTU ÇİZ, API ANAHTARINI TEST ET
+        # Sonuç (gülümseme/üzülme) bir sonraki ekranda tarayıcı tarafında oynatılır;
+        # sunucu animasyonun bitmesini beklemez, sadece doğrulama kadar sürer.
+        st.markdown(_dogrulama_overlay_html(""), unsafe_allow_html=True)
         api_anahtari = st.session_state.get('login_api_anahtari', '')
-        auth_status = "error"
-        if api_anahtari:
-            try:
-                genai.configure(api_key=api_anahtari)
-                next(genai.list_models())
-                auth_status = "success"
-            except Exception:
-                auth_status = "error"
-        
-        # 2. TEST SONUCUNA GÖRE DOĞRU HTML'İ OLUŞTURMAK
-        loading_html = f"""
-        <div class="loading-overlay">
-            <div class="loading-robot-container {auth_status}">
-                <svg viewBox="0 0 100 100">
-                    <path class="robot-path robot-draw" d="M 20 40 Q 15 40, 15 45 V 85 Q 15 90, 20 90 H 80 Q 85 90, 85 85 V 45 Q 85 40, 80 40 H 20" />
-                    <path class="robot-path robot-draw" d="M 50 40 V 20" />
-                    <path class="robot-path robot-mouth-straight" d="M 35 78 H 65" />
-                    <path class="robot-path robot-mouth-smile" d="M 35 78 Q 50 90, 65 78" />
-                    <path class="robot-path robot-mouth-sad" d="M 35 82 Q 50 70, 65 82" />
-                    <circle class="robot-feature" cx="50" cy="15" r="5" />
-                    <circle class="robot-feature" cx="35" cy="60" r="7" />
-                    <circle class="robot-feature" cx="65" cy="60" r="7" />
-                </svg>
-            </div>
-            <div class="loading-text">DOĞRULANIYOR...</div>
-        </div>
-        """
-        st.markdown(loading_html, unsafe_allow_html=True)
-        
-        # 3. ANİMASYONUN BİTMESİNİ BEKLE
-        time.sleep(4.5)
+        auth_status = "success" if anahtar_dogrulama_onbellegi().dogrula(api_anahtari) else "error"
+        st.session_state.giris_animasyonu = auth_status
 
-        # 4. SONUCA GÖRE YÖNLENDİRME YAP
+        # 2. SONUCA GÖRE YÖNLENDİRME YAP
         if auth_status == "success":
             kullanici_adi = st.session_state.get('login_kullanici_adi', '')
             st.session_state.logged_in = True; st.session_state.kullanici_adi = kullanici_adi; st.session_state.api_anahtari = api_anahtari
-            if 'asistan' not in st.session_state: st.session_state.asistan = AkilliOgrenciAsistani()
-            st.session_state.asistan.kullanici_adi = kullanici_adi; st.session_state.asistan.gemini_ayarla(api_anahtari)
+            with oturum_yoneticisi().kullan(_oturum_kimligi()) as asistan:
+                asistan.kullanici_ayarla(kullanici_adi, api_anahtari); asistan.gemini_ayarla(api_anahtari)
             st.session_state.loading = False; st.rerun()
         else:
             st.session_state.loading = False
@@ -976,6 +3356,9 @@ def show_login_screen():
             st.rerun()
 
     else:
+        if st.session_state.get('giris_animasyonu'):
+            st.markdown(_dogrulama_overlay_html(st.session_state.pop('giris_animasyonu')), unsafe_allow_html=True)
+
         animated_title_html = create_animated_title("AKILLI ÖĞRENCİ", "ASİSTANI")
         st.markdown(animated_title_html, unsafe_allow_html=True)
         
@@ -1008,118 +3391,166 @@ def show_logout_animation():
     
     kullanici_adi = st.session_state.get('kullanici_adi', 'Kullanıcı')
     
-    logout_html = f"""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400&family=Orbitron:wght@700&display=swap');
-    
-    /* --- DÜZELTME 1: SİDEBAR'I ARKADA BIRAKMA --- */
-    /* Çıkış animasyonu aktifken, sidebar'ı overlay'in arkasına it */
-    [data-testid="stSidebar"] {{
-        z-index: 0 !important;
-    }}
-    /* --- DÜZELTME SONU --- */
-
-    .logout-overlay {{
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100vw;
-        height: 100vh;
-        
-        /* İstediğin yarı-şeffaf koyu renk (Tam siyah değil, arka plan okunmuyor) */
-        background-color: rgba(10, 10, 15, 0.95); 
-        backdrop-filter: blur(5px);
-
-        /* --- DÜZELTME 2: Z-INDEX GARANTİSİ --- */
-        /* Sidebar'dan (ve diğer her şeyden) üstte olmasını garanti et */
-        z-index: 99999;
-        /* --- DÜZELTME SONU --- */
-
-        display: flex;
-        justify-content: center;
-        align-items: center;
-        flex-direction: column; 
-        opacity: 0; 
-        animation: fadeInOverlay 0.3s ease-out forwards;
-    }}
-    @keyframes fadeInOverlay {{ to {{ opacity: 1; }} }}
-
-    .robot-container {{
-        width: 150px;
-        height: 150px;
-        margin-bottom: 20px;
-        filter: drop-shadow(0 0 10px rgba(168, 184, 255, 0.7));
-    }}
-
-    /* Hızlandırılmış animasyonlar (Aynı) */
-    .robot-path {{
-        stroke: #a8b8ff; stroke-width: 4; fill: none;
-        stroke-linecap: round; stroke-linejoin: round;
-        stroke-dasharray: 400;
-        stroke-dashoffset: 400;
-        animation: draw 1s ease-out 0.2s forwards;
-    }}
-    .robot-feature {{ 
-        fill: #a8b8ff; stroke: none; opacity: 0;
-        animation: fadeInFeature 0.5s ease-out 1.3s forwards;
-    }}
-    .robot-mouth-sad {{
-        stroke-dasharray: 40; stroke-dashoffset: 40;
-        animation: draw 0.5s ease-out 1.5s forwards;
-    }}
-    #waving-antenna {{
-        transform-origin: 50px 40px; 
-        animation: waveAntenna 1.5s ease-in-out 1.8s infinite;
-    }}
-    
-    @keyframes draw {{ to {{ stroke-dashoffset: 0; }} }}
-    @keyframes fadeInFeature {{ to {{ opacity: 1; }} }}
-    @keyframes waveAntenna {{
-        0% {{ transform: rotate(0deg); }}
-        25% {{ transform: rotate(20deg); }}
-        75% {{ transform: rotate(-20deg); }}
-        100% {{ transform: rotate(0deg); }}
-    }}
-
-    .logout-text {{
-        font-family: 'Orbitron', sans-serif; 
-        color: rgba(255, 255, 255, 0.9);
-        font-size: 1.5rem; 
-        letter-spacing: 0.1rem;
-        text-transform: uppercase;
-        margin-top: 25px;
-        opacity: 0;
-        animation: fadeInFeature 1s ease-out 0.5s forwards;
-    }}
-    </style>
-    
-    <div class="logout-overlay">
-        <div class="robot-container">
-            <svg viewBox="0 0 100 100">
-                <path class="robot-path" d="M 20 40 Q 15 40, 15 45 V 85 Q 15 90, 20 90 H 80 Q 85 90, 85 85 V 45 Q 85 40, 80 40 H 20" />
-                <circle class="robot-feature" cx="35" cy="60" r="7" />
-                <circle class="robot-feature" cx="65" cy="60" r="7" />
-                <path class="robot-path robot-mouth-sad" d="M 35 82 Q 50 70, 65 82" />
-                <g id="waving-antenna">
-                    <path class="robot-path" d="M 50 40 V 20" />
-                    <circle class="robot-feature" cx="50" cy="15" r="5" />
-                </g>
-            </svg>
-        </div>
-        <div class="logout-text">GÜLE GÜLE, {kullanici_adi}!</div>
-    </div>
-    """
+    logout_html = _CIKIS_HTML_SABLONU.format(stil=_stil_baglantisi("cikis.css"), kullanici_adi=html.escape(kullanici_adi))
     
     st.markdown(logout_html, unsafe_allow_html=True)
     
     time.sleep(3.0) 
     
+    if 'oturum_kimligi' in st.session_state:
+        oturum_yoneticisi().birak(st.session_state.oturum_kimligi)
     for key in list(st.session_state.keys()):
         del st.session_state[key]
     
     st.rerun()
 
+# --- KART OLUŞTURUCU YARDIMCI FONKSİYON ---
+def create_metric_card(icon: str, title: str, value: Any, color: str):
+    return _METRIK_KARTI_SABLONU.format(icon=icon, title=title, value=value, color=color)
+
+def _ana_stilleri_yaz():
+    """Ana uygulamanın ikon/yazı tipi bağlantılarını ve stillerini (static/ana.css) yazar."""
+    st.markdown('<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.min.css">'
+                + _stil_baglantisi("ana.css"), unsafe_allow_html=True)
+
+
+def _sidebar_ciz(asistan):
+    """Kullanıcı bilgisi, hedef özeti, hatırlatmalar ve hızlı erişim butonları."""
+    st.markdown(f"### 👤 {st.session_state.kullanici_adi}")
+    st.markdown("---")
+    hedef_stats = asistan.hedef_takip.hedef_istatistikleri(asistan.kullanici_adi)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Toplam Ders", len(asistan.dersler))
+    with col2:
+        st.metric("Aktif Hedefler", f"{hedef_stats['aktif_hedef']}")
+    
+    st.markdown("##### 🏆 Başarı Oranı")
+    tamamlanma_orani_int = int(hedef_stats['tamamlanma_orani'])
+    st.progress(tamamlanma_orani_int, text=f"%{tamamlanma_orani_int}")
+    hatirlatmalar = asistan.hedef_takip.hatirlatma_kontrol(asistan.kullanici_adi)
+    if hatirlatmalar:
+        st.markdown("---")
+        st.markdown("### 🔔 Hatırlatmalar")
+        for hatirlatma in hatirlatmalar[:3]:
+            st.warning(hatirlatma)
+    st.markdown("---")
+    st.markdown("### 🎯 Hızlı Erişim")
+    
+    if st.button("💪 Motivasyon Ver", key="sidebar_motivasyon"):
+        st.success(asistan.motivasyon_sistemi.rastgele_motivasyon())
+    
+    _veri_tasima_paneli(asistan)
+    st.markdown("---")
+    
+    # ---BUTON MANTIĞI ---
+    if st.button("🚪 Çıkış Yap", key="sidebar_cikis"):
+        # Sadece durumu ayarla ve yeniden çalıştır
+        st.session_state.logging_out = True
+        st.rerun()
+
+
+def _arsiv_baytlari(asistan) -> bytes:
+    import io
+    cikti = io.BytesIO()
+    DurumArsivi.disa_aktar(asistan, cikti)
+    return cikti.getvalue()
+
+
+def _veri_tasima_paneli(asistan):
+    """Tüm verilerin (kayıtlar, hedefler, dersler, sohbet) arşiv dosyası olarak indirilmesi ve geri yüklenmesi."""
+    with st.expander("💾 Verilerimi Taşı", expanded=False):
+        # Arşiv sadece indirme tıklandığında üretilir
+        st.download_button("⬇️ Dışa aktar", data=lambda: _arsiv_baytlari(asistan),
+                           file_name=f"asistan_{asistan.kullanici_adi}_{datetime.date.today():%Y%m%d}.arsiv",
+                           mime="application/octet-stream", on_click="ignore", key="arsiv_indir",
+                           use_container_width=True)
+        dosya = st.file_uploader("Arşiv yükle", type=["arsiv"], key="arsiv_yukle", label_visibility="collapsed")
+        if dosya is not None and st.button("⬆️ İçe aktar", key="arsiv_ice_aktar", use_container_width=True):
+            try:
+                sayilar = DurumArsivi.ice_aktar(asistan, dosya.getvalue(), kullanici_adi=asistan.kullanici_adi)
+            except ValueError as e:
+                st.error(f"Arşiv yüklenemedi: {e}")
+                return
+            # Arşivden gelen kayıtlar sınıf analitiğine ve sonraki girişlere de yansısın
+            asistan.ogrenme_analitigi.depoya_yaz(asistan.kullanici_adi)
+            st.success(f"✅ {sayilar['calisma_kayitlari']} çalışma kaydı, {sayilar['hedefler']} hedef, "
+                       f"{sayilar['dersler']} ders yüklendi.")
+
+
+# ==================== İZLEME PANELİ (YÖNETİCİ) ====================
+def _yonetici_sifresi_dogru_mu(sifre: str) -> bool:
+    """Sunucuda ASISTAN_YONETICI_SIFRESI ile karşılaştırır; değişken boşsa yönetici girişi kapalıdır."""
+    beklenen = os.environ.get("ASISTAN_YONETICI_SIFRESI", "")
+    return bool(beklenen) and hmac.compare_digest(sifre.encode("utf-8"), beklenen.encode("utf-8"))
+
+
+def _yonetici_girisi():
+    """Sidebar'daki yönetici şifresi formu; doğrulanırsa bu tarayıcı oturumu yönetici olur."""
+    if not os.environ.get("ASISTAN_YONETICI_SIFRESI"):
+        return
+    with st.expander("🔐 Yönetici Girişi", expanded=False):
+        with st.form("yonetici_girisi", clear_on_submit=True):
+            sifre = st.text_input("Yönetici şifresi", type="password")
+            if st.form_submit_button("Giriş"):
+                if _yonetici_sifresi_dogru_mu(sifre):
+                    st.session_state.yonetici = True
+                    st.rerun()
+                st.error("Şifre yanlış.")
+
+
+def _izleme_paneli():
+    """Sidebar'da aşama bazlı gecikme özetlerini ve sayaçları gösterir; izlemeyi açıp kapatır."""
+    iz = izleyici()
+    with st.expander("📈 İzleme Paneli", expanded=False):
+        iz.aktif = st.toggle("İzleme açık", value=iz.aktif)
+        goruntu = iz.anlik_goruntu()
+        if goruntu["asamalar"]:
+            st.dataframe(
+                [{"aşama": ad, "adet": o["adet"], "ort. ms": o["ortalama_ms"], "p50 ms": o["p50_ms"],
+                  "p95 ms": o["p95_ms"], "maks ms": o["maks_ms"]} for ad, o in goruntu["asamalar"].items()],
+                hide_index=True, use_container_width=True,
+            )
+        else:
+            st.caption("Henüz ölçüm yok.")
+        for ad, deger in sorted(goruntu["sayaclar"].items()):
+            st.caption(f"{ad}: {deger:,}")
+        sohbet = sohbet_onbellegi()
+        if sohbet is not None and sohbet.isabet + sohbet.iskalama:
+            st.caption(f"Sohbet önbelleği: %{sohbet.isabet_orani * 100:.0f} isabet, "
+                       f"~{sohbet.kazanilan_ms / 1000:.1f} sn kazanıldı")
+        oturumlar = oturum_yoneticisi().istatistik()
+        st.caption(f"Oturumlar: {oturumlar['bellekte']} bellekte (~{oturumlar['bellekte_bayt'] / 2**20:.1f} MB), "
+                   f"{oturumlar['diskte']} diskte")
+        hatirlatma = hatirlatma_zamanlayici()
+        if hatirlatma.son_hesaplama is not None:
+            st.caption(f"Hatırlatmalar: {hatirlatma.bildirim_sayisi()} bildirim, "
+                       f"{len(hatirlatma.son_bildirimler)} oturum (son geçiş {hatirlatma.son_hesaplama:%H:%M:%S})")
+
+        dosya = os.environ.get("ASISTAN_IZLEME_DOSYASI", "izleme_metrikleri.json")
+        col1, col2 = st.columns(2)
+        if col1.button("💾 Dışa aktar", use_container_width=True):
+            iz.disa_aktar(dosya)
+            st.success(f"{dosya} yazıldı.")
+        if col2.button("🧹 Sıfırla", use_container_width=True):
+            iz.sifirla()
+            st.rerun()
+
+
 # ==================== ANA UYGULAMA ====================
+def _oturum_kimligi() -> str:
+    """Bu tarayıcı oturumunun yöneticideki kimliği; yoksa (ya da süresi dolmuşsa) yeni asistan açılır."""
+    yonetici = oturum_yoneticisi()
+    kimlik = st.session_state.get('oturum_kimligi')
+    if kimlik is None or not yonetici.var_mi(kimlik):
+        asistan = AkilliOgrenciAsistani()
+        asistan.kullanici_ayarla(st.session_state.get('kullanici_adi', ''), st.session_state.get('api_anahtari', ''))
+        if st.session_state.get('api_anahtari'):
+            asistan.gemini_ayarla(st.session_state.api_anahtari)
+        kimlik = st.session_state.oturum_kimligi = yonetici.ekle(asistan)
+    return kimlik
+
+
 def show_main_app():
     
     # --- ÇIKIŞ ANİMASYONU KONTROLÜ ---
@@ -1128,495 +3559,535 @@ def show_main_app():
         return # Animasyon fonksiyonu çalışırken alttaki kodun çalışmasını engeller
     
 
+    # --- Giriş animasyonu (tarayıcı tarafında oynar, sunucu beklemez) ---
+    if st.session_state.get('giris_animasyonu'):
+        st.markdown(_dogrulama_overlay_html(st.session_state.pop('giris_animasyonu')), unsafe_allow_html=True)
+
     # --- Animasyon Gösterme Mantığı ---
     if 'show_success_animation' in st.session_state and st.session_state.show_success_animation:
         icon = "✓"
         if st.session_state.show_success_animation == 'hedef_tamamla':
             icon = "🏆"
         
-        st.markdown(f"""
-            <div class="success-animation-overlay">
-                <div class="icon-container">
-                    <span class="icon">{icon}</span>
-                </div>
-            </div>
-            <style>
-                .success-animation-overlay {{
-                    position: fixed; top: 0; left: 0; width: 100vw; height: 100vh;
-                    z-index: 99999; display: flex; justify-content: center; align-items: center;
-                    pointer-events: none; animation: fade-out-overlay 2s ease-out forwards;
-                }}
-                .icon-container {{
-                    background-color: rgba(30, 30, 45, 0.85); backdrop-filter: blur(5px);
-                    border-radius: 50%; width: 120px; height: 120px; display: flex;
-                    justify-content: center; align-items: center;
-                    box-shadow: 0 8px 30px rgba(0, 0, 0, 0.4);
-                    animation: pop-in 0.5s cubic-bezier(0.68, -0.55, 0.27, 1.55) forwards;
-                }}
-                .icon {{
-                    font-size: 60px; color: #a8b8ff; text-shadow: 0 0 15px rgba(168, 184, 255, 0.8);
-                }}
-                @keyframes pop-in {{ 0% {{ transform: scale(0.5); opacity: 0; }} 100% {{ transform: scale(1); opacity: 1; }} }}
-                @keyframes fade-out-overlay {{ 0% {{ opacity: 1; }} 80% {{ opacity: 1; }} 100% {{ opacity: 0; }} }}
-            </style>
-        """, unsafe_allow_html=True)
+        st.markdown(_BASARI_ANIMASYONU_SABLONU.format(icon=icon), unsafe_allow_html=True)
         
         time.sleep(2)
         st.session_state.show_success_animation = None
         st.rerun()
 
     # --- Fonksiyonun geri kalanı ---
-    if 'asistan' not in st.session_state:
-        st.session_state.asistan = AkilliOgrenciAsistani()
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
-
-    asistan = st.session_state.asistan
-
-    # --- KART OLUŞTURUCU YARDIMCI FONKSİYON ---
-    def create_metric_card(icon: str, title: str, value: Any, color: str):
-        html_content = f"""
-        <div class="metric-card">
-            <div class="metric-card-icon" style="background: linear-gradient(135deg, {color} 0%, {color}99 100%); color: white; text-shadow: 0 0 10px #FFFFFF99;">
-                <i class="bi {icon}"></i>
-            </div>
-            <div class="metric-card-content">
-                <h3>{value}</h3>
-                <p>{title}</p>
-            </div>
-        </div>
-        """
-        return html_content
-    
-    # --- BOOTSTRAP İKON CDN LİNKİ VE ORİJİNAL STİLLER ---
-    st.markdown("""
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.min.css">
-    
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-        
-        .stApp { background: linear-gradient(135deg, #0a0a0a 0%, #1a1a2e 50%, #16213e 100%); }
-        [data-testid="stSidebar"] { background: linear-gradient(180deg, #1a1a2e 0%, #0f0f0f 100%); border-right: 1px solid rgba(255,255,255,0.1); }
-        [data-testid="stSidebar"] h1, [data-testid="stSidebar"] h2, [data-testid="stSidebar"] h3 { color: white !important; font-family: 'Inter', sans-serif; }
-        h1 { color: white !important; font-family: 'Inter', sans-serif !important; font-weight: 700 !important; letter-spacing: 0.05rem !important; background: linear-gradient(135deg, #ffffff 0%, #a8b8ff 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent; }
-        h2, h3 { color: rgba(255,255,255,0.9) !important; font-family: 'Inter', sans-serif !important; font-weight: 600 !important; }
-        
-        /* Sekmeleri DAHA FAZLA daraltıyoruz */
-        .stTabs [data-baseweb="tab"] { 
-            background: transparent; 
-            border: 1px solid rgba(255,255,255,0.1); 
-            color: rgba(255,255,255,0.7); 
-            border-radius: 8px; /* Kenar yuvarlaklığını biraz azalttık */
-            
-            /* --- DAHA FAZLA KÜÇÜLTME --- */
-            padding: 8px 12px !important; /* İç boşluğu İYİCE azalttık (10px 16px idi) */
-            font-size: 0.85rem !important; /* Yazı boyutunu BİRAZ DAHA küçülttük (0.9rem idi) */
-            /* --- KÜÇÜLTME SONU --- */
-            
-            font-weight: 500; 
-            transition: all 0.3s; 
-            white-space: nowrap; /* Yazıların alta kaymasını engelle */
-        }
+    # Asistan süreç genelindeki oturum yöneticisinde durur, session_state'te sadece kimliği var
+    yonetici = oturum_yoneticisi()
+    try:
+        with yonetici.kullan(_oturum_kimligi()) as asistan:
+            _ana_icerigi_ciz(asistan)
+    # Yönetici önbellekte, betik her rerun'da yeniden çalışır: sınıf yöneticinin kendisinden alınır
+    except yonetici.YuklemeHatasi:
+        # Diske alınmış oturum dosyaları okunamadı; oturum diskte durur, sayfa yenilenince yeniden denenir
+        st.error("⚠️ Oturumun geri yüklenemedi. Sayfayı yenileyerek tekrar deneyebilir ya da yeni bir "
+                 "oturumla devam edebilirsin (kalıcı depodaki çalışma kayıtların yeniden yüklenir).")
+        if st.button("🔄 Yeni oturumla devam et", key="oturum_yenile"):
+            yonetici.birak(st.session_state.pop('oturum_kimligi'))
+            st.rerun()
 
-        .stTabs [data-baseweb="tab"] { background: transparent; border: 1px solid rgba(255,255,255,0.1); color: rgba(255,255,255,0.7); border-radius: 10px; padding: 12px 24px; font-weight: 500; transition: all 0.3s; }
-        .stTabs [aria-selected="true"] { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white !important; border-color: transparent; box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4); }
-        .stTextInput input, .stTextArea textarea, .stSelectbox select, .stNumberInput input { background: rgba(255,255,255,0.05) !important; border: 1px solid rgba(255,255,255,0.15) !important; color: white !important; border-radius: 10px !important; font-family: 'Inter', sans-serif !important; }
-        .stTextInput input:focus, .stTextArea textarea:focus { border-color: #667eea !important; box-shadow: 0 0 0 1px #667eea !important; }
-        .stTextInput label, .stTextArea label, .stSelectbox label, .stNumberInput label { color: rgba(255,255,255,0.8) !important; font-weight: 500 !important; font-size: 0.9rem !important; }
-        .stButton > button { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important; color: white !important; border: none !important; border-radius: 10px !important; padding: 0.6rem 1.5rem !important; font-weight: 600 !important; font-family: 'Inter', sans-serif !important; transition: all 0.3s !important; box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3) !important; }
-        .stButton > button:hover { transform: translateY(-2px) !important; box-shadow: 0 6px 20px rgba(102, 126, 234, 0.5) !important; }
-        [data-testid="stSidebar"] .stButton > button { width: 100%; background: rgba(255,255,255,0.05) !important; border: 1px solid rgba(255,255,255,0.15) !important; box-shadow: none !important; }
-        [data-testid="stSidebar"] .stButton > button:hover { background: rgba(255,255,255,0.1) !important; border-color: rgba(255,255,255,0.3) !important; }
-        [data-testid="stMetricValue"] { color: white !important; font-size: 2rem !important; font-weight: 700 !important; }
-        [data-testid="stMetricLabel"] { color: rgba(255,255,255,0.7) !important; }
-        .metric-card {
-            background: linear-gradient(145deg, rgba(255, 255, 255, 0.05), rgba(255, 255, 255, 0.02));
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 15px;
-            padding: 20px;
-            display: flex;
-            align-items: center;
-            transition: all 0.3s ease;
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
-            height: 100%; 
-        }
-        .metric-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 8px 30px rgba(0, 0, 0, 0.2);
-            border-color: rgba(255, 255, 255, 0.2);
-        }
-        .metric-card-icon {
-            font-size: 2.2rem; 
-            margin-right: 15px;
-            padding: 15px;
-            border-radius: 12px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            width: 60px; 
-            height: 60px; 
-        }
-        .metric-card-content {
-            flex-grow: 1;
-        }
-        .metric-card-content h3 { 
-            font-size: 2rem;
-            font-weight: 700;
-            color: #FFFFFF;
-            margin: 0;
-            line-height: 1;
-            -webkit-text-fill-color: #FFFFFF; 
-        }
-        .metric-card-content p { 
-            font-size: 0.9rem;
-            color: rgba(255, 255, 255, 0.7);
-            margin: 0;
-            margin-top: 5px;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }
-    </style>
-    """, unsafe_allow_html=True)
 
-    with st.sidebar:
-        st.markdown(f"### 👤 {st.session_state.kullanici_adi}")
-        st.markdown("---")
-        hedef_stats = asistan.hedef_takip.hedef_istatistikleri(asistan.kullanici_adi)
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("Toplam Ders", len(asistan.dersler))
-        with col2:
-            st.metric("Aktif Hedefler", f"{hedef_stats['aktif_hedef']}")
-        
-        st.markdown("##### 🏆 Başarı Oranı")
-        tamamlanma_orani_int = int(hedef_stats['tamamlanma_orani'])
-        st.progress(tamamlanma_orani_int, text=f"%{tamamlanma_orani_int}")
-        hatirlatmalar = asistan.hedef_takip.hatirlatma_kontrol(asistan.kullanici_adi)
-        if hatirlatmalar:
-            st.markdown("---")
-            st.markdown("### 🔔 Hatırlatmalar")
-            for hatirlatma in hatirlatmalar[:3]:
-                st.warning(hatirlatma)
-        st.markdown("---")
-        st.markdown("### 🎯 Hızlı Erişim")
-        
-        if st.button("💪 Motivasyon Ver", key="sidebar_motivasyon"):
-            st.success(asistan.motivasyon_sistemi.rastgele_motivasyon())
-        
-        st.markdown("---")
-        
-        # ---BUTON MANTIĞI ---
-        if st.button("🚪 Çıkış Yap", key="sidebar_cikis"):
-            # Sadece durumu ayarla ve yeniden çalıştır
-            st.session_state.logging_out = True
-            st.rerun()
-        
-        
-              
+def _yeni_bildirimleri_goster(asistan):
+    """Arka plan geçişinin bu oturum için bulduğu yeni hatırlatmaları bir kez toast olarak gösterir"""
+    bildirimler = hatirlatma_zamanlayici().bildirimler(asistan.hedef_takip, asistan.kullanici_adi)
+    anahtarlar = {(b["hedef_id"], b["durum"]) for b in bildirimler}
+    gosterilen = st.session_state.get('gosterilen_bildirimler')
+    if gosterilen is None:
+        st.session_state.gosterilen_bildirimler = anahtarlar
+        return
+    for bildirim in bildirimler:
+        if (bildirim["hedef_id"], bildirim["durum"]) not in gosterilen:
+            st.toast(bildirim["mesaj"], icon="🔔")
+    gosterilen |= anahtarlar
+
+
+def _ana_icerigi_ciz(asistan):
+    """Sidebar, başlık ve seçili sekme."""
+    hatirlatma_zamanlayici().kaydet(asistan.hedef_takip)
+    _yeni_bildirimleri_goster(asistan)
+    zamanlayici = RerunZamanlayici()
+
+    # --- BOOTSTRAP İKON CDN LİNKİ VE ORİJİNAL STİLLER ---
+    with zamanlayici.olc("Stiller"):
+        _ana_stilleri_yaz()
+
+    with zamanlayici.olc("Sidebar"), st.sidebar:
+        _sidebar_ciz(asistan)
 
     st.title(f"🎓 Hoş Geldin, {st.session_state.kullanici_adi}!")
     st.markdown("##### Bugün hangi konuda sana yardımcı olabilirim?")
     st.markdown("---")
     
     # Emojili sekme başlıkları
-    tab_labels = [
-        "💬 Sohbet", "📚 Ders Planlama", "🎯 Hedeflerim", "📊 Öğrenme Analitiği", 
-        "📊 Görsel Pano", "📄 PDF İşleme", "🌐 Web Analiz",
-        "🤖 RAG Chatbot"  # <--- YENİ SEKME EKLENDİ
-    ]
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs(tab_labels) # <--- tab8 EKLENDİ
+    # st.tabs sekmelerin hepsini her rerun'da çalıştırıyordu; seçili sekme
+    # gezinti durumunda (session_state) tutulur ve sadece o sekme çalıştırılır.
+    yonetici = st.session_state.get('yonetici', False)
+    sekmeler = {**SEKMELER, **YONETICI_SEKMELERI} if yonetici else SEKMELER
+    tab_labels = list(sekmeler.keys())
+    aktif_sekme = st.radio("Sekme", tab_labels, horizontal=True, key="aktif_sekme", label_visibility="collapsed")
 
-    
-    
-    with tab1:
-        st.markdown("### 💬 Akıllı Asistan ile Sohbet Et")
-        st.markdown("*Merak ettiklerin,derslerin, hedeflerin ve çalışma alışkanlıkların hakkında sohbet ederek sana özel tavsiyeler alabilirsin.*"); st.markdown("")
-        chat_container = st.container()
-        with chat_container:
-            for chat in st.session_state.chat_history[-10:]:
-                # GÜNCELLEME: Öğrenci emojisi eklendi
-                with st.chat_message("user", avatar="🧑‍🎓"): 
-                    st.markdown(chat["mesaj"])
-                with st.chat_message("assistant"): 
-                    st.markdown(chat["cevap"])
-        
-        mesaj = st.chat_input("✨ Mesajını buraya yaz...", key="chat_input")
-        
-        if mesaj:
+    with zamanlayici.olc(aktif_sekme):
+        sekmeler[aktif_sekme](asistan)
+
+    zamanlayici.kaydet(aktif_sekme)
+    with st.sidebar:
+        zamanlayici.goster()
+        if yonetici:
+            _izleme_paneli()
+        else:
+            _yonetici_girisi()
+
+
+def _sekme_sohbet(asistan):
+    """Sohbet sekmesi."""
+    st.markdown("### 💬 Akıllı Asistan ile Sohbet Et")
+    st.markdown("*Merak ettiklerin,derslerin, hedeflerin ve çalışma alışkanlıkların hakkında sohbet ederek sana özel tavsiyeler alabilirsin.*"); st.markdown("")
+    chat_container = st.container()
+    with chat_container:
+        for chat in asistan.chat_gecmisi[-10:]:
             # GÜNCELLEME: Öğrenci emojisi eklendi
             with st.chat_message("user", avatar="🧑‍🎓"): 
-                st.markdown(mesaj)
-            with st.chat_message("assistant"):
-                with st.spinner("Düşünüyorum..."):
-                    cevap = asistan.gemini_sohbet(mesaj)
-                    st.markdown(cevap)
-            asistan.chat_gecmisi_kaydet(asistan.kullanici_adi, mesaj, cevap)
-            st.session_state.chat_history.append({"mesaj": mesaj, "cevap": cevap})
-
-    with tab2:
-        st.markdown("### 📚 Ders Planlama Modülü") 
-        st.markdown("*Derslerini organize et ve haftalık çalışma planı oluştur*"); st.markdown("")
-        col1, col2 = st.columns([1, 1])
-        with col1:
-            st.markdown("#### ➕ Yeni Ders Ekle")
-            with st.form("ders_ekle_form", clear_on_submit=True):
-                ders = st.text_input("📖 Ders Adı", placeholder="Örn: Matematik, Fizik...")
-                zorluk = st.selectbox("⚡ Zorluk Seviyesi", ["Kolay", "Orta", "Zor"])
-                submitted = st.form_submit_button("Ders Ekle", use_container_width=True)
-                if submitted and ders:
-                    asistan.ders_ekle(ders, zorluk); st.success(f"✅ {ders} başarıyla eklendi!"); st.rerun()
-        with col2:
-            st.markdown("#### 📋 Mevcut Derslerim")
+                st.markdown(chat.mesaj)
+            with st.chat_message("assistant"): 
+                st.markdown(chat.cevap)
+    
+    mesaj = st.chat_input("✨ Mesajını buraya yaz...", key="chat_input")
+    
+    if mesaj:
+        # GÜNCELLEME: Öğrenci emojisi eklendi
+        with st.chat_message("user", avatar="🧑‍🎓"): 
+            st.markdown(mesaj)
+        with st.chat_message("assistant"):
+            with st.spinner("Düşünüyorum..."):
+                cevap = asistan.gemini_sohbet(mesaj)
+                st.markdown(cevap)
+        asistan.chat_gecmisi_kaydet(mesaj, cevap)
+
+
+def _sekme_ders_planlama(asistan):
+    """Ders planlama sekmesi."""
+    st.markdown("### 📚 Ders Planlama Modülü") 
+    st.markdown("*Derslerini organize et ve haftalık çalışma planı oluştur*"); st.markdown("")
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.markdown("#### ➕ Yeni Ders Ekle")
+        with st.form("ders_ekle_form", clear_on_submit=True):
+            ders = st.text_input("📖 Ders Adı", placeholder="Örn: Matematik, Fizik...")
+            zorluk = st.selectbox("⚡ Zorluk Seviyesi", ["Kolay", "Orta", "Zor"])
+            submitted = st.form_submit_button("Ders Ekle", use_container_width=True)
+            if submitted and ders:
+                asistan.ders_ekle(ders, zorluk); st.success(f"✅ {ders} başarıyla eklendi!"); st.rerun()
+    with col2:
+        st.markdown("#### 📋 Mevcut Derslerim")
+        if asistan.dersler:
+            for i, d in enumerate(asistan.dersler, 1):
+                emoji = "🟢" if d['zorluk'] == "Kolay" else "🟡" if d['zorluk'] == "Orta" else "🔴"
+                st.markdown(f"{emoji} **{d['adi']}** - _{d['zorluk']}_")
+        else: st.info("Henüz ders eklenmemiş. Sol taraftan ekleyebilirsin!")
+    st.markdown("---")
+    col_saat1, col_saat2, col_hafta = st.columns(3)
+    with col_saat1: hafta_ici_saat = st.number_input("⏱️ Hafta içi (saat/gün)", 0.0, 12.0, 2.0, 1.0, key="plan_hafta_ici_saat")
+    with col_saat2: hafta_sonu_saat = st.number_input("⏱️ Hafta sonu (saat/gün)", 0.0, 12.0, 2.0, 1.0, key="plan_hafta_sonu_saat")
+    with col_hafta: hafta_sayisi = st.number_input("🗓️ Kaç haftalık?", 1, 8, 1, key="plan_hafta_sayisi")
+    col3, col4 = st.columns(2)
+    with col3:
+        if st.button("📅 Haftalık Plan Oluştur", use_container_width=True, key="plan_olustur_btn"):
             if asistan.dersler:
-                for i, d in enumerate(asistan.dersler, 1):
-                    emoji = "🟢" if d['zorluk'] == "Kolay" else "🟡" if d['zorluk'] == "Orta" else "🔴"
-                    st.markdown(f"{emoji} **{d['adi']}** - _{d['zorluk']}_")
-            else: st.info("Henüz ders eklenmemiş. Sol taraftan ekleyebilirsin!")
-        st.markdown("---")
-        col3, col4 = st.columns(2)
-        with col3:
-            if st.button("📅 Haftalık Plan Oluştur", use_container_width=True, key="plan_olustur_btn"):
-                if asistan.dersler:
-                    plan = asistan.haftalik_plan_olustur(); st.success("✅ Haftalık planın hazır!")
-                    for gun, detay in plan.items(): st.markdown(f"**{gun}:** {detay['ders']} - {detay['sure']}")
-                else: st.warning("⚠️ Önce en az bir ders eklemelisin!")
-        with col4:
-            if st.button("🎯 Bugün Ne Çalışmalıyım?", use_container_width=True, key="bugun_ne_calis_btn"):
-                oneri = asistan.bugun_ne_calismali(); st.info(oneri)
-
-    with tab3:
-        st.markdown("### 🎯 Hedef Belirle ve Takip Et")
-        st.markdown("*Hedeflerini belirle, ilerlemeni takip et ve başarıya ulaş!*"); st.markdown("")
-        stats = asistan.hedef_takip.hedef_istatistikleri(asistan.kullanici_adi)
+                plan = asistan.haftalik_plan_olustur([hafta_ici_saat] * 5 + [hafta_sonu_saat] * 2, int(hafta_sayisi))
+                st.success("✅ Haftalık planın hazır!")
+                for gun, detay in plan.items():
+                    st.markdown(f"**{gun}:** " + ", ".join(f"{b['ders']} - {b['sure']:g} saat" for b in detay["bloklar"]))
+                for hafta in range(1, int(hafta_sayisi)):
+                    with st.expander(f"🗓️ {hafta + 1}. hafta"):
+                        for gun in asistan.calisma_plani["gunler"][hafta * 7:(hafta + 1) * 7]:
+                            if gun["bloklar"]:
+                                st.markdown(f"**{gun['tarih']:%d.%m} {gun['gun']}:** "
+                                            + ", ".join(f"{b['ders']} - {b['sure']:g} saat" for b in gun["bloklar"]))
+                if asistan.calisma_plani["yerlestirilemeyen"]:
+                    st.warning("⚠️ Süre veya günlük ders sınırı yüzünden planlanandan az saat alan dersler: " + ", ".join(
+                        f"{ders} ({blok:g} saat)" for ders, blok in asistan.calisma_plani["yerlestirilemeyen"].items()))
+            else: st.warning("⚠️ Önce en az bir ders eklemelisin!")
+    with col4:
+        if st.button("🎯 Bugün Ne Çalışmalıyım?", use_container_width=True, key="bugun_ne_calis_btn"):
+            oneri = asistan.bugun_ne_calismali(); st.info(oneri)
+
+
+def _sekme_hedeflerim(asistan):
+    """Hedef takip sekmesi."""
+    st.markdown("### 🎯 Hedef Belirle ve Takip Et")
+    st.markdown("*Hedeflerini belirle, ilerlemeni takip et ve başarıya ulaş!*"); st.markdown("")
+    stats = asistan.hedef_takip.hedef_istatistikleri(asistan.kullanici_adi)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1: 
+        st.markdown(create_metric_card("bi-bullseye", "Aktif Hedef", stats['aktif_hedef'], "#667eea"), unsafe_allow_html=True)
+    with col2: 
+        st.markdown(create_metric_card("bi-check-all", "Tamamlanan", stats['tamamlanan_hedef'], "#764ba2"), unsafe_allow_html=True)
+    with col3: 
+        st.markdown(create_metric_card("bi-list-task", "Toplam", stats['toplam_hedef'], "#2c3e50"), unsafe_allow_html=True)
+    with col4: 
+        st.markdown(create_metric_card("bi-trophy-fill", "Başarı Oranı", f"{stats['tamamlanma_orani']:.0f}%", "#1d976c"), unsafe_allow_html=True)
+
+    st.markdown("---")
+    st.markdown("#### ➕ Yeni Hedef Ekle")
+    with st.form("hedef_ekle_form", clear_on_submit=True):
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1: hedef_metni = st.text_input("🎯 Hedefin", placeholder="Örn: Bu hafta 3 ders bitireceğim")
+        with col2: kategori = st.selectbox("📁 Kategori", ["Genel", "Ders", "Sınav", "Proje", "Okuma", "Diğer"])
+        with col3: bitis_tarihi = st.date_input("📅 Bitiş Tarihi", min_value=datetime.datetime.now().date())
+        hedef_ekle_btn = st.form_submit_button("🎯 Hedef Ekle", use_container_width=True)
+        if hedef_ekle_btn and hedef_metni:
+            asistan.hedef_takip.hedef_ekle(asistan.kullanici_adi, hedef_metni, bitis_tarihi, kategori)
+            st.success(f"✅ Hedef eklendi: **{hedef_metni}**")
+            st.session_state.show_success_animation = 'hedef_ekle'
+            st.rerun()
+    st.markdown("---")
+    st.markdown("#### 🎯 Aktif Hedeflerim")
+    aktif_hedefler = asistan.hedef_takip.aktif_hedefler(asistan.kullanici_adi)
+    if aktif_hedefler:
+        for hedef in aktif_hedefler:
+            with st.expander(f"{'📌' if hedef.ilerleme < 30 else '🔥' if hedef.ilerleme < 70 else '⭐'} {hedef.metin}", expanded=True):
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.markdown(f"**Kategori:** {hedef.kategori}")
+                    kalan = (hedef.bitis_tarihi - datetime.datetime.now().date()).days
+                    if kalan < 0: st.error(f"⏰ **Süre Doldu!** ({abs(kalan)} gün geçti)")
+                    elif kalan == 0: st.warning("⏰ **Bugün bitiyor!**")
+                    else: st.info(f"📅 **Bitiş:** {hedef.bitis_tarihi} ({kalan} gün kaldı)")
+                    st.progress(hedef.ilerleme / 100); st.caption(f"İlerleme: %{hedef.ilerleme}")
+                with col2:
+                    yeni_ilerleme = st.slider("İlerleme", 0, 100, hedef.ilerleme, key=f"slider_{hedef.id}")
+                    if st.button("💾 Güncelle", key=f"guncelle_{hedef.id}", use_container_width=True):
+                        asistan.hedef_takip.hedef_guncelle(asistan.kullanici_adi, hedef.id, yeni_ilerleme)
+                        if yeni_ilerleme >= 100:
+                            st.success("🎉 Tebrikler! Hedefi tamamladın!")
+                            st.session_state.show_success_animation = 'hedef_tamamla'
+                        st.rerun()
+                    if st.button("✅ Tamamla", key=f"tamamla_{hedef.id}", use_container_width=True):
+                        asistan.hedef_takip.hedef_tamamla(asistan.kullanici_adi, hedef.id)
+                        st.success("🎉 Harika! Hedef tamamlandı!")
+                        st.session_state.show_success_animation = 'hedef_tamamla'
+                        st.rerun()
+                    if st.button("🗑️ Sil", key=f"sil_{hedef.id}", use_container_width=True):
+                        asistan.hedef_takip.hedef_sil(asistan.kullanici_adi, hedef.id); st.rerun()
+    else: st.info("📝 Henüz aktif hedefin yok. Yukarıdan yeni hedef ekleyebilirsin!")
+    st.markdown("---")
+    st.markdown("#### ✅ Tamamlanan Hedefler")
+    tamamlanan = asistan.hedef_takip.tamamlanan_hedefler_listesi(asistan.kullanici_adi)
+    if tamamlanan:
+        with st.expander(f"🏆 {len(tamamlanan)} Hedef Tamamlandı", expanded=False):
+            for hedef in tamamlanan[-5:]:
+                st.success(f"✅ **{hedef.metin}** - _{hedef.kategori}_")
+    else: st.info("Henüz tamamlanmış hedef yok. Çalışmaya devam et!")
+
+
+def _sekme_ogrenme_analitigi(asistan):
+    """Öğrenme analitiği sekmesi."""
+    st.markdown("### 📊 Kişisel Öğrenme Analitiği")
+    st.markdown("*AI destekli çalışma analizi ve kişiselleştirilmiş öneriler*"); st.markdown("")
+    st.markdown("#### 📝 Yeni Çalışma Kaydı Ekle")
+    with st.form("analitik_kayit_form", clear_on_submit=True):
+        col1, col2, col3 = st.columns([2, 1, 2])
+        with col1: ders_sec = st.selectbox("📚 Ders", [d["adi"] for d in asistan.dersler] if asistan.dersler else ["Genel"])
+        with col2: sure_input = st.number_input("⏱️ Süre (saat)", 0.0, 12.0, 1.0, 0.5)
+        with col3: konular_input = st.text_input("📖 Konular", placeholder="Virgülle ayır: Konu1, Konu2")
+        kayit_btn = st.form_submit_button("💾 Kaydı Ekle", use_container_width=True)
+        if kayit_btn and ders_sec and sure_input > 0:
+            konu_listesi = [k.strip() for k in konular_input.split(",") if k.strip()]
+            asistan.ogrenme_analitigi.calisma_kaydet(asistan.kullanici_adi, ders_sec, sure_input, konu_listesi)
+            st.success(f"✅ {ders_sec} dersi için {sure_input} saatlik çalışma kaydedildi!")
+            st.session_state.show_success_animation = 'kayit_ekle'
+            st.rerun()
+    st.markdown("---")
+    st.markdown("#### ⚡ Hızlı İçgörüler")
+    hizli_oneriler = asistan.ogrenme_analitigi.hizli_oneriler(asistan.kullanici_adi)
+    for oneri in hizli_oneriler: st.info(oneri)
+    tekrar = asistan.ogrenme_analitigi.konu_tekrari
+    tekrarlar = tekrar.bugun_tekrar_edilecekler(asistan.kullanici_adi)
+    if tekrarlar:
+        st.markdown("#### 🔁 Bugün Tekrar Edilecek Konular")
+        for i, t in enumerate(tekrarlar):
+            col1, col2, col3 = st.columns([3, 1, 1])
+            with col1:
+                gecikme = f" · {t['gecikme_gun']} gün gecikti" if t["gecikme_gun"] else ""
+                st.markdown(f"**{t['konu']}** - _{t['ders']}_ (tekrar {t['tekrar']}{gecikme})")
+            with col2:
+                if st.button("✅ Hatırladım", key=f"tekrar_iyi_{i}", use_container_width=True):
+                    tekrar.tekrar_kaydet(asistan.kullanici_adi, t["ders"], t["konu"], 4); st.rerun()
+            with col3:
+                if st.button("😓 Zorlandım", key=f"tekrar_zor_{i}", use_container_width=True):
+                    tekrar.tekrar_kaydet(asistan.kullanici_adi, t["ders"], t["konu"], 2); st.rerun()
+    st.markdown("---")
+    st.markdown("#### 📈 Ders Bazlı Analiz")
+    genel_analiz = asistan.ogrenme_analitigi.genel_analiz(asistan.kullanici_adi)
+    if genel_analiz:
+        for ders, veri in genel_analiz.items():
+            with st.expander(f"📚 {ders}", expanded=True):
+                
+                col1, col2, col3, col4 = st.columns(4)
+                with col1: 
+                    st.markdown(create_metric_card("bi-clock-history", "Toplam Süre", f"{veri['toplam_sure']:.1f}h", "#fd7e14"), unsafe_allow_html=True)
+                with col2: 
+                    st.markdown(create_metric_card("bi-calendar-check", "Çalışma Günü", veri['calisma_gun_sayisi'], "#20c997"), unsafe_allow_html=True)
+                with col3: 
+                    st.markdown(create_metric_card("bi-book", "Konu Sayısı", veri['toplam_konu'], "#0dcaf0"), unsafe_allow_html=True)
+                with col4: 
+                    durum_renk = "#28a745" if veri['durum'] == "aktif" else "#ffc107"
+                    durum_ikon = "bi-check-circle-fill" if veri['durum'] == "aktif" else "bi-pause-circle-fill"
+                    st.markdown(create_metric_card(durum_ikon, "Durum", f"{veri['durum'].title()}", durum_renk), unsafe_allow_html=True)
+                
+                if veri['son_calisma'] == 0: st.success("🎉 Bugün çalıştın! Harika!")
+                elif veri['son_calisma'] == 1: st.info("👍 Dün çalışmıştın, bugün de devam edebilirsin!")
+                elif veri['son_calisma'] <= 3: st.warning(f"⏰ {veri['son_calisma']} gün önce çalışmıştın, tekrar başlama zamanı!")
+                else: st.error(f"⚠️ {veri['son_calisma']} gündür çalışmıyorsun! Hemen başla!")
+                if veri.get('son_7_gun_calisma', 0) >= 5: st.success(f"🔥 Son 7 günde {veri['son_7_gun_calisma']} gün çalıştın! Muhteşem tempo!")
+                elif veri.get('son_7_gun_calisma', 0) >= 3: st.info(f"💪 Son 7 günde {veri['son_7_gun_calisma']} gün çalıştın. İyi gidiyorsun!")
+    else: st.info("📝 Henüz çalışma kaydı yok. Yukarıdan ekleyerek başlayabilirsin!")
+    st.markdown("---")
+    st.markdown("#### 🤖 Kişiselleştirilmiş Öneriler")
+    st.markdown("*Asistanın çalışma verilerini analiz ederek sana özel önerilerde bulunuyor*")
+    if st.button("🤖Analizi Başlat", use_container_width=True, key="ai_analiz_btn"):
+        if not genel_analiz: st.warning("⚠️Analiz için önce çalışma kayıtları eklemelisin!")
+        else:
+            with st.spinner("🤖Asistanın verilerini analiz ediyor ve öneriler hazırlıyor..."):
+                ai_onerileri = asistan.ogrenme_analitigi.ai_onerileri_olustur(asistan.kullanici_adi, asistan.api_anahtari)
+                st.markdown("---"); st.markdown(ai_onerileri); st.markdown("---"); st.success("✨Analizi tamamlandı!")
+    if genel_analiz:
+        st.markdown("---"); st.markdown("#### 📊 Genel İstatistikler")
+        toplam_sure = sum([v['toplam_sure'] for v in genel_analiz.values()]); toplam_ders = len(genel_analiz)
+        aktif_dersler = len([v for v in genel_analiz.values() if v['durum'] == 'aktif']); toplam_konu = sum([v['toplam_konu'] for v in genel_analiz.values()])
         
         col1, col2, col3, col4 = st.columns(4)
         with col1: 
-            st.markdown(create_metric_card("bi-bullseye", "Aktif Hedef", stats['aktif_hedef'], "#667eea"), unsafe_allow_html=True)
+            st.markdown(create_metric_card("bi-journals", "Takip Edilen Ders", toplam_ders, "#667eea"), unsafe_allow_html=True)
         with col2: 
-            st.markdown(create_metric_card("bi-check-all", "Tamamlanan", stats['tamamlanan_hedef'], "#764ba2"), unsafe_allow_html=True)
+            st.markdown(create_metric_card("bi-fire", "Aktif Ders", aktif_dersler, "#dc3545"), unsafe_allow_html=True)
         with col3: 
-            st.markdown(create_metric_card("bi-list-task", "Toplam", stats['toplam_hedef'], "#2c3e50"), unsafe_allow_html=True)
+            st.markdown(create_metric_card("bi-stopwatch-fill", "Toplam Çalışma", f"{toplam_sure:.1f}h", "#fd7e14"), unsafe_allow_html=True)
         with col4: 
-            st.markdown(create_metric_card("bi-trophy-fill", "Başarı Oranı", f"{stats['tamamlanma_orani']:.0f}%", "#1d976c"), unsafe_allow_html=True)
+            st.markdown(create_metric_card("bi-card-list", "Toplam Konu", toplam_konu, "#2c3e50"), unsafe_allow_html=True)
 
-        st.markdown("---")
-        st.markdown("#### ➕ Yeni Hedef Ekle")
-        with st.form("hedef_ekle_form", clear_on_submit=True):
-            col1, col2, col3 = st.columns([2, 1, 1])
-            with col1: hedef_metni = st.text_input("🎯 Hedefin", placeholder="Örn: Bu hafta 3 ders bitireceğim")
-            with col2: kategori = st.selectbox("📁 Kategori", ["Genel", "Ders", "Sınav", "Proje", "Okuma", "Diğer"])
-            with col3: bitis_tarihi = st.date_input("📅 Bitiş Tarihi", min_value=datetime.datetime.now().date())
-            hedef_ekle_btn = st.form_submit_button("🎯 Hedef Ekle", use_container_width=True)
-            if hedef_ekle_btn and hedef_metni:
-                asistan.hedef_takip.hedef_ekle(asistan.kullanici_adi, hedef_metni, bitis_tarihi, kategori)
-                st.success(f"✅ Hedef eklendi: **{hedef_metni}**")
-                st.session_state.show_success_animation = 'hedef_ekle'
-                st.rerun()
-        st.markdown("---")
-        st.markdown("#### 🎯 Aktif Hedeflerim")
-        aktif_hedefler = asistan.hedef_takip.aktif_hedefler(asistan.kullanici_adi)
-        if aktif_hedefler:
-            for hedef in aktif_hedefler:
-                with st.expander(f"{'📌' if hedef['ilerleme'] < 30 else '🔥' if hedef['ilerleme'] < 70 else '⭐'} {hedef['metin']}", expanded=True):
-                    col1, col2 = st.columns([3, 1])
-                    with col1:
-                        st.markdown(f"**Kategori:** {hedef['kategori']}")
-                        kalan = (hedef['bitis_tarihi'] - datetime.datetime.now().date()).days
-                        if kalan < 0: st.error(f"⏰ **Süre Doldu!** ({abs(kalan)} gün geçti)")
-                        elif kalan == 0: st.warning(f"⏰ **Bugün bitiyor!**")
-                        else: st.info(f"📅 **Bitiş:** {hedef['bitis_tarihi']} ({kalan} gün kaldı)")
-                        st.progress(hedef['ilerleme'] / 100); st.caption(f"İlerleme: %{hedef['ilerleme']}")
-                    with col2:
-                        yeni_ilerleme = st.slider("İlerleme", 0, 100, hedef['ilerleme'], key=f"slider_{hedef['id']}")
-                        if st.button("💾 Güncelle", key=f"guncelle_{hedef['id']}", use_container_width=True):
-                            asistan.hedef_takip.hedef_guncelle(asistan.kullanici_adi, hedef['id'], yeni_ilerleme)
-                            if yeni_ilerleme >= 100:
-                                st.success("🎉 Tebrikler! Hedefi tamamladın!")
-                                st.session_state.show_success_animation = 'hedef_tamamla'
-                            st.rerun()
-                        if st.button("✅ Tamamla", key=f"tamamla_{hedef['id']}", use_container_width=True):
-                            asistan.hedef_takip.hedef_tamamla(asistan.kullanici_adi, hedef['id'])
-                            st.success("🎉 Harika! Hedef tamamlandı!")
-                            st.session_state.show_success_animation = 'hedef_tamamla'
-                            st.rerun()
-                        if st.button("🗑️ Sil", key=f"sil_{hedef['id']}", use_container_width=True):
-                            asistan.hedef_takip.hedef_sil(asistan.kullanici_adi, hedef['id']); st.rerun()
-        else: st.info("📝 Henüz aktif hedefin yok. Yukarıdan yeni hedef ekleyebilirsin!")
-        st.markdown("---")
-        st.markdown("#### ✅ Tamamlanan Hedefler")
-        tamamlanan = asistan.hedef_takip.tamamlanan_hedefler_listesi(asistan.kullanici_adi)
-        if tamamlanan:
-            with st.expander(f"🏆 {len(tamamlanan)} Hedef Tamamlandı", expanded=False):
-                for hedef in tamamlanan[-5:]:
-                    st.success(f"✅ **{hedef['metin']}** - _{hedef['kategori']}_")
-        else: st.info("Henüz tamamlanmış hedef yok. Çalışmaya devam et!")
-
-    with tab4:
-        st.markdown("### 📊 Kişisel Öğrenme Analitiği")
-        st.markdown("*AI destekli çalışma analizi ve kişiselleştirilmiş öneriler*"); st.markdown("")
-        st.markdown("#### 📝 Yeni Çalışma Kaydı Ekle")
-        with st.form("analitik_kayit_form", clear_on_submit=True):
-            col1, col2, col3 = st.columns([2, 1, 2])
-            with col1: ders_sec = st.selectbox("📚 Ders", [d["adi"] for d in asistan.dersler] if asistan.dersler else ["Genel"])
-            with col2: sure_input = st.number_input("⏱️ Süre (saat)", 0.0, 12.0, 1.0, 0.5)
-            with col3: konular_input = st.text_input("📖 Konular", placeholder="Virgülle ayır: Konu1, Konu2")
-            kayit_btn = st.form_submit_button("💾 Kaydı Ekle", use_container_width=True)
-            if kayit_btn and ders_sec and sure_input > 0:
-                konu_listesi = [k.strip() for k in konular_input.split(",") if k.strip()]
-                asistan.ogrenme_analitigi.calisma_kaydet(asistan.kullanici_adi, ders_sec, sure_input, konu_listesi)
-                st.success(f"✅ {ders_sec} dersi için {sure_input} saatlik çalışma kaydedildi!")
-                st.session_state.show_success_animation = 'kayit_ekle'
-                st.rerun()
-        st.markdown("---")
-        st.markdown("#### ⚡ Hızlı İçgörüler")
-        hizli_oneriler = asistan.ogrenme_analitigi.hizli_oneriler(asistan.kullanici_adi)
-        for oneri in hizli_oneriler: st.info(oneri)
-        st.markdown("---")
-        st.markdown("#### 📈 Ders Bazlı Analiz")
-        genel_analiz = asistan.ogrenme_analitigi.genel_analiz(asistan.kullanici_adi)
-        if genel_analiz:
-            for ders, veri in genel_analiz.items():
-                with st.expander(f"📚 {ders}", expanded=True):
-                    
-                    col1, col2, col3, col4 = st.columns(4)
-                    with col1: 
-                        st.markdown(create_metric_card("bi-clock-history", "Toplam Süre", f"{veri['toplam_sure']:.1f}h", "#fd7e14"), unsafe_allow_html=True)
-                    with col2: 
-                        st.markdown(create_metric_card("bi-calendar-check", "Çalışma Günü", veri['calisma_gun_sayisi'], "#20c997"), unsafe_allow_html=True)
-                    with col3: 
-                        st.markdown(create_metric_card("bi-book", "Konu Sayısı", veri['toplam_konu'], "#0dcaf0"), unsafe_allow_html=True)
-                    with col4: 
-                        durum_renk = "#28a745" if veri['durum'] == "aktif" else "#ffc107"
-                        durum_ikon = "bi-check-circle-fill" if veri['durum'] == "aktif" else "bi-pause-circle-fill"
-                        st.markdown(create_metric_card(durum_ikon, "Durum", f"{veri['durum'].title()}", durum_renk), unsafe_allow_html=True)
-                    
-                    if veri['son_calisma'] == 0: st.success("🎉 Bugün çalıştın! Harika!")
-                    elif veri['son_calisma'] == 1: st.info("👍 Dün çalışmıştın, bugün de devam edebilirsin!")
-                    elif veri['son_calisma'] <= 3: st.warning(f"⏰ {veri['son_calisma']} gün önce çalışmıştın, tekrar başlama zamanı!")
-                    else: st.error(f"⚠️ {veri['son_calisma']} gündür çalışmıyorsun! Hemen başla!")
-                    if veri.get('son_7_gun_calisma', 0) >= 5: st.success(f"🔥 Son 7 günde {veri['son_7_gun_calisma']} gün çalıştın! Muhteşem tempo!")
-                    elif veri.get('son_7_gun_calisma', 0) >= 3: st.info(f"💪 Son 7 günde {veri['son_7_gun_calisma']} gün çalıştın. İyi gidiyorsun!")
-        else: st.info("📝 Henüz çalışma kaydı yok. Yukarıdan ekleyerek başlayabilirsin!")
-        st.markdown("---")
-        st.markdown("#### 🤖 Kişiselleştirilmiş Öneriler")
-        st.markdown("*Asistanın çalışma verilerini analiz ederek sana özel önerilerde bulunuyor*")
-        if st.button("🤖Analizi Başlat", use_container_width=True, key="ai_analiz_btn"):
-            if not genel_analiz: st.warning("⚠️Analiz için önce çalışma kayıtları eklemelisin!")
-            else:
-                with st.spinner("🤖Asistanın verilerini analiz ediyor ve öneriler hazırlıyor..."):
-                    ai_onerileri = asistan.ogrenme_analitigi.ai_onerileri_olustur(asistan.kullanici_adi, asistan.api_anahtari)
-                    st.markdown("---"); st.markdown(ai_onerileri); st.markdown("---"); st.success("✨Analizi tamamlandı!")
-        if genel_analiz:
-            st.markdown("---"); st.markdown("#### 📊 Genel İstatistikler")
-            toplam_sure = sum([v['toplam_sure'] for v in genel_analiz.values()]); toplam_ders = len(genel_analiz)
-            aktif_dersler = len([v for v in genel_analiz.values() if v['durum'] == 'aktif']); toplam_konu = sum([v['toplam_konu'] for v in genel_analiz.values()])
-            
-            col1, col2, col3, col4 = st.columns(4)
-            with col1: 
-                st.markdown(create_metric_card("bi-journals", "Takip Edilen Ders", toplam_ders, "#667eea"), unsafe_allow_html=True)
-            with col2: 
-                st.markdown(create_metric_card("bi-fire", "Aktif Ders", aktif_dersler, "#dc3545"), unsafe_allow_html=True)
-            with col3: 
-                st.markdown(create_metric_card("bi-stopwatch-fill", "Toplam Çalışma", f"{toplam_sure:.1f}h", "#fd7e14"), unsafe_allow_html=True)
-            with col4: 
-                st.markdown(create_metric_card("bi-card-list", "Toplam Konu", toplam_konu, "#2c3e50"), unsafe_allow_html=True)
-    
-    with tab5:
-        st.markdown("### 📊 Görsel Öğrenme Panosu")
-        st.markdown("*Son bir haftalık çalışma performansını grafiklerle incele.*"); st.markdown("")
-        fig_bar, fig_line, ozet = asistan.ogrenme_analitigi.gorsel_pano_olustur(asistan.kullanici_adi)
-        st.info(ozet)
-        if fig_bar and fig_line:
-            st.markdown("---"); st.pyplot(fig_bar); st.markdown("---"); st.pyplot(fig_line); plt.close('all')
-
-    with tab6:
-        st.markdown("### 📄 PDF Analiz ve Özet")
-        st.markdown("*PDF dosyalarını yükle, analiz et, özetle ve soru sor*"); st.markdown("")
-        
-        st.warning("🔒 **Gizlilik Notu:** Analiz için yüklediğiniz PDF dosyası, Google'ın sunucularına gönderilecektir. Lütfen çok hassas veya kişisel veriler içeren belgeleri yüklemeyin.", icon="⚠️")
-        st.markdown("---")
 
-        pdf = st.file_uploader("📎 PDF Dosyası Seç", type="pdf", key="pdf_uploader_main_tab")
-        
-        if pdf:
-            st.success(f"✅ PDF başarıyla yüklendi: **{pdf.name}**")
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("📝 PDF'i Akıllı Asistan ile Özetle", use_container_width=True, key="pdf_ozet_btn"):
-                    with st.spinner("🤖 PDF özenle analiz ediliyor..."):
-                        ozet = asistan.pdf_isleyici.pdf_ozetle(pdf, api_anahtari=asistan.api_anahtari)
-                        st.markdown("#### 📋 Özet"); st.markdown(ozet)
-            with col2:
-                st.markdown("#### ❓ PDF Hakkında Soru Sor")
-                with st.form("pdf_soru_form"):
-                    soru = st.text_input("Sorunuzu yazın", placeholder="Bu PDF'te hangi konular işleniyor?")
-                    soruldu = st.form_submit_button("🤖 Asistana Sor", use_container_width=True)
-                    if soruldu and soru:
-                        with st.spinner("🤖 Cevap hazırlanıyor..."):
-                            cevap = asistan.pdf_isleyici.pdf_soru_cevapla(pdf, soru, asistan.api_anahtari)
-                            st.markdown("#### 💡 Cevap"); st.markdown(cevap)
-        else:
-            st.info("👆 Analiz etmek için bir PDF dosyası yükleyin")
+def _sekme_gorsel_pano(asistan):
+    """Görsel pano sekmesi (Matplotlib grafikleri)."""
+    st.markdown("### 📊 Görsel Öğrenme Panosu")
+    st.markdown("*Son bir haftalık çalışma performansını grafiklerle incele.*"); st.markdown("")
+    fig_bar, fig_line, ozet = asistan.ogrenme_analitigi.gorsel_pano_olustur(asistan.kullanici_adi)
+    st.info(ozet)
+    if fig_bar and fig_line:
+        import matplotlib.pyplot as plt
+        st.markdown("---"); st.pyplot(fig_bar); st.markdown("---"); st.pyplot(fig_line); plt.close('all')
 
-    with tab7:
-        st.markdown("### 🌐 Web Sitesi Analizi")
-        st.markdown("*Herhangi bir web sitesini analiz et ve sorular sor*"); st.markdown("")
-        
-        st.warning("🔒 **Gizlilik Notu:** Analiz için girilen web sitesinin içeriği, Google'ın sunucularına gönderilecektir. Lütfen gizli veya erişimi kısıtlı sitelerin linklerini girmeyin.", icon="⚠️")
-        st.markdown("---")
-        
-        url = st.text_input("🔗 Web Sitesi URL'si", placeholder="https://example.com", key="web_url_input")
-
-        if st.button("🔍 Web Sitesini Analiz Et", use_container_width=True, key="web_analiz_btn") and url:
-            with st.spinner("🤖 Web sitesi analiz ediliyor.."):
-                veri = asistan.web_analiz.web_sitesi_oku(url, api_anahtari=asistan.api_anahtari)
-                if "hata" not in veri:
-                    st.session_state.web_data = veri; st.success(f"✅ **{veri['baslik']}**"); st.markdown("#### 🤖 Asistanın Görüşü"); st.markdown(veri['analiz'])
-                    with st.expander("📄 İçerik Önizleme"): st.text(veri['icerik'][:500] + "...")
-                else: st.error(f"❌ Hata: {veri['hata']}")
-                
-        if 'web_data' in st.session_state:
-            st.markdown("---"); st.markdown("#### ❓ Web Sitesi Hakkında Soru Sor")
-            with st.form("web_soru_form"):
-                web_soru = st.text_input("Sorunuzu yazın", placeholder="Bu web sitesinde hangi bilgiler var?")
-                web_soruldu = st.form_submit_button("🤖 Asistana Sor", use_container_width=True)
-                if web_soruldu and web_soru:
-                    with st.spinner("🤖 Asistanın cevabı dikkatlice hazırlıyor..."):
-                        cevap = asistan.web_analiz.web_icerik_analiz(st.session_state.web_data, web_soru, asistan.api_anahtari)
+
+def _sekme_pdf_isleme(asistan):
+    """PDF işleme sekmesi."""
+    st.markdown("### 📄 PDF Analiz ve Özet")
+    st.markdown("*PDF dosyalarını yükle, analiz et, özetle ve soru sor*"); st.markdown("")
+    
+    st.warning("🔒 **Gizlilik Notu:** Analiz için yüklediğiniz PDF dosyası, Google'ın sunucularına gönderilecektir. Lütfen çok hassas veya kişisel veriler içeren belgeleri yüklemeyin.", icon="⚠️")
+    st.markdown("---")
+
+    pdf = st.file_uploader("📎 PDF Dosyası Seç", type="pdf", key="pdf_uploader_main_tab")
+    
+    if pdf:
+        st.success(f"✅ PDF başarıyla yüklendi: **{pdf.name}**")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("📝 PDF'i Akıllı Asistan ile Özetle", use_container_width=True, key="pdf_ozet_btn"):
+                with st.spinner("🤖 PDF özenle analiz ediliyor..."):
+                    ozet = asistan.pdf_isleyici.pdf_ozetle(pdf, api_anahtari=asistan.api_anahtari)
+                    st.markdown("#### 📋 Özet"); st.markdown(ozet)
+        with col2:
+            st.markdown("#### ❓ PDF Hakkında Soru Sor")
+            with st.form("pdf_soru_form"):
+                soru = st.text_input("Sorunuzu yazın", placeholder="Bu PDF'te hangi konular işleniyor?")
+                soruldu = st.form_submit_button("🤖 Asistana Sor", use_container_width=True)
+                if soruldu and soru:
+                    with st.spinner("🤖 Cevap hazırlanıyor..."):
+                        cevap = asistan.pdf_isleyici.pdf_soru_cevapla(pdf, soru, asistan.api_anahtari)
                         st.markdown("#### 💡 Cevap"); st.markdown(cevap)
+    else:
+        st.info("👆 Analiz etmek için bir PDF dosyası yükleyin")
 
-   # --- RAG SEKME ---
-    with tab8:
-        st.markdown("### 🤖 RAG Temelli PDF Chatbot")
-        st.info("Bu chatbot, uygulama ile birlikte gelen PDF'lerdeki bilgilere dayanarak sorularınızı yanıtlar.", icon="📚")
-        st.markdown("""
-        **Nasıl Çalışır?**
-        Uygulama, `rag_pdfs` klasöründeki PDF dosyalarını otomatik olarak işleyerek bir bilgi veritabanı oluşturmuştur. Sorularınız bu veritabanı kullanılarak cevaplanır.
-        """)
-        st.markdown("---")
 
-        # RAG veritabanının hazır olup olmadığını KONTROL ET veya İLK KEZ OLUŞTUR
-        # Bu fonksiyon, veritabanı zaten varsa True döner, yoksa oluşturmayı dener.
-        rag_ready = asistan.rag_isleyici.initialize_vector_store() 
-
-        if rag_ready:
-            st.markdown("#### 💬 PDF İçeriği Hakkında Soru Sor")
-            user_question = st.text_input("Sorunuzu buraya yazın:", key="rag_question_input", placeholder="Örn: Zaman yönetimi için hangi teknikler var?")
-            if user_question:
-                with st.spinner("Cevap aranıyor..."):
-                    response = asistan.rag_isleyici.user_input(user_question)
-                    st.write("### Asistanın Cevabı:")
-                    st.markdown(response)
-        else:
-            # initialize_vector_store içinde zaten hata mesajı gösterildi.
-            st.error("RAG Chatbot başlatılamadı. Lütfen yönetici ile iletişime geçin veya PDF dosyalarını kontrol edin.")
+def _sekme_web_analiz(asistan):
+    """Web analiz sekmesi."""
+    st.markdown("### 🌐 Web Sitesi Analizi")
+    st.markdown("*Herhangi bir web sitesini analiz et ve sorular sor*"); st.markdown("")
+    
+    st.warning("🔒 **Gizlilik Notu:** Analiz için girilen web sitesinin içeriği, Google'ın sunucularına gönderilecektir. Lütfen gizli veya erişimi kısıtlı sitelerin linklerini girmeyin.", icon="⚠️")
+    st.markdown("---")
+    
+    url = st.text_input("🔗 Web Sitesi URL'si", placeholder="https://example.com", key="web_url_input")
+
+    if st.button("🔍 Web Sitesini Analiz Et", use_container_width=True, key="web_analiz_btn") and url:
+        with st.spinner("🤖 Web sitesi analiz ediliyor.."):
+            veri = asistan.web_analiz.web_sitesi_oku(url, api_anahtari=asistan.api_anahtari)
+            if "hata" not in veri:
+                asistan.web_analiz.son_veri = veri; st.success(f"✅ **{veri['baslik']}**"); st.markdown("#### 🤖 Asistanın Görüşü"); st.markdown(veri['analiz'])
+                with st.expander("📄 İçerik Önizleme"): st.text(veri['icerik'][:500] + "...")
+            else: st.error(f"❌ Hata: {veri['hata']}")
+            
+    if asistan.web_analiz.son_veri:
+        st.markdown("---"); st.markdown("#### ❓ Web Sitesi Hakkında Soru Sor")
+        with st.form("web_soru_form"):
+            web_soru = st.text_input("Sorunuzu yazın", placeholder="Bu web sitesinde hangi bilgiler var?")
+            web_soruldu = st.form_submit_button("🤖 Asistana Sor", use_container_width=True)
+            if web_soruldu and web_soru:
+                with st.spinner("🤖 Asistanın cevabı dikkatlice hazırlıyor..."):
+                    cevap = asistan.web_analiz.web_icerik_analiz(asistan.web_analiz.son_veri, web_soru, asistan.api_anahtari)
+                    st.markdown("#### 💡 Cevap"); st.markdown(cevap)
+
+
+def _sekme_rag_chatbot(asistan):
+    """RAG chatbot sekmesi."""
+    st.markdown("### 🤖 RAG Temelli PDF Chatbot")
+    st.info("Bu chatbot, uygulama ile birlikte gelen PDF'lerdeki bilgilere dayanarak sorularınızı yanıtlar.", icon="📚")
+    st.markdown("""
+    **Nasıl Çalışır?**
+    Uygulama, `rag_pdfs` klasöründeki PDF dosyalarını otomatik olarak işleyerek bir bilgi veritabanı oluşturmuştur. Her alt klasör ayrı bir ders koleksiyonudur; sorularınız sadece seçtiğiniz koleksiyonlarda aranır.
+    """)
+    st.markdown("---")
+
+    yonetici = rag_koleksiyon_yoneticisi()
+    koleksiyonlar = yonetici.koleksiyonlar()
+    if not koleksiyonlar:
+        st.error("RAG Chatbot başlatılamadı: 'rag_pdfs' klasöründe hiç PDF dosyası bulunamadı.")
+        return
+    # Seçim bellekteki indeks sınırını aşmasın; aşarsa her soru bazı indeksleri yeniden yükletir
+    secili = st.multiselect("📚 Koleksiyonlar", koleksiyonlar, default=koleksiyonlar[:1], key="rag_koleksiyonlari",
+                            max_selections=yonetici.azami_bellekte or None,
+                            help="Sorular sadece seçili derslerin belgelerinde aranır.")
+    if not secili:
+        st.info("Soru sormak için en az bir koleksiyon seç.")
+        return
+
+    # Seçili koleksiyonların hazır olup olmadığını KONTROL ET veya İLK KEZ YÜKLE/OLUŞTUR
+    # Bu fonksiyon, hepsi hazırsa True döner; değilse yükleme/inşayı arka planda başlatır, beklemez.
+    rag_ready = asistan.rag_isleyici.initialize_vector_store(secili)
+
+    if rag_ready:
+        st.markdown("#### 💬 PDF İçeriği Hakkında Soru Sor")
+        user_question = st.text_input("Sorunuzu buraya yazın:", key="rag_question_input", placeholder="Örn: Zaman yönetimi için hangi teknikler var?")
+        if user_question:
+            with st.spinner("Cevap aranıyor..."):
+                response = asistan.rag_isleyici.user_input(user_question, secili)
+                st.write("### Asistanın Cevabı:")
+                st.markdown(response)
+                istatistik = asistan.rag_isleyici.son_baglam_istatistigi
+                if istatistik:
+                    st.caption(f"🧮 Bağlam: {istatistik['token_once']} → {istatistik['token_sonra']} token (tahmini), "
+                               f"{istatistik['atilan_cumle']} tekrar eden cümle atıldı")
+    elif asistan.rag_isleyici.api_anahtari:
+        _rag_ilerleme_paneli(tuple(secili))
+    else:
+        # initialize_vector_store içinde zaten hata mesajı gösterildi.
+        st.error("RAG Chatbot başlatılamadı. Lütfen yönetici ile iletişime geçin veya PDF dosyalarını kontrol edin.")
+
+
+@st.fragment(run_every=1.0)
+def _rag_ilerleme_paneli(koleksiyonlar: tuple):
+    """Arka plandaki indeks yükleme/inşasının ilerlemesini saniyede bir yeniler; diğer sekmeler bu sırada kullanılabilir."""
+    yonetici = rag_koleksiyon_yoneticisi()
+    durumlar = {ad: yonetici.insaci(ad, koleksiyonlar).durum_ozeti() for ad in koleksiyonlar}
+    if all(durum["durum"] == "hazir" for durum in durumlar.values()):
+        st.rerun()  # Tüm sayfayı yeniden çalıştır, soru alanı görünsün
+
+    for ad, durum in durumlar.items():
+        if durum["durum"] == "hazir":
+            st.caption(f"✅ {ad}: hazır")
+            continue
+        st.markdown(f"**📚 {ad}**")
+        for uyari in durum["uyarilar"]:
+            st.warning(uyari)
+        if durum["durum"] == "hata":
+            st.error(f"RAG Chatbot başlatılamadı: {durum['hata']}")
+            if st.button("🔄 Tekrar Dene", key=f"rag_tekrar_dene_{ad}"):
+                yonetici.insaci(ad).baslat()
+            continue
+
+        st.info(f"⏳ RAG veritabanı arka planda hazırlanıyor: **{durum['asama'] or 'Başlatılıyor'}**. Bu sırada diğer sekmeleri kullanabilirsin.")
+        if durum["toplam_dosya"]:
+            st.progress(durum["okunan_dosya"] / durum["toplam_dosya"],
+                        text=f"📄 Okunan dosya: {durum['okunan_dosya']}/{durum['toplam_dosya']} · Çıkarılan sayfa: {durum['sayfa']}")
+        if durum["toplam_chunk"]:
+            st.progress(durum["gomulen_chunk"] / durum["toplam_chunk"],
+                        text=f"🧠 Vektöre dönüştürülen chunk: {durum['gomulen_chunk']}/{durum['toplam_chunk']}")
+
+
+def _sekme_sinif_analitigi(asistan):
+    """Sınıf (kohort) analitiği sekmesi; sadece yöneticilere gösterilir."""
+    st.markdown("### 👩‍🏫 Sınıf Analitiği")
+    st.markdown("*Tüm öğrencilerin çalışma kayıtları üzerinden ders toplamları, aktivite ve sıralamalar*"); st.markdown("")
+    kohort = kohort_analitigi()
+    if kohort is None:
+        st.info("Kalıcı veri kapalı (ASISTAN_VERI_DIZINI verilmedi); sınıf analitiği için çalışma kayıtları saklanmıyor.")
+        return
+    ozet = kohort.ozet()
+    if not ozet["ogrenci_sayisi"]:
+        st.info("📝 Henüz hiçbir öğrencinin çalışma kaydı yok.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown(create_metric_card("bi-people-fill", "Öğrenci", ozet["ogrenci_sayisi"], "#667eea"), unsafe_allow_html=True)
+    with col2:
+        st.markdown(create_metric_card("bi-exclamation-triangle-fill", "Durgun Öğrenci", len(ozet["durgun"]), "#dc3545"), unsafe_allow_html=True)
+    with col3:
+        st.markdown(create_metric_card("bi-stopwatch-fill", "Sorgu Süresi", f"{ozet['sure_ms']} ms", "#20c997"), unsafe_allow_html=True)
+
+    st.markdown("---"); st.markdown("#### 📚 Ders Bazlı Toplamlar")
+    st.dataframe(ozet["ders_toplamlari"].rename(columns={"ders": "Ders", "toplam_saat": "Toplam Saat", "ogrenci": "Öğrenci",
+                                                         "ogrenci_basina_saat": "Öğrenci Başına Saat"}),
+                 hide_index=True, use_container_width=True)
+
+    st.markdown("#### 🗓️ Aktivite Isı Haritası (son 12 hafta, saat)")
+    st.dataframe(ozet["isi_haritasi"].style.background_gradient(cmap="Purples", axis=None).format("{:.1f}"),
+                 use_container_width=True)
+
+    st.markdown("#### 💤 Durgun Öğrenciler")
+    if ozet["durgun"].empty:
+        st.success("🎉 Durgun öğrenci yok!")
+    else:
+        st.dataframe(ozet["durgun"].rename(columns={"kullanici": "Öğrenci", "gun_once": "Son Çalışma (gün önce)",
+                                                    "son_7_gun_saat": "Son 7 Gün (saat)",
+                                                    "onceki_haftalik_ort": "Önceki Haftalık Ort.", "neden": "Neden"}),
+                     hide_index=True, use_container_width=True)
+
+    st.markdown("#### 🏅 Yüzdelik Sıralama (son 30 gün)")
+    st.dataframe(ozet["siralama"].head(100).rename(columns={"kullanici": "Öğrenci", "toplam_saat": "Toplam Saat",
+                                                            "yuzdelik": "Yüzdelik"}),
+                 hide_index=True, use_container_width=True)
+
+
+# Sekme başlığı -> sekmeyi çizen fonksiyon
+SEKMELER = {
+    "💬 Sohbet": _sekme_sohbet,
+    "📚 Ders Planlama": _sekme_ders_planlama,
+    "🎯 Hedeflerim": _sekme_hedeflerim,
+    "📊 Öğrenme Analitiği": _sekme_ogrenme_analitigi,
+    "📊 Görsel Pano": _sekme_gorsel_pano,
+    "📄 PDF İşleme": _sekme_pdf_isleme,
+    "🌐 Web Analiz": _sekme_web_analiz,
+    "🤖 RAG Chatbot": _sekme_rag_chatbot,
+}
+# Sadece yönetici şifresiyle (ASISTAN_YONETICI_SIFRESI) giriş yapan oturumlara gösterilen sekmeler
+YONETICI_SEKMELERI = {
+    "👩‍🏫 Sınıf Analitiği": _sekme_sinif_analitigi,
+}
 
-   
 
 def main():
     st.set_page_config(page_title="Akıllı Öğrenci Asistanı", page_icon="🎓", layout="wide")
     if 'logged_in' not in st.session_state:
         st.session_state.logged_in = False
+    # Hazır RAG indeksleri (rag_indeks_olustur.py) ve yeniden sıralama modeli süreç açılışında arka planda yüklenmeye başlar
+    rag_koleksiyon_yoneticisi().on_yukle()
+    yeniden_siralayici().on_yukle()
     if st.session_state.logged_in:
         show_main_app()
     else:
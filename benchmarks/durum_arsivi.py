@@ -0,0 +1,115 @@
+"""
+DurumArsivi dışa/içe aktarma süresi ve boyutu; JSON dökümüyle karşılaştırmalı.
+
+Sentetik bir "yoğun" kullanıcı (çok sayıda çalışma kaydı, konu tekrarı, hedef ve sohbet) üretilir,
+arşive yazılıp geri okunur ve içeriğin birebir aynı olduğu doğrulanır. Aynı durumun
+json.dumps/json.loads (tarihler metin olarak) süresi ve boyutu da raporlanır.
+
+Kullanım:
+    python benchmarks/durum_arsivi.py --kayit 10000,100000
+"""
+import argparse
+import dataclasses
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def asistan_olustur(app, kayit_sayisi: int, rnd: random.Random):
+    asistan = app.AkilliOgrenciAsistani()
+    asistan.kullanici_adi = "yogun"
+    analitik = asistan.ogrenme_analitigi
+    baslangic = datetime.datetime(2024, 1, 1, 8)
+    kayitlar = analitik.calisma_kayitlari.setdefault("yogun", [])
+    for i in range(kayit_sayisi):
+        tarih = baslangic + datetime.timedelta(minutes=rnd.randint(5, 600) * i // 10 + i)
+        kayitlar.append(app.CalismaKaydi(f"Ders{rnd.randrange(12)}", rnd.choice([0.5, 1.0, 1.5, 2.0]), tarih,
+                                         tuple(f"Konu{rnd.randrange(400)}" for _ in range(rnd.randint(0, 3)))))
+    for i in range(min(kayit_sayisi // 100, 2000)):
+        analitik.konu_tekrari.tekrar_kaydet("yogun", f"Ders{i % 12}", f"Konu{i}", rnd.choice([2, 4, 5]),
+                                            datetime.date(2024, 1, 1) + datetime.timedelta(days=i % 300))
+    for i in range(min(kayit_sayisi // 100, 1000)):
+        hedef = asistan.hedef_takip.hedef_ekle("yogun", f"Hedef {i}", datetime.date(2024, 6, 1) + datetime.timedelta(days=i % 90))
+        if rnd.random() < 0.5:
+            asistan.hedef_takip.hedef_tamamla("yogun", hedef.id)
+    for i in range(100):
+        asistan.chat_gecmisi_kaydet(f"Soru {i}", "Cevap metni " * rnd.randint(5, 60))
+    return asistan
+
+
+def _json_varsayilan(nesne):
+    if dataclasses.is_dataclass(nesne):
+        return {alan.name: getattr(nesne, alan.name) for alan in dataclasses.fields(nesne)}
+    return str(nesne)
+
+
+def json_olc(asistan) -> dict:
+    durum = {"kayitlar": asistan.ogrenme_analitigi.calisma_kayitlari, "hedefler": asistan.hedef_takip.hedefler,
+             "chat": asistan.chat_gecmisi, "tekrar": {k: list(d.values()) for k, d in
+                                                     asistan.ogrenme_analitigi.konu_tekrari.durumlar.items()}}
+    t0 = time.perf_counter()
+    metin = json.dumps(durum, default=_json_varsayilan, ensure_ascii=False)
+    yazma = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    json.loads(metin)
+    okuma = time.perf_counter() - t0
+    return {"bayt": len(metin.encode("utf-8")), "yazma_ms": round(yazma * 1000, 1), "okuma_ms": round(okuma * 1000, 1)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Durum arşivi dışa/içe aktarma ölçümü")
+    parser.add_argument("--kayit", default="10000,100000", help="Virgülle ayrılmış çalışma kaydı sayıları")
+    parser.add_argument("--tekrar", type=int, default=5, help="Ölçüm tekrarı (en iyisi raporlanır)")
+    parser.add_argument("--kaydet", default=os.path.join(KOK_DIZIN, "benchmarks", "sonuclar", "durum_arsivi.jsonl"),
+                        help="Sonucun ekleneceği JSON Lines dosyası")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("ASISTAN_VERI_DIZINI", "")
+    sys.path.insert(0, KOK_DIZIN)
+    import app
+    from rag_performansi import _commit_bilgisi
+
+    rnd = random.Random(42)
+    kayit = {"zaman": datetime.datetime.now().isoformat(timespec="seconds"), "commit": _commit_bilgisi(),
+             "python": platform.python_version(), "parametreler": {"kayit": args.kayit, "tekrar": args.tekrar},
+             "olcumler": []}
+    print(f"{'kayıt':>8} {'arşiv KB':>9} {'yazma ms':>9} {'okuma ms':>9} {'json KB':>8} {'json yaz':>9} {'json oku':>9}")
+    for kayit_sayisi in (int(k) for k in args.kayit.split(",")):
+        asistan = asistan_olustur(app, kayit_sayisi, rnd)
+        yazma, okuma = [], []
+        for _ in range(args.tekrar):
+            cikti = io.BytesIO()
+            t0 = time.perf_counter()
+            app.DurumArsivi.disa_aktar(asistan, cikti)
+            yazma.append(time.perf_counter() - t0)
+            kopya = app.AkilliOgrenciAsistani()
+            t0 = time.perf_counter()
+            app.DurumArsivi.ice_aktar(kopya, cikti.getvalue())
+            okuma.append(time.perf_counter() - t0)
+        assert kopya.ogrenme_analitigi.calisma_kayitlari == asistan.ogrenme_analitigi.calisma_kayitlari
+        assert kopya.hedef_takip.hedefler == asistan.hedef_takip.hedefler
+        assert kopya.ogrenme_analitigi.konu_tekrari.durumlar == asistan.ogrenme_analitigi.konu_tekrari.durumlar
+        olcum = {"kayit": kayit_sayisi, "arsiv_bayt": len(cikti.getvalue()),
+                 "yazma_ms": round(min(yazma) * 1000, 1), "okuma_ms": round(min(okuma) * 1000, 1),
+                 "json": json_olc(asistan)}
+        kayit["olcumler"].append(olcum)
+        j = olcum["json"]
+        print(f"{kayit_sayisi:>8} {olcum['arsiv_bayt'] // 1024:>9} {olcum['yazma_ms']:>9} {olcum['okuma_ms']:>9} "
+              f"{j['bayt'] // 1024:>8} {j['yazma_ms']:>9} {j['okuma_ms']:>9}")
+
+    if args.kaydet:
+        os.makedirs(os.path.dirname(args.kaydet), exist_ok=True)
+        with open(args.kaydet, "a", encoding="utf-8") as f:
+            f.write(json.dumps(kayit, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Embedding arka uçlarının (torch / onnx / onnx_int8) yükleme süresi, throughput ve eşdeğerlik ölçümü.
+
+Her arka uç ve iş parçacığı sayısı ayrı bir süreçte (temiz bellek ve iş parçacığı havuzu için)
+uygulamanın _embedding_modeli_olustur() fonksiyonuyla yüklenir ve şunlar ölçülür:
+
+  * model yükleme süresi ve tepe bellek
+  * embed_documents throughput'u (CHUNK_BOYUTU karakterlik sentetik chunk'lar, chunk/sn)
+  * embed_query gecikmesi (p50/p95)
+  * torch arka ucuna göre eşdeğerlik: en büyük mutlak fark ve en düşük kosinüs benzerliği
+
+ONNX arka uçları için model dizini önce onnx_model_disa_aktar.py ile üretilmelidir.
+
+Kullanım:
+    python benchmarks/embedding_arka_ucu.py --model-dizini modeller/embedding_onnx
+    python benchmarks/embedding_arka_ucu.py --arka-uclar onnx,onnx_int8 --is-parcacigi 1,2,4
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def tek_olcum(arka_uc: str, is_parcacigi: int, chunk_sayisi: int, sorgu_sayisi: int) -> dict:
+    """Ortam değişkenleri ana süreçte ayarlanmış olarak alt süreçte çağrılır."""
+    sys.path.insert(0, KOK_DIZIN)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import app
+    from onnx_model_disa_aktar import ORNEK_CUMLELER
+    from rag_performansi import _cumle, _tepe_bellek_mb, _yuzdelikler, sorgular_olustur
+
+    if arka_uc == "torch" and is_parcacigi:
+        import torch
+        torch.set_num_threads(is_parcacigi)
+
+    rnd = random.Random(42)
+    chunklar = []
+    for _ in range(chunk_sayisi):
+        metin = ""
+        while len(metin) < app.CHUNK_BOYUTU:
+            metin += _cumle(rnd) + " "
+        chunklar.append(metin[:app.CHUNK_BOYUTU])
+
+    t0 = time.perf_counter()
+    model = app._embedding_modeli_olustur()
+    yukleme_sn = time.perf_counter() - t0
+
+    model.embed_documents(chunklar[:8])  # Isınma
+    t0 = time.perf_counter()
+    model.embed_documents(chunklar)
+    gomme_sn = time.perf_counter() - t0
+
+    sorgu_ms = []
+    for soru in sorgular_olustur(sorgu_sayisi):
+        t0 = time.perf_counter()
+        model.embed_query(soru)
+        sorgu_ms.append((time.perf_counter() - t0) * 1000)
+
+    return {
+        "arka_uc": arka_uc,
+        "is_parcacigi": is_parcacigi,
+        "yukleme_sn": round(yukleme_sn, 3),
+        "chunk_sn": round(chunk_sayisi / gomme_sn, 1),
+        "embed_query": _yuzdelikler(sorgu_ms),
+        "tepe_bellek_mb": _tepe_bellek_mb(),
+        # Eşdeğerlik ana süreçte torch çıktısıyla karşılaştırılır
+        "ornek_vektorler": model.embed_documents(ORNEK_CUMLELER + chunklar[:16]),
+    }
+
+
+def _alt_surecte_olc(arka_uc: str, is_parcacigi: int, model_dizini: str, chunk_sayisi: int, sorgu_sayisi: int) -> dict:
+    ortam = dict(os.environ, ASISTAN_EMBEDDING_ARKA_UCU=arka_uc, ASISTAN_ONNX_MODEL_DIZINI=model_dizini,
+                 ASISTAN_ONNX_IS_PARCACIGI=str(is_parcacigi))
+    komut = [sys.executable, os.path.abspath(__file__), "--_tek", arka_uc, "--_is", str(is_parcacigi),
+             "--chunk", str(chunk_sayisi), "--sorgu", str(sorgu_sayisi)]
+    sonuc = subprocess.run(komut, cwd=KOK_DIZIN, env=ortam, capture_output=True, text=True)
+    if sonuc.returncode != 0:
+        raise RuntimeError(f"{arka_uc} ({is_parcacigi} iş parçacığı) ölçümü başarısız:\n{sonuc.stderr[-2000:]}")
+    return json.loads(sonuc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Embedding arka uçlarını karşılaştırır")
+    parser.add_argument("--arka-uclar", default="torch,onnx,onnx_int8", help="Virgülle ayrılmış arka uçlar")
+    parser.add_argument("--is-parcacigi", default="0",
+                        help="Virgülle ayrılmış iş parçacığı sayıları (0: çekirdek sayısı)")
+    parser.add_argument("--model-dizini", default=os.path.join("modeller", "embedding_onnx"),
+                        help="onnx_model_disa_aktar.py çıktı dizini")
+    parser.add_argument("--chunk", type=int, default=256, help="Throughput için gömülecek chunk sayısı")
+    parser.add_argument("--sorgu", type=int, default=100, help="embed_query gecikmesi için sorgu sayısı")
+    parser.add_argument("--kaydet", default=os.path.join(KOK_DIZIN, "benchmarks", "sonuclar", "embedding_arka_ucu.jsonl"),
+                        help="Sonucun ekleneceği JSON Lines dosyası")
+    parser.add_argument("--json", action="store_true", help="Sadece JSON çıktı ver")
+    parser.add_argument("--_tek", help=argparse.SUPPRESS)
+    parser.add_argument("--_is", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args._tek:
+        print(json.dumps(tek_olcum(args._tek, args._is, args.chunk, args.sorgu)))
+        return 0
+
+    sys.path.insert(0, KOK_DIZIN)
+    from onnx_model_disa_aktar import embedding_farki
+    from rag_performansi import _commit_bilgisi
+
+    arka_uclar = args.arka_uclar.split(",")
+    is_parcaciklari = [int(n) for n in args.is_parcacigi.split(",")]
+    olcumler = []
+    for arka_uc in arka_uclar:
+        for is_parcacigi in is_parcaciklari:
+            if not args.json:
+                sys.stderr.write(f"{arka_uc} ({is_parcacigi or 'tüm'} iş parçacığı) ölçülüyor...\n")
+            olcumler.append(_alt_surecte_olc(arka_uc, is_parcacigi, args.model_dizini, args.chunk, args.sorgu))
+
+    referans = next((o["ornek_vektorler"] for o in olcumler if o["arka_uc"] == "torch"), None)
+    for olcum in olcumler:
+        vektorler = olcum.pop("ornek_vektorler")
+        olcum["torch_farki"] = embedding_farki(referans, vektorler) if referans else None
+
+    kayit = {
+        "zaman": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_bilgisi(),
+        "python": platform.python_version(),
+        "cpu_sayisi": os.cpu_count(),
+        "parametreler": {"arka_uclar": arka_uclar, "is_parcacigi": is_parcaciklari, "chunk": args.chunk,
+                         "sorgu": args.sorgu},
+        "olcumler": olcumler,
+    }
+    if args.kaydet:
+        os.makedirs(os.path.dirname(args.kaydet), exist_ok=True)
+        with open(args.kaydet, "a", encoding="utf-8") as f:
+            f.write(json.dumps(kayit, ensure_ascii=False) + "\n")
+    if args.json:
+        print(json.dumps(kayit, ensure_ascii=False))
+        return 0
+
+    print(f"{'arka uç':>10} {'iş p.':>6} {'yükleme sn':>11} {'chunk/sn':>9} {'sorgu p50':>10} {'p95':>7} "
+          f"{'bellek MB':>10} {'maks fark':>10} {'min kosinüs':>12}")
+    for o in olcumler:
+        fark = o["torch_farki"] or {}
+        print(f"{o['arka_uc']:>10} {o['is_parcacigi'] or 'tüm':>6} {o['yukleme_sn']:>11} {o['chunk_sn']:>9} "
+              f"{o['embed_query']['p50_ms']:>10} {o['embed_query']['p95_ms']:>7} {o['tepe_bellek_mb']:>10} "
+              f"{fark.get('azami_mutlak_fark', float('nan')):>10.2e} {fark.get('en_dusuk_kosinus', float('nan')):>12.5f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Uygulamanın açılış (import) süresini ve giriş ekranına kadar geçen süreyi ölçer.
+
+`python -X importtime -c "import app"` çıktısından app modülünün kümülatif import
+süresini ve app'in doğrudan import ettiği en pahalı modülleri çıkarır; ardından giriş ekranını
+Streamlit AppTest ile çizerek soğuk başlangıçtan giriş ekranına kadar geçen süreyi ölçer.
+Her ölçüm ayrı bir süreçte yapılır (soğuk başlangıç). Sonuçlar zaman içinde
+karşılaştırılabilmesi için commit bilgisiyle birlikte bir JSON Lines dosyasına eklenir.
+
+Kullanım:
+    python benchmarks/import_suresi.py --tekrar 5
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GIRIS_EKRANI_BETIGI = """
+import time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+assert not at.exception, [e.value for e in at.exception]
+print(time.perf_counter() - t0)
+"""
+
+
+def _importtime_olc():
+    """Tek bir soğuk süreçte importtime çıktısını ayrıştırır: (app_ms, {app'in doğrudan importu: kümülatif_ms})."""
+    sonuc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                           cwd=KOK_DIZIN, capture_output=True, text=True, check=True)
+    satirlar = []  # (derinlik, modul, kumulatif_us)
+    for satir in sonuc.stderr.splitlines():
+        if not satir.startswith("import time:"):
+            continue
+        _, kumulatif, modul = satir[len("import time:"):].split("|")
+        if not kumulatif.strip().isdigit():
+            continue  # başlık satırı
+        satirlar.append(((len(modul) - len(modul.lstrip())) // 2, modul.strip(), int(kumulatif)))
+
+    # importtime çocukları ebeveynden önce yazar: app satırından geriye doğru,
+    # bir derinlik altındaki satırlar app'in doğrudan importlarıdır
+    i = next(i for i, (_, ad, _) in enumerate(satirlar) if ad == "app")
+    derinlik, _, app_us = satirlar[i]
+    dogrudan = {}
+    for d, ad, us in reversed(satirlar[:i]):
+        if d <= derinlik:
+            break
+        if d == derinlik + 1:
+            dogrudan[ad] = us / 1000
+    return app_us / 1000, dogrudan
+
+
+def _giris_ekrani_olc() -> float:
+    sonuc = subprocess.run([sys.executable, "-c", GIRIS_EKRANI_BETIGI],
+                           cwd=KOK_DIZIN, capture_output=True, text=True, check=True)
+    return float(sonuc.stdout.strip().splitlines()[-1])
+
+
+def _commit_bilgisi() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=KOK_DIZIN,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "bilinmiyor"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="app.py import süresi ve giriş ekranına kadar geçen süre ölçümü")
+    parser.add_argument("--tekrar", type=int, default=5, help="Soğuk başlangıç ölçüm sayısı (varsayılan: 5)")
+    parser.add_argument("--en-pahali", type=int, default=10, help="Raporlanacak en pahalı modül sayısı")
+    parser.add_argument("--giris-ekrani-yok", action="store_true", help="AppTest ile giriş ekranı ölçümünü atla")
+    parser.add_argument("--kaydet", default=os.path.join(KOK_DIZIN, "benchmarks", "sonuclar", "import_suresi.jsonl"),
+                        help="Sonucun ekleneceği JSON Lines dosyası")
+    args = parser.parse_args(argv)
+
+    app_sureleri, moduller = [], {}
+    for _ in range(args.tekrar):
+        app_ms, dogrudan = _importtime_olc()
+        app_sureleri.append(app_ms)
+        for ad, ms in dogrudan.items():
+            moduller.setdefault(ad, []).append(ms)
+
+    en_pahali = sorted(((ad, statistics.median(v)) for ad, v in moduller.items()), key=lambda x: -x[1])[:args.en_pahali]
+    kayit = {
+        "tarih": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_bilgisi(),
+        "python": sys.version.split()[0],
+        "tekrar": args.tekrar,
+        "app_import_ms_medyan": round(statistics.median(app_sureleri), 1),
+        "app_import_ms_min": round(min(app_sureleri), 1),
+        "en_pahali_moduller_ms": {ad: round(ms, 1) for ad, ms in en_pahali},
+    }
+    if not args.giris_ekrani_yok:
+        giris = [_giris_ekrani_olc() * 1000 for _ in range(args.tekrar)]
+        kayit["giris_ekrani_ms_medyan"] = round(statistics.median(giris), 1)
+
+    os.makedirs(os.path.dirname(args.kaydet), exist_ok=True)
+    with open(args.kaydet, "a", encoding="utf-8") as f:
+        f.write(json.dumps(kayit, ensure_ascii=False) + "\n")
+    print(json.dumps(kayit, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Kohort analitiği sorgu süreleri: ders toplamları, ısı haritası, durgun öğrenciler, yüzdelik sıralama.
+
+Geçici bir SQLite deposuna sentetik öğrenci x gün çalışma kayıtları (CalismaDeposu.toplu_ekle ile,
+günlük özet dahil) yazılır. Ardından şunlar ölçülür:
+
+  * soğuk yükleme: günlük özetten ve (--ham ile) ham kayıtlardan
+  * her sorgunun p50/p95 süresi (bellekteki çerçeve üzerinde)
+  * artımlı yenileme: yeni kayıtlar eklendikten sonra sadece yeni satırların okunması
+
+Kullanım:
+    python benchmarks/kohort.py --ogrenci 10000 --gun 365
+    python benchmarks/kohort.py --ogrenci 1000 --ham
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DERSLER = ["Matematik", "Fizik", "Kimya", "Biyoloji", "Tarih", "Edebiyat", "İngilizce", "Coğrafya"]
+
+
+def veri_uret(depo, ogrenci_sayisi: int, gun_sayisi: int, bugun: datetime.date, rnd: random.Random) -> int:
+    """Her öğrenci için bir çalışma olasılığı; bir kısmı son haftalarda bırakır (durgun)."""
+    toplam = 0
+    for baslangic in range(0, ogrenci_sayisi, 500):
+        kayitlar = []
+        for o in range(baslangic, min(baslangic + 500, ogrenci_sayisi)):
+            olasilik = rnd.uniform(0.1, 0.9)
+            birakti = rnd.randint(1, 40) if rnd.random() < 0.1 else 0
+            dersler = rnd.sample(DERSLER, 3)
+            for g in range(gun_sayisi, birakti, -1):
+                if rnd.random() < olasilik:
+                    zaman = datetime.datetime.combine(bugun - datetime.timedelta(days=g - 1), datetime.time(20))
+                    kayitlar.append((f"ogrenci{o}", rnd.choice(dersler), rnd.choice([0.5, 1.0, 1.5, 2.0]), [], zaman))
+        toplam += depo.toplu_ekle(kayitlar)
+    return toplam
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Kohort analitiği sorgu süresi ölçümü")
+    parser.add_argument("--ogrenci", type=int, default=10000, help="Öğrenci sayısı")
+    parser.add_argument("--gun", type=int, default=365, help="Geriye doğru gün sayısı")
+    parser.add_argument("--tekrar", type=int, default=20, help="Sorgu başına ölçüm sayısı")
+    parser.add_argument("--ham", action="store_true", help="Ham kayıtlardan soğuk yüklemeyi de ölç")
+    parser.add_argument("--kaydet", default=os.path.join(KOK_DIZIN, "benchmarks", "sonuclar", "kohort.jsonl"),
+                        help="Sonucun ekleneceği JSON Lines dosyası")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, KOK_DIZIN)
+    import app
+    from rag_performansi import _commit_bilgisi, _tepe_bellek_mb, _yuzdelikler
+
+    bugun = datetime.date(2025, 6, 30)
+    rnd = random.Random(42)
+    gecici = tempfile.mkdtemp(prefix="kohort_")
+    try:
+        depo = app.CalismaDeposu(os.path.join(gecici, "asistan.db"))
+        t0 = time.perf_counter()
+        kayit_sayisi = veri_uret(depo, args.ogrenci, args.gun, bugun, rnd)
+        print(f"{kayit_sayisi:,} kayıt yazıldı ({time.perf_counter() - t0:.1f} sn)")
+
+        yukleme = {}
+        for ozet_kullan in ([True, False] if args.ham else [True]):
+            kohort = app.KohortAnalitigi(depo, yenileme_sn=0, ozet_kullan=ozet_kullan)
+            t0 = time.perf_counter()
+            kohort._veri()
+            yukleme["ozet" if ozet_kullan else "ham"] = round(time.perf_counter() - t0, 3)
+
+        kohort = app.KohortAnalitigi(depo, yenileme_sn=3600)
+        kohort._veri()
+        sorgular = {
+            "ders_toplamlari": lambda: kohort.ders_toplamlari(bugun=bugun),
+            "isi_haritasi": lambda: kohort.aktivite_isi_haritasi(bugun=bugun),
+            "durgun_ogrenciler": lambda: kohort.durgun_ogrenciler(bugun=bugun),
+            "yuzdelik_siralamalari": lambda: kohort.yuzdelik_siralamalari(bugun=bugun),
+            "ozet": lambda: kohort.ozet(bugun=bugun),
+        }
+        olcumler = {}
+        for ad, sorgu in sorgular.items():
+            sureler = []
+            for _ in range(args.tekrar):
+                t0 = time.perf_counter()
+                sorgu()
+                sureler.append((time.perf_counter() - t0) * 1000)
+            olcumler[ad] = _yuzdelikler(sureler)
+        durgun = len(kohort.durgun_ogrenciler(bugun=bugun))
+
+        # Artımlı yenileme: bir günlük yeni kayıt ekle, sadece onları oku
+        zaman = datetime.datetime.combine(bugun, datetime.time(21))
+        depo.toplu_ekle([(f"ogrenci{o}", rnd.choice(DERSLER), 1.0, [], zaman) for o in range(0, args.ogrenci, 2)])
+        kohort.yenileme_sn = 0
+        t0 = time.perf_counter()
+        kohort._veri()
+        artimli_ms = round((time.perf_counter() - t0) * 1000, 1)
+        satir_sayisi = len(kohort._cerceve)
+    finally:
+        shutil.rmtree(gecici, ignore_errors=True)
+
+    kayit = {"zaman": datetime.datetime.now().isoformat(timespec="seconds"), "commit": _commit_bilgisi(),
+             "python": platform.python_version(),
+             "parametreler": {"ogrenci": args.ogrenci, "gun": args.gun, "tekrar": args.tekrar},
+             "kayit_sayisi": kayit_sayisi, "cerceve_satiri": satir_sayisi, "durgun_ogrenci": durgun,
+             "soguk_yukleme_sn": yukleme, "artimli_yenileme_ms": artimli_ms, "sorgular": olcumler,
+             "tepe_bellek_mb": _tepe_bellek_mb()}
+    if args.kaydet:
+        os.makedirs(os.path.dirname(args.kaydet), exist_ok=True)
+        with open(args.kaydet, "a", encoding="utf-8") as f:
+            f.write(json.dumps(kayit, ensure_ascii=False) + "\n")
+
+    print(f"soğuk yükleme (sn): {yukleme}  artımlı yenileme: {artimli_ms} ms  durgun: {durgun}")
+    print(f"{'sorgu':>22} {'p50 ms':>8} {'p95 ms':>8}")
+    for ad, o in olcumler.items():
+        print(f"{ad:>22} {o['p50_ms']:>8} {o['p95_ms']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
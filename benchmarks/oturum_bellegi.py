@@ -0,0 +1,101 @@
+"""
+Oturum başına bellek: eski sözlük kayıtları ile __slots__'lı veri modellerinin karşılaştırması.
+
+Aynı rastgele içerikten (çalışma kayıtları, hedefler, sohbet turları) iki durum kurulur:
+
+  * sozluk: eski biçim; kayıtlar {ders, sure, tarih, gun, konular: list}, hedefler ve sohbet
+    turları sözlük, sohbet turunda kullanıcı adı da tutulur
+  * slotlu: uygulamanın CalismaKaydi / Hedef / SohbetTuru nesneleri
+
+Her durumun kurulumu tracemalloc ile ölçülür (kurulum sonrası ayrılmış bayt); sonuç oturum başına
+KB ve kayıt başına bayt olarak raporlanır.
+
+Kullanım:
+    python benchmarks/oturum_bellegi.py --kayit 1000,10000,100000
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import tracemalloc
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BICIMLER = ("sozluk", "slotlu")
+
+
+def ham_veri(kayit_sayisi: int, hedef_sayisi: int, tur_sayisi: int, tohum: int = 42):
+    rnd = random.Random(tohum)
+    baslangic = datetime.datetime(2024, 1, 1, 8)
+    kayitlar = [(f"Ders{rnd.randrange(12)}", rnd.choice([0.5, 1.0, 1.5, 2.0]),
+                 baslangic + datetime.timedelta(minutes=37 * i),
+                 [f"Konu{rnd.randrange(400)}" for _ in range(rnd.randint(0, 3))]) for i in range(kayit_sayisi)]
+    hedefler = [(i, f"Hedef {i}", rnd.choice(["Sınav", "Ödev", "Genel"]), baslangic + datetime.timedelta(hours=i),
+                 datetime.date(2024, 6, 1) + datetime.timedelta(days=i % 90), i % 2 == 0) for i in range(hedef_sayisi)]
+    turlar = [(f"Soru {i}", "Cevap metni " * rnd.randint(5, 60), baslangic + datetime.timedelta(minutes=i))
+              for i in range(tur_sayisi)]
+    return kayitlar, hedefler, turlar
+
+
+def durum_kur(app, bicim: str, kayitlar, hedefler, turlar):
+    # Metinler her iki biçimde de ham veriden paylaşılır; ölçülen fark kayıt kabuklarıdır
+    if bicim == "sozluk":
+        return ([{"ders": d, "sure": s, "tarih": t, "gun": t.date(), "konular": list(k)} for d, s, t, k in kayitlar],
+                [{"id": i, "metin": m, "kategori": c, "olusturma_tarihi": o, "bitis_tarihi": b, "tamamlandi": tm,
+                  "ilerleme": 100 if tm else 0, **({"tamamlanma_tarihi": o} if tm else {})}
+                 for i, m, c, o, b, tm in hedefler],
+                [{"kullanici": "ogrenci", "mesaj": m, "cevap": c, "zaman": z} for m, c, z in turlar])
+    return ([app.CalismaKaydi(d, s, t, tuple(k)) for d, s, t, k in kayitlar],
+            [app.Hedef(i, m, c, o, b, tm, 100 if tm else 0, o if tm else None) for i, m, c, o, b, tm in hedefler],
+            [app.SohbetTuru(m, c, z) for m, c, z in turlar])
+
+
+def olc(app, bicim: str, kayitlar, hedefler, turlar) -> int:
+    tracemalloc.start()
+    once = tracemalloc.get_traced_memory()[0]
+    durum = durum_kur(app, bicim, kayitlar, hedefler, turlar)
+    sonra = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del durum
+    return sonra - once
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Oturum durumunun bellek kullanımını karşılaştırır")
+    parser.add_argument("--kayit", default="1000,10000,100000", help="Virgülle ayrılmış çalışma kaydı sayıları")
+    parser.add_argument("--hedef", type=int, default=200, help="Oturum başına hedef sayısı")
+    parser.add_argument("--tur", type=int, default=100, help="Oturum başına sohbet turu sayısı")
+    parser.add_argument("--kaydet", default=os.path.join(KOK_DIZIN, "benchmarks", "sonuclar", "oturum_bellegi.jsonl"),
+                        help="Sonucun ekleneceği JSON Lines dosyası")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("ASISTAN_VERI_DIZINI", "")
+    sys.path.insert(0, KOK_DIZIN)
+    import app
+    from rag_performansi import _commit_bilgisi
+
+    kayit = {"zaman": datetime.datetime.now().isoformat(timespec="seconds"), "commit": _commit_bilgisi(),
+             "python": platform.python_version(),
+             "parametreler": {"kayit": args.kayit, "hedef": args.hedef, "tur": args.tur}, "olcumler": []}
+    print(f"{'kayıt':>8} {'sözlük KB':>10} {'slotlu KB':>10} {'B/kayıt önce':>13} {'sonra':>7} {'azalma':>7}")
+    for kayit_sayisi in (int(k) for k in args.kayit.split(",")):
+        veri = ham_veri(kayit_sayisi, args.hedef, args.tur)
+        bayt = {bicim: olc(app, bicim, *veri) for bicim in BICIMLER}
+        olcum = {"kayit": kayit_sayisi, **{f"{b}_bayt": n for b, n in bayt.items()},
+                 "azalma_kati": round(bayt["sozluk"] / bayt["slotlu"], 2)}
+        kayit["olcumler"].append(olcum)
+        print(f"{kayit_sayisi:>8} {bayt['sozluk'] // 1024:>10} {bayt['slotlu'] // 1024:>10} "
+              f"{bayt['sozluk'] // max(kayit_sayisi, 1):>13} {bayt['slotlu'] // max(kayit_sayisi, 1):>7} "
+              f"{olcum['azalma_kati']:>6}x")
+
+    if args.kaydet:
+        os.makedirs(os.path.dirname(args.kaydet), exist_ok=True)
+        with open(args.kaydet, "a", encoding="utf-8") as f:
+            f.write(json.dumps(kayit, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
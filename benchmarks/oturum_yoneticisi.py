@@ -0,0 +1,116 @@
+"""
+OturumYoneticisi'nin bellek tavanı ve boşta oturumları diske alma ölçümü.
+
+Farklı büyüklükte --oturum adet asistan (durum_arsivi.py'deki sentetik durumla) yöneticiye verilir
+ve şunlar raporlanır:
+
+  * oturumların tracemalloc ile ölçülen gerçek boyutu ve boyut_tahmini()'nin buna oranı
+  * --tavan-mb ile bakım sonrası bellekte kalan oturum sayısı ve geri kazanılan bellek
+  * tek bakım geçişinin süresi ve diskteki oturumların geri yüklenme (kullan) süresi (p50/p95)
+
+Kullanım:
+    python benchmarks/oturum_yoneticisi.py --oturum 20 --kayit 1000,50000 --tavan-mb 32
+    python benchmarks/oturum_yoneticisi.py --oturum 10 --kayit 20000 --tavan-mb 16
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Oturum yöneticisinin bellek tavanı ve diske alma ölçümü")
+    parser.add_argument("--oturum", type=int, default=20, help="Oturum sayısı")
+    parser.add_argument("--kayit", default="1000,50000", help="Oturum başına çalışma kaydı aralığı (en az,en çok; tek sayı: sabit)")
+    parser.add_argument("--tavan-mb", type=float, default=32, help="Bellek tavanı (MB)")
+    parser.add_argument("--kaydet", default=os.path.join(KOK_DIZIN, "benchmarks", "sonuclar", "oturum_yoneticisi.jsonl"),
+                        help="Sonucun ekleneceği JSON Lines dosyası")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("ASISTAN_VERI_DIZINI", "")
+    sys.path.insert(0, KOK_DIZIN)
+    import app
+    from durum_arsivi import asistan_olustur
+    from rag_performansi import _commit_bilgisi, _yuzdelikler
+
+    sinirlar = [int(k) for k in args.kayit.split(",")]
+    en_az, en_cok = sinirlar[0], sinirlar[-1]
+    rnd = random.Random(42)
+    dizin = tempfile.mkdtemp(prefix="oturum_yoneticisi_")
+    # Bakım ölçümle aynı iş parçacığında: arka plandaki bakım ölçümlere karışmasın
+    yonetici = app.OturumYoneticisi(dizin, bosta_sn=float("inf"), tavan_bayt=int(args.tavan_mb * 2 ** 20),
+                                    arka_plan=False)
+
+    # Isınma: ilk diske alma/geri yükleme pyarrow modüllerini yükler; bu bellek kazanılanı eksiye çekmesin
+    isinma = app.OturumYoneticisi(os.path.join(dizin, "isinma"), bosta_sn=0, arka_plan=False)
+    kimlik = isinma.ekle(asistan_olustur(app, 100, random.Random(0)))
+    isinma.bakim()
+    with isinma.kullan(kimlik):
+        pass
+    isinma.birak(kimlik)
+
+    # Bellek ölçümü için izleme baştan açık; süreler izleme kapalıyken ayrıca ölçülür
+    tracemalloc.start()
+    gercek, tahmin = 0, 0
+    for _ in range(args.oturum):
+        once = tracemalloc.get_traced_memory()[0]
+        asistan = asistan_olustur(app, rnd.randint(en_az, en_cok), rnd)
+        gercek += tracemalloc.get_traced_memory()[0] - once
+        tahmin += app.OturumYoneticisi.boyut_tahmini(asistan)
+        yonetici.ekle(asistan)
+        del asistan
+    gc.collect()
+    once = tracemalloc.get_traced_memory()[0]
+    yonetici.bakim()
+    gc.collect()
+    kazanilan = once - tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    sonra = yonetici.istatistik()
+
+    # Geri yüklerken tavan kapalı: her kullan() çıkışındaki bakım başka bir oturumu diske almasın
+    yonetici.tavan_bayt = 0
+    geri_yukleme = []
+    for kimlik in list(yonetici._diskte):
+        t0 = time.perf_counter()
+        with yonetici.kullan(kimlik):
+            pass
+        geri_yukleme.append((time.perf_counter() - t0) * 1000)
+    yonetici.tavan_bayt = int(args.tavan_mb * 2 ** 20)
+    t0 = time.perf_counter()
+    yonetici.bakim()
+    bakim_ms = (time.perf_counter() - t0) * 1000
+    shutil.rmtree(dizin, ignore_errors=True)
+
+    kayit = {"zaman": datetime.datetime.now().isoformat(timespec="seconds"), "commit": _commit_bilgisi(),
+             "python": platform.python_version(),
+             "parametreler": {"oturum": args.oturum, "kayit": args.kayit, "tavan_mb": args.tavan_mb},
+             "gercek_bayt": gercek, "tahmin_bayt": tahmin, "tahmin_orani": round(tahmin / gercek, 3),
+             "bakim_sonrasi": sonra, "kazanilan_bayt": kazanilan,
+             "bakim_ms": round(bakim_ms, 1),
+             "geri_yukleme": _yuzdelikler(geri_yukleme) if geri_yukleme else None}
+    print(f"{args.oturum} oturum: gerçek {gercek / 2 ** 20:.1f} MB, tahmin {tahmin / 2 ** 20:.1f} MB "
+          f"(oran {kayit['tahmin_orani']})")
+    print(f"tavan {args.tavan_mb} MB: {sonra['bellekte']} oturum bellekte, {sonra['diskte']} diskte, "
+          f"{kazanilan / 2 ** 20:.1f} MB geri kazanıldı, bakım {kayit['bakim_ms']} ms")
+    if geri_yukleme:
+        print(f"geri yükleme p50 {kayit['geri_yukleme']['p50_ms']} ms, p95 {kayit['geri_yukleme']['p95_ms']} ms")
+
+    if args.kaydet:
+        os.makedirs(os.path.dirname(args.kaydet), exist_ok=True)
+        with open(args.kaydet, "a", encoding="utf-8") as f:
+            f.write(json.dumps(kayit, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
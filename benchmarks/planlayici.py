@@ -0,0 +1,95 @@
+"""
+CalismaPlanlayici'nin çözüm süresi ve kısıt sağlama ölçümü.
+
+Rastgele ders kümeleri (zorluk, son çalışma günü, bir kısmı için hedef bitiş tarihi) üretir ve
+farklı ders sayısı / hafta ufku kombinasyonlarında planla() süresini (p50/p95) ölçer. Her planda
+kısıtlar da doğrulanır: günlük saat aşılmaz, bir derse günde en fazla GUNLUK_AZAMI_BLOK verilir.
+Tarihli derslerin bitiş tarihinden sonraya kalan bloklarının oranı "geciken %" olarak raporlanır.
+
+Kullanım:
+    python benchmarks/planlayici.py --dersler 5,15,30 --haftalar 1,4,12
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def senaryo(rnd: random.Random, ders_sayisi: int, baslangic: datetime.date, hafta_sayisi: int):
+    dersler = [{"adi": f"Ders{i}", "zorluk": rnd.choice(["Kolay", "Orta", "Zor"])} for i in range(ders_sayisi)]
+    son_calisma = {d["adi"]: rnd.choice([-1, 0, 1, 3, 7, 20]) for d in dersler}
+    son_tarihler = {d["adi"]: baslangic + datetime.timedelta(days=rnd.randint(0, hafta_sayisi * 7 + 5))
+                    for d in dersler if rnd.random() < 0.3}
+    gunluk_saat = [rnd.choice([1, 2, 3, 4])] * 5 + [rnd.choice([0, 2, 5])] * 2
+    return dersler, son_calisma, son_tarihler, gunluk_saat
+
+
+def kisitlari_dogrula(app, planlayici, sonuc, son_tarihler) -> int:
+    """Kısıtları doğrular; bitiş tarihinden sonraya kalan blok sayısını döner."""
+    geciken = 0
+    for gun in sonuc["gunler"]:
+        toplam = sum(b["sure"] for b in gun["bloklar"])
+        assert toplam <= planlayici.gunluk_saat[gun["tarih"].weekday()], gun
+        for blok in gun["bloklar"]:
+            assert blok["sure"] <= planlayici.GUNLUK_AZAMI_BLOK * planlayici.BLOK_SAAT, gun
+            son_tarih = son_tarihler.get(blok["ders"])
+            if son_tarih is not None and gun["tarih"] > son_tarih:
+                geciken += int(blok["sure"] // planlayici.BLOK_SAAT)
+    return geciken
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Çalışma planlayıcısı çözüm süresi ölçümü")
+    parser.add_argument("--dersler", default="5,15,30", help="Virgülle ayrılmış ders sayıları")
+    parser.add_argument("--haftalar", default="1,4,12", help="Virgülle ayrılmış hafta ufukları")
+    parser.add_argument("--tekrar", type=int, default=50, help="Kombinasyon başına senaryo sayısı")
+    parser.add_argument("--kaydet", default=os.path.join(KOK_DIZIN, "benchmarks", "sonuclar", "planlayici.jsonl"),
+                        help="Sonucun ekleneceği JSON Lines dosyası")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, KOK_DIZIN)
+    import app
+    from rag_performansi import _commit_bilgisi, _yuzdelikler
+
+    baslangic = datetime.date(2025, 1, 6)
+    rnd = random.Random(42)
+    kayit = {"zaman": datetime.datetime.now().isoformat(timespec="seconds"), "commit": _commit_bilgisi(),
+             "parametreler": {"dersler": args.dersler, "haftalar": args.haftalar, "tekrar": args.tekrar},
+             "olcumler": []}
+    print(f"{'ders':>5} {'hafta':>6} {'p50 ms':>8} {'p95 ms':>8} {'yerleşmeyen %':>14} {'geciken %':>10} {'taşınan':>8}")
+    for ders_sayisi in (int(d) for d in args.dersler.split(",")):
+        for hafta_sayisi in (int(h) for h in args.haftalar.split(",")):
+            sureler, yerlesmeyen, geciken, toplam, tasinan = [], 0, 0, 0, 0
+            for _ in range(args.tekrar):
+                dersler, son_calisma, son_tarihler, gunluk_saat = senaryo(rnd, ders_sayisi, baslangic, hafta_sayisi)
+                planlayici = app.CalismaPlanlayici(gunluk_saat)
+                t0 = time.perf_counter()
+                sonuc = planlayici.planla(dersler, baslangic, hafta_sayisi, son_calisma, son_tarihler)
+                sureler.append((time.perf_counter() - t0) * 1000)
+                geciken += kisitlari_dogrula(app, planlayici, sonuc, son_tarihler)
+                yerlesmeyen += sum(sonuc["yerlestirilemeyen"].values())
+                toplam += sum(sonuc["hedef_blok"].values())
+                tasinan += sonuc["tasinan_blok"]
+            olcum = {"ders": ders_sayisi, "hafta": hafta_sayisi, "sure": _yuzdelikler(sureler),
+                     "yerlesmeyen_orani": round(yerlesmeyen / toplam, 4) if toplam else 0.0,
+                     "geciken_orani": round(geciken / toplam, 4) if toplam else 0.0,
+                     "ortalama_tasinan": round(tasinan / args.tekrar, 2)}
+            kayit["olcumler"].append(olcum)
+            print(f"{ders_sayisi:>5} {hafta_sayisi:>6} {olcum['sure']['p50_ms']:>8} {olcum['sure']['p95_ms']:>8} "
+                  f"{olcum['yerlesmeyen_orani'] * 100:>13.2f}% {olcum['geciken_orani'] * 100:>9.2f}% "
+                  f"{olcum['ortalama_tasinan']:>8}")
+
+    if args.kaydet:
+        os.makedirs(os.path.dirname(args.kaydet), exist_ok=True)
+        with open(args.kaydet, "a", encoding="utf-8") as f:
+            f.write(json.dumps(kayit, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""
+RAG ingest ve sorgu hattının performans ölçümü.
+
+Birkaç korpus boyutu için yerelde sentetik PDF'ler üretir ve her boyutu ayrı bir
+süreçte (temiz bellek ölçümü için) şu adımlardan geçirir:
+
+  * RAGIndeksInsaci.insa_et: PDF metin çıkarma, chunk'lama, embedding ve FAISS kurulumu
+    (sayfa/sn, karakter/sn, chunk/sn throughput'ları ve tepe bellek)
+  * artifakt_kaydet: indeksin diskteki boyutu
+  * similarity_search: p50/p95/p99 gecikme
+  * RAGIsleyici.user_input: kaydedilen artifakttan koleksiyon yöneticisiyle yüklenen indeks
+    üzerinde uçtan uca sorgu; LLM zinciri deterministik bir sahte zincirle değiştirilir,
+    böylece ölçüm sadece bizim kodumuzu yansıtır
+
+Aynı sorgular arama, uçtan uca ve ısınma adımlarında tekrarlandığından sorgu embedding
+önbelleği varsayılan olarak kapatılır; --sorgu-onbellegi ile açık ölçülür ve isabet oranı raporlanır.
+
+Sonuçlar commit bilgisiyle birlikte bir JSON Lines dosyasına eklenir; --karsilastir aynı
+parametrelerle alınmış bir önceki ölçüme göre değişimi yazdırır.
+
+Kullanım:
+    python benchmarks/rag_performansi.py --boyutlar 20,100,400
+    python benchmarks/rag_performansi.py --sahte-embedding --karsilastir
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sentetik metin için kelime havuzu. PDF'e standart Helvetica ile yazıldığından ASCII tutulur.
+KELIMELER = (
+    "zaman yonetimi ogrenci akademik basari calisma plani ders sinav hedef motivasyon "
+    "erteleme oncelik takvim verimlilik odaklanma tekrar not ozet konu kaynak proje odev "
+    "universite donem haftalik gunluk disiplin aliskanlik strateji degerlendirme analiz "
+    "performans ogrenme bellek dikkat uyku beslenme stres kaygi destek rehberlik ortam"
+).split()
+SATIR_UZUNLUGU = 90
+SAYFA_BASINA_SATIR = 45
+SAYFA_BASINA_DOSYA = 10
+
+
+# ==================== SENTETİK PDF ====================
+def _pdf_metni_kacir(metin: str) -> str:
+    return metin.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_yaz(yol: str, sayfalar):
+    """Her sayfası satır listesi olan, metni çıkarılabilir minimal bir PDF yazar."""
+    nesneler = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+                b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    sayfa_numaralari = []
+    for satirlar in sayfalar:
+        akis = "BT /F1 10 Tf 14 TL 50 800 Td " + " ".join(f"({_pdf_metni_kacir(s)}) Tj T*" for s in satirlar) + " ET"
+        akis = akis.encode("latin-1")
+        nesneler.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(akis), akis))
+        nesneler.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                        b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(nesneler)))
+        sayfa_numaralari.append(len(nesneler))
+    kidler = " ".join(f"{n} 0 R" for n in sayfa_numaralari).encode()
+    nesneler[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kidler, len(sayfa_numaralari))
+
+    cikti = bytearray(b"%PDF-1.4\n")
+    konumlar = []
+    for i, nesne in enumerate(nesneler, 1):
+        konumlar.append(len(cikti))
+        cikti += b"%d 0 obj\n%s\nendobj\n" % (i, nesne)
+    xref = len(cikti)
+    cikti += b"xref\n0 %d\n0000000000 65535 f \n" % (len(nesneler) + 1)
+    cikti += b"".join(b"%010d 00000 n \n" % k for k in konumlar)
+    cikti += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(nesneler) + 1, xref)
+    with open(yol, "wb") as f:
+        f.write(cikti)
+
+
+def _cumle(rnd: random.Random) -> str:
+    return " ".join(rnd.choice(KELIMELER) for _ in range(rnd.randint(6, 14))).capitalize() + "."
+
+
+def korpus_olustur(klasor: str, sayfa_sayisi: int, tohum: int = 42):
+    """sayfa_sayisi sayfalık korpusu SAYFA_BASINA_DOSYA sayfalık PDF'lere bölerek yazar."""
+    rnd = random.Random(tohum)
+    os.makedirs(klasor, exist_ok=True)
+    for dosya_no, bas in enumerate(range(0, sayfa_sayisi, SAYFA_BASINA_DOSYA)):
+        sayfalar = []
+        for _ in range(min(SAYFA_BASINA_DOSYA, sayfa_sayisi - bas)):
+            metin = " ".join(_cumle(rnd) for _ in range(40))
+            satirlar = [metin[i:i + SATIR_UZUNLUGU] for i in range(0, len(metin), SATIR_UZUNLUGU)]
+            sayfalar.append(satirlar[:SAYFA_BASINA_SATIR])
+        pdf_yaz(os.path.join(klasor, f"sentetik_{dosya_no:04d}.pdf"), sayfalar)
+
+
+def sorgular_olustur(adet: int, tohum: int = 7):
+    rnd = random.Random(tohum)
+    return [" ".join(rnd.choice(KELIMELER) for _ in range(rnd.randint(3, 8))) + "?" for _ in range(adet)]
+
+
+# ==================== ÖLÇÜM (ALT SÜREÇ) ====================
+class SahteZincir:
+    """LLM zincirinin yerine geçen deterministik zincir: ağ çağrısı yapmaz, sabit biçimli cevap döner."""
+
+    def __call__(self, girdiler, return_only_outputs=True):
+        belgeler = girdiler["input_documents"]
+        return {"output_text": f"{len(belgeler)} belge, {sum(len(b.page_content) for b in belgeler)} karakter"}
+
+
+def _yuzdelikler(sureler_ms):
+    sirali = sorted(sureler_ms)
+
+    def yuzdelik(oran):
+        return round(sirali[min(len(sirali) - 1, int(oran * len(sirali)))], 3)
+
+    return {"p50_ms": yuzdelik(0.50), "p95_ms": yuzdelik(0.95), "p99_ms": yuzdelik(0.99),
+            "ortalama_ms": round(sum(sirali) / len(sirali), 3)}
+
+
+def _tepe_bellek_mb() -> float:
+    # Linux'ta ru_maxrss KB, macOS'ta bayt cinsindendir
+    tepe = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(tepe / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def tek_boyut_olc(sayfa_sayisi: int, sorgu_sayisi: int, sahte_embedding: bool, sorgu_onbellegi: bool = False) -> dict:
+    """Bir korpus boyutu için tüm hattı ölçer. Temiz bellek ölçümü için ayrı süreçte çağrılır."""
+    sys.path.insert(0, KOK_DIZIN)
+    import app
+
+    if sahte_embedding:
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+        sahte = DeterministicFakeEmbedding(size=384)
+        # Gerçek fonksiyon gibi hep aynı nesneyi döner; yoksa sorgu önbelleği her çağrıda model değişti sanar
+        app._embedding_modeli_olustur = lambda: sahte
+    onbellek = app.sorgu_embedding_onbellegi()
+    if not sorgu_onbellegi:
+        onbellek.kapasite = 0
+
+    gecici = tempfile.mkdtemp(prefix="rag_performansi_")
+    pdf_klasoru = os.path.join(gecici, "pdfler")
+    indeks_dizini = os.path.join(gecici, "indeks")
+    korpus_olustur(pdf_klasoru, sayfa_sayisi)
+    pdf_bayt = sum(os.path.getsize(os.path.join(pdf_klasoru, d)) for d in os.listdir(pdf_klasoru))
+
+    bellek_once = _tepe_bellek_mb()
+    insaci = app.RAGIndeksInsaci(pdf_klasoru, indeks_dizini)
+    t0 = time.perf_counter()
+    vector_store = insaci.insa_et()
+    insa_sn = time.perf_counter() - t0
+    bellek_sonra = _tepe_bellek_mb()
+    manifest = insaci.artifakt_kaydet(vector_store)
+
+    ist = insaci.istatistikler
+    sureler = ist["sureler_sn"]
+
+    def oran(miktar, sure):
+        return round(miktar / sure, 1) if sure > 0 else None
+
+    sorgular = sorgular_olustur(sorgu_sayisi)
+    for soru in sorgular[:5]:  # Isınma
+        vector_store.similarity_search(soru, k=3)
+    arama_ms = []
+    for soru in sorgular:
+        t0 = time.perf_counter()
+        vector_store.similarity_search(soru, k=3)
+        arama_ms.append((time.perf_counter() - t0) * 1000)
+
+    yonetici = app.RAGKoleksiyonYoneticisi(pdf_klasoru, indeks_dizini)
+    t0 = time.perf_counter()
+    while not yonetici.hazir_mi(yonetici.GENEL):
+        if yonetici.insaci(yonetici.GENEL).durum_ozeti()["durum"] == "hata":
+            raise RuntimeError(yonetici.insaci(yonetici.GENEL).durum_ozeti()["hata"])
+        time.sleep(0.01)
+    artifakt_yukleme_sn = time.perf_counter() - t0
+
+    rag = app.RAGIsleyici(koleksiyon_yoneticisi=yonetici)
+    rag._get_conversational_chain = SahteZincir
+    uctan_uca_ms = []
+    baglam_tokenlari = []  # (sıkıştırma öncesi, sonrası)
+    for soru in sorgular:
+        t0 = time.perf_counter()
+        rag.user_input(soru, [yonetici.GENEL])
+        uctan_uca_ms.append((time.perf_counter() - t0) * 1000)
+        baglam_tokenlari.append((rag.son_baglam_istatistigi["token_once"], rag.son_baglam_istatistigi["token_sonra"]))
+    shutil.rmtree(gecici, ignore_errors=True)
+
+    return {
+        "sayfa_sayisi": ist["sayfa_sayisi"],
+        "dosya_sayisi": ist["dosya_sayisi"],
+        "pdf_bayt": pdf_bayt,
+        "karakter_sayisi": ist["karakter_sayisi"],
+        "chunk_sayisi": ist["chunk_sayisi"],
+        "insa_sn": round(insa_sn, 3),
+        "asama_sureleri_sn": sureler,
+        "throughput": {
+            "cikarma_sayfa_sn": oran(ist["sayfa_sayisi"], sureler["okuma"]),
+            "cikarma_mb_sn": oran(pdf_bayt / 1e6, sureler["okuma"]),
+            "parcalama_karakter_sn": oran(ist["karakter_sayisi"], sureler["parcalama"]),
+            "embedding_chunk_sn": oran(ist["chunk_sayisi"], sureler["embedding"]),
+        },
+        "tepe_bellek_mb": bellek_sonra,
+        "insa_bellek_artisi_mb": round(bellek_sonra - bellek_once, 1),
+        "indeks_boyutu_bayt": manifest["istatistikler"]["indeks_boyutu_bayt"],
+        "artifakt_yukleme_sn": round(artifakt_yukleme_sn, 3),
+        "similarity_search": _yuzdelikler(arama_ms),
+        "uctan_uca_sahte_llm": _yuzdelikler(uctan_uca_ms),
+        "sorgu_onbellegi_isabet_orani": round(onbellek.isabet_orani, 3) if sorgu_onbellegi else None,
+        "baglam_token_ortalama": {
+            "once": round(sum(o for o, _ in baglam_tokenlari) / len(baglam_tokenlari), 1),
+            "sonra": round(sum(s for _, s in baglam_tokenlari) / len(baglam_tokenlari), 1),
+        },
+    }
+
+
+# ==================== ANA SÜREÇ ====================
+def _commit_bilgisi() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=KOK_DIZIN,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "bilinmiyor"
+
+
+def _alt_surecte_olc(sayfa_sayisi: int, sorgu_sayisi: int, sahte_embedding: bool, sorgu_onbellegi: bool) -> dict:
+    komut = [sys.executable, os.path.abspath(__file__), "--_tek-boyut", str(sayfa_sayisi),
+             "--sorgu", str(sorgu_sayisi)] + (["--sahte-embedding"] if sahte_embedding else []) \
+        + (["--sorgu-onbellegi"] if sorgu_onbellegi else [])
+    sonuc = subprocess.run(komut, cwd=KOK_DIZIN, capture_output=True, text=True)
+    if sonuc.returncode != 0:
+        raise RuntimeError(f"{sayfa_sayisi} sayfalık ölçüm başarısız:\n{sonuc.stderr[-2000:]}")
+    return json.loads(sonuc.stdout.strip().splitlines()[-1])
+
+
+def _onceki_kayit(dosya: str, parametreler: dict):
+    """Aynı parametrelerle alınmış son kaydı döner."""
+    if not os.path.exists(dosya):
+        return None
+    onceki = None
+    with open(dosya, encoding="utf-8") as f:
+        for satir in f:
+            kayit = json.loads(satir)
+            if kayit.get("parametreler") == parametreler:
+                onceki = kayit
+    return onceki
+
+
+def _karsilastir(onceki: dict, yeni: dict):
+    print(f"\nKarşılaştırma: {onceki['commit']} ({onceki['zaman']}) -> {yeni['commit']}")
+    onceki_boyutlar = {b["sayfa_sayisi"]: b for b in onceki["boyutlar"]}
+    for b in yeni["boyutlar"]:
+        o = onceki_boyutlar.get(b["sayfa_sayisi"])
+        if o is None:
+            continue
+        for ad, eski, simdi in (
+            ("insa_sn", o["insa_sn"], b["insa_sn"]),
+            ("tepe_bellek_mb", o["tepe_bellek_mb"], b["tepe_bellek_mb"]),
+            ("arama_p95_ms", o["similarity_search"]["p95_ms"], b["similarity_search"]["p95_ms"]),
+            ("uctan_uca_p95_ms", o["uctan_uca_sahte_llm"]["p95_ms"], b["uctan_uca_sahte_llm"]["p95_ms"]),
+        ):
+            degisim = (simdi - eski) / eski * 100 if eski else 0.0
+            print(f"  {b['sayfa_sayisi']:>5} sayfa  {ad:18s} {eski:>10} -> {simdi:>10}  ({degisim:+.1f}%)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="RAG ingest ve sorgu hattı performans ölçümü")
+    parser.add_argument("--boyutlar", default="20,100,400", help="Virgülle ayrılmış korpus boyutları (sayfa)")
+    parser.add_argument("--sorgu", type=int, default=200, help="Boyut başına ölçülen sorgu sayısı")
+    parser.add_argument("--sahte-embedding", action="store_true",
+                        help="Gerçek model yerine deterministik sahte embedding kullan (model indirmeden hattı ölçer)")
+    parser.add_argument("--sorgu-onbellegi", action="store_true",
+                        help="Sorgu embedding önbelleğini açık bırak (tekrarlanan sorgular modeli çalıştırmaz)")
+    parser.add_argument("--kaydet", default=os.path.join(KOK_DIZIN, "benchmarks", "sonuclar", "rag_performansi.jsonl"),
+                        help="Sonucun ekleneceği JSON Lines dosyası")
+    parser.add_argument("--karsilastir", action="store_true", help="Aynı parametrelerle alınmış önceki ölçümle karşılaştır")
+    parser.add_argument("--json", action="store_true", help="Sadece JSON çıktı ver")
+    parser.add_argument("--_tek-boyut", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args._tek_boyut is not None:
+        print(json.dumps(tek_boyut_olc(args._tek_boyut, args.sorgu, args.sahte_embedding, args.sorgu_onbellegi)))
+        return 0
+
+    parametreler = {"boyutlar": [int(b) for b in args.boyutlar.split(",")], "sorgu": args.sorgu,
+                    "sahte_embedding": args.sahte_embedding}
+    if args.sorgu_onbellegi:
+        # Önbelleksiz ölçümler eski kayıtlarla karşılaştırılabilir kalsın diye anahtar sadece açıkken eklenir
+        parametreler["sorgu_onbellegi"] = True
+    kayit = {
+        "zaman": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_bilgisi(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_sayisi": os.cpu_count(),
+        "parametreler": parametreler,
+        "boyutlar": [],
+    }
+    for sayfa_sayisi in parametreler["boyutlar"]:
+        if not args.json:
+            sys.stderr.write(f"{sayfa_sayisi} sayfa ölçülüyor...\n")
+        kayit["boyutlar"].append(_alt_surecte_olc(sayfa_sayisi, args.sorgu, args.sahte_embedding, args.sorgu_onbellegi))
+
+    onceki = _onceki_kayit(args.kaydet, parametreler) if args.karsilastir else None
+    if args.kaydet:
+        os.makedirs(os.path.dirname(args.kaydet), exist_ok=True)
+        with open(args.kaydet, "a", encoding="utf-8") as f:
+            f.write(json.dumps(kayit, ensure_ascii=False) + "\n")
+
+    if args.json:
+        print(json.dumps(kayit, ensure_ascii=False))
+        return 0
+
+    print(f"{'sayfa':>6} {'chunk':>6} {'inşa sn':>8} {'sayfa/sn':>9} {'chunk/sn':>9} {'bellek MB':>10} "
+          f"{'indeks KB':>10} {'ara p50':>8} {'p95':>7} {'p99':>7} {'uçtan uca p95':>14} {'bağlam token':>14}")
+    for b in kayit["boyutlar"]:
+        t, ara = b["throughput"], b["similarity_search"]
+        print(f"{b['sayfa_sayisi']:>6} {b['chunk_sayisi']:>6} {b['insa_sn']:>8} {t['cikarma_sayfa_sn']:>9} "
+              f"{t['embedding_chunk_sn']:>9} {b['tepe_bellek_mb']:>10} {b['indeks_boyutu_bayt'] // 1024:>10} "
+              f"{ara['p50_ms']:>8} {ara['p95_ms']:>7} {ara['p99_ms']:>7} {b['uctan_uca_sahte_llm']['p95_ms']:>14} "
+              f"{b['baglam_token_ortalama']['once']:>6} -> {b['baglam_token_ortalama']['sonra']:<6}")
+    if onceki:
+        _karsilastir(onceki, kayit)
+    elif args.karsilastir:
+        print("\nAynı parametrelerle alınmış önceki ölçüm bulunamadı.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
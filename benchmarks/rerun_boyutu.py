@@ -0,0 +1,89 @@
+"""
+Her rerun'da tarayıcıya gönderilen eleman yükünü (bayt) ölçer.
+
+Streamlit her rerun'da sayfadaki tüm elemanları delta mesajı olarak yeniden gönderir.
+Bu betik uygulamayı Streamlit AppTest ile çalıştırır ve eleman ağacındaki protobuf
+mesajlarının serileştirilmiş boyutlarını toplar: giriş ekranı ve örnek verilerle
+doldurulmuş ana uygulamanın her sekmesi için ayrı ayrı.
+
+Kullanım:
+    python benchmarks/rerun_boyutu.py
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+
+from streamlit.testing.v1 import AppTest
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_YOLU = os.path.join(KOK_DIZIN, "app.py")
+
+
+def _agac_boyutu(dugum) -> int:
+    """Eleman ağacındaki tüm protobuf mesajlarının serileştirilmiş boyut toplamı."""
+    toplam = 0
+    proto = getattr(dugum, "proto", None)
+    if proto is not None and hasattr(proto, "ByteSize"):
+        toplam += proto.ByteSize()
+    for cocuk in getattr(dugum, "children", {}).values():
+        toplam += _agac_boyutu(cocuk)
+    return toplam
+
+
+def _ornek_veri_ekle(asistan):
+    bugun = datetime.date.today()
+    kullanici = asistan.kullanici_adi
+    for ders, zorluk in (("Matematik", "Zor"), ("Fizik", "Orta"), ("Tarih", "Kolay")):
+        asistan.ders_ekle(ders, zorluk)
+        asistan.ogrenme_analitigi.calisma_kaydet(kullanici, ders, 1.5, ["konu 1", "konu 2"])
+    for i in range(3):
+        asistan.hedef_takip.hedef_ekle(kullanici, f"Hedef {i + 1}", bugun + datetime.timedelta(days=i), "Ders")
+
+
+def olc() -> dict:
+    sonuc = {}
+    at = AppTest.from_file(APP_YOLU, default_timeout=120)
+    at.run()
+    sonuc["giris_ekrani"] = _agac_boyutu(at._tree)
+
+    at = AppTest.from_file(APP_YOLU, default_timeout=120)
+    at.session_state.logged_in = True
+    at.session_state.kullanici_adi = "ornek"
+    at.run()
+    asistan = at.session_state["asistan"]
+    asistan.kullanici_adi = "ornek"
+    _ornek_veri_ekle(asistan)
+    at.run()
+
+    # Sekme gezintisi yoksa (eski sürümler) tek bir ana uygulama ölçümü yapılır
+    try:
+        sekmeler = at.radio(key="aktif_sekme").options
+    except KeyError:
+        sekmeler = []
+    if not sekmeler:
+        sonuc["ana_uygulama"] = _agac_boyutu(at._tree)
+    for sekme in sekmeler:
+        if sekme == "🤖 RAG Chatbot":
+            continue  # İndeks inşasını tetiklememek için atlanır
+        at.radio(key="aktif_sekme").set_value(sekme).run()
+        sonuc[f"ana_uygulama/{sekme}"] = _agac_boyutu(at._tree)
+    return sonuc
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rerun başına gönderilen eleman yükünü ölçer")
+    parser.add_argument("--json", action="store_true", help="Sadece JSON çıktı ver")
+    args = parser.parse_args(argv)
+    sonuc = olc()
+    if args.json:
+        print(json.dumps(sonuc, ensure_ascii=False))
+    else:
+        for ad, bayt in sonuc.items():
+            print(f"{ad:40s} {bayt:>8,d} bayt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
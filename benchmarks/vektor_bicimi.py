@@ -0,0 +1,140 @@
+"""
+RAG vektör saklama biçimlerinin karşılaştırması: float32 (FAISS) / int8 / ikili.
+
+Sentetik bir korpus için embedding'ler bir kez hesaplanır; aynı vektörlerden her biçimde
+bir depo kurulup diske yazılır ve uygulamanın yaptığı gibi (bellek eşlemeli) geri yüklenir.
+Her biçim için şunlar raporlanır:
+
+  * recall@k: tam float32 L2 aramasının ilk k sonucundan kaçının bulunduğu
+  * bellekte kalan bayt: float32'de FAISS vektörleri + docstore'daki chunk metinleri,
+    kompakt biçimlerde nicemlenmiş kodlar + metin konum tablosu (float vektörler ve metinler
+    mmap'li dosyalardadır, sadece erişilen sayfalar okunur)
+  * diskteki artifakt boyutu ve similarity_search gecikmesi
+
+Kullanım:
+    python benchmarks/vektor_bicimi.py --sayfa 200
+    python benchmarks/vektor_bicimi.py --sahte-embedding --k 3,10
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BICIMLER = ("float32", "int8", "ikili")
+
+
+def _bellekteki_bayt(depo) -> int:
+    if hasattr(depo, "konumlar"):
+        return depo.indeks.code_size * depo.indeks.ntotal + depo.konumlar.nbytes
+    metin_bayt = sum(sys.getsizeof(b.page_content) for b in depo.docstore._dict.values())
+    return depo.index.ntotal * depo.index.d * 4 + metin_bayt
+
+
+def olc(sayfa_sayisi: int, sorgu_sayisi: int, k_degerleri, sahte_embedding: bool) -> dict:
+    sys.path.insert(0, KOK_DIZIN)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import numpy as np
+    import app
+    from rag_performansi import _commit_bilgisi, _yuzdelikler, korpus_olustur, sorgular_olustur
+
+    if sahte_embedding:
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+        app._embedding_modeli_olustur = lambda: DeterministicFakeEmbedding(size=384)
+
+    gecici = tempfile.mkdtemp(prefix="vektor_bicimi_")
+    pdf_klasoru = os.path.join(gecici, "pdfler")
+    korpus_olustur(pdf_klasoru, sayfa_sayisi)
+    referans = app.RAGIndeksInsaci(pdf_klasoru, os.path.join(gecici, "float32"), vektor_bicimi="float32").insa_et()
+    embedding = referans.embedding_function
+    vektorler = referans.index.reconstruct_n(0, referans.index.ntotal)
+    metinler = [referans.docstore.search(referans.index_to_docstore_id[i]).page_content
+                for i in range(referans.index.ntotal)]
+
+    sorgular = sorgular_olustur(sorgu_sayisi)
+    sorgu_vektorleri = np.asarray([embedding.embed_query(s) for s in sorgular], dtype="float32")
+    en_buyuk_k = max(k_degerleri)
+    uzakliklar = ((sorgu_vektorleri[:, None, :] - vektorler[None, :, :]) ** 2).sum(axis=2)
+    dogru = [[metinler[i] for i in satir] for satir in np.argsort(uzakliklar, axis=1)[:, :en_buyuk_k]]
+
+    sonuc = {"zaman": datetime.datetime.now().isoformat(timespec="seconds"), "commit": _commit_bilgisi(),
+             "python": platform.python_version(),
+             "parametreler": {"sayfa": sayfa_sayisi, "sorgu": sorgu_sayisi, "k": list(k_degerleri),
+                              "sahte_embedding": sahte_embedding},
+             "chunk_sayisi": len(metinler), "boyut": int(vektorler.shape[1]), "bicimler": {}}
+    for bicim in BICIMLER:
+        dizin = os.path.join(gecici, bicim)
+        os.makedirs(dizin, exist_ok=True)
+        if bicim == "float32":
+            depo = referans
+        else:
+            depo = app.KompaktVektorDeposu.olustur(metinler, vektorler, embedding, bicim)
+        insaci = app.RAGIndeksInsaci(pdf_klasoru, dizin, vektor_bicimi=bicim)
+        manifest = insaci.artifakt_kaydet(depo)
+        depo = insaci.artifakti_yukle()
+
+        recall = {}
+        for k in k_degerleri:
+            bulunan = 0
+            for soru, beklenen in zip(sorgular, dogru):
+                sonuclar = {b.page_content for b in depo.similarity_search(soru, k=k)}
+                bulunan += len(sonuclar & set(beklenen[:k]))
+            recall[f"recall@{k}"] = round(bulunan / (k * len(sorgular)), 4)
+        arama_ms = []
+        for soru in sorgular:
+            t0 = time.perf_counter()
+            depo.similarity_search(soru, k=3)
+            arama_ms.append((time.perf_counter() - t0) * 1000)
+        sonuc["bicimler"][bicim] = {
+            **recall,
+            "bellekte_bayt": _bellekteki_bayt(depo),
+            "disk_bayt": manifest["istatistikler"]["indeks_boyutu_bayt"],
+            "similarity_search": _yuzdelikler(arama_ms),
+        }
+    shutil.rmtree(gecici, ignore_errors=True)
+
+    taban = sonuc["bicimler"]["float32"]["bellekte_bayt"]
+    for b in sonuc["bicimler"].values():
+        b["bellek_azalma_kati"] = round(taban / b["bellekte_bayt"], 1)
+    return sonuc
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="RAG vektör saklama biçimlerini karşılaştırır")
+    parser.add_argument("--sayfa", type=int, default=200, help="Sentetik korpus boyutu (sayfa)")
+    parser.add_argument("--sorgu", type=int, default=100, help="Ölçülen sorgu sayısı")
+    parser.add_argument("--k", default="3,10", help="Virgülle ayrılmış recall@k değerleri")
+    parser.add_argument("--sahte-embedding", action="store_true",
+                        help="Gerçek model yerine deterministik sahte embedding kullan")
+    parser.add_argument("--kaydet", default=os.path.join(KOK_DIZIN, "benchmarks", "sonuclar", "vektor_bicimi.jsonl"),
+                        help="Sonucun ekleneceği JSON Lines dosyası")
+    parser.add_argument("--json", action="store_true", help="Sadece JSON çıktı ver")
+    args = parser.parse_args(argv)
+
+    k_degerleri = [int(k) for k in args.k.split(",")]
+    sonuc = olc(args.sayfa, args.sorgu, k_degerleri, args.sahte_embedding)
+    if args.kaydet:
+        os.makedirs(os.path.dirname(args.kaydet), exist_ok=True)
+        with open(args.kaydet, "a", encoding="utf-8") as f:
+            f.write(json.dumps(sonuc, ensure_ascii=False) + "\n")
+    if args.json:
+        print(json.dumps(sonuc, ensure_ascii=False))
+        return 0
+
+    print(f"{sonuc['chunk_sayisi']} chunk, {sonuc['boyut']} boyut, {args.sorgu} sorgu")
+    basliklar = "".join(f"{'recall@' + str(k):>11}" for k in k_degerleri)
+    print(f"{'biçim':>8}{basliklar} {'bellek KB':>10} {'azalma':>7} {'disk KB':>8} {'ara p50':>8} {'p95':>7}")
+    for bicim, b in sonuc["bicimler"].items():
+        recall = "".join(f"{b[f'recall@{k}']:>11}" for k in k_degerleri)
+        print(f"{bicim:>8}{recall} {b['bellekte_bayt'] // 1024:>10} {b['bellek_azalma_kati']:>6}x "
+              f"{b['disk_bayt'] // 1024:>8} {b['similarity_search']['p50_ms']:>8} {b['similarity_search']['p95_ms']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+"""
+Eşzamanlı Streamlit oturumları için yük testi.
+
+Tek bir süreçte N sanal öğrenci oturumunu (her biri ayrı bir Streamlit AppTest örneği,
+ayrı bir iş parçacığında) gerçekçi akışlardan geçirir:
+
+  giris        giriş formunu doldurup API anahtarı doğrulamasıyla ana uygulamaya geçiş
+  kayit_ekle   Öğrenme Analitiği sekmesinden çalışma kaydı ekleme
+  pano         Görsel Pano sekmesi (matplotlib grafikleri)
+  sohbet       Sohbet sekmesinden mesaj gönderme
+  rag          RAG Chatbot sekmesinden soru sorma
+
+Süreç genelindeki önbellekler (cache_resource: RAG indeksi, anahtar doğrulama, izleyici)
+gerçek sunucudaki gibi oturumlar arasında paylaşılır. Gemini çağrıları ve RAG zincirindeki
+LLM, ağa çıkmayan ve isteğe bağlı gecikme ekleyen sahte sürümlerle değiştirilir.
+
+Her eşzamanlılık seviyesi için akış bazlı p50/p95/p99 gecikme, oturum başına bellek
+(RSS artışı ve asistan nesnesinin yaklaşık boyutu) ve CPU doygunluğu raporlanır.
+Sonuçlar commit bilgisiyle birlikte bir JSON Lines dosyasına eklenir.
+
+Kullanım:
+    python benchmarks/yuk_testi.py --oturumlar 1,5,10,20 --tur 3
+    python benchmarks/yuk_testi.py --oturumlar 10 --llm-gecikme-ms 800 --rag-korpus 50 --sahte-embedding
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_YOLU = os.path.join(KOK_DIZIN, "app.py")
+AKISLAR = ("giris", "kayit_ekle", "pano", "sohbet", "rag")
+DERSLER = ("Matematik", "Fizik", "Kimya", "Tarih")
+
+
+# ==================== SAHTE LLM ====================
+def sahte_llm_kur(gecikme_ms: float):
+    """google.generativeai ve RAG zincirindeki sohbet modelini ağa çıkmayan sürümlerle değiştirir.
+
+    app.py bu modülleri fonksiyon içinde import ettiğinden modül özniteliklerini değiştirmek yeterlidir.
+    Gecikme time.sleep ile eklenir; gerçek ağ beklemesi gibi GIL'i bırakır.
+    """
+    import google.generativeai as genai
+    import langchain_google_genai
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    class SahteModel:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def generate_content(self, icerik):
+            time.sleep(gecikme_ms / 1000)
+            return SimpleNamespace(text="Sahte cevap: düzenli tekrar yap ve hedeflerini küçük parçalara böl.",
+                                   usage_metadata=None)
+
+    class SahteSohbetModeli(FakeListChatModel):
+        def _call(self, *args, **kwargs):
+            time.sleep(gecikme_ms / 1000)
+            return super()._call(*args, **kwargs)
+
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = SahteModel
+    genai.list_models = lambda: iter(["models/sahte"])
+    langchain_google_genai.ChatGoogleGenerativeAI = (
+        lambda **kwargs: SahteSohbetModeli(responses=["Sahte RAG cevabı: bağlamdaki tekniklere göre plan yap."]))
+
+
+def sahte_embedding_kur():
+    """HuggingFace modelini indirmeden RAG akışını çalıştırmak için deterministik embedding."""
+    import langchain_community.embeddings
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    langchain_community.embeddings.HuggingFaceEmbeddings = lambda **kwargs: DeterministicFakeEmbedding(size=384)
+
+
+def eszamanli_apptest_kur():
+    """AppTest'i eşzamanlı iş parçacıklarında gerçek sunucuya benzer şekilde çalıştırır.
+
+    AppTest tek bir test için tasarlanmıştır: her rerun'da yeni bir ScriptCache kurup betiği
+    yeniden derler ve bittiğinde global Runtime örneğini siler. Gerçek sunucuda ise tüm
+    oturumlar tek bir ScriptCache ve tek bir Runtime paylaşır. Eşzamanlı çalıştırmada ilki
+    ölçümü şişirir ve ast.parse iş parçacığı güvenli olmadığından SystemError verir; ikincisi
+    başka bir oturumun rerun'ı sırasında "Runtime hasn't been created!" hatasına yol açar.
+    """
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    son_runtime = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            son_runtime[:] = [cls._instance]
+            return cls._instance
+        if son_runtime:
+            return son_runtime[0]
+        raise RuntimeError("Runtime hasn't been created!")
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or bool(son_runtime))
+
+    paylasilan = ScriptCache()
+    orijinal = ScriptCache.get_bytecode
+    kilit = threading.Lock()
+
+    def get_bytecode(self, script_path):
+        with kilit:
+            return orijinal(paylasilan, script_path)
+
+    ScriptCache.get_bytecode = get_bytecode
+
+
+# ==================== OTURUM ====================
+_OTURUM_YONETICISI = []
+
+
+def oturum_asistani(at):
+    """
+    Oturumun asistanı (with ile kullanılır). Asistan uygulamanın oturum yöneticisinde durur,
+    session_state'te sadece oturum_kimligi vardır. Streamlit app.py'yi __main__ olarak çalıştırır ve
+    cache_resource anahtarına modül adı girer; "import app" ayrı (boş) bir yönetici kurardı,
+    sys.modules["__main__"] ise eşzamanlı rerun'larda yarım çalışmış başka bir modül olabilir.
+    Bu yüzden betiğin kurduğu tek yönetici örneği bir kez bulunup saklanır.
+    """
+    if not _OTURUM_YONETICISI:
+        import gc
+        _OTURUM_YONETICISI.extend(o for o in gc.get_objects() if type(o).__name__ == "OturumYoneticisi")
+    return _OTURUM_YONETICISI[0].kullan(at.session_state["oturum_kimligi"])
+
+
+class SanalOturum:
+    """Tek bir öğrencinin tarayıcı oturumu; her akışın sunucu tarafı süresini ölçer."""
+
+    def __init__(self, no: int, zaman_asimi: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.no = no
+        self.at = AppTest.from_file(APP_YOLU, default_timeout=zaman_asimi)
+        self.olcumler = {akis: [] for akis in AKISLAR}
+        self.hatalar = []
+
+    def _olc(self, akis: str, fn):
+        t0 = time.perf_counter()
+        fn()
+        self.olcumler[akis].append((time.perf_counter() - t0) * 1000)
+        if self.at.exception:
+            self.hatalar.append(f"{akis}: {self.at.exception[0].value}")
+
+    def _sekme(self, etiket: str):
+        self.at.radio(key="aktif_sekme").set_value(etiket).run()
+
+    def giris(self):
+        at = self.at
+        at.run()
+        at.text_input[0].input(f"ogrenci{self.no}")
+        at.text_input[1].input(f"sahte-anahtar-{self.no}")
+        at.button[0].click().run()
+        if not at.session_state["logged_in"]:
+            raise RuntimeError(f"Oturum {self.no} giriş yapamadı")
+
+    def kayit_ekle(self, tur: int):
+        self._sekme("📊 Öğrenme Analitiği")
+        at = self.at
+        at.number_input[0].set_value(1.5)
+        at.text_input[0].input(f"konu {tur}, tekrar {tur}")
+        at.button[0].click().run()  # Formun gönder butonu
+
+    def calistir(self, tur_sayisi: int, rag_hazir: threading.Event):
+        self._olc("giris", self.giris)
+        with oturum_asistani(self.at) as asistan:
+            for ders in DERSLER:
+                asistan.ders_ekle(ders, "orta")
+        for tur in range(tur_sayisi):
+            self._olc("kayit_ekle", lambda: self.kayit_ekle(tur))
+            self._olc("pano", lambda: self._sekme("📊 Görsel Pano"))
+            self._sekme("💬 Sohbet")
+            self._olc("sohbet", lambda: self.at.chat_input(key="chat_input").set_value(
+                f"Bugün {DERSLER[tur % len(DERSLER)]} için ne yapmalıyım?").run())
+            if rag_hazir.is_set():
+                self._sekme("🤖 RAG Chatbot")
+                self._olc("rag", lambda: self.at.text_input(key="rag_question_input").input(
+                    f"Zaman yönetimi tekniği {tur} nedir?").run())
+
+    def asistan_boyutu(self) -> int:
+        with oturum_asistani(self.at) as asistan:
+            return _derin_boyut(asistan)
+
+
+# ==================== ÖLÇÜM ====================
+def _rss_mb() -> float:
+    """Güncel RSS (Linux'ta /proc'tan); yoksa tepe RSS'e düşer."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        tepe = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return tepe / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _derin_boyut(nesne, gorulen=None) -> int:
+    """Nesnenin ve erişilebilen içeriğinin yaklaşık bellek boyutu (bayt).
+
+    Sınıflar AppTest betiğinin içinde tanımlandığından pickle ile ölçülemez; sys.getsizeof
+    ile özyinelemeli olarak toplanır. Modüller, sınıflar ve fonksiyonlar sayılmaz.
+    """
+    gorulen = set() if gorulen is None else gorulen
+    if id(nesne) in gorulen or isinstance(nesne, (type, type(sys), type(_rss_mb))):
+        return 0
+    gorulen.add(id(nesne))
+    boyut = sys.getsizeof(nesne)
+    if isinstance(nesne, dict):
+        boyut += sum(_derin_boyut(k, gorulen) + _derin_boyut(v, gorulen) for k, v in nesne.items())
+    elif isinstance(nesne, (list, tuple, set, frozenset)):
+        boyut += sum(_derin_boyut(o, gorulen) for o in nesne)
+    else:
+        if hasattr(nesne, "__dict__"):
+            boyut += _derin_boyut(vars(nesne), gorulen)
+        for ad in getattr(type(nesne), "__slots__", ()):
+            if hasattr(nesne, ad):
+                boyut += _derin_boyut(getattr(nesne, ad), gorulen)
+    return boyut
+
+
+def _yuzdelikler(sureler_ms):
+    if not sureler_ms:
+        return None
+    sirali = sorted(sureler_ms)
+
+    def yuzdelik(oran):
+        return round(sirali[min(len(sirali) - 1, int(oran * len(sirali)))], 1)
+
+    return {"adet": len(sirali), "p50_ms": yuzdelik(0.50), "p95_ms": yuzdelik(0.95),
+            "p99_ms": yuzdelik(0.99), "maks_ms": round(sirali[-1], 1)}
+
+
+def rag_indeksini_hazirla(zaman_asimi: float) -> bool:
+    """Süreç genelindeki RAG indeksini ölçümden önce oluşturur (inşa süresi gecikmelere karışmasın)."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_YOLU, default_timeout=zaman_asimi)
+    at.session_state.logged_in = True
+    at.session_state.kullanici_adi = "isinma"
+    at.session_state.aktif_sekme = "🤖 RAG Chatbot"
+    at.run()
+    with oturum_asistani(at) as asistan:
+        asistan.gemini_ayarla("sahte-anahtar")
+    bitis = time.monotonic() + zaman_asimi
+    while time.monotonic() < bitis:
+        at.run()
+        if any(t.key == "rag_question_input" for t in at.text_input):
+            return True
+        time.sleep(0.5)
+    return False
+
+
+def seviye_olc(oturum_sayisi: int, tur_sayisi: int, rag_hazir: threading.Event, zaman_asimi: float) -> dict:
+    rss_once = _rss_mb()
+    oturumlar = [SanalOturum(i, zaman_asimi) for i in range(oturum_sayisi)]
+    cpu_once = os.times()
+    t0 = time.perf_counter()
+
+    def _calistir(oturum):
+        try:
+            oturum.calistir(tur_sayisi, rag_hazir)
+        except Exception as e:
+            oturum.hatalar.append(f"{type(e).__name__}: {e}")
+
+    is_parcaciklari = [threading.Thread(target=_calistir, args=(o,)) for o in oturumlar]
+    for t in is_parcaciklari:
+        t.start()
+    for t in is_parcaciklari:
+        t.join()
+
+    sure = time.perf_counter() - t0
+    cpu_sonra = os.times()
+    cpu_sn = (cpu_sonra.user - cpu_once.user) + (cpu_sonra.system - cpu_once.system)
+    rss_sonra = _rss_mb()
+    boyutlar = [o.asistan_boyutu() for o in oturumlar if "oturum_kimligi" in o.at.session_state]
+
+    return {
+        "oturum_sayisi": oturum_sayisi,
+        "sure_sn": round(sure, 2),
+        "akislar": {akis: _yuzdelikler([ms for o in oturumlar for ms in o.olcumler[akis]]) for akis in AKISLAR},
+        "bellek": {
+            "rss_once_mb": round(rss_once, 1),
+            "rss_sonra_mb": round(rss_sonra, 1),
+            "oturum_basina_rss_mb": round((rss_sonra - rss_once) / oturum_sayisi, 2),
+            "oturum_basina_asistan_kb": round(sum(boyutlar) / len(boyutlar) / 1024, 1) if boyutlar else None,
+        },
+        "cpu": {
+            "cpu_sn": round(cpu_sn, 2),
+            # Kullanılan çekirdek sayısı; GIL nedeniyle Python kodu için pratik üst sınır ~1.0'dır
+            "kullanilan_cekirdek": round(cpu_sn / sure, 2),
+            "doygunluk_yuzde": round(cpu_sn / sure / (os.cpu_count() or 1) * 100, 1),
+        },
+        "hatalar": [h for o in oturumlar for h in o.hatalar][:20],
+    }
+
+
+def _commit_bilgisi() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=KOK_DIZIN,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "bilinmiyor"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Eşzamanlı Streamlit oturumları için yük testi")
+    parser.add_argument("--oturumlar", default="1,5,10", help="Virgülle ayrılmış eşzamanlı oturum sayıları")
+    parser.add_argument("--tur", type=int, default=3, help="Oturum başına akış turu sayısı")
+    parser.add_argument("--llm-gecikme-ms", type=float, default=0,
+                        help="Sahte LLM cevabına eklenen gecikme (gerçek API'yi taklit etmek için)")
+    parser.add_argument("--rag-yok", action="store_true", help="RAG akışını atla (indeks oluşturma gerekmez)")
+    parser.add_argument("--rag-korpus", type=int, default=0,
+                        help="rag_pdfs yerine bu kadar sayfalık sentetik korpus kullan (0: rag_pdfs)")
+    parser.add_argument("--sahte-embedding", action="store_true", help="HuggingFace modeli yerine deterministik embedding")
+    parser.add_argument("--zaman-asimi", type=float, default=300, help="Tek bir rerun için zaman aşımı (sn)")
+    parser.add_argument("--kaydet", default=os.path.join(KOK_DIZIN, "benchmarks", "sonuclar", "yuk_testi.jsonl"),
+                        help="Sonucun ekleneceği JSON Lines dosyası")
+    parser.add_argument("--json", action="store_true", help="Sadece JSON çıktı ver")
+    args = parser.parse_args(argv)
+
+    sahte_llm_kur(args.llm_gecikme_ms)
+    eszamanli_apptest_kur()
+    if args.sahte_embedding:
+        sahte_embedding_kur()
+
+    # Göreli yollar (rag_pdfs, rag_index) çalışma dizinine göre çözülür
+    gecici = tempfile.TemporaryDirectory()
+    if args.rag_korpus:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from rag_performansi import korpus_olustur
+
+        korpus_olustur(os.path.join(gecici.name, "rag_pdfs"), args.rag_korpus)
+        os.chdir(gecici.name)
+    else:
+        os.chdir(KOK_DIZIN)
+
+    rag_hazir = threading.Event()
+    if not args.rag_yok:
+        if not args.json:
+            sys.stderr.write("RAG indeksi hazırlanıyor...\n")
+        if rag_indeksini_hazirla(args.zaman_asimi):
+            rag_hazir.set()
+        elif not args.json:
+            sys.stderr.write("Uyarı: RAG indeksi hazırlanamadı, RAG akışı atlanıyor.\n")
+
+    kayit = {
+        "zaman": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_bilgisi(),
+        "python": platform.python_version(),
+        "cpu_sayisi": os.cpu_count(),
+        "parametreler": {"tur": args.tur, "llm_gecikme_ms": args.llm_gecikme_ms, "rag": rag_hazir.is_set(),
+                         "rag_korpus": args.rag_korpus, "sahte_embedding": args.sahte_embedding},
+        "seviyeler": [],
+    }
+    for oturum_sayisi in (int(n) for n in args.oturumlar.split(",")):
+        if not args.json:
+            sys.stderr.write(f"{oturum_sayisi} eşzamanlı oturum çalıştırılıyor...\n")
+        kayit["seviyeler"].append(seviye_olc(oturum_sayisi, args.tur, rag_hazir, args.zaman_asimi))
+    gecici.cleanup()
+
+    if args.kaydet:
+        os.makedirs(os.path.dirname(args.kaydet), exist_ok=True)
+        with open(args.kaydet, "a", encoding="utf-8") as f:
+            f.write(json.dumps(kayit, ensure_ascii=False) + "\n")
+
+    if args.json:
+        print(json.dumps(kayit, ensure_ascii=False))
+        return 0
+
+    for seviye in kayit["seviyeler"]:
+        bellek, cpu = seviye["bellek"], seviye["cpu"]
+        print(f"\n=== {seviye['oturum_sayisi']} oturum · {seviye['sure_sn']} sn · "
+              f"CPU {cpu['kullanilan_cekirdek']} çekirdek (%{cpu['doygunluk_yuzde']}) · "
+              f"oturum başına {bellek['oturum_basina_rss_mb']} MB RSS, {bellek['oturum_basina_asistan_kb']} KB asistan")
+        print(f"{'akış':12s} {'adet':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'maks ms':>9}")
+        for akis, y in seviye["akislar"].items():
+            if y:
+                print(f"{akis:12s} {y['adet']:>5} {y['p50_ms']:>9} {y['p95_ms']:>9} {y['p99_ms']:>9} {y['maks_ms']:>9}")
+        for hata in seviye["hatalar"]:
+            print(f"  hata: {hata}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
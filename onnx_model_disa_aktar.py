@@ -0,0 +1,125 @@
+"""
+Embedding modelini (EMBEDDING_MODELI) ONNX'e aktarır ve mevcut PyTorch arka ucuyla eşdeğerliğini doğrular.
+
+Çıktı dizini uygulamanın ONNX arka ucunun (ASISTAN_EMBEDDING_ARKA_UCU=onnx|onnx_int8) ağ
+erişimi olmadan yüklediği dosyaları içerir:
+
+    model.onnx        float32 transformer (son gizli katman çıktısı)
+    model_int8.onnx   dinamik int8 nicemlenmiş kopya (--nicemle)
+    tokenizer.json    hızlı tokenizer
+    manifest.json     model adı, havuzlama/normalize ayarları ve doğrulama sonuçları
+
+Doğrulama: örnek cümleler hem sentence-transformers hem ONNX ile gömülür. float32 modelde
+en büyük mutlak fark --tolerans'ı, int8 modelde en düşük kosinüs benzerliği
+--int8-kosinus eşiğini geçmezse komut hata ile biter.
+
+Bu adım sadece dışa aktarırken torch, sentence-transformers ve onnx paketlerini gerektirir;
+uygulama tarafında onnxruntime ve tokenizers yeterlidir.
+
+Kullanım:
+    python onnx_model_disa_aktar.py --cikti modeller/embedding_onnx --nicemle
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+
+from app import EMBEDDING_MODELI, OnnxEmbedding
+
+ORNEK_CUMLELER = [
+    "Zaman yönetimi öğrencilerin akademik başarısını doğrudan etkiler.",
+    "Sınav haftasından önce konu tekrarı için haftalık bir plan hazırla.",
+    "What is the difference between spaced repetition and cramming?",
+    "Erteleme alışkanlığı çoğu zaman görevin belirsiz olmasından kaynaklanır; görevi küçük adımlara bölmek başlamayı kolaylaştırır.",
+    "Pomodoro",
+    "Uyku, dikkat ve bellek üzerinde güçlü bir etkiye sahiptir. " * 20,
+    "Fizik dersinde türev ve integral kavramları hareket problemlerinde kullanılır.",
+    "Hedeflerini ölçülebilir ve zamana bağlı olarak belirle.",
+]
+
+
+def embedding_farki(referans, aday) -> dict:
+    """İki embedding kümesi arasındaki en büyük mutlak fark ile en düşük/ortalama kosinüs benzerliği."""
+    import numpy as np
+
+    referans = np.asarray(referans, dtype="float64")
+    aday = np.asarray(aday, dtype="float64")
+    kosinus = (referans * aday).sum(axis=1) / (np.linalg.norm(referans, axis=1) * np.linalg.norm(aday, axis=1))
+    return {"azami_mutlak_fark": float(np.abs(referans - aday).max()),
+            "en_dusuk_kosinus": float(kosinus.min()), "ortalama_kosinus": float(kosinus.mean())}
+
+
+def disa_aktar(cikti: str, opset: int = 14):
+    """sentence-transformers modelini çıktı dizinine model.onnx + tokenizer.json olarak yazar, manifesti döner."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize, Pooling
+
+    model = SentenceTransformer(EMBEDDING_MODELI, device="cpu")
+    transformer = model[0].auto_model.eval()
+    havuz = next(m for m in model if isinstance(m, Pooling)).get_config_dict()
+    if not (havuz.get("pooling_mode_mean_tokens") or havuz.get("pooling_mode_cls_token")):
+        raise ValueError(f"Desteklenmeyen havuzlama ayarı: {havuz}")
+
+    os.makedirs(cikti, exist_ok=True)
+    model.tokenizer.backend_tokenizer.save(os.path.join(cikti, "tokenizer.json"))
+    ornek = model.tokenizer(["örnek cümle"], return_tensors="pt")
+    girdi_adlari = ["input_ids", "attention_mask", "token_type_ids"]
+    dinamik = {ad: {0: "parti", 1: "dizi"} for ad in girdi_adlari + ["last_hidden_state"]}
+    with torch.no_grad():
+        torch.onnx.export(transformer, tuple(ornek[ad] for ad in girdi_adlari), os.path.join(cikti, "model.onnx"),
+                          input_names=girdi_adlari, output_names=["last_hidden_state"],
+                          dynamic_axes=dinamik, opset_version=opset)
+
+    manifest = {
+        "embedding_modeli": EMBEDDING_MODELI,
+        "olusturma_tarihi": datetime.datetime.now().isoformat(timespec="seconds"),
+        "havuzlama": "ortalama" if havuz.get("pooling_mode_mean_tokens") else "cls",
+        "normalize": any(isinstance(m, Normalize) for m in model),
+        "azami_token": model.max_seq_length,
+        "opset": opset,
+    }
+    with open(os.path.join(cikti, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return model, manifest
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Embedding modelini ONNX'e aktarır ve eşdeğerliğini doğrular.")
+    parser.add_argument("--cikti", default=os.path.join("modeller", "embedding_onnx"),
+                        help="Model dizini (varsayılan: modeller/embedding_onnx)")
+    parser.add_argument("--nicemle", action="store_true", help="Ayrıca int8 nicemlenmiş model_int8.onnx üret")
+    parser.add_argument("--tolerans", type=float, default=1e-4,
+                        help="float32 ONNX için izin verilen en büyük mutlak fark (varsayılan: 1e-4)")
+    parser.add_argument("--int8-kosinus", type=float, default=0.99,
+                        help="int8 ONNX için izin verilen en düşük kosinüs benzerliği (varsayılan: 0.99)")
+    args = parser.parse_args(argv)
+
+    model, manifest = disa_aktar(args.cikti)
+    if args.nicemle:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(os.path.join(args.cikti, "model.onnx"), os.path.join(args.cikti, "model_int8.onnx"),
+                         weight_type=QuantType.QInt8)
+
+    referans = model.encode(ORNEK_CUMLELER, convert_to_numpy=True)
+    dogrulama = {"float32": embedding_farki(referans, OnnxEmbedding(args.cikti).embed_documents(ORNEK_CUMLELER))}
+    if args.nicemle:
+        dogrulama["int8"] = embedding_farki(referans, OnnxEmbedding(args.cikti, nicemli=True).embed_documents(ORNEK_CUMLELER))
+    manifest["dogrulama"] = dogrulama
+    with open(os.path.join(args.cikti, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(json.dumps(dogrulama, indent=2))
+
+    hatalar = []
+    if dogrulama["float32"]["azami_mutlak_fark"] > args.tolerans:
+        hatalar.append(f"float32 ONNX farkı {dogrulama['float32']['azami_mutlak_fark']:.2e} > {args.tolerans:.0e}")
+    if args.nicemle and dogrulama["int8"]["en_dusuk_kosinus"] < args.int8_kosinus:
+        hatalar.append(f"int8 ONNX kosinüs {dogrulama['int8']['en_dusuk_kosinus']:.4f} < {args.int8_kosinus}")
+    for hata in hatalar:
+        sys.stderr.write(f"Hata: {hata}\n")
+    return 1 if hatalar else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+RAG indeksini uygulama dışında (çevrimdışı) oluşturur.
+
+PDF klasörünü okur, chunk'lara ayırır, embedding'leri alır ve FAISS indeksini
+sürümlü bir artifakt olarak yazar (index.faiss, index.pkl, manifest.json).
+Uygulama açılışta bu artifaktı yükler; böylece sunucu tarafında embedding yapılmaz.
+
+PDF klasörünün alt klasörleri ayrı ders koleksiyonlarıdır (bkz. RAGKoleksiyonYoneticisi);
+--tumu ile kök klasör ("genel") ve her alt klasör için ayrı artifakt üretilir; PDF'i olmayan
+(sadece hazır artifaktı bulunan) koleksiyonlar uyarıyla atlanır.
+
+Kullanım:
+    python rag_indeks_olustur.py --pdf-klasoru rag_pdfs --cikti rag_index
+    python rag_indeks_olustur.py --tumu
+    python rag_indeks_olustur.py --koleksiyon fizik
+    python rag_indeks_olustur.py --tumu --vektor-bicimi int8
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+from app import RAG_VEKTOR_BICIMI, RAGIndeksInsaci, RAGKoleksiyonYoneticisi
+
+
+def _ilerleme_yaz(durum):
+    satir = f"\r[{durum['asama']}] dosya {durum['okunan_dosya']}/{durum['toplam_dosya']} · sayfa {durum['sayfa']}"
+    if durum["toplam_chunk"]:
+        satir += f" · chunk {durum['gomulen_chunk']}/{durum['toplam_chunk']}"
+    sys.stderr.write(satir.ljust(100))
+    sys.stderr.flush()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="rag_pdfs klasöründen çevrimdışı RAG indeksi oluşturur.")
+    parser.add_argument("--pdf-klasoru", default="rag_pdfs", help="PDF dosyalarının bulunduğu klasör (varsayılan: rag_pdfs)")
+    parser.add_argument("--cikti", default="rag_index", help="Artifaktın yazılacağı klasör (varsayılan: rag_index)")
+    parser.add_argument("--vektor-bicimi", choices=("float32", "int8", "ikili"), default=RAG_VEKTOR_BICIMI,
+                        help="Vektör saklama biçimi; uygulama aynı biçimle (ASISTAN_RAG_VEKTOR_BICIMI) çalışmalı "
+                             f"(varsayılan: {RAG_VEKTOR_BICIMI})")
+    parser.add_argument("--sessiz", action="store_true", help="İlerleme satırını yazdırma")
+    secim = parser.add_mutually_exclusive_group()
+    secim.add_argument("--koleksiyon", help="Sadece bu koleksiyonu (PDF klasörünün alt klasörü) oluştur")
+    secim.add_argument("--tumu", action="store_true", help="Tüm koleksiyonları oluştur")
+    args = parser.parse_args(argv)
+
+    yonetici = RAGKoleksiyonYoneticisi(args.pdf_klasoru, args.cikti)
+    if args.tumu:
+        koleksiyonlar = yonetici.koleksiyonlar()
+        if not koleksiyonlar:
+            sys.stderr.write(f"Hata: '{args.pdf_klasoru}' klasöründe hiç koleksiyon bulunamadı.\n")
+            return 1
+    else:
+        koleksiyonlar = [args.koleksiyon or RAGKoleksiyonYoneticisi.GENEL]
+
+    istatistikler = {}
+    for koleksiyon in koleksiyonlar:
+        pdf_klasoru, _ = yonetici.yollar(koleksiyon)
+        if args.tumu and not glob.glob(os.path.join(pdf_klasoru, "*.pdf")):
+            # Sadece artifaktı olan koleksiyon: kaynak yok, mevcut artifakt olduğu gibi kullanılır
+            sys.stderr.write(f"Uyarı: '{koleksiyon}' koleksiyonunda PDF yok, atlandı.\n")
+            continue
+        insaci = RAGIndeksInsaci(*yonetici.yollar(koleksiyon), vektor_bicimi=args.vektor_bicimi)
+        if not args.sessiz:
+            sys.stderr.write(f"{koleksiyon}:\n")
+            insaci.ilerleme_dinleyicisi = _ilerleme_yaz
+        try:
+            vector_store = insaci.insa_et()
+        except ValueError as e:
+            sys.stderr.write(f"\nHata ({koleksiyon}): {e}\n")
+            return 1
+        manifest = insaci.artifakt_kaydet(vector_store)
+        if not args.sessiz:
+            sys.stderr.write("\n")
+        for uyari in insaci.durum_ozeti()["uyarilar"]:
+            sys.stderr.write(f"Uyarı: {uyari}\n")
+        istatistikler[koleksiyon] = manifest["istatistikler"]
+
+    if not istatistikler:
+        sys.stderr.write(f"Hata: '{args.pdf_klasoru}' klasöründe PDF'i olan koleksiyon bulunamadı.\n")
+        return 1
+    # Tek koleksiyonda çıktı biçimi eskisi gibi kalır
+    print(json.dumps(istatistikler if len(istatistikler) > 1 else next(iter(istatistikler.values())),
+                     ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Giriş ekranındaki API anahtarı doğrulama önbelleği (ağa çıkmadan, sahte model listeleyiciyle)."""
+import os
+
+os.environ.setdefault("ASISTAN_VERI_DIZINI", "")
+
+import app  # noqa: E402
+
+
+class SahteListeleyici:
+    def __init__(self, gecerli=("iyi",)):
+        self.gecerli = set(gecerli)
+        self.cagrilar = []
+
+    def __call__(self, api_anahtari):
+        self.cagrilar.append(api_anahtari)
+        if api_anahtari not in self.gecerli:
+            raise PermissionError("API key not valid")
+        return ["gemini"]
+
+
+def _saat(monkeypatch, baslangic=1000.0):
+    zaman = [baslangic]
+    monkeypatch.setattr(app.time, "monotonic", lambda: zaman[0])
+    return zaman
+
+
+def test_ttl_icinde_isabet(monkeypatch):
+    zaman = _saat(monkeypatch)
+    listeleyici = SahteListeleyici()
+    onbellek = app.AnahtarDogrulamaOnbellegi(basarili_ttl=600, basarisiz_ttl=60, model_listeleyici=listeleyici)
+
+    assert onbellek.dogrula("iyi")
+    zaman[0] += 599
+    assert onbellek.dogrula("iyi")
+    assert listeleyici.cagrilar == ["iyi"]
+    assert (onbellek.isabet, onbellek.iskalama) == (1, 1)
+
+    zaman[0] += 2  # Başarılı sonucun TTL'i doldu
+    assert onbellek.dogrula("iyi")
+    assert listeleyici.cagrilar == ["iyi", "iyi"]
+
+
+def test_basarisiz_sonuc_kisa_ttl_ile_duser(monkeypatch):
+    zaman = _saat(monkeypatch)
+    listeleyici = SahteListeleyici()
+    onbellek = app.AnahtarDogrulamaOnbellegi(basarili_ttl=600, basarisiz_ttl=60, model_listeleyici=listeleyici)
+
+    assert not onbellek.dogrula("kotu")
+    zaman[0] += 59
+    assert not onbellek.dogrula("kotu")
+    assert listeleyici.cagrilar == ["kotu"]
+
+    zaman[0] += 2  # Başarılı olsaydı hâlâ geçerliydi; başarısız sonuç yeniden sorulur
+    listeleyici.gecerli.add("kotu")
+    assert onbellek.dogrula("kotu")
+    assert listeleyici.cagrilar == ["kotu", "kotu"]
+
+
+def test_anahtar_basina_tek_cagri(monkeypatch):
+    _saat(monkeypatch)
+    listeleyici = SahteListeleyici(gecerli=("a", "b"))
+    onbellek = app.AnahtarDogrulamaOnbellegi(model_listeleyici=listeleyici)
+
+    for _ in range(5):
+        for anahtar in ("a", "b", "c"):
+            onbellek.dogrula(anahtar)
+    assert sorted(listeleyici.cagrilar) == ["a", "b", "c"]
+    assert not onbellek.dogrula("")
+    assert len(listeleyici.cagrilar) == 3
+    # Anahtarın kendisi saklanmaz
+    assert "a" not in onbellek._kayitlar
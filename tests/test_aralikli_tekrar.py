@@ -0,0 +1,66 @@
+"""AralikliTekrar (SM-2) ve depodan yüklerken tekrar durumunun yeniden kurulması."""
+import datetime
+import os
+
+os.environ.setdefault("ASISTAN_VERI_DIZINI", "")
+
+import app  # noqa: E402
+
+GUN = datetime.date(2025, 3, 1)
+
+
+def _gun(n):
+    return GUN + datetime.timedelta(days=n)
+
+
+def test_araliklar_ve_ayni_gun():
+    tekrar = app.AralikliTekrar()
+    durum = tekrar.tekrar_kaydet("ali", "Matematik", "Türev", tarih=_gun(0))
+    assert (durum["tekrar"], durum["aralik"], durum["vade"]) == (1, 1, _gun(1))
+    # Aynı gün ikinci kez çalışmak aralığı büyütmez
+    assert tekrar.tekrar_kaydet("ali", "matematik ", " türev", tarih=_gun(0))["aralik"] == 1
+    assert tekrar.tekrar_kaydet("ali", "Matematik", "Türev", tarih=_gun(1))["aralik"] == 6
+    durum = tekrar.tekrar_kaydet("ali", "Matematik", "Türev", tarih=_gun(7))
+    assert durum["aralik"] == round(6 * durum["kolaylik"])
+    assert durum["kolaylik"] == 2.5  # Kalite 4 katsayıyı değiştirmez
+
+
+def test_dusuk_kalite_basa_dondurur():
+    tekrar = app.AralikliTekrar()
+    for n in (0, 1, 7):
+        tekrar.tekrar_kaydet("ali", "Fizik", "Kuvvet", tarih=_gun(n))
+    durum = tekrar.tekrar_kaydet("ali", "Fizik", "Kuvvet", kalite=2, tarih=_gun(20))
+    assert (durum["tekrar"], durum["aralik"], durum["vade"]) == (0, 1, _gun(21))
+    assert durum["kolaylik"] < 2.5
+    assert tekrar.tekrar_kaydet("ali", "Fizik", "Kuvvet", kalite=0, tarih=_gun(21))["kolaylik"] >= 1.3
+
+
+def test_vadesi_gelenler_en_eski_once():
+    tekrar = app.AralikliTekrar()
+    tekrar.tekrar_kaydet("ali", "Fizik", "Kuvvet", tarih=_gun(0))
+    tekrar.tekrar_kaydet("ali", "Kimya", "Mol", tarih=_gun(2))
+    tekrar.tekrar_kaydet("ali", "Tarih", "Osmanlı", tarih=_gun(0))
+    tekrar.tekrar_kaydet("ali", "Tarih", "Osmanlı", tarih=_gun(1))  # Vadesi 7. güne kaydı; eski kaydı bayat
+
+    secilen = tekrar.bugun_tekrar_edilecekler("ali", _gun(3))
+    assert [(d["konu"], d["gecikme_gun"]) for d in secilen] == [("Kuvvet", 2), ("Mol", 0)]
+    assert [d["konu"] for d in tekrar.bugun_tekrar_edilecekler("ali", _gun(3), k=1)] == ["Kuvvet"]
+    assert tekrar.bugun_tekrar_edilecekler("veli", _gun(3)) == []
+
+
+def test_depodan_yuklerken_durum_yeniden_kurulur(tmp_path):
+    depo = app.CalismaDeposu(str(tmp_path / "asistan.db"))
+    kimlik = app.depo_kimligi("ali", "x")
+    simdi = datetime.datetime.now()
+    for gun_once in (10, 9, 2):
+        depo.kayit_ekle(kimlik, "Matematik", 1.0, ["Türev"], simdi - datetime.timedelta(days=gun_once))
+
+    canli = app.AralikliTekrar()
+    for gun_once in (10, 9, 2):
+        canli.tekrar_kaydet("ali", "Matematik", "Türev", tarih=(simdi - datetime.timedelta(days=gun_once)).date())
+
+    analitik = app.OgrenmeAnalitigi(depo=depo)
+    analitik.konu_tekrari.tekrar_kaydet("ali", "Eski", "Konu")  # Yüklemeden önceki durum silinir
+    analitik.depo_kimlikleri["ali"] = kimlik
+    analitik.depodan_yukle(depo, "ali")
+    assert analitik.konu_tekrari.durumlar["ali"] == canli.durumlar["ali"]
@@ -0,0 +1,79 @@
+"""DurumArsivi: dışa/içe aktarma gidiş-dönüşü ve bozuk arşivlerin reddedilmesi."""
+import datetime
+import io
+import os
+
+os.environ.setdefault("ASISTAN_VERI_DIZINI", "")
+
+import pytest  # noqa: E402
+
+import app  # noqa: E402
+
+
+def _asistan():
+    asistan = app.AkilliOgrenciAsistani()
+    asistan.kullanici_adi = "ali"
+    analitik = asistan.ogrenme_analitigi
+    analitik.calisma_kaydet("ali", "Matematik", 2.0, ["Türev", "İntegral"])
+    analitik.calisma_kaydet("ali", "Fizik", 1.5, [])
+    analitik.konu_tekrari.tekrar_kaydet("ali", "Matematik", "Türev", kalite=2)
+    bugun = datetime.date.today()
+    hedefler = asistan.hedef_takip
+    hedefler.hedef_ekle("ali", "Türev çalış", bugun + datetime.timedelta(days=3), "Ders")
+    hedefler.hedef_ekle("ali", "Deneme çöz", bugun + datetime.timedelta(days=7))
+    hedefler.hedef_guncelle("ali", 1, 40)
+    hedefler.hedef_tamamla("ali", 2)
+    asistan.ders_ekle("Matematik", "zor")
+    asistan.chat_gecmisi_kaydet("merhaba", "selam!")
+    asistan.haftalik_plan = {"Pazartesi": ["Matematik"]}
+    asistan.calisma_plani = app.CalismaPlanlayici().planla(asistan.dersler, bugun)
+    return asistan
+
+
+def _arsiv(asistan) -> bytes:
+    cikti = io.BytesIO()
+    app.DurumArsivi.disa_aktar(asistan, cikti)
+    return cikti.getvalue()
+
+
+def test_gidis_donus():
+    kaynak = _asistan()
+    hedef = app.AkilliOgrenciAsistani()
+    sayilar = app.DurumArsivi.ice_aktar(hedef, _arsiv(kaynak))
+
+    assert sayilar["calisma_kayitlari"] == 2 and sayilar["hedefler"] == 2
+    assert hedef.ogrenme_analitigi.calisma_kayitlari == kaynak.ogrenme_analitigi.calisma_kayitlari
+    assert hedef.ogrenme_analitigi.konu_tekrari.durumlar == kaynak.ogrenme_analitigi.konu_tekrari.durumlar
+    assert hedef.hedef_takip.aktif_hedefler("ali") == kaynak.hedef_takip.aktif_hedefler("ali")
+    assert hedef.hedef_takip.tamamlanan_hedefler_listesi("ali") == kaynak.hedef_takip.tamamlanan_hedefler_listesi("ali")
+    assert hedef.hedef_takip.hedef_ekle("ali", "Yeni", datetime.date.today()).id == 3  # Sayaç da taşınır
+    assert hedef.dersler == kaynak.dersler
+    assert hedef.chat_gecmisi == kaynak.chat_gecmisi
+    assert hedef.haftalik_plan == kaynak.haftalik_plan
+    assert hedef.calisma_plani["gunler"] == kaynak.calisma_plani["gunler"]
+
+
+def test_baska_ada_aktarilir():
+    hedef = app.AkilliOgrenciAsistani()
+    app.DurumArsivi.ice_aktar(hedef, _arsiv(_asistan()), kullanici_adi="veli")
+    assert set(hedef.ogrenme_analitigi.calisma_kayitlari) == {"veli"}
+    assert len(hedef.hedef_takip.aktif_hedefler("veli")) == 1
+
+
+@pytest.mark.parametrize("boz", [
+    lambda v: b"JSON" + v[4:],  # Sihirli baytlar
+    lambda v: v[:len(v) // 2],  # Kesik dosya
+    lambda v: v[:15],  # Çerçeve başlığının ortasında biten dosya
+    lambda v: v + b"\x05\x00abc",  # Sonda yarım çerçeve
+    lambda v: v[:200] + bytes(b ^ 0xFF for b in v[200:260]) + v[260:],  # Ortası değiştirilmiş
+])
+def test_bozuk_arsiv_valueerror_ve_durum_korunur(boz):
+    veri = _arsiv(_asistan())
+    asistan = app.AkilliOgrenciAsistani()
+    asistan.ogrenme_analitigi.calisma_kaydet("ali", "Kimya", 1.0, [])
+    onceki = asistan.ogrenme_analitigi
+
+    with pytest.raises(ValueError):
+        app.DurumArsivi.ice_aktar(asistan, boz(veri))
+    assert asistan.ogrenme_analitigi is onceki
+    assert [k.ders for k in onceki.calisma_kayitlari["ali"]] == ["Kimya"]
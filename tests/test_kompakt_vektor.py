@@ -0,0 +1,62 @@
+"""KompaktVektorDeposu: nicemlenmiş kodlarla arama + float32 yeniden puanlamanın isabeti (recall@k)."""
+import os
+
+os.environ.setdefault("ASISTAN_VERI_DIZINI", "")
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+import app  # noqa: E402
+
+BOYUT = 64
+K = 5
+
+
+class SabitEmbedding:
+    """Sorgu metni "s<i>" ise i'nci sorgu vektörünü döner."""
+
+    def __init__(self, sorgular):
+        self.sorgular = sorgular
+
+    def embed_query(self, metin):
+        return self.sorgular[int(metin[1:])].tolist()
+
+
+@pytest.fixture(scope="module")
+def veri():
+    rnd = np.random.default_rng(7)
+    merkezler = rnd.normal(size=(20, BOYUT))
+    vektorler = (merkezler[rnd.integers(0, 20, 2000)] + 0.6 * rnd.normal(size=(2000, BOYUT))).astype("float32")
+    sorgular = (merkezler[rnd.integers(0, 20, 50)] + 0.6 * rnd.normal(size=(50, BOYUT))).astype("float32")
+    uzakliklar = ((sorgular[:, None, :] - vektorler[None, :, :]) ** 2).sum(axis=2)
+    return vektorler, sorgular, np.argsort(uzakliklar, axis=1)[:, :K]
+
+
+def _recall(depo, sorgular, dogru):
+    bulunan = 0
+    for i in range(len(sorgular)):
+        metinler = {belge.page_content for belge in depo.similarity_search(f"s{i}", k=K)}
+        bulunan += len(metinler & {f"parça {j}" for j in dogru[i]})
+    return bulunan / dogru.size
+
+
+# İkili kodlar sıralamayı kaba korur; eşik sadece gerilemeyi yakalamak içindir
+@pytest.mark.parametrize("bicim, en_az", [("int8", 0.95), ("ikili", 0.7)])
+def test_recall(tmp_path, veri, bicim, en_az):
+    vektorler, sorgular, dogru = veri
+    metinler = [f"parça {i}" for i in range(len(vektorler))]
+    depo = app.KompaktVektorDeposu.olustur(metinler, vektorler, SabitEmbedding(sorgular), bicim)
+    assert _recall(depo, sorgular, dogru) >= en_az
+
+    # Diskten bellek eşlemeli açılan depo aynı sonuçları ve FAISS ölçeğinde (kare L2) skorları verir
+    depo.save_local(str(tmp_path))
+    yuklenen = app.KompaktVektorDeposu.load_local(str(tmp_path), SabitEmbedding(sorgular), bicim)
+    sonuc = yuklenen.similarity_search_with_score("s0", k=K)
+    assert [b.page_content for b, _ in sonuc] == [b.page_content for b, _ in depo.similarity_search_with_score("s0", k=K)]
+    j = int(sonuc[0][0].page_content.split()[1])
+    assert sonuc[0][1] == pytest.approx(float(((vektorler[j] - sorgular[0]) ** 2).sum()), rel=1e-4)
+
+
+def test_bilinmeyen_bicim():
+    with pytest.raises(ValueError):
+        app.KompaktVektorDeposu.olustur(["a"], np.ones((1, 4), dtype="float32"), None, "float16")
@@ -0,0 +1,44 @@
+"""Gece önceden üretilen AI önerisinin, öğrenci giriş yapıp "Analizi Başlat"a bastığında kullanıldığı."""
+import datetime
+import os
+
+os.environ.setdefault("ASISTAN_VERI_DIZINI", "")
+
+import app  # noqa: E402
+import toplu_oneri_uret  # noqa: E402
+
+
+def test_gece_uretilen_oneri_oturumda_kullanilir(tmp_path, monkeypatch):
+    depo = app.CalismaDeposu(str(tmp_path / "asistan.db"))
+    simdi = datetime.datetime.now()
+    kimlik = app.depo_kimligi("ali", "x")
+    depo.kayit_ekle(kimlik, "Matematik", 2.0, ["türev"], simdi - datetime.timedelta(days=2))
+    depo.kayit_ekle(kimlik, "Fizik", 1.5, [], simdi - datetime.timedelta(days=1))
+
+    monkeypatch.setattr(toplu_oneri_uret, "gemini_uret", lambda *a: "GECE ÖNERİSİ")
+    assert toplu_oneri_uret.main(["--veri-dizini", str(tmp_path), "--aralik-sn", "0", "--api-anahtari", "x"]) == 0
+
+    def llm_cagrilmamali(*a):
+        raise AssertionError("önceden üretilmiş öneri varken LLM çağrıldı")
+    monkeypatch.setattr(app, "gemini_uret", llm_cagrilmamali)
+
+    # Uygulamadaki gibi yeni oturum: boş analitik, girişte kullanici_ayarla
+    asistan = app.AkilliOgrenciAsistani()
+    asistan.ogrenme_analitigi = app.OgrenmeAnalitigi(depo=depo, oneri_onbellegi=app.OneriOnbellegi(depo))
+    asistan.kullanici_ayarla("ali", "x")
+    assert asistan.ogrenme_analitigi.ai_onerileri_olustur("ali", "x") == "GECE ÖNERİSİ"
+
+
+def test_ayni_ad_baska_anahtarla_kayitlari_gormez(tmp_path):
+    depo = app.CalismaDeposu(str(tmp_path / "asistan.db"))
+    depo.kayit_ekle(app.depo_kimligi("ali", "x"), "Matematik", 2.0, ["türev"], datetime.datetime.now())
+
+    asistan = app.AkilliOgrenciAsistani()
+    asistan.ogrenme_analitigi = app.OgrenmeAnalitigi(depo=depo)
+    asistan.kullanici_ayarla("ali", "baska-anahtar")
+    assert asistan.ogrenme_analitigi.calisma_kayitlari["ali"] == []
+
+    asistan = app.AkilliOgrenciAsistani()
+    asistan.ogrenme_analitigi = app.OgrenmeAnalitigi(depo=depo)
+    asistan.kullanici_ayarla("ali")
+    assert "ali" not in asistan.ogrenme_analitigi.calisma_kayitlari
@@ -0,0 +1,84 @@
+"""OturumYoneticisi: boşta ve tavan yüzünden diske alma, geri yükleme ve okunamayan dosyalar."""
+import datetime
+import os
+import time
+
+os.environ.setdefault("ASISTAN_VERI_DIZINI", "")
+
+import pytest  # noqa: E402
+
+import app  # noqa: E402
+
+
+def _asistan(ad: str, kayit_sayisi: int = 3):
+    asistan = app.AkilliOgrenciAsistani()
+    asistan.kullanici_adi = ad
+    asistan.api_anahtari = "gizli-anahtar"
+    for i in range(kayit_sayisi):
+        asistan.ogrenme_analitigi.calisma_kaydet(ad, "Matematik", 1.0, [f"konu{i}"])
+    asistan.hedef_takip.hedef_ekle(ad, "Türev", datetime.date.today() + datetime.timedelta(days=1))
+    asistan.chat_gecmisi_kaydet("merhaba", "selam")
+    asistan.web_analiz.mevcut_url = "https://ornek.com"
+    asistan.pdf_isleyici.mevcut_pdf_bytes = b"%PDF-1.4"
+    return asistan
+
+
+def _yonetici(tmp_path, **ayarlar):
+    return app.OturumYoneticisi(str(tmp_path), bosta_sn=ayarlar.pop("bosta_sn", 3600), arka_plan=False, **ayarlar)
+
+
+def test_bosta_oturum_diske_alinir_ve_geri_yuklenir(tmp_path):
+    yonetici = _yonetici(tmp_path)
+    kimlik = yonetici.ekle(_asistan("ali"))
+    with yonetici.kullan(kimlik) as asistan:
+        hedef_takip = asistan.hedef_takip
+
+    yonetici.bakim(simdi=time.monotonic() + 10)
+    assert yonetici.istatistik()["diskte"] == 0
+    yonetici.bakim(simdi=time.monotonic() + 3601)
+    assert yonetici.istatistik() == {"bellekte": 0, "diskte": 1, "bellekte_bayt": 0, "tavan_bayt": 0}
+    for ad in os.listdir(tmp_path):  # API anahtarı diske yazılmaz
+        with open(tmp_path / ad, "rb") as f:
+            assert b"gizli-anahtar" not in f.read()
+
+    with yonetici.kullan(kimlik) as asistan:
+        assert asistan.kullanici_adi == "ali" and asistan.api_anahtari == "gizli-anahtar"
+        assert len(asistan.ogrenme_analitigi.calisma_kayitlari["ali"]) == 3
+        assert asistan.hedef_takip is hedef_takip  # Diskteyken hatırlatmalar için tutulan nesne
+        assert [t.mesaj for t in asistan.chat_gecmisi] == ["merhaba"]
+        assert asistan.web_analiz.mevcut_url == "https://ornek.com"
+        assert asistan.pdf_isleyici.mevcut_pdf_bytes == b"%PDF-1.4"
+    assert yonetici.istatistik()["bellekte"] == 1
+    assert os.listdir(tmp_path) == []
+
+
+def test_tavan_asilinca_en_buyuk_oturum_diske_alinir(tmp_path):
+    yonetici = _yonetici(tmp_path)
+    kucuk = yonetici.ekle(_asistan("ali", 1))
+    buyuk = yonetici.ekle(_asistan("veli", 200))
+    orta = yonetici.ekle(_asistan("ayse", 50))
+    yonetici.tavan_bayt = yonetici.istatistik()["bellekte_bayt"] - 1
+
+    yonetici.bakim(haric=orta)
+    assert os.path.exists(tmp_path / f"{buyuk}.arsiv")
+    assert yonetici.istatistik()["diskte"] == 1
+    with yonetici.kullan(kucuk):
+        pass
+    with yonetici.kullan(buyuk) as asistan:  # Geri gelir; tavan yüzünden bu sefer başkası gider
+        assert len(asistan.ogrenme_analitigi.calisma_kayitlari["veli"]) == 200
+    assert (yonetici.istatistik()["bellekte"], yonetici.istatistik()["diskte"]) == (2, 1)
+
+
+def test_okunamayan_oturum_diskte_kalir(tmp_path):
+    yonetici = _yonetici(tmp_path)
+    kimlik = yonetici.ekle(_asistan("ali"))
+    yonetici.bakim(simdi=time.monotonic() + 3601)
+    with open(tmp_path / f"{kimlik}.arsiv", "r+b") as f:
+        f.truncate(20)
+
+    with pytest.raises(yonetici.YuklemeHatasi):
+        with yonetici.kullan(kimlik):
+            pass
+    assert yonetici.istatistik()["diskte"] == 1
+    yonetici.birak(kimlik)
+    assert not yonetici.var_mi(kimlik) and os.listdir(tmp_path) == []
@@ -0,0 +1,47 @@
+"""CalismaPlanlayici: kısıtlar ve hedef bitiş tarihlerinin bloklara etkisi."""
+import datetime
+import os
+
+os.environ.setdefault("ASISTAN_VERI_DIZINI", "")
+
+import app  # noqa: E402
+
+BASLANGIC = datetime.date(2025, 1, 6)  # Pazartesi
+DERSLER = [{"adi": "Fizik", "zorluk": "Zor"}, {"adi": "Kimya", "zorluk": "Orta"}, {"adi": "Tarih", "zorluk": "Kolay"}]
+
+
+def _bloklar(sonuc, ders):
+    """{gün indeksi: blok} — dersin plandaki yerleşimi."""
+    return {g: b["sure"] for g, gun in enumerate(sonuc["gunler"]) for b in gun["bloklar"] if b["ders"] == ders}
+
+
+def _tarihler(**gun_farki):
+    return {ad: BASLANGIC + datetime.timedelta(days=fark) for ad, fark in gun_farki.items()}
+
+
+def test_kisitlar_saglanir():
+    planlayici = app.CalismaPlanlayici([3, 3, 3, 3, 3, 1, 0])
+    sonuc = planlayici.planla(DERSLER, BASLANGIC, 2, {"Tarih": 20}, _tarihler(Kimya=4))
+    for gun in sonuc["gunler"]:
+        assert sum(b["sure"] for b in gun["bloklar"]) <= planlayici.gunluk_saat[gun["tarih"].weekday()]
+        assert all(b["sure"] <= planlayici.GUNLUK_AZAMI_BLOK * planlayici.BLOK_SAAT for b in gun["bloklar"])
+    assert sum(b["sure"] for gun in sonuc["gunler"] for b in gun["bloklar"]) == 2 * (5 * 3 + 1)
+
+
+def test_gecmis_tarihli_ders_plandan_dusmez():
+    sonuc = app.CalismaPlanlayici().planla(DERSLER, BASLANGIC, 2, {}, _tarihler(Fizik=0, Kimya=14))
+    fizik = _bloklar(sonuc, "Fizik")
+    assert fizik.get(0) == 2.0  # Bugün bitiyor: ilk gün dolu dolu
+    assert len(fizik) > 1  # Tarih geçince de çalışılmaya devam eder
+
+    gecikmis = app.CalismaPlanlayici().planla(DERSLER, BASLANGIC, 2, {}, _tarihler(Fizik=-3))
+    assert _bloklar(gecikmis, "Fizik").get(0) == 2.0
+    assert not gecikmis["yerlestirilemeyen"]
+
+
+def test_bitis_tarihi_bloklari_one_ceker():
+    tarihsiz = app.CalismaPlanlayici().planla(DERSLER, BASLANGIC, 2, {})
+    tarihli = app.CalismaPlanlayici().planla(DERSLER, BASLANGIC, 2, {}, _tarihler(Kimya=3))
+    onceki = lambda sonuc: sum(s for g, s in _bloklar(sonuc, "Kimya").items() if g <= 3)  # noqa: E731
+    assert onceki(tarihli) > onceki(tarihsiz)
+    assert max(_bloklar(tarihli, "Kimya")) > 3  # Sonrasında da plandadır
@@ -0,0 +1,73 @@
+"""SohbetOnbellegi: hangi mesajların önbelleğe girdiği, anahtar, TTL ve paylaşılan cevapların geçmişsiz üretilmesi."""
+import os
+
+os.environ.setdefault("ASISTAN_VERI_DIZINI", "")
+
+import pytest  # noqa: E402
+
+import app  # noqa: E402
+
+
+@pytest.mark.parametrize("mesaj", [
+    "Merhaba", "selaaam 👋", "Günaydın!", "motivasyon ver", "Nasıl ders çalışırım?", "teşekkürler",
+    "SINAV KAYGISI", "pomodoro nedir",
+])
+def test_genel_mesajlar_uygun(mesaj):
+    assert app.SohbetOnbellegi.baglamdan_bagimsiz_mi(mesaj)
+
+
+@pytest.mark.parametrize("mesaj", [
+    "", "bunu açıkla", "peki motivasyon", "devam et", "türev nedir",
+    "merhaba bugün matematik fizik kimya ve biyoloji çalışmam gerekiyor nereden başlayayım",
+])
+def test_baglama_bagli_ya_da_ozel_mesajlar_uygun_degil(mesaj):
+    assert not app.SohbetOnbellegi.baglamdan_bagimsiz_mi(mesaj)
+
+
+def test_anahtar_buyuk_kucuk_harf_ve_bosluk_duyarsiz():
+    onbellek = app.SohbetOnbellegi()
+    uretilen = []
+
+    def uret():
+        uretilen.append(1)
+        return f"cevap {len(uretilen)}"
+
+    assert onbellek.cevapla("Motivasyon  ver", uret, uret) == "cevap 1"
+    assert onbellek.cevapla("MOTİVASYON VER", uret, uret) == "cevap 1"
+    assert onbellek.cevapla("motivasyon ver!", uret, uret) == "cevap 2"  # Noktalama anahtarda kalır
+    assert (onbellek.isabet, onbellek.iskalama) == (1, 2)
+
+
+def test_uygun_olmayan_mesaj_onbellege_girmez():
+    onbellek = app.SohbetOnbellegi()
+    cevaplar = iter(["bir", "iki"])
+    assert onbellek.cevapla("bunu açıkla", lambda: next(cevaplar), None) == "bir"
+    assert onbellek.cevapla("bunu açıkla", lambda: next(cevaplar), None) == "iki"
+    assert (onbellek.isabet, onbellek.iskalama) == (0, 0)
+
+
+def test_ttl_dolunca_yeniden_uretilir(monkeypatch):
+    zaman = [1000.0]
+    monkeypatch.setattr(app.time, "time", lambda: zaman[0])
+    onbellek = app.SohbetOnbellegi(ttl_sn=60)
+    cevaplar = iter(["eski", "yeni"])
+    assert onbellek.cevapla("merhaba", None, lambda: next(cevaplar)) == "eski"
+    zaman[0] += 59
+    assert onbellek.cevapla("merhaba", None, lambda: next(cevaplar)) == "eski"
+    zaman[0] += 2
+    assert onbellek.cevapla("merhaba", None, lambda: next(cevaplar)) == "yeni"
+
+
+def test_paylasilan_cevap_gecmis_olmadan_uretilir(monkeypatch):
+    onbellek = app.SohbetOnbellegi()
+    monkeypatch.setattr(app, "sohbet_onbellegi", lambda: onbellek)
+    promptlar = []
+    monkeypatch.setattr(app, "gemini_uret", lambda anahtar, prompt, islem: promptlar.append(prompt) or "cevap")
+
+    asistan = app.AkilliOgrenciAsistani()
+    asistan.api_anahtari = "x"
+    asistan.chat_gecmisi_kaydet("notum 45 geldi", "üzülme!")
+    assert asistan.gemini_sohbet("motivasyon ver") == "cevap"
+    assert "notum 45" not in promptlar[-1]
+    asistan.gemini_sohbet("peki neden")
+    assert "notum 45" in promptlar[-1]
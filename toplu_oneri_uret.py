@@ -0,0 +1,76 @@
+"""
+Aktif öğrenciler için AI önerilerini (Öğrenme Analitiği > "Analizi Başlat") önceden üretir.
+
+Yoğun olmayan saatlerde (örn. gece cron ile) çalıştırılmak içindir. Kalıcı depodaki (ASISTAN_VERI_DIZINI)
+son --gun gün içinde kaydı olan her öğrencinin analizi depodan kurulur. Analiz anahtarı öneri
+önbelleğinde geçerli değilse Gemini'ye gönderilir ve sonuç SQLite'a yazılır. Öğrenci gün içinde
+"Analizi Başlat"a bastığında verisi değişmediyse cevap doğrudan önbellekten gelir.
+
+İstekler sırayla ve aralarında --aralik-sn beklenerek gönderilir (kullanılan istemci kütüphanesinde
+toplu iş API'si olmadığından oran sınırına takılmamak için). API anahtarı --api-anahtari ya da
+GOOGLE_API_KEY ortam değişkeniyle verilir.
+
+Kullanım:
+    python toplu_oneri_uret.py --gun 7
+    0 3 * * * cd /srv/asistan && python toplu_oneri_uret.py --aralik-sn 6    # crontab
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from app import VERI_DIZINI, CalismaDeposu, OgrenmeAnalitigi, OneriOnbellegi, gemini_uret
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Aktif öğrenciler için AI önerilerini önceden üretir.")
+    parser.add_argument("--veri-dizini", default=VERI_DIZINI,
+                        help="Kalıcı veri dizini (varsayılan: ASISTAN_VERI_DIZINI)")
+    parser.add_argument("--gun", type=int, default=7, help="Son kaç günde kaydı olanlar aktif sayılır (varsayılan: 7)")
+    parser.add_argument("--aralik-sn", type=float, default=4.0, help="İki LLM isteği arasındaki bekleme (varsayılan: 4)")
+    parser.add_argument("--azami", type=int, default=0, help="En fazla bu kadar öneri üret (0: sınırsız)")
+    parser.add_argument("--api-anahtari", default=os.environ.get("GOOGLE_API_KEY", ""), help="Gemini API anahtarı")
+    parser.add_argument("--kuru", action="store_true", help="LLM'e gönderme, sadece kaç öneri üretileceğini yaz")
+    args = parser.parse_args(argv)
+
+    if not args.veri_dizini:
+        sys.stderr.write("Hata: kalıcı veri kapalı (veri dizini boş).\n")
+        return 1
+    if not args.api_anahtari and not args.kuru:
+        sys.stderr.write("Hata: API anahtarı gerekli (--api-anahtari veya GOOGLE_API_KEY).\n")
+        return 1
+
+    depo = CalismaDeposu(os.path.join(args.veri_dizini, "asistan.db"))
+    onbellek = OneriOnbellegi(depo)
+    istatistik = {"aktif": 0, "onbellekte": 0, "uretilen": 0, "hata": 0}
+    for kullanici_adi in depo.aktif_kullanicilar(args.gun):
+        istatistik["aktif"] += 1
+        analitik = OgrenmeAnalitigi()
+        analitik.depodan_yukle(depo, kullanici_adi)
+        istek = analitik.oneri_istegi(kullanici_adi)
+        if istek is None:
+            continue
+        anahtar, prompt = istek
+        if onbellek.al(anahtar) is not None:
+            istatistik["onbellekte"] += 1
+            continue
+        if args.azami and istatistik["uretilen"] + istatistik["hata"] >= args.azami:
+            break
+        if args.kuru:
+            istatistik["uretilen"] += 1
+            continue
+        try:
+            onbellek.kaydet(anahtar, kullanici_adi, gemini_uret(args.api_anahtari, prompt, "ai_oneri_toplu"))
+            istatistik["uretilen"] += 1
+        except Exception as e:
+            istatistik["hata"] += 1
+            sys.stderr.write(f"{kullanici_adi}: {e}\n")
+        time.sleep(args.aralik_sn)
+
+    print(json.dumps(istatistik, ensure_ascii=False))
+    return 1 if istatistik["hata"] and not istatistik["uretilen"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())